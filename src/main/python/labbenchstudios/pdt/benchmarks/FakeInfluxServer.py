@@ -0,0 +1,243 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import gzip
+import logging
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+class InfluxWriteRequestHandler(BaseHTTPRequestHandler):
+	"""
+	Request handler for FakeInfluxServer. POST to the write path, and
+	GET / HEAD to the ping and health paths, are supported.
+	
+	"""
+	
+	protocol_version = 'HTTP/1.1'
+	
+	def do_GET(self):
+		self._handleStatusRequest(sendBody = True)
+	
+	def do_HEAD(self):
+		self._handleStatusRequest(sendBody = False)
+	
+	def do_POST(self):
+		influxServer = self.server.influxServer
+		url = urlsplit(self.path)
+		
+		body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+		
+		if url.path != influxServer.WRITE_PATH:
+			self._sendResponse(404, b'{"code":"not found","message":"path not found"}')
+			
+			return
+		
+		statusCode, message = influxServer.handleWrite(url.query, self.headers, body)
+		
+		self._sendResponse(statusCode, message)
+	
+	def log_message(self, format, *args):
+		logging.debug("Fake Influx request from %s: %s", self.address_string(), format % args)
+	
+	def _handleStatusRequest(self, sendBody: bool = True):
+		path = urlsplit(self.path).path
+		
+		if path == FakeInfluxServer.PING_PATH:
+			self._sendResponse(204)
+		elif path == FakeInfluxServer.HEALTH_PATH:
+			self._sendResponse(200, b'{"name":"influxdb","status":"pass"}' if sendBody else b'')
+		else:
+			self._sendResponse(404)
+	
+	def _sendResponse(self, statusCode: int, body: bytes = b''):
+		self.send_response(statusCode)
+		
+		if body:
+			self.send_header('Content-Type', 'application/json; charset=utf-8')
+		
+		self.send_header('Content-Length', str(len(body)))
+		self.end_headers()
+		
+		if body:
+			self.wfile.write(body)
+	
+class FakeInfluxServer(object):
+	"""
+	In-process stand-in for the InfluxDB v2 HTTP write API, for testing and
+	benchmarking the Influx connector without a real server. It serves
+	/api/v2/write (line protocol, optionally gzip encoded) plus /ping and
+	/health, from a ThreadingHTTPServer on a daemon thread.
+	
+	Each write is recorded - the bucket, org, precision, and the lines - and
+	answered with 204. Faults can be injected:
+	  responseDelaySecs: the delay before each write response.
+	  failEvery: if > 0, every Nth write gets a 'failStatusCode' response.
+	  authToken: if set, writes without a matching 'Authorization: Token'
+	  header get a 401 response.
+	"""
+	
+	WRITE_PATH  = '/api/v2/write'
+	PING_PATH   = '/ping'
+	HEALTH_PATH = '/health'
+	
+	DEFAULT_HOST = '127.0.0.1'
+	
+	def __init__(self, host: str = DEFAULT_HOST, port: int = 0):
+		"""
+		Constructor. The server isn't started until startServer() is called.
+		
+		@param host The address to listen on.
+		@param port The port to listen on. 0 (default) uses a free port.
+		"""
+		self.host = host
+		self.port = port
+		
+		self.responseDelaySecs = 0.0
+		self.failEvery         = 0
+		self.failStatusCode    = 503
+		self.authToken         = None
+		
+		self.lock = threading.Lock()
+		
+		self.httpServer   = None
+		self.serverThread = None
+		self.requestCount = 0
+		
+		self.clearRecords()
+	
+	def clearRecords(self):
+		"""
+		Clears the recorded writes.
+		
+		"""
+		with self.lock:
+			self.writes = []
+			self.failedCount = 0
+	
+	def getFailedCount(self) -> int:
+		return self.failedCount
+	
+	def getLines(self, bucket: str = None) -> list:
+		"""
+		Returns every line written, optionally only those written to 'bucket'.
+		
+		@param bucket The bucket. None (default) returns all lines.
+		@return list The line protocol str's.
+		"""
+		with self.lock:
+			return [line for write in self.writes if bucket is None or write[0] == bucket for line in write[3]]
+	
+	def getPort(self) -> int:
+		return self.port
+	
+	def getUrl(self) -> str:
+		return 'http://' + self.host + ':' + str(self.port)
+	
+	def getWrites(self) -> list:
+		"""
+		Returns each write received.
+		
+		@return list (bucket, org, precision, lines, time received) tuples.
+		"""
+		with self.lock:
+			return list(self.writes)
+	
+	def handleWrite(self, query: str, headers, body: bytes) -> tuple:
+		"""
+		Handles a write request. Called by InfluxWriteRequestHandler.
+		
+		@param query The URL query string.
+		@param headers The request headers.
+		@param body The request body.
+		@return tuple The (status code, response body bytes).
+		"""
+		if self.responseDelaySecs > 0.0:
+			time.sleep(self.responseDelaySecs)
+		
+		if self.authToken and headers.get('Authorization') != 'Token ' + self.authToken:
+			return (401, b'{"code":"unauthorized","message":"unauthorized access"}')
+		
+		params = parse_qs(query)
+		bucket = params.get('bucket', [None])[0]
+		
+		if not bucket:
+			return (400, b'{"code":"invalid","message":"bucket not specified"}')
+		
+		with self.lock:
+			self.requestCount += 1
+			
+			if self.failEvery > 0 and self.requestCount % self.failEvery == 0:
+				self.failedCount += 1
+				
+				return (self.failStatusCode, b'{"code":"unavailable","message":"injected failure"}')
+		
+		if headers.get('Content-Encoding') == 'gzip':
+			body = gzip.decompress(body)
+		
+		lines = [line for line in body.decode('utf-8').split('\n') if line]
+		
+		with self.lock:
+			self.writes.append( \
+				(bucket, params.get('org', [None])[0], params.get('precision', ['ns'])[0], lines, time.time()))
+		
+		return (204, b'')
+	
+	def isRunning(self) -> bool:
+		return self.httpServer is not None
+	
+	def startServer(self) -> int:
+		"""
+		Starts the HTTP server.
+		
+		@return int The port the server is listening on.
+		"""
+		if not self.httpServer:
+			self.httpServer = ThreadingHTTPServer((self.host, self.port), InfluxWriteRequestHandler)
+			self.httpServer.daemon_threads = True
+			self.httpServer.influxServer = self
+			
+			self.port = self.httpServer.server_address[1]
+			
+			self.serverThread = threading.Thread(target = self.httpServer.serve_forever, name = 'FakeInfluxServer', daemon = True)
+			self.serverThread.start()
+			
+			logging.info("Fake Influx server listening on %s", self.getUrl())
+		
+		return self.port
+	
+	def stopServer(self):
+		"""
+		Stops the HTTP server. The port is kept, so it can be restarted.
+		
+		"""
+		if self.httpServer:
+			self.httpServer.shutdown()
+			self.httpServer.server_close()
+			self.serverThread.join()
+			
+			self.httpServer   = None
+			self.serverThread = None
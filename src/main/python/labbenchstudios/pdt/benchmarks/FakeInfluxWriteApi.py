@@ -0,0 +1,106 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import threading
+import time
+
+class FakeInfluxWriteApi(object):
+	"""
+	In-process stand-in for the synchronous influxdb-client WriteApi used
+	by InfluxClientConnector. Assign an instance to the connector's
+	'dbClientWriteApi' (instead of calling connectClient()).
+	
+	Each record is serialized to line protocol - as the real write API
+	does before sending it - so the benchmark includes that cost. Each
+	write() can optionally be delayed, and every Nth write can raise
+	(as an unreachable server would).
+	"""
+	
+	def __init__(self, writeDelaySecs: float = 0.0, failEvery: int = 0):
+		"""
+		Constructor.
+		
+		@param writeDelaySecs The time each write() takes.
+		@param failEvery If > 0, every Nth write() raises ConnectionError.
+		"""
+		self.writeDelaySecs = max(writeDelaySecs, 0.0)
+		self.failEvery = max(failEvery, 0)
+		
+		self.lock = threading.Lock()
+		self.reset()
+		
+	def getBucketCounts(self) -> dict:
+		"""
+		Returns the number of records written to each bucket.
+		
+		@return dict
+		"""
+		with self.lock:
+			return dict(self.bucketCounts)
+	
+	def getFailedCount(self) -> int:
+		return self.failedCount
+	
+	def getWriteCount(self) -> int:
+		return self.writeCount
+	
+	def getWrittenBytes(self) -> int:
+		return self.writtenBytes
+	
+	def reset(self):
+		"""
+		Clears the recorded counts.
+		
+		"""
+		with self.lock:
+			self.callCount    = 0
+			self.writeCount   = 0
+			self.writtenBytes = 0
+			self.failedCount  = 0
+			self.bucketCounts = {}
+	
+	def write(self, bucket: str = None, org: str = None, record = None, **kwargs):
+		"""
+		Serializes and records 'record' (a Point, or a line protocol str).
+		
+		@param bucket The target bucket.
+		@param org The org (ignored).
+		@param record The record to write.
+		"""
+		if self.writeDelaySecs > 0.0:
+			time.sleep(self.writeDelaySecs)
+		
+		lineProtocol = record if isinstance(record, str) else record.to_line_protocol()
+		
+		with self.lock:
+			self.callCount += 1
+			
+			if self.failEvery > 0 and self.callCount % self.failEvery == 0:
+				self.failedCount += 1
+				
+				raise ConnectionError("Simulated write failure to bucket: " + str(bucket))
+			
+			self.writeCount   += 1
+			self.writtenBytes += len(lineProtocol)
+			self.bucketCounts[bucket] = self.bucketCounts.get(bucket, 0) + 1
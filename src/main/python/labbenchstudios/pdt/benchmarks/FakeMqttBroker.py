@@ -0,0 +1,469 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import asyncio
+import logging
+import struct
+import threading
+import time
+
+class FakeMqttBroker(object):
+	"""
+	Minimal in-process MQTT 3.1.1 broker, for testing and benchmarking the
+	MQTT connector without a real broker. It runs an asyncio event loop on
+	a daemon thread, and supports CONNECT, PUBLISH (QoS 0 and 1), SUBSCRIBE
+	and UNSUBSCRIBE (with '+' and '#' wildcards), PINGREQ and DISCONNECT.
+	QoS 2 subscriptions are granted as QoS 1; a QoS 2 PUBLISH closes the
+	connection. Retained messages, wills and sessions aren't supported -
+	every connection is a clean session.
+	
+	Every CONNECT and PUBLISH received is recorded, along with the time it
+	was received. Faults can be injected:
+	  connectRc: the CONNACK return code (e.g. 5 to refuse every client).
+	  ackDelaySecs: the delay before each PUBACK (and before routing the message).
+	  dropEvery: if > 0, the connection is closed (without an ack) on every Nth PUBLISH.
+	  disconnectClients(): closes all client connections.
+	
+	stopBroker() and startBroker() can be used to simulate a broker restart;
+	the port is kept, so clients can reconnect.
+	"""
+	
+	CONNECT     = 1
+	CONNACK     = 2
+	PUBLISH     = 3
+	PUBACK      = 4
+	SUBSCRIBE   = 8
+	SUBACK      = 9
+	UNSUBSCRIBE = 10
+	UNSUBACK    = 11
+	PINGREQ     = 12
+	PINGRESP    = 13
+	DISCONNECT  = 14
+	
+	CONNACK_ACCEPTED = 0
+	
+	DEFAULT_HOST = '127.0.0.1'
+	
+	def __init__(self, host: str = DEFAULT_HOST, port: int = 0):
+		"""
+		Constructor. The broker isn't started until startBroker() is called.
+		
+		@param host The address to listen on.
+		@param port The port to listen on. 0 (default) uses a free port.
+		"""
+		self.host = host
+		self.port = port
+		
+		self.connectRc    = self.CONNACK_ACCEPTED
+		self.ackDelaySecs = 0.0
+		self.dropEvery    = 0
+		
+		self.lock = threading.Lock()
+		
+		self.eventLoop    = None
+		self.loopThread   = None
+		self.server       = None
+		self.clients      = set()
+		self.publishCount = 0
+		
+		self.clearRecords()
+	
+	def clearRecords(self):
+		"""
+		Clears the recorded connects and messages.
+		
+		"""
+		with self.lock:
+			self.connects = []
+			self.messages = []
+	
+	def disconnectClients(self) -> int:
+		"""
+		Closes every client connection (without a DISCONNECT, as a broker
+		failure would). The broker keeps listening.
+		
+		@return int The number of connections closed.
+		"""
+		if not self.eventLoop:
+			return 0
+		
+		return asyncio.run_coroutine_threadsafe(self._closeClients(), self.eventLoop).result()
+	
+	def getClientCount(self) -> int:
+		"""
+		Returns the number of connected clients.
+		
+		@return int
+		"""
+		return len(self.clients)
+	
+	def getConnects(self) -> list:
+		"""
+		Returns each CONNECT received.
+		
+		@return list (clientID, time received) tuples.
+		"""
+		with self.lock:
+			return list(self.connects)
+	
+	def getMessages(self, topic: str = None) -> list:
+		"""
+		Returns each PUBLISH received, optionally only those for 'topic'.
+		
+		@param topic The topic. None (default) returns all messages.
+		@return list (clientID, topic, payload bytes, qos, time received) tuples.
+		"""
+		with self.lock:
+			return [msg for msg in self.messages if topic is None or msg[1] == topic]
+	
+	def getPort(self) -> int:
+		"""
+		Returns the port the broker is listening on (once started).
+		
+		@return int
+		"""
+		return self.port
+	
+	def getSubscriptionCount(self) -> int:
+		"""
+		Returns the total number of subscriptions of all connected clients.
+		
+		@return int
+		"""
+		return sum(len(client.subscriptions) for client in list(self.clients))
+	
+	def isRunning(self) -> bool:
+		return self.server is not None
+	
+	def startBroker(self) -> int:
+		"""
+		Starts listening. The event loop thread is created on the first call.
+		
+		@return int The port the broker is listening on.
+		"""
+		if not self.eventLoop:
+			self.eventLoop  = asyncio.new_event_loop()
+			self.loopThread = threading.Thread(target = self.eventLoop.run_forever, name = 'FakeMqttBroker', daemon = True)
+			self.loopThread.start()
+		
+		if not self.server:
+			asyncio.run_coroutine_threadsafe(self._startServer(), self.eventLoop).result()
+			
+			logging.info("Fake MQTT broker listening on %s:%s", self.host, self.port)
+		
+		return self.port
+	
+	def stopBroker(self, stopLoop: bool = False):
+		"""
+		Stops listening and closes every client connection.
+		
+		@param stopLoop If True, the event loop thread is stopped as well
+		(and is recreated if the broker is started again).
+		"""
+		if not self.eventLoop:
+			return
+		
+		asyncio.run_coroutine_threadsafe(self._stopServer(), self.eventLoop).result()
+		
+		if stopLoop:
+			self.eventLoop.call_soon_threadsafe(self.eventLoop.stop)
+			self.loopThread.join()
+			self.eventLoop.close()
+			
+			self.eventLoop  = None
+			self.loopThread = None
+	
+	@classmethod
+	def isTopicMatch(cls, topicFilter: str, topic: str) -> bool:
+		"""
+		Checks if 'topic' matches 'topicFilter' (which may contain '+' and '#').
+		
+		@param topicFilter The subscription topic filter.
+		@param topic The topic name.
+		@return bool
+		"""
+		filterLevels = topicFilter.split('/')
+		topicLevels  = topic.split('/')
+		
+		for i, filterLevel in enumerate(filterLevels):
+			if filterLevel == '#':
+				return True
+			
+			if i >= len(topicLevels):
+				return False
+			
+			if filterLevel != '+' and filterLevel != topicLevels[i]:
+				return False
+		
+		return len(filterLevels) == len(topicLevels)
+	
+	@classmethod
+	def encodePacket(cls, packetType: int, flags: int, body: bytes) -> bytes:
+		"""
+		Creates a packet - the fixed header (including the variable length
+		remaining length) followed by 'body'.
+		
+		@param packetType The packet type.
+		@param flags The fixed header flags.
+		@param body The variable header and payload.
+		@return bytes
+		"""
+		header = bytearray([(packetType << 4) | flags])
+		remaining = len(body)
+		
+		while True:
+			digit = remaining % 128
+			remaining //= 128
+			
+			header.append(digit | 0x80 if remaining > 0 else digit)
+			
+			if remaining == 0:
+				break
+		
+		return bytes(header) + body
+	
+	async def _closeClients(self) -> int:
+		"""
+		Closes every client connection. Runs on the event loop.
+		
+		"""
+		clients = list(self.clients)
+		
+		for client in clients:
+			client.close()
+		
+		return len(clients)
+	
+	async def _startServer(self):
+		"""
+		Creates the listening server. Runs on the event loop.
+		
+		"""
+		self.server = await asyncio.start_server(self._handleClient, self.host, self.port, reuse_address = True)
+		self.port = self.server.sockets[0].getsockname()[1]
+	
+	async def _stopServer(self):
+		"""
+		Closes the listening server and every client connection. Runs on the event loop.
+		
+		"""
+		server = self.server
+		self.server = None
+		
+		if server:
+			server.close()
+		
+		# newer Python versions wait for the client connections in wait_closed()
+		await self._closeClients()
+		
+		if server:
+			await server.wait_closed()
+	
+	async def _handleClient(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+		"""
+		Reads and handles packets from a single client connection, until
+		it's closed. The first packet must be a CONNECT.
+		
+		"""
+		client = _FakeMqttSession(writer)
+		
+		try:
+			while True:
+				firstByte = await reader.readexactly(1)
+				
+				remaining  = 0
+				multiplier = 1
+				
+				while True:
+					digit = (await reader.readexactly(1))[0]
+					remaining += (digit & 0x7F) * multiplier
+					multiplier *= 128
+					
+					if not digit & 0x80:
+						break
+				
+				body = await reader.readexactly(remaining) if remaining else b''
+				
+				packetType = firstByte[0] >> 4
+				flags = firstByte[0] & 0x0F
+				
+				if not client.clientID and packetType != self.CONNECT:
+					break
+				
+				if not await self._handlePacket(client, packetType, flags, body):
+					break
+		except (asyncio.IncompleteReadError, ConnectionError):
+			pass
+		except Exception as e:
+			logging.warning("Fake MQTT broker client error: %s", str(e))
+		finally:
+			self.clients.discard(client)
+			client.close()
+	
+	async def _handlePacket(self, client, packetType: int, flags: int, body: bytes) -> bool:
+		"""
+		Handles a single packet.
+		
+		@return bool False if the connection should be closed; True otherwise.
+		"""
+		if packetType == self.CONNECT:
+			# protocol name, level, connect flags and keep alive precede the client ID
+			nameLen = struct.unpack_from('!H', body)[0]
+			pos = 2 + nameLen + 4
+			idLen = struct.unpack_from('!H', body, pos)[0]
+			
+			client.clientID = body[pos + 2:pos + 2 + idLen].decode('utf-8') or ('fake-' + str(id(client)))
+			
+			with self.lock:
+				self.connects.append((client.clientID, time.time()))
+			
+			client.write(self.encodePacket(self.CONNACK, 0, bytes([0, self.connectRc])))
+			
+			if self.connectRc != self.CONNACK_ACCEPTED:
+				return False
+			
+			self.clients.add(client)
+			
+		elif packetType == self.PUBLISH:
+			qos = (flags >> 1) & 0x03
+			topicLen = struct.unpack_from('!H', body)[0]
+			topic = body[2:2 + topicLen].decode('utf-8')
+			pos = 2 + topicLen
+			packetID = None
+			
+			if qos > 1:
+				return False
+			
+			if qos == 1:
+				packetID = struct.unpack_from('!H', body, pos)[0]
+				pos += 2
+			
+			self.publishCount += 1
+			
+			if self.dropEvery > 0 and self.publishCount % self.dropEvery == 0:
+				return False
+			
+			payload = body[pos:]
+			
+			with self.lock:
+				self.messages.append((client.clientID, topic, payload, qos, time.time()))
+			
+			if self.ackDelaySecs > 0.0:
+				await asyncio.sleep(self.ackDelaySecs)
+			
+			if packetID is not None:
+				client.write(self.encodePacket(self.PUBACK, 0, struct.pack('!H', packetID)))
+			
+			self._routeMessage(topic, payload, qos)
+			
+		elif packetType == self.SUBSCRIBE:
+			packetID = struct.unpack_from('!H', body)[0]
+			pos = 2
+			grantedQos = bytearray()
+			
+			while pos < len(body):
+				filterLen = struct.unpack_from('!H', body, pos)[0]
+				topicFilter = body[pos + 2:pos + 2 + filterLen].decode('utf-8')
+				qos = min(body[pos + 2 + filterLen] & 0x03, 1)
+				
+				client.subscriptions[topicFilter] = qos
+				grantedQos.append(qos)
+				
+				pos += 3 + filterLen
+			
+			client.write(self.encodePacket(self.SUBACK, 0, struct.pack('!H', packetID) + bytes(grantedQos)))
+			
+		elif packetType == self.UNSUBSCRIBE:
+			packetID = struct.unpack_from('!H', body)[0]
+			pos = 2
+			
+			while pos < len(body):
+				filterLen = struct.unpack_from('!H', body, pos)[0]
+				client.subscriptions.pop(body[pos + 2:pos + 2 + filterLen].decode('utf-8'), None)
+				
+				pos += 2 + filterLen
+			
+			client.write(self.encodePacket(self.UNSUBACK, 0, struct.pack('!H', packetID)))
+			
+		elif packetType == self.PINGREQ:
+			client.write(self.encodePacket(self.PINGRESP, 0, b''))
+			
+		elif packetType == self.DISCONNECT:
+			return False
+		
+		# PUBACKs from subscribers need no action
+		return True
+	
+	def _routeMessage(self, topic: str, payload: bytes, qos: int):
+		"""
+		Sends the message to every client with a matching subscription, at
+		the lower of the published and subscribed QoS.
+		
+		"""
+		topicBytes = topic.encode('utf-8')
+		
+		for client in list(self.clients):
+			subQos = None
+			
+			for topicFilter, filterQos in client.subscriptions.items():
+				if self.isTopicMatch(topicFilter, topic):
+					subQos = filterQos if subQos is None else max(subQos, filterQos)
+			
+			if subQos is None:
+				continue
+			
+			deliveryQos = min(qos, subQos)
+			body = struct.pack('!H', len(topicBytes)) + topicBytes
+			
+			if deliveryQos > 0:
+				body += struct.pack('!H', client.nextPacketID())
+			
+			client.write(self.encodePacket(self.PUBLISH, deliveryQos << 1, body + payload))
+	
+class _FakeMqttSession(object):
+	"""
+	The state of a single FakeMqttBroker client connection. Only used on
+	the broker's event loop thread.
+	
+	"""
+	
+	def __init__(self, writer: asyncio.StreamWriter):
+		self.writer = writer
+		
+		self.clientID      = None
+		self.subscriptions = {}
+		self.packetID      = 0
+		
+	def close(self):
+		if not self.writer.is_closing():
+			self.writer.close()
+	
+	def nextPacketID(self) -> int:
+		self.packetID = (self.packetID % 65535) + 1
+		
+		return self.packetID
+	
+	def write(self, packet: bytes):
+		if not self.writer.is_closing():
+			self.writer.write(packet)
@@ -0,0 +1,128 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import threading
+import time
+
+import paho.mqtt.client as mqttClient
+
+class FakeMessageInfo(object):
+	"""
+	Stand-in for the paho MQTTMessageInfo returned by FakeMqttClient.publish().
+	
+	"""
+	
+	def __init__(self, mid: int = 0, rc: int = mqttClient.MQTT_ERR_SUCCESS):
+		self.mid = mid
+		self.rc  = rc
+		
+	def is_published(self) -> bool:
+		return self.rc == mqttClient.MQTT_ERR_SUCCESS
+	
+	def wait_for_publish(self, timeout: float = None):
+		pass
+	
+class FakeMqttClient(object):
+	"""
+	In-process stand-in for the paho MQTT client used by MqttClientConnector.
+	Assign an instance to the connector's 'mqttClient' (instead of calling
+	connectClient()) and everything but the network I/O - topic and QoS
+	checks, the publish span and the msg counters - is exercised.
+	
+	Each publish() can optionally be delayed (the caller's thread sleeps,
+	as it would while waiting for the socket), and every Nth publish can
+	be failed with MQTT_ERR_NO_CONN.
+	"""
+	
+	def __init__(self, publishDelaySecs: float = 0.0, failEvery: int = 0):
+		"""
+		Constructor.
+		
+		@param publishDelaySecs The time each publish() takes.
+		@param failEvery If > 0, every Nth publish() fails.
+		"""
+		self.publishDelaySecs = max(publishDelaySecs, 0.0)
+		self.failEvery = max(failEvery, 0)
+		
+		self.lock = threading.Lock()
+		self.reset()
+		
+	def getFailedCount(self) -> int:
+		return self.failedCount
+	
+	def getPublishCount(self) -> int:
+		return self.publishCount
+	
+	def getPublishedBytes(self) -> int:
+		return self.publishedBytes
+	
+	def getTopicCounts(self) -> dict:
+		"""
+		Returns the number of messages published to each topic.
+		
+		@return dict
+		"""
+		with self.lock:
+			return dict(self.topicCounts)
+	
+	def publish(self, topic: str = None, payload = None, qos: int = 0, retain: bool = False) -> FakeMessageInfo:
+		"""
+		Records the message, as paho's publish() would queue it.
+		
+		@param topic The topic.
+		@param payload The payload (str or bytes).
+		@param qos The QoS (ignored).
+		@param retain The retain flag (ignored).
+		@return FakeMessageInfo
+		"""
+		if self.publishDelaySecs > 0.0:
+			time.sleep(self.publishDelaySecs)
+		
+		payloadSize = len(payload.encode('utf-8') if isinstance(payload, str) else (payload or b''))
+		
+		with self.lock:
+			self.mid += 1
+			
+			if self.failEvery > 0 and self.mid % self.failEvery == 0:
+				self.failedCount += 1
+				
+				return FakeMessageInfo(mid = self.mid, rc = mqttClient.MQTT_ERR_NO_CONN)
+			
+			self.publishCount   += 1
+			self.publishedBytes += payloadSize
+			self.topicCounts[topic] = self.topicCounts.get(topic, 0) + 1
+			
+			return FakeMessageInfo(mid = self.mid)
+	
+	def reset(self):
+		"""
+		Clears the recorded counts.
+		
+		"""
+		with self.lock:
+			self.mid            = 0
+			self.publishCount   = 0
+			self.publishedBytes = 0
+			self.failedCount    = 0
+			self.topicCounts    = {}
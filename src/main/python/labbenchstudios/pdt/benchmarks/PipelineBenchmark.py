@@ -0,0 +1,476 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import gc
+import json
+import logging
+import platform
+import sys
+import time
+import tracemalloc
+
+from datetime import datetime, timezone
+from time import perf_counter, perf_counter_ns, process_time_ns, thread_time_ns
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.MetricHistogram import MetricHistogram
+from labbenchstudios.pdt.common.MetricsRegistry import MetricsRegistry
+
+from labbenchstudios.pdt.benchmarks.FakeInfluxWriteApi import FakeInfluxWriteApi
+from labbenchstudios.pdt.benchmarks.FakeMqttClient import FakeMqttClient
+
+from labbenchstudios.pdt.edge.app.DeviceDataManager import DeviceDataManager
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+
+class PipelineBenchmark(object):
+	"""
+	End-to-end benchmark of the DeviceDataManager sensor pipeline. Synthetic
+	SensorData is passed to handleSensorMessage() - as fast as possible, or
+	at a fixed rate - with the real MQTT and Influx connectors wired to
+	in-process fake clients (FakeMqttClient and FakeInfluxWriteApi), so no
+	broker or TSDB is needed.
+	
+	The results include the throughput, the p50 / p99 latency of the whole
+	pipeline and of each instrumented stage (the MetricsRegistry spans),
+	the CPU time per message, and - from a separate, shorter pass with
+	tracemalloc enabled, as tracing slows everything down - the memory
+	allocated per message.
+	
+	Results are a JSON serializable dict, and can be compared with a stored
+	baseline using compareResults(). Run this module directly to run the
+	benchmark, write the results, and compare them with a baseline.
+	"""
+	
+	RESULTS_VERSION = 1
+	
+	DEFAULT_MSG_COUNT       = 5000
+	DEFAULT_ALLOC_MSG_COUNT = 500
+	DEFAULT_WARM_UP_COUNT   = 200
+	DEFAULT_TOLERANCE_PCT   = 10.0
+	
+	PIPELINE_SPAN = 'handleSensorMessage'
+	
+	STAGE_SPANS = ( \
+		ConfigConst.DATA_ENCODE_SPAN, \
+		ConfigConst.TSDB_STORE_SPAN, \
+		ConfigConst.MQTT_PUBLISH_SPAN, \
+		ConfigConst.ACTUATOR_DISPATCH_SPAN)
+	
+	PERCENTILES = (50.0, 99.0)
+	
+	# metrics where a larger value is better - all others are costs
+	HIGHER_IS_BETTER = ('msgsPerSec',)
+	
+	# (type ID, name, base value) of the synthetic sensors
+	SENSOR_TYPES = ( \
+		(ConfigConst.HUMIDITY_SENSOR_TYPE, ConfigConst.HUMIDITY_SENSOR_NAME, 40.0), \
+		(ConfigConst.PRESSURE_SENSOR_TYPE, ConfigConst.PRESSURE_SENSOR_NAME, 1000.0), \
+		(ConfigConst.TEMP_SENSOR_TYPE, ConfigConst.TEMP_SENSOR_NAME, 19.0))
+	
+	def __init__(self, \
+			msgCount: int = DEFAULT_MSG_COUNT, \
+			ratePerSec: float = 0.0, \
+			enableMqtt: bool = True, \
+			enableTsdb: bool = True, \
+			publishDelaySecs: float = 0.0, \
+			storeDelaySecs: float = 0.0, \
+			allocMsgCount: int = DEFAULT_ALLOC_MSG_COUNT, \
+			warmUpCount: int = DEFAULT_WARM_UP_COUNT, \
+			logLevel: str = 'WARNING'):
+		"""
+		Constructor.
+		
+		@param msgCount The number of messages to time.
+		@param ratePerSec The message rate. 0 (default) sends as fast as possible.
+		@param enableMqtt If True, the MQTT connector (with a FakeMqttClient) is used.
+		@param enableTsdb If True, the Influx connector (with a FakeInfluxWriteApi) is used.
+		@param publishDelaySecs The simulated time of each MQTT publish.
+		@param storeDelaySecs The simulated time of each TSDB write.
+		@param allocMsgCount The number of messages to send with tracemalloc enabled. 0 skips this pass.
+		@param warmUpCount The number of untimed messages sent first.
+		@param logLevel The root logger level while the benchmark runs.
+		"""
+		self.msgCount         = max(msgCount, 1)
+		self.ratePerSec       = max(ratePerSec, 0.0)
+		self.enableMqtt       = enableMqtt
+		self.enableTsdb       = enableTsdb
+		self.publishDelaySecs = publishDelaySecs
+		self.storeDelaySecs   = storeDelaySecs
+		self.allocMsgCount    = max(allocMsgCount, 0)
+		self.warmUpCount      = max(warmUpCount, 0)
+		self.logLevel         = logLevel
+		
+		self.fakeMqttClient = None
+		self.fakeWriteApi   = None
+		self.results        = None
+	
+	def createSensorData(self, count: int) -> list:
+		"""
+		Creates 'count' SensorData instances, cycling through SENSOR_TYPES
+		with slowly varying values.
+		
+		@param count The number of instances to create.
+		@return list
+		"""
+		dataList = []
+		
+		for i in range(count):
+			typeID, name, baseValue = self.SENSOR_TYPES[i % len(self.SENSOR_TYPES)]
+			
+			sensorData = SensorData(typeID = typeID, name = name)
+			sensorData.setValue(baseValue + (i % 50) * 0.1)
+			
+			dataList.append(sensorData)
+		
+		return dataList
+	
+	def getFakeMqttClient(self) -> FakeMqttClient:
+		return self.fakeMqttClient
+	
+	def getFakeWriteApi(self) -> FakeInfluxWriteApi:
+		return self.fakeWriteApi
+	
+	def getResults(self) -> dict:
+		"""
+		Returns the results of the last call to runBenchmark().
+		
+		@return dict
+		"""
+		return self.results
+	
+	def runBenchmark(self) -> dict:
+		"""
+		Runs the warm up, the timed pass and the allocation pass.
+		
+		@return dict The results (see flattenMetrics() for the metric names).
+		"""
+		rootLogger = logging.getLogger()
+		rootLevel  = rootLogger.level
+		rootLogger.setLevel(self.logLevel)
+		
+		dataMgr = self._createDataManager()
+		
+		try:
+			self._sendMessages(dataMgr, self.createSensorData(self.warmUpCount))
+			
+			metricsRegistry = MetricsRegistry()
+			metricsRegistry.reset()
+			
+			if self.fakeMqttClient:
+				self.fakeMqttClient.reset()
+			
+			if self.fakeWriteApi:
+				self.fakeWriteApi.reset()
+			
+			pipelineHistogram = MetricHistogram(self.PIPELINE_SPAN)
+			dataList = self.createSensorData(self.msgCount)
+			
+			cpuStartNs    = process_time_ns()
+			threadStartNs = thread_time_ns()
+			startTime     = perf_counter()
+			
+			self._sendMessages(dataMgr, dataList, pipelineHistogram)
+			
+			elapsedSecs = perf_counter() - startTime
+			cpuNs       = process_time_ns() - cpuStartNs
+			threadNs    = thread_time_ns() - threadStartNs
+			
+			stages = {self.PIPELINE_SPAN: self._getSpanStats(pipelineHistogram)}
+			
+			for spanName in self.STAGE_SPANS:
+				stats = self._getSpanStats(metricsRegistry.getHistogram(spanName))
+				
+				if stats['count'] > 0:
+					stages[spanName] = stats
+			
+			metrics = { \
+				'msgsPerSec': self.msgCount / elapsedSecs if elapsedSecs > 0.0 else 0.0, \
+				'cpuNsPerMsg': cpuNs / self.msgCount, \
+				'callerCpuNsPerMsg': threadNs / self.msgCount, \
+				'stages': stages }
+			
+			if self.allocMsgCount > 0:
+				metrics.update(self._measureAllocations(dataMgr))
+			
+			self.results = { \
+				'benchmark': self.__class__.__name__, \
+				'version': self.RESULTS_VERSION, \
+				'timeStamp': datetime.now(timezone.utc).isoformat(), \
+				'python': platform.python_version(), \
+				'platform': platform.platform(), \
+				'params': { \
+					'msgCount': self.msgCount, \
+					'ratePerSec': self.ratePerSec, \
+					'enableMqtt': self.enableMqtt, \
+					'enableTsdb': self.enableTsdb, \
+					'publishDelaySecs': self.publishDelaySecs, \
+					'storeDelaySecs': self.storeDelaySecs, \
+					'allocMsgCount': self.allocMsgCount, \
+					'logLevel': self.logLevel }, \
+				'metrics': metrics }
+			
+			return self.results
+		finally:
+			if dataMgr.actuatorAdapterMgr:
+				dataMgr.actuatorAdapterMgr.stopManager()
+			
+			rootLogger.setLevel(rootLevel)
+	
+	@classmethod
+	def compareResults(cls, results: dict, baseline: dict, tolerancePct: float = DEFAULT_TOLERANCE_PCT) -> list:
+		"""
+		Compares each metric in 'results' with the same metric in 'baseline'.
+		Metrics that are missing from either, or are 0 in the baseline, are
+		skipped.
+		
+		@param results The current results.
+		@param baseline The baseline results.
+		@param tolerancePct The allowed change (in percent) in the worse direction.
+		@return list (metric name, baseline value, current value, change percent)
+		tuples for each metric that regressed by more than 'tolerancePct'.
+		"""
+		currentMetrics  = cls.flattenMetrics(results)
+		baselineMetrics = cls.flattenMetrics(baseline)
+		regressions     = []
+		
+		for name, baselineVal in baselineMetrics.items():
+			currentVal = currentMetrics.get(name)
+			
+			if currentVal is None or not baselineVal:
+				continue
+			
+			changePct = (currentVal - baselineVal) * 100.0 / baselineVal
+			
+			if name.split('.')[-1] in cls.HIGHER_IS_BETTER:
+				regressed = changePct < -tolerancePct
+			else:
+				regressed = changePct > tolerancePct
+			
+			if regressed:
+				regressions.append((name, baselineVal, currentVal, changePct))
+		
+		return regressions
+	
+	@classmethod
+	def flattenMetrics(cls, results: dict) -> dict:
+		"""
+		Returns the comparable metrics in 'results' as a flat dict, keyed
+		by name - e.g. 'msgsPerSec' and 'stages.mqttPublish.p99'. Sample
+		counts aren't included.
+		
+		@param results The results.
+		@return dict
+		"""
+		flatMetrics = {}
+		metrics = results.get('metrics', {}) if results else {}
+		
+		for name, val in metrics.items():
+			if name == 'stages':
+				for spanName, stats in val.items():
+					for statName, statVal in stats.items():
+						if statName != 'count':
+							flatMetrics['stages.' + spanName + '.' + statName] = statVal
+			else:
+				flatMetrics[name] = val
+		
+		return flatMetrics
+	
+	@classmethod
+	def loadResults(cls, fileName: str) -> dict:
+		"""
+		Loads results written by saveResults().
+		
+		@param fileName The file name.
+		@return dict The results, or None if the file can't be read.
+		"""
+		try:
+			with open(fileName, 'r', encoding = 'utf-8') as resultsFile:
+				return json.load(resultsFile)
+		except (OSError, ValueError) as e:
+			logging.warning("Failed to load benchmark results %s: %s", fileName, str(e))
+		
+		return None
+	
+	@classmethod
+	def saveResults(cls, results: dict, fileName: str):
+		"""
+		Writes 'results' as JSON.
+		
+		@param results The results.
+		@param fileName The file name.
+		"""
+		with open(fileName, 'w', encoding = 'utf-8') as resultsFile:
+			json.dump(results, resultsFile, indent = 2, sort_keys = True)
+	
+	def _createDataManager(self) -> DeviceDataManager:
+		"""
+		Creates a DeviceDataManager (which isn't started), with the
+		enabled connectors wired to fake clients.
+		
+		@return DeviceDataManager
+		"""
+		dataMgr = DeviceDataManager()
+		
+		# imported here, so only the enabled connectors' dependencies are loaded
+		if self.enableMqtt:
+			from labbenchstudios.pdt.edge.connection.MqttClientConnector import MqttClientConnector
+			
+			self.fakeMqttClient = FakeMqttClient(publishDelaySecs = self.publishDelaySecs)
+			
+			dataMgr.mqttClient = MqttClientConnector()
+			dataMgr.mqttClient.mqttClient = self.fakeMqttClient
+		
+		if self.enableTsdb:
+			from labbenchstudios.pdt.edge.connection.InfluxClientConnector import InfluxClientConnector
+			
+			self.fakeWriteApi = FakeInfluxWriteApi(writeDelaySecs = self.storeDelaySecs)
+			
+			dataMgr.tsdbClient = InfluxClientConnector()
+			dataMgr.tsdbClient.dbClientWriteApi = self.fakeWriteApi
+		
+		return dataMgr
+	
+	def _getSpanStats(self, histogram: MetricHistogram) -> dict:
+		"""
+		Returns the count, mean and PERCENTILES of 'histogram', in microseconds.
+		
+		@param histogram The histogram.
+		@return dict
+		"""
+		stats = histogram.getStats(percentiles = self.PERCENTILES)
+		
+		return { \
+			statName: (statVal if statName == 'count' else statVal / 1000.0) \
+				for statName, statVal in stats.items() if statName in ('count', 'mean', 'p50', 'p99') }
+	
+	def _measureAllocations(self, dataMgr: DeviceDataManager) -> dict:
+		"""
+		Sends 'allocMsgCount' messages with tracemalloc enabled.
+		
+		@param dataMgr The DeviceDataManager.
+		@return dict The peak traced bytes above the starting point (the transient
+		allocations), and the traced bytes per message still allocated afterwards.
+		"""
+		dataList = self.createSensorData(self.allocMsgCount)
+		
+		tracemalloc.start()
+		
+		try:
+			startBytes = tracemalloc.get_traced_memory()[0]
+			tracemalloc.reset_peak()
+			
+			self._sendMessages(dataMgr, dataList)
+			
+			# the inputs aren't retained by the pipeline, so what they allocated
+			# (e.g. the instance dicts created by the JSON encoder) isn't counted
+			dataList.clear()
+			gc.collect()
+			
+			endBytes, peakBytes = tracemalloc.get_traced_memory()
+		finally:
+			tracemalloc.stop()
+		
+		return { \
+			'peakAllocBytes': peakBytes - startBytes, \
+			'retainedBytesPerMsg': max(endBytes - startBytes, 0) / self.allocMsgCount }
+	
+	def _sendMessages(self, dataMgr: DeviceDataManager, dataList: list, histogram: MetricHistogram = None):
+		"""
+		Passes each SensorData in 'dataList' to handleSensorMessage(),
+		paced at 'ratePerSec' (if set).
+		
+		@param dataMgr The DeviceDataManager.
+		@param dataList The SensorData instances.
+		@param histogram If set, the time of each call is recorded.
+		"""
+		intervalSecs = 1.0 / self.ratePerSec if self.ratePerSec > 0.0 else 0.0
+		startTime    = perf_counter()
+		
+		for i, sensorData in enumerate(dataList):
+			if intervalSecs > 0.0:
+				delay = startTime + i * intervalSecs - perf_counter()
+				
+				if delay > 0.0:
+					time.sleep(delay)
+			
+			startNs = perf_counter_ns()
+			
+			dataMgr.handleSensorMessage(sensorData)
+			
+			if histogram:
+				histogram.recordSince(startNs)
+	
+def main():
+	"""
+	Main function definition for running as an application.
+	
+	Usage: PipelineBenchmark.py [msgCount] [ratePerSec] [resultsFile] [baselineFile] [tolerancePct]
+	
+	If 'baselineFile' doesn't exist, the results are written to it;
+	otherwise, the results are compared with it, and the exit code
+	is 1 if any metric regressed.
+	"""
+	msgCount     = int(sys.argv[1]) if len(sys.argv) > 1 else PipelineBenchmark.DEFAULT_MSG_COUNT
+	ratePerSec   = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+	resultsFile  = sys.argv[3] if len(sys.argv) > 3 else None
+	baselineFile = sys.argv[4] if len(sys.argv) > 4 else None
+	tolerancePct = float(sys.argv[5]) if len(sys.argv) > 5 else PipelineBenchmark.DEFAULT_TOLERANCE_PCT
+	
+	benchmark = PipelineBenchmark(msgCount = msgCount, ratePerSec = ratePerSec)
+	results = benchmark.runBenchmark()
+	
+	if resultsFile:
+		PipelineBenchmark.saveResults(results, resultsFile)
+	else:
+		print(json.dumps(results, indent = 2, sort_keys = True))
+	
+	if not baselineFile:
+		return
+	
+	baseline = PipelineBenchmark.loadResults(baselineFile)
+	
+	if not baseline:
+		PipelineBenchmark.saveResults(results, baselineFile)
+		print("Stored baseline: %s" % baselineFile)
+		
+		return
+	
+	regressions = PipelineBenchmark.compareResults(results, baseline, tolerancePct)
+	
+	for name, baselineVal, currentVal, changePct in regressions:
+		print("REGRESSION %-40s %12.2f -> %12.2f (%+.1f%%)" % (name, baselineVal, currentVal, changePct))
+	
+	if regressions:
+		sys.exit(1)
+	
+	print("No regressions vs. baseline (tolerance: %.1f%%): %s" % (tolerancePct, baselineFile))
+	
+if __name__ == '__main__':
+	"""
+	Attribute definition for when invoking as app via command line
+	
+	"""
+	main()
@@ -0,0 +1,137 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import logging.handlers
+import queue
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
+
+class AsyncLoggingManager():
+	"""
+	Moves log output off the calling threads. While started, the root
+	logger's handlers are replaced by a single QueueHandler, and a
+	QueueListener thread passes each queued record to the original
+	handlers - so a slow console or file never stalls the telemetry or
+	actuation threads.
+	
+	The message itself is still formatted by the calling thread (when
+	the record is queued), as the arguments may be mutable data objects
+	that change once the call returns. Records below the configured
+	level are discarded before any formatting is done.
+	
+	"""
+	
+	def __init__(self, logLevel: str = None, enableAsyncLogging: bool = None):
+		"""
+		Constructor. Any parameter that's None is loaded from the configuration file.
+		
+		@param logLevel The root logger level name (e.g. 'INFO').
+		@param enableAsyncLogging If False, start() only sets the level.
+		"""
+		configUtil = ConfigUtil()
+		
+		if logLevel is None:
+			logLevel = configUtil.getProperty( \
+				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.LOG_LEVEL_KEY, \
+				defaultVal = ConfigConst.DEFAULT_LOG_LEVEL)
+		
+		if enableAsyncLogging is None:
+			enableAsyncLogging = configUtil.getBoolean( \
+				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.ENABLE_ASYNC_LOGGING_KEY)
+		
+		self.logLevel = logging.getLevelName(str(logLevel).upper())
+		
+		if not isinstance(self.logLevel, int):
+			logging.warning("Invalid log level: %s. Using %s.", logLevel, ConfigConst.DEFAULT_LOG_LEVEL)
+			
+			self.logLevel = logging.getLevelName(ConfigConst.DEFAULT_LOG_LEVEL)
+		
+		self.enableAsyncLogging = enableAsyncLogging
+		
+		self.logQueue      = None
+		self.queueHandler  = None
+		self.queueListener = None
+		self.rootHandlers  = []
+	
+	def getLogLevel(self) -> int:
+		return self.logLevel
+	
+	def isStarted(self) -> bool:
+		return self.queueListener is not None
+	
+	def start(self) -> bool:
+		"""
+		Sets the root logger level and, if enabled, routes the root
+		logger's output through the queue.
+		
+		@return bool True if async logging was started; False otherwise.
+		"""
+		rootLogger = logging.getLogger()
+		rootLogger.setLevel(self.logLevel)
+		
+		if not self.enableAsyncLogging or self.queueListener:
+			return False
+		
+		self.rootHandlers = list(rootLogger.handlers)
+		
+		if not self.rootHandlers:
+			self.rootHandlers = [logging.lastResort]
+		
+		self.logQueue      = queue.SimpleQueue()
+		self.queueHandler  = logging.handlers.QueueHandler(self.logQueue)
+		self.queueListener = \
+			logging.handlers.QueueListener(self.logQueue, *self.rootHandlers, respect_handler_level = True)
+		
+		for handler in list(rootLogger.handlers):
+			rootLogger.removeHandler(handler)
+		
+		rootLogger.addHandler(self.queueHandler)
+		
+		self.queueListener.start()
+		
+		return True
+	
+	def stop(self):
+		"""
+		Writes any queued records, and restores the original handlers.
+		
+		"""
+		if self.queueListener:
+			rootLogger = logging.getLogger()
+			rootLogger.removeHandler(self.queueHandler)
+			
+			# this blocks until all queued records have been handled
+			self.queueListener.stop()
+			
+			for handler in self.rootHandlers:
+				if handler is not logging.lastResort:
+					rootLogger.addHandler(handler)
+			
+			self.logQueue      = None
+			self.queueHandler  = None
+			self.queueListener = None
+			self.rootHandlers  = []
@@ -44,6 +44,9 @@ DEFAULT_MQTT_SECURE_PORT = 8883
 DEFAULT_TSDB_PORT        = 8086
 DEFAULT_RTSP_STREAM_PORT = 8554
 DEFAULT_KEEP_ALIVE       = 60
+DEFAULT_RECONNECT_MIN_DELAY = 1
+DEFAULT_RECONNECT_MAX_DELAY = 120
+DEFAULT_MAX_QUEUED_MSGS  = 1000
 DEFAULT_POLL_CYCLES      = 60
 DEFAULT_VAL              = 0.0
 DEFAULT_COMMAND          = 0
@@ -124,6 +127,15 @@ CPU_UTIL_PROP    = 'cpuUtil'
 DISK_UTIL_PROP   = 'diskUtil'
 MEM_UTIL_PROP    = 'memUtil'
 
+CPU_CORE_UTIL_PROP        = 'cpuCoreUtil'
+DISK_READ_RATE_PROP       = 'diskReadRate'
+DISK_WRITE_RATE_PROP      = 'diskWriteRate'
+NET_RX_RATE_PROP          = 'netRxRate'
+NET_TX_RATE_PROP          = 'netTxRate'
+PROCESS_RSS_PROP          = 'processRss'
+PROCESS_THREAD_COUNT_PROP = 'processThreadCount'
+PIPELINE_METRICS_PROP     = 'pipelineMetrics'
+
 ACTION_ID_PROP             = 'actionID'
 DATA_URI_PROP              = 'dataURI'
 MESSAGE_PROP               = 'message'
@@ -145,12 +157,54 @@ MESSAGE_OUT_COUNT_PROP     = 'msgOutCount'
 IS_CONNECTING_PROP         = 'isConnecting'
 IS_CONNECTED_PROP          = 'isConnected'
 IS_DISCONNECTED_PROP       = 'isDisconnected'
+CONNECT_TIME_PROP          = 'connectTime'
+DISCONNECT_TIME_PROP       = 'disconnectTime'
+RECONNECT_COUNT_PROP       = 'reconnectCount'
+ROUND_TRIP_LATENCY_PROP    = 'roundTripLatency'
 
 CMD_DATA_PERSISTENCE_NAME    = 'pdt-cmd-data'
 CONN_DATA_PERSISTENCE_NAME   = 'pdt-conn-data'
 SENSOR_DATA_PERSISTENCE_NAME = 'pdt-sensor-data'
+SENSOR_ROLLUP_1M_PERSISTENCE_NAME  = 'pdt-sensor-rollup-1m'
+SENSOR_ROLLUP_15M_PERSISTENCE_NAME = 'pdt-sensor-rollup-15m'
+SENSOR_ROLLUP_1H_PERSISTENCE_NAME  = 'pdt-sensor-rollup-1h'
 SYS_DATA_PERSISTENCE_NAME    = 'pdt-sys-data'
 
+#####
+# Pipeline Metrics Names
+#
+
+# latency histograms (spans)
+SENSOR_GENERATE_SPAN   = 'sensorGenerate'
+DATA_ENCODE_SPAN       = 'dataEncode'
+DATA_DECODE_SPAN       = 'dataDecode'
+TSDB_STORE_SPAN        = 'tsdbStore'
+MQTT_PUBLISH_SPAN      = 'mqttPublish'
+ACTUATOR_DISPATCH_SPAN = 'actuatorDispatch'
+
+# throughput counters
+SENSOR_MSG_COUNTER          = 'sensorMsgCount'
+ACTUATOR_CMD_COUNTER        = 'actuatorCmdCount'
+SYS_PERF_MSG_COUNTER        = 'sysPerfMsgCount'
+MQTT_PUBLISH_FAILED_COUNTER = 'mqttPublishFailedCount'
+MQTT_MSG_IN_COUNTER         = 'mqttMsgInCount'
+MQTT_MSG_OUT_COUNTER        = 'mqttMsgOutCount'
+TSDB_MSG_OUT_COUNTER        = 'tsdbMsgOutCount'
+
+# scheduler lag histograms (time from scheduled run to job submission)
+SENSOR_SCHEDULER_LAG       = 'sensorSchedulerLag'
+SYS_PERF_SCHEDULER_LAG     = 'sysPerfSchedulerLag'
+WIND_TURBINE_SCHEDULER_LAG = 'windTurbineSchedulerLag'
+
+# gauges
+ACTUATOR_QUEUE_DEPTH_GAUGE = 'actuatorQueueDepth'
+
+# adaptive polling - one of each per sensor, named '<name>-<sensor name>'
+POLL_INTERVAL_GAUGE  = 'pollInterval'
+POLL_BACKOFF_COUNTER = 'pollBackoffCount'
+POLL_TIGHTEN_COUNTER = 'pollTightenCount'
+POLL_SPEEDUP_COUNTER = 'pollSpeedupCount'
+
 #####
 # Resource and Topic Names
 #
@@ -163,6 +217,8 @@ MGMT_STATUS_MSG   = 'MgmtStatusMsg'
 MGMT_STATUS_CMD   = 'MgmtStatusCmd'
 MEDIA_MSG         = 'MediaMsg'
 SENSOR_MSG        = 'SensorMsg'
+SENSOR_ROLLUP_MSG = 'SensorRollupMsg'
+CONN_STATE_MSG    = 'ConnStateMsg'
 SYSTEM_PERF_MSG   = 'SystemPerfMsg'
 
 UPDATE_NOTIFICATIONS_MSG      = 'UpdateMsg'
@@ -178,6 +234,7 @@ TEMP_SENSOR_NAME     = 'Thermostat'
 THERMOSTAT_NAME      = 'Thermostat'
 HVAC_NAME            = 'HVAC'
 WIND_TURBINE_NAME    = 'WindTurbine'
+WIND_FARM_NAME       = 'WindFarm'
 SYSTEM_MGMT_NAME     = 'EdgeComputingDevice'
 SYSTEM_PERF_NAME     = 'EdgeComputingDevice'
 CAMERA_SENSOR_NAME   = 'Camera'
@@ -262,8 +319,10 @@ SYSTEM_MGMT_TYPE          = 8000
 SYSTEM_MGMT_TYPE_CATEGORY = 8000
 RESOURCE_MGMT_TYPE        = 8001
 SYSTEM_CONN_STATE_TYPE    = 8002
+SAMPLING_PROFILER_TYPE    = 8003
 
 RESOURCE_MGMT_NAME        = 'ResourceMgmt'
+SAMPLING_PROFILER_NAME    = 'SamplingProfiler'
 
 SYSTEM_PERF_TYPE          = 9000
 SYSTEM_PERF_TYPE_CATEGORY = 9000
@@ -297,6 +356,16 @@ CDA_MEDIA_DATA_MSG_RESOURCE           = PRODUCT_NAME + '/' + CONSTRAINED_DEVICE
 CDA_REGISTRATION_REQUEST_RESOURCE     = PRODUCT_NAME + '/' + CONSTRAINED_DEVICE + '/' + RESOURCE_REGISTRATION_REQUEST
 CDA_SENSOR_DATA_MSG_RESOURCE          = PRODUCT_NAME + '/' + CONSTRAINED_DEVICE + '/' + SENSOR_MSG
 CDA_SYSTEM_PERF_MSG_RESOURCE          = PRODUCT_NAME + '/' + CONSTRAINED_DEVICE + '/' + SYSTEM_PERF_MSG
+CDA_CONN_STATE_MSG_RESOURCE           = PRODUCT_NAME + '/' + CONSTRAINED_DEVICE + '/' + CONN_STATE_MSG
+
+# e.g., PIOT/ConstrainedDevice/SensorRollupMsg/15m
+ROLLUP_1M_NAME  = '1m'
+ROLLUP_15M_NAME = '15m'
+ROLLUP_1H_NAME  = '1h'
+
+CDA_SENSOR_ROLLUP_1M_MSG_RESOURCE     = PRODUCT_NAME + '/' + CONSTRAINED_DEVICE + '/' + SENSOR_ROLLUP_MSG + '/' + ROLLUP_1M_NAME
+CDA_SENSOR_ROLLUP_15M_MSG_RESOURCE    = PRODUCT_NAME + '/' + CONSTRAINED_DEVICE + '/' + SENSOR_ROLLUP_MSG + '/' + ROLLUP_15M_NAME
+CDA_SENSOR_ROLLUP_1H_MSG_RESOURCE     = PRODUCT_NAME + '/' + CONSTRAINED_DEVICE + '/' + SENSOR_ROLLUP_MSG + '/' + ROLLUP_1H_NAME
 
 #####
 # Configuration Sections, Keys and Defaults
@@ -362,10 +431,22 @@ ENABLE_SIMULATOR_KEY = 'enableSimulator'
 ENABLE_EMULATOR_KEY  = 'enableEmulator'
 ENABLE_SENSE_HAT_KEY = 'enableSenseHAT'
 ENABLE_LOGGING_KEY   = 'enableLogging'
+ENABLE_ASYNC_LOGGING_KEY = 'enableAsyncLogging'
+LOG_LEVEL_KEY        = 'logLevel'
+DEFAULT_LOG_LEVEL    = 'DEBUG'
 USE_WEB_ACCESS_KEY   = 'useWebAccess'
 POLL_CYCLES_KEY      = 'pollCycleSecs'
+
+ENABLE_ADAPTIVE_POLLING_KEY = 'enableAdaptivePolling'
+MIN_POLL_CYCLES_KEY         = 'minPollCycleSecs'
+MAX_POLL_CYCLES_KEY         = 'maxPollCycleSecs'
+POLL_DEADBAND_PCT_KEY       = 'pollDeadbandPct'
+POLL_RATE_THRESHOLD_PCT_KEY = 'pollRateThresholdPct'
 KEEP_ALIVE_KEY       = 'keepAlive'
 DEFAULT_QOS_KEY      = 'defaultQos'
+RECONNECT_MIN_DELAY_KEY = 'reconnectMinDelaySecs'
+RECONNECT_MAX_DELAY_KEY = 'reconnectMaxDelaySecs'
+MAX_QUEUED_MSGS_KEY  = 'maxQueuedMsgs'
 
 ENABLE_TSDB_CLIENT_KEY = 'enableTsdbClient'
 ENABLE_MQTT_CLIENT_KEY = 'enableMqttClient'
@@ -377,9 +458,37 @@ ENABLE_SYSTEM_PERF_KEY = 'enableSystemPerformance'
 ENABLE_SENSING_KEY     = 'enableSensing'
 
 UPDATE_DISPLAY_ON_ACTUATION_KEY = 'updateDisplayOnActuation'
+ENABLE_ASYNC_ACTUATION_KEY      = 'enableAsyncActuation'
+CONFIG_WATCH_POLL_SECS_KEY      = 'configWatchPollSecs'
+ENABLE_PIPELINE_METRICS_KEY     = 'enablePipelineMetrics'
+
+ENABLE_METRICS_SERVER_KEY   = 'enableMetricsServer'
+METRICS_SERVER_HOST_KEY     = 'metricsServerHost'
+METRICS_SERVER_PORT_KEY     = 'metricsServerPort'
+METRICS_CACHE_SECS_KEY      = 'metricsCacheSecs'
+
+DEFAULT_METRICS_SERVER_HOST = '127.0.0.1'
+DEFAULT_METRICS_SERVER_PORT = 9464
+DEFAULT_METRICS_CACHE_SECS  = 1.0
+
+CONN_STATE_POLL_SECS_KEY    = 'connStatePollSecs'
+
+ENABLE_EVENT_JOURNAL_KEY        = 'enableEventJournal'
+EVENT_JOURNAL_PATH_KEY          = 'eventJournalPath'
+EVENT_JOURNAL_SEGMENT_BYTES_KEY = 'eventJournalSegmentBytes'
+EVENT_JOURNAL_SEGMENT_COUNT_KEY = 'eventJournalSegmentCount'
+
+ENABLE_SAMPLING_PROFILER_KEY    = 'enableSamplingProfiler'
+PROFILER_SAMPLE_SECS_KEY        = 'profilerSampleSecs'
+PROFILER_MAX_DURATION_SECS_KEY  = 'profilerMaxDurationSecs'
+PROFILER_OUTPUT_PATH_KEY        = 'profilerOutputPath'
+
+MQTT_CONN_STATE_NAME        = 'MqttConnState'
+TSDB_CONN_STATE_NAME        = 'TsdbConnState'
 
 MIN_WIND_SPEED_KEY       = 'minWindSpeed'
 MAX_WIND_SPEED_KEY       = 'maxWindSpeed'
+WIND_TURBINE_COUNT_KEY   = 'windTurbineCount'
 
 HUMIDITY_SIM_FLOOR_KEY   = 'humiditySimFloor'
 HUMIDITY_SIM_CEILING_KEY = 'humiditySimCeiling'
@@ -388,6 +497,28 @@ PRESSURE_SIM_CEILING_KEY = 'pressureSimCeiling'
 TEMP_SIM_FLOOR_KEY       = 'tempSimFloor'
 TEMP_SIM_CEILING_KEY     = 'tempSimCeiling'
 
+ENABLE_SIM_DATA_REPLAY_KEY = 'enableSimDataReplay'
+SIM_DATA_REPLAY_PATH_KEY   = 'simDataReplayPath'
+SIM_DATA_REPLAY_RATE_KEY   = 'simDataReplayRate'
+
+ENABLE_SIM_DATA_CACHE_KEY  = 'enableSimDataCache'
+SIM_DATA_CACHE_PATH_KEY    = 'simDataCachePath'
+SIM_DATA_CHUNK_SIZE_KEY    = 'simDataChunkSize'
+SIM_RANDOM_SEED_KEY        = 'simRandomSeed'
+
+ENABLE_SENSOR_DATA_FILTER_KEY = 'enableSensorDataFilter'
+SENSOR_DEADBAND_KEY           = 'sensorDeadband'
+USE_SENSOR_DEADBAND_PCT_KEY   = 'useSensorDeadbandPct'
+SENSOR_MAX_SILENCE_SECS_KEY   = 'sensorMaxSilenceSecs'
+ENABLE_SWINGING_DOOR_KEY      = 'enableSwingingDoor'
+
+ENABLE_SENSOR_ROLLUP_KEY     = 'enableSensorRollup'
+ROLLUP_MIN_NAME   = 'min'
+ROLLUP_MAX_NAME   = 'max'
+ROLLUP_MEAN_NAME  = 'mean'
+ROLLUP_COUNT_NAME = 'count'
+ROLLUP_LAST_NAME  = 'last'
+
 HANDLE_TEMP_CHANGE_ON_DEVICE_KEY = 'handleTempChangeOnDevice'
 TRIGGER_HVAC_TEMP_FLOOR_KEY      = 'triggerHvacTempFloor'
 TRIGGER_HVAC_TEMP_CEILING_KEY    = 'triggerHvacTempCeiling'
@@ -0,0 +1,222 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import configparser
+import logging
+
+from time import time
+from types import MappingProxyType
+
+class ConfigSnapshot(object):
+	"""
+	An immutable view of a loaded configuration.
+	
+	All values are read from the ConfigParser once, when the snapshot
+	is created, and stored per section in read-only dicts - along with
+	their boolean, integer and float conversions (where valid) - so
+	each lookup is a dict access rather than a ConfigParser string
+	parse.
+	
+	As with ConfigParser, section names are case sensitive and keys
+	are not.
+	
+	"""
+	
+	def __init__(self, configParser: configparser.ConfigParser = None, configFile: str = None, version: int = 0):
+		"""
+		Constructor.
+		
+		@param configParser The loaded ConfigParser to copy the values from.
+		@param configFile The name of the file the config was loaded from.
+		@param version The version of this snapshot. Incremented on each reload.
+		"""
+		self._configFile = configFile
+		self._version = version
+		self._createTime = time()
+		
+		sections = {}
+		booleans = {}
+		integers = {}
+		floats   = {}
+		
+		if configParser:
+			for section in configParser.sections():
+				props = {}
+				
+				for key in configParser.options(section):
+					try:
+						val = configParser.get(section, key)
+					except configparser.InterpolationError:
+						val = configParser.get(section, key, raw = True)
+					
+					props[key] = val
+					
+					self._convertValue(section, key, val, booleans, integers, floats)
+				
+				sections[section] = MappingProxyType(props)
+		
+		self._sections = MappingProxyType(sections)
+		self._booleans = MappingProxyType(booleans)
+		self._integers = MappingProxyType(integers)
+		self._floats   = MappingProxyType(floats)
+		
+		logging.debug("Created config snapshot v%s with %s sections from: %s", str(version), str(len(sections)), configFile)
+		
+	def getConfigFileName(self) -> str:
+		"""
+		Returns the name of the file the config was loaded from.
+		
+		@return str
+		"""
+		return self._configFile
+	
+	def getCreateTime(self) -> float:
+		"""
+		Returns the time (seconds since the Epoch) this snapshot was created.
+		
+		@return float
+		"""
+		return self._createTime
+	
+	def getSection(self, section: str):
+		"""
+		Returns a read-only dict of the (lower case) keys and values in 'section'.
+		
+		@param section The name of the section.
+		@return The read-only dict, or None if the section doesn't exist.
+		"""
+		return self._sections.get(section)
+	
+	def getSections(self) -> list:
+		"""
+		Returns the names of all sections.
+		
+		@return list
+		"""
+		return list(self._sections.keys())
+	
+	def getVersion(self) -> int:
+		"""
+		Returns the version of this snapshot.
+		
+		@return int
+		"""
+		return self._version
+	
+	def getProperty(self, section: str, key: str, defaultVal: str = None) -> str:
+		"""
+		Returns the value of 'key' in 'section'.
+		
+		@param section The name of the section.
+		@param key The name of the key.
+		@param defaultVal The value to return if the section or key doesn't exist.
+		@return str
+		"""
+		props = self._sections.get(section)
+		
+		if props is None:
+			return defaultVal
+		
+		return props.get(key.lower(), defaultVal)
+	
+	def getBoolean(self, section: str, key: str) -> bool:
+		"""
+		Returns the boolean value of 'key' in 'section'.
+		
+		@param section The name of the section.
+		@param key The name of the key.
+		@return bool The value, or False if it doesn't exist or isn't a valid boolean.
+		"""
+		return self._booleans.get((section, key.lower()), False)
+	
+	def getInteger(self, section: str, key: str, defaultVal: int = 0) -> int:
+		"""
+		Returns the integer value of 'key' in 'section'.
+		
+		@param section The name of the section.
+		@param key The name of the key.
+		@param defaultVal The value to return if the key doesn't exist or isn't a valid integer.
+		@return int
+		"""
+		return self._integers.get((section, key.lower()), defaultVal)
+	
+	def getFloat(self, section: str, key: str, defaultVal: float = 0.0) -> float:
+		"""
+		Returns the float value of 'key' in 'section'.
+		
+		@param section The name of the section.
+		@param key The name of the key.
+		@param defaultVal The value to return if the key doesn't exist or isn't a valid float.
+		@return float
+		"""
+		return self._floats.get((section, key.lower()), defaultVal)
+	
+	def hasProperty(self, section: str, key: str) -> bool:
+		"""
+		Checks if 'key' exists in 'section'.
+		
+		@param section The name of the section.
+		@param key The name of the key.
+		@return bool
+		"""
+		props = self._sections.get(section)
+		
+		return props is not None and key.lower() in props
+	
+	def hasSection(self, section: str) -> bool:
+		"""
+		Checks if 'section' exists.
+		
+		@param section The name of the section.
+		@return bool
+		"""
+		return section in self._sections
+	
+	def _convertValue(self, section: str, key: str, val: str, booleans: dict, integers: dict, floats: dict):
+		"""
+		Stores the boolean, integer and float conversions of 'val', for
+		those conversions that are valid.
+		
+		@param section The name of the section.
+		@param key The (lower case) name of the key.
+		@param val The string value.
+		@param booleans The dict of boolean values to update.
+		@param integers The dict of integer values to update.
+		@param floats The dict of float values to update.
+		"""
+		propKey = (section, key)
+		normVal = val.strip().lower()
+		
+		if normVal in configparser.ConfigParser.BOOLEAN_STATES:
+			booleans[propKey] = configparser.ConfigParser.BOOLEAN_STATES[normVal]
+		
+		try:
+			integers[propKey] = int(val)
+		except ValueError:
+			pass
+		
+		try:
+			floats[propKey] = float(val)
+		except ValueError:
+			pass
@@ -25,10 +25,13 @@
 import configparser
 import logging
 import os
+import threading
 import traceback
 
 from pathlib import Path
 
+from labbenchstudios.pdt.common.ConfigSnapshot import ConfigSnapshot
+from labbenchstudios.pdt.common.IConfigUpdateListener import IConfigUpdateListener
 from labbenchstudios.pdt.common.Singleton import Singleton
 
 import labbenchstudios.pdt.common.ConfigConst as ConfigConst
@@ -40,8 +43,15 @@ class ConfigUtil(metaclass = Singleton):
 	
 	Implemented as a Singleton using the Singleton metaclass.
 	
+	Lookups are served from an immutable ConfigSnapshot built when
+	the config is loaded. If the config watcher is started, the file is
+	polled for changes; on change, a new snapshot replaces the old one
+	and each registered IConfigUpdateListener is notified.
+	
 	"""
 
+	DEFAULT_WATCH_POLL_SECS = 5.0
+	
 	configFile   = ConfigConst.DEFAULT_CONFIG_FILE_NAME
 	configParser = configparser.ConfigParser()
 	isLoaded	 = False
@@ -54,6 +64,15 @@ class ConfigUtil(metaclass = Singleton):
 		"""
 		if (configFile != None):
 			self.configFile = configFile
+		
+		self.configSnapshot  = None
+		self.configLock      = threading.RLock()
+		self.credentialCache = {}
+		self.updateListeners = []
+		
+		self.watcherThread    = None
+		self.watcherStopEvent = threading.Event()
+		self.configFileMtime  = None
 			
 		self._loadConfig()
 		logging.info("Created instance of ConfigUtil: " + str(self))
@@ -61,6 +80,36 @@ class ConfigUtil(metaclass = Singleton):
 	#
 	# public methods
 	#
+	def addConfigUpdateListener(self, listener: IConfigUpdateListener = None) -> bool:
+		"""
+		Registers 'listener' to be notified each time the config is reloaded.
+		
+		@param listener The IConfigUpdateListener to add.
+		@return bool True if added; False if None or already registered.
+		"""
+		with self.configLock:
+			if listener and listener not in self.updateListeners:
+				self.updateListeners.append(listener)
+				
+				return True
+		
+		return False
+	
+	def removeConfigUpdateListener(self, listener: IConfigUpdateListener = None) -> bool:
+		"""
+		Unregisters 'listener'.
+		
+		@param listener The IConfigUpdateListener to remove.
+		@return bool True if removed; False otherwise.
+		"""
+		with self.configLock:
+			if listener in self.updateListeners:
+				self.updateListeners.remove(listener)
+				
+				return True
+		
+		return False
+	
 	def getConfigFileName(self) -> str:
 		"""
 		Returns the name of the configuration file.
@@ -69,6 +118,15 @@ class ConfigUtil(metaclass = Singleton):
 		"""
 		return self.configFile
 
+	def getConfigSnapshot(self) -> ConfigSnapshot:
+		"""
+		Returns the current (immutable) config snapshot. Callers that need
+		several consistent values should read them all from one snapshot.
+		
+		@return ConfigSnapshot
+		"""
+		return self._getConfig()
+	
 	def getCredentials(self, section: str) -> dict:
 		"""
 		Attempts to load a separate configuration 'credential' file comprised
@@ -79,42 +137,21 @@ class ConfigUtil(metaclass = Singleton):
 		If the credential file key has an entry (e.g. the file where the
 		credentials are stored in key = value form), the file will be
 		loaded if possible, and a dict object will be returned
-		to the caller. No caching of the data is made, except within the
-		returned dict object.
+		to the caller. The result is cached per section until the config
+		is reloaded; each call returns a copy of the cached dict.
 		
 		NOTE: The key case IS preserved.
 		
 		@param section
 		@return dict The dictionary of properties, or None if non-existent.
 		"""
-		if (self.hasSection(section)):
-			credFileName = self.getProperty(section, ConfigConst.CRED_FILE_KEY);
-			
-			try:
-				if os.path.exists(credFileName) and os.path.isfile(credFileName):
-					logging.info("Loading credentials from section " + section + " and file " + credFileName)
-					
-					# read cred data and dump it into a custom section for parsing
-					fileRef  = Path(credFileName)
-					credData = "[" + ConfigConst.CRED_SECTION + "]\n" + fileRef.read_text()
-					
-					# create unique ConfigParser that preserves key case
-					credParser = configparser.ConfigParser()
-					credParser.optionxform = str
-					
-					# read the stringified file data and generate / return
-					# a dict for the section we just created
-					credParser.read_string(credData)
-					credProps = dict(credParser.items(ConfigConst.CRED_SECTION))
-					
-					return credProps
-				else:
-					logging.warn("Credential file doesn't exist: " + credFileName)
-			except Exception as e:
-				traceback.print_exc()
-				logging.warn("Failed to load credentials from file: " + credFileName + ". Exception: " + str(e))
+		credProps = self.credentialCache.get(section)
 		
-		return None
+		if credProps is None and section not in self.credentialCache:
+			credProps = self._loadCredentials(section)
+			self.credentialCache[section] = credProps
+		
+		return dict(credProps) if credProps is not None else None
 	
 	def getProperty(self, section: str, key: str, defaultVal: str = None, forceReload: bool = False):
 		"""
@@ -125,7 +162,7 @@ class ConfigUtil(metaclass = Singleton):
 		@param forceReload Defaults to false; if true will reload the config.
 		@return The property associated with 'key' in 'section'.
 		"""
-		return self._getConfig(forceReload).get(section, key, fallback = defaultVal)
+		return self._getConfig(forceReload).getProperty(section, key, defaultVal)
 	
 	def getBoolean(self, section: str, key: str, forceReload: bool = False):
 		"""
@@ -137,7 +174,7 @@ class ConfigUtil(metaclass = Singleton):
 		@param forceReload Defaults to false; if true will reload the config.
 		@return The boolean associated with 'key' in 'section', or false.
 		"""
-		return self._getConfig(forceReload).getboolean(section, key, fallback = False)
+		return self._getConfig(forceReload).getBoolean(section, key)
 		
 	def getInteger(self, section: str, key: str, defaultVal: int = 0, forceReload: bool = False):
 		"""
@@ -149,7 +186,7 @@ class ConfigUtil(metaclass = Singleton):
 		@param forceReload Defaults to false; if true will reload the config.
 		@return The property associated with 'key' in 'section'.
 		"""
-		return self._getConfig(forceReload).getint(section, key, fallback = defaultVal)
+		return self._getConfig(forceReload).getInteger(section, key, defaultVal)
 	
 	def getFloat(self, section: str, key: str, defaultVal: float = 0.0, forceReload: bool = False):
 		"""
@@ -161,7 +198,7 @@ class ConfigUtil(metaclass = Singleton):
 		@param forceReload Defaults to false; if true will reload the config.
 		@return The property associated with 'key' in 'section'.
 		"""
-		return self._getConfig(forceReload).getfloat(section, key, fallback = defaultVal)
+		return self._getConfig(forceReload).getFloat(section, key, defaultVal)
 	
 	def hasProperty(self, section: str, key: str) -> bool:
 		"""
@@ -171,7 +208,7 @@ class ConfigUtil(metaclass = Singleton):
 		@param key The name of the key to lookup in 'section'.
 		@return True if 'key' is found in 'section'; False otherwise.
 		"""
-		return self._getConfig().has_option(section, key)
+		return self._getConfig().hasProperty(section, key)
 		
 	def hasSection(self, section: str) -> bool:
 		"""
@@ -180,7 +217,7 @@ class ConfigUtil(metaclass = Singleton):
 		@param section The name of the section to search.
 		@return True if 'section' exists and has parameters; false otherwise.
 		"""
-		return self._getConfig().has_section(section)
+		return self._getConfig().hasSection(section)
 		
 	def isConfigDataLoaded(self) -> bool:
 		"""
@@ -190,40 +227,192 @@ class ConfigUtil(metaclass = Singleton):
 		"""
 		return self.isLoaded
 	
+	def isConfigWatcherRunning(self) -> bool:
+		"""
+		Checks if the config watcher thread is running.
+		
+		@return bool
+		"""
+		return self.watcherThread is not None and self.watcherThread.is_alive()
+	
+	def reloadConfig(self) -> bool:
+		"""
+		Reloads the config file, replaces the current snapshot, clears the
+		credential cache and notifies each registered IConfigUpdateListener.
+		
+		@return bool True if each listener handled the update successfully; False otherwise.
+		"""
+		self._loadConfig()
+		
+		configSnapshot = self.configSnapshot
+		success = True
+		
+		with self.configLock:
+			listeners = list(self.updateListeners)
+		
+		for listener in listeners:
+			try:
+				if listener.handleConfigUpdate(configSnapshot) == False:
+					success = False
+			except Exception as e:
+				success = False
+				logging.warning("Config update listener failed: %s. Exception: %s", str(listener), str(e))
+		
+		return success
+	
+	def startConfigWatcher(self, pollSecs: float = DEFAULT_WATCH_POLL_SECS) -> bool:
+		"""
+		Starts a daemon thread that checks the config file's modification
+		time every 'pollSecs' seconds, and calls reloadConfig() when it changes.
+		
+		@param pollSecs The poll interval in seconds.
+		@return bool True if started; False if already running.
+		"""
+		with self.configLock:
+			if self.isConfigWatcherRunning():
+				return False
+			
+			if pollSecs <= 0.0:
+				pollSecs = self.DEFAULT_WATCH_POLL_SECS
+			
+			self.watcherStopEvent.clear()
+			self.watcherThread = \
+				threading.Thread(target = self._runConfigWatcher, args = (pollSecs,), name = 'ConfigWatcher', daemon = True)
+			self.watcherThread.start()
+		
+		logging.info("Started config watcher. Poll interval (secs): %s. File: %s", str(pollSecs), self.configFile)
+		
+		return True
+	
+	def stopConfigWatcher(self) -> bool:
+		"""
+		Stops the config watcher thread.
+		
+		@return bool True if stopped; False if it wasn't running.
+		"""
+		with self.configLock:
+			watcherThread = self.watcherThread
+			self.watcherThread = None
+		
+		if watcherThread:
+			self.watcherStopEvent.set()
+			
+			if watcherThread is not threading.current_thread():
+				watcherThread.join()
+			
+			logging.info("Stopped config watcher.")
+			
+			return True
+		
+		return False
+	
 	#
 	# private methods
 	#
 	
+	def _getConfigFileMtime(self) -> float:
+		"""
+		Returns the modification time of the config file.
+		
+		@return float The time, or None if the file doesn't exist.
+		"""
+		try:
+			return os.stat(self.configFile).st_mtime_ns
+		except OSError:
+			return None
+	
 	def _loadConfig(self):
 		"""
 		Attempts to load the config file using the name passed into
-		the constructor.
+		the constructor, and creates a new snapshot from it.
 		 
 		"""
 		if (os.path.exists(self.configFile)):
 			logging.info("Loading config: %s", self.configFile)
-			
-			self.configParser.read(self.configFile)
-			self.isLoaded = True
 		else:
 			logging.info("Can't load %s. Trying default: %s", self.configFile, ConfigConst.DEFAULT_CONFIG_FILE_NAME)
 			
 			self.configFile = ConfigConst.DEFAULT_CONFIG_FILE_NAME
-			self.configParser.read(self.configFile)
+		
+		# a new parser is used so keys removed from the file don't linger
+		configMtime = self._getConfigFileMtime()
+		configParser = configparser.ConfigParser()
+		configParser.read(self.configFile)
+		
+		version = self.configSnapshot.getVersion() + 1 if self.configSnapshot else 0
+		configSnapshot = ConfigSnapshot(configParser = configParser, configFile = self.configFile, version = version)
+		
+		with self.configLock:
+			self.configParser    = configParser
+			self.configSnapshot  = configSnapshot
+			self.configFileMtime = configMtime
+			self.credentialCache = {}
 			self.isLoaded = True
 		
-		logging.debug("Config: %s", str(self.configParser.sections()))
+		logging.debug("Config: %s", str(configSnapshot.getSections()))
+	
+	def _loadCredentials(self, section: str) -> dict:
+		"""
+		Reads the credential file referenced by 'section' from disk.
+		
+		@param section
+		@return dict The dictionary of properties, or None if non-existent.
+		"""
+		if (self.hasSection(section)):
+			credFileName = self.getProperty(section, ConfigConst.CRED_FILE_KEY);
+			
+			try:
+				if os.path.exists(credFileName) and os.path.isfile(credFileName):
+					logging.info("Loading credentials from section " + section + " and file " + credFileName)
+					
+					# read cred data and dump it into a custom section for parsing
+					fileRef  = Path(credFileName)
+					credData = "[" + ConfigConst.CRED_SECTION + "]\n" + fileRef.read_text()
+					
+					# create unique ConfigParser that preserves key case
+					credParser = configparser.ConfigParser()
+					credParser.optionxform = str
+					
+					# read the stringified file data and generate / return
+					# a dict for the section we just created
+					credParser.read_string(credData)
+					credProps = dict(credParser.items(ConfigConst.CRED_SECTION))
+					
+					return credProps
+				else:
+					logging.warn("Credential file doesn't exist: " + credFileName)
+			except Exception as e:
+				traceback.print_exc()
+				logging.warn("Failed to load credentials from file: " + credFileName + ". Exception: " + str(e))
+		
+		return None
 
-	def _getConfig(self, forceReload: bool = False) -> configparser:
+	def _getConfig(self, forceReload: bool = False) -> ConfigSnapshot:
 		"""
-		Returns the entire configuration object. If the config file hasn't
+		Returns the current config snapshot. If the config file hasn't
 		yet been loaded, it will be loaded.
 		
 		@param forceReload Defaults to false; if true, will reload the config.
-		@return The entire configuration file.
+		@return The current ConfigSnapshot.
 		"""
 		if (self.isLoaded == False or forceReload):
 			self._loadConfig()
 		
-		return self.configParser
-	
\ No newline at end of file
+		return self.configSnapshot
+	
+	def _runConfigWatcher(self, pollSecs: float):
+		"""
+		Config watcher thread loop.
+		
+		@param pollSecs The poll interval in seconds.
+		"""
+		while not self.watcherStopEvent.wait(pollSecs):
+			configMtime = self._getConfigFileMtime()
+			
+			if configMtime is not None and configMtime != self.configFileMtime:
+				logging.info("Config file changed. Reloading: %s", self.configFile)
+				
+				try:
+					self.reloadConfig()
+				except Exception as e:
+					logging.warning("Failed to reload config file: %s. Exception: %s", self.configFile, str(e))
@@ -85,7 +85,7 @@ class DefaultDataMessageListener(IDataMessageListener):
 		@return bool True on success; False otherwise.
 		"""
 		if data:
-			logging.info('Actuator Command Msg: ' + str(data.getCommand()))
+			logging.info('Actuator Command Msg: %s', data.getCommand())
 			
 		return True
 	
@@ -97,7 +97,7 @@ class DefaultDataMessageListener(IDataMessageListener):
 		@return bool True on success; False otherwise.
 		"""
 		if data:
-			logging.info('Actuator Command: ' + str(data.getCommand()))
+			logging.info('Actuator Command: %s', data.getCommand())
 			
 		return True
 	
@@ -121,13 +121,45 @@ class DefaultDataMessageListener(IDataMessageListener):
 		@return bool True on success; False otherwise.
 		"""
 		if data:
-			logging.info('Sensor Message: ' + str(data))
+			logging.info('Sensor Message: %s', data)
 			
 			if data.getName() in self.telemetryDataListeners:
 				self.telemetryDataListeners[data.getName()].onSensorDataUpdate(data)
 			
 		return True
 	
+	def handleSensorMessageBatch(self, dataList: list) -> bool:
+		"""
+		Callback function to handle a batch of sensor messages, each packaged
+		as a SensorData object.
+		
+		@param dataList The list of SensorData messages received.
+		@return bool True if all messages were handled successfully; False otherwise.
+		"""
+		success = True
+		
+		if dataList:
+			for data in dataList:
+				success = self.handleSensorMessage(data) and success
+			
+		return success
+	
+	def handleSensorRollupMessage(self, resource: ResourceNameEnum = None, dataList: list = None) -> bool:
+		"""
+		Callback function to handle the rollups for a closed aggregation window,
+		each packaged as a SensorData object.
+		
+		@param resource The rollup window's resource.
+		@param dataList The list of rollup SensorData messages.
+		@return bool True on success; False otherwise.
+		"""
+		if resource and dataList:
+			logging.info("Sensor rollup message received. Resource: %s, count: %s", str(resource), str(len(dataList)))
+			
+			return True
+		
+		return False
+	
 	def handleSystemPerformanceMessage(self, data: SystemPerformanceData) -> bool:
 		"""
 		Callback function to handle a system performance message packaged as
@@ -137,7 +169,7 @@ class DefaultDataMessageListener(IDataMessageListener):
 		@return bool True on success; False otherwise.
 		"""
 		if data:
-			logging.info('System Performance Message: ' + str(data))
+			logging.info('System Performance Message: %s', data)
 			
 			if self.sysPerfDataListener:
 				self.sysPerfDataListener.onSystemPerformanceDataUpdate(data)
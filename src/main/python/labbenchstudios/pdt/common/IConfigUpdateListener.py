@@ -0,0 +1,43 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+from labbenchstudios.pdt.common.ConfigSnapshot import ConfigSnapshot
+
+class IConfigUpdateListener():
+	"""
+	Interface definition for clients that are notified when the
+	configuration file is reloaded (see ConfigUtil.addConfigUpdateListener()).
+	
+	"""
+	
+	def handleConfigUpdate(self, configSnapshot: ConfigSnapshot = None) -> bool:
+		"""
+		Callback function to handle a configuration update. This is invoked
+		on the config watcher thread, after the new snapshot has replaced
+		the previous one.
+		
+		@param configSnapshot The new ConfigSnapshot.
+		@return bool True on success; False otherwise.
+		"""
+		pass
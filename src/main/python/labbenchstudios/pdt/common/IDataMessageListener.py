@@ -102,6 +102,27 @@ class IDataMessageListener():
 		"""
 		pass
 	
+	def handleSensorMessageBatch(self, dataList: list) -> bool:
+		"""
+		Callback function to handle a batch of sensor messages, each packaged
+		as a SensorData object - e.g. from a simulated sensor fleet.
+		
+		@param dataList The list of SensorData messages received.
+		@return bool True if all messages were handled successfully; False otherwise.
+		"""
+		pass
+	
+	def handleSensorRollupMessage(self, resource: ResourceNameEnum = None, dataList: list = None) -> bool:
+		"""
+		Callback function to handle the rollups for a closed aggregation window,
+		each packaged as a SensorData object.
+		
+		@param resource The rollup window's resource.
+		@param dataList The list of rollup SensorData messages.
+		@return bool True on success; False otherwise.
+		"""
+		pass
+	
 	def handleSystemPerformanceMessage(self, data: SystemPerformanceData) -> bool:
 		"""
 		Callback function to handle a system performance message packaged as
@@ -0,0 +1,94 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import threading
+
+class MetricCounter(object):
+	"""
+	A monotonically increasing counter (e.g. messages handled).
+	
+	Each thread increments its own cell, so increment() never takes a
+	lock - the cells are only summed when the value is read. A lock is
+	only used the first time a given thread increments the counter.
+	
+	"""
+	
+	def __init__(self, name: str = None):
+		"""
+		Constructor.
+		
+		@param name The counter name.
+		"""
+		self.name = name
+		
+		self.cellLock    = threading.Lock()
+		self.cells       = []
+		self.threadLocal = threading.local()
+	
+	def getName(self) -> str:
+		return self.name
+	
+	def getValue(self) -> int:
+		"""
+		Returns the sum of all threads' counts.
+		
+		@return int
+		"""
+		with self.cellLock:
+			return sum(cell[0] for cell in self.cells)
+	
+	def increment(self, amount: int = 1):
+		"""
+		Adds 'amount' to the calling thread's count.
+		
+		@param amount The amount to add. Defaults to 1.
+		"""
+		try:
+			self.threadLocal.cell[0] += amount
+		except AttributeError:
+			self._createCell()[0] += amount
+	
+	def reset(self):
+		"""
+		Resets all threads' counts to 0.
+		
+		"""
+		with self.cellLock:
+			for cell in self.cells:
+				cell[0] = 0
+	
+	def _createCell(self) -> list:
+		"""
+		Creates and registers the calling thread's cell.
+		
+		@return list The cell.
+		"""
+		cell = [0]
+		
+		with self.cellLock:
+			self.cells.append(cell)
+		
+		self.threadLocal.cell = cell
+		
+		return cell
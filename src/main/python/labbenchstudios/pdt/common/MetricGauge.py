@@ -0,0 +1,69 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+class MetricGauge(object):
+	"""
+	A value that can go up or down (e.g. queue depth). Only the latest
+	value is kept - setting it is a single (atomic) attribute assignment,
+	so no lock is needed.
+	
+	Alternatively, a value supplier can be set, which is called each time
+	the gauge is read - for values that are cheaper to read on demand than
+	to track (e.g. the number of queued commands).
+	
+	"""
+	
+	def __init__(self, name: str = None):
+		"""
+		Constructor.
+		
+		@param name The gauge name.
+		"""
+		self.name  = name
+		self.value = 0.0
+		
+		self.valueSupplier = None
+	
+	def getName(self) -> str:
+		return self.name
+	
+	def getValue(self) -> float:
+		if self.valueSupplier:
+			return self.valueSupplier()
+		
+		return self.value
+	
+	def reset(self):
+		self.value = 0.0
+	
+	def setValue(self, value: float):
+		self.value = value
+	
+	def setValueSupplier(self, valueSupplier = None):
+		"""
+		Sets the callable that returns the gauge's value when read.
+		
+		@param valueSupplier A no-arg callable, or None to use the set value.
+		"""
+		self.valueSupplier = valueSupplier
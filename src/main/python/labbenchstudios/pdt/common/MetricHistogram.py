@@ -0,0 +1,217 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import threading
+
+from time import perf_counter_ns
+
+class MetricHistogram(object):
+	"""
+	A latency histogram with logarithmic (HDR-style) buckets, for values
+	in nanoseconds.
+	
+	Each power of two is split into SUB_BUCKET_COUNT linear sub-buckets,
+	so any recorded value is within 1 / SUB_BUCKET_COUNT (12.5%) of the
+	bucket it's counted in, for a fixed BUCKET_COUNT counts - regardless
+	of the number or range of values recorded.
+	
+	As with MetricCounter, each thread records into its own cell, and
+	the cells are only merged when the histogram is read.
+	
+	Use recordSince() to time a span:
+	
+		startNs = perf_counter_ns()
+		...
+		histogram.recordSince(startNs)
+	"""
+	
+	SUB_BUCKET_BITS  = 3
+	SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+	
+	# enough buckets for any 64 bit value - a value with a bit length of
+	# 64 is counted in bucket (64 - SUB_BUCKET_BITS) * SUB_BUCKET_COUNT + 7
+	BUCKET_COUNT = (64 - SUB_BUCKET_BITS + 1) * SUB_BUCKET_COUNT
+	
+	# cell stats slots
+	COUNT = 0
+	SUM   = 1
+	MIN   = 2
+	MAX   = 3
+	
+	def __init__(self, name: str = None):
+		"""
+		Constructor.
+		
+		@param name The histogram name.
+		"""
+		self.name = name
+		
+		self.cellLock    = threading.Lock()
+		self.cells       = []
+		self.threadLocal = threading.local()
+	
+	def getName(self) -> str:
+		return self.name
+	
+	def getStats(self, percentiles: tuple = (50.0, 90.0, 99.0)) -> dict:
+		"""
+		Merges all threads' cells, and returns the count, mean, min, max
+		and requested percentiles. Percentiles are reported as the upper
+		bound of the bucket they fall in (capped at the max value).
+		
+		@param percentiles The percentiles to calculate.
+		@return dict With keys 'count', 'mean', 'min', 'max' and 'p<N>' (e.g. 'p99') - values in nanoseconds.
+		"""
+		counts = [0] * self.BUCKET_COUNT
+		count  = 0
+		total  = 0
+		minVal = None
+		maxVal = 0
+		
+		with self.cellLock:
+			for cellCounts, cellStats in self.cells:
+				if cellStats[self.COUNT] == 0:
+					continue
+				
+				for i, bucketCount in enumerate(cellCounts):
+					if bucketCount:
+						counts[i] += bucketCount
+				
+				count += cellStats[self.COUNT]
+				total += cellStats[self.SUM]
+				maxVal = max(maxVal, cellStats[self.MAX])
+				minVal = cellStats[self.MIN] if minVal is None else min(minVal, cellStats[self.MIN])
+		
+		stats = { \
+			'count': count, \
+			'mean': (total / count) if count else 0.0, \
+			'min': minVal or 0, \
+			'max': maxVal }
+		
+		for percentile in percentiles:
+			stats['p' + ('%g' % percentile)] = self._getPercentile(counts, count, percentile, maxVal)
+		
+		return stats
+	
+	def record(self, value: int):
+		"""
+		Records a value in the calling thread's cell.
+		
+		@param value The value in nanoseconds. Negative values are recorded as 0.
+		"""
+		try:
+			cellCounts, cellStats = self.threadLocal.cell
+		except AttributeError:
+			cellCounts, cellStats = self._createCell()
+		
+		if value < 0:
+			value = 0
+		
+		shift = value.bit_length() - self.SUB_BUCKET_BITS - 1
+		
+		if shift > 0:
+			cellCounts[(shift << self.SUB_BUCKET_BITS) + (value >> shift)] += 1
+		else:
+			cellCounts[value] += 1
+		
+		# literal slot indexes (see COUNT, SUM, MIN and MAX) avoid attribute lookups
+		cellStats[0] += 1
+		cellStats[1] += value
+		
+		if value > cellStats[3]:
+			cellStats[3] = value
+		
+		if value < cellStats[2]:
+			cellStats[2] = value
+	
+	def recordSince(self, startNs: int):
+		"""
+		Records the time elapsed since 'startNs'.
+		
+		@param startNs A perf_counter_ns() value.
+		"""
+		self.record(perf_counter_ns() - startNs)
+	
+	def reset(self):
+		"""
+		Clears all threads' cells.
+		
+		"""
+		with self.cellLock:
+			for cellCounts, cellStats in self.cells:
+				cellCounts[:] = [0] * self.BUCKET_COUNT
+				cellStats[:]  = self._createCellStats()
+	
+	@classmethod
+	def getBucketUpperBound(cls, index: int) -> int:
+		"""
+		Returns the largest value counted in the bucket at 'index'.
+		
+		@param index The bucket index.
+		@return int
+		"""
+		shift = (index >> cls.SUB_BUCKET_BITS) - 1
+		
+		if shift <= 0:
+			return index
+		
+		return ((index - (shift << cls.SUB_BUCKET_BITS) + 1) << shift) - 1
+	
+	def _createCell(self) -> tuple:
+		"""
+		Creates and registers the calling thread's cell.
+		
+		@return tuple (bucketCounts, stats).
+		"""
+		cell = ([0] * self.BUCKET_COUNT, self._createCellStats())
+		
+		with self.cellLock:
+			self.cells.append(cell)
+		
+		self.threadLocal.cell = cell
+		
+		return cell
+	
+	def _createCellStats(self) -> list:
+		# count, sum, min, max
+		return [0, 0, 1 << 64, 0]
+	
+	def _getPercentile(self, counts: list, count: int, percentile: float, maxVal: int) -> int:
+		"""
+		Returns the upper bound of the bucket containing the value at 'percentile'.
+		
+		"""
+		if count == 0:
+			return 0
+		
+		rank = max(1, int(count * percentile / 100.0 + 0.5))
+		seen = 0
+		
+		for i, bucketCount in enumerate(counts):
+			seen += bucketCount
+			
+			if seen >= rank:
+				return min(self.getBucketUpperBound(i), maxVal)
+		
+		return maxVal
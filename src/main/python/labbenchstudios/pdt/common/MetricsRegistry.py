@@ -0,0 +1,145 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import threading
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.MetricCounter import MetricCounter
+from labbenchstudios.pdt.common.MetricGauge import MetricGauge
+from labbenchstudios.pdt.common.MetricHistogram import MetricHistogram
+from labbenchstudios.pdt.common.Singleton import Singleton
+
+class MetricsRegistry(metaclass = Singleton):
+	"""
+	Process wide registry of the pipeline's counters, gauges and latency
+	histograms. Implemented as a Singleton using the Singleton metaclass.
+	
+	Components should look up their metrics once (e.g. in the constructor)
+	and keep a reference, so the hot path only calls increment(), setValue()
+	or recordSince() - none of which take a lock.
+	
+	"""
+	
+	# histogram stats included in the snapshot, converted to microseconds
+	SNAPSHOT_PERCENTILES = (50.0, 90.0, 99.0)
+	
+	def __init__(self):
+		"""
+		Constructor.
+		
+		"""
+		self.lock = threading.Lock()
+		
+		self.counters   = {}
+		self.gauges     = {}
+		self.histograms = {}
+	
+	def getCounter(self, name: str) -> MetricCounter:
+		"""
+		Returns the named counter, creating it if needed.
+		
+		@param name The counter name.
+		@return MetricCounter
+		"""
+		return self.counters.get(name) or self._getOrCreate(self.counters, name, MetricCounter)
+	
+	def getGauge(self, name: str) -> MetricGauge:
+		"""
+		Returns the named gauge, creating it if needed.
+		
+		@param name The gauge name.
+		@return MetricGauge
+		"""
+		return self.gauges.get(name) or self._getOrCreate(self.gauges, name, MetricGauge)
+	
+	def getHistogram(self, name: str) -> MetricHistogram:
+		"""
+		Returns the named histogram, creating it if needed.
+		
+		@param name The histogram name.
+		@return MetricHistogram
+		"""
+		return self.histograms.get(name) or self._getOrCreate(self.histograms, name, MetricHistogram)
+	
+	def getSnapshot(self) -> dict:
+		"""
+		Returns the current value of every metric as a flat dict, suitable
+		for publishing as telemetry. Counters and gauges are keyed by name.
+		Histograms are keyed by '<name>-<stat>' - e.g. 'mqttPublish-p99' -
+		for the count, mean, max and SNAPSHOT_PERCENTILES, in microseconds
+		(except the count).
+		
+		@return dict
+		"""
+		with self.lock:
+			counters   = list(self.counters.values())
+			gauges     = list(self.gauges.values())
+			histograms = list(self.histograms.values())
+		
+		snapshot  = {}
+		separator = ConfigConst.SUB_TYPE_SEPARATOR_CHAR
+		
+		for counter in counters:
+			snapshot[counter.getName()] = counter.getValue()
+		
+		for gauge in gauges:
+			snapshot[gauge.getName()] = gauge.getValue()
+		
+		for histogram in histograms:
+			stats = histogram.getStats(percentiles = self.SNAPSHOT_PERCENTILES)
+			
+			for statName, statVal in stats.items():
+				if statName == 'min':
+					continue
+				
+				snapshot[histogram.getName() + separator + statName] = \
+					statVal if statName == 'count' else statVal / 1000.0
+		
+		return snapshot
+	
+	def reset(self):
+		"""
+		Resets the value of every metric (the metrics stay registered).
+		
+		"""
+		with self.lock:
+			metrics = list(self.counters.values()) + list(self.gauges.values()) + list(self.histograms.values())
+		
+		for metric in metrics:
+			metric.reset()
+	
+	def _getOrCreate(self, metrics: dict, name: str, metricClazz):
+		"""
+		Returns the named metric from 'metrics', creating it if needed.
+		
+		"""
+		with self.lock:
+			metric = metrics.get(name)
+			
+			if not metric:
+				metric = metricClazz(name)
+				metrics[name] = metric
+			
+			return metric
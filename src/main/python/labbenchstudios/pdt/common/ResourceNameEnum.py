@@ -66,9 +66,13 @@ class ResourceNameEnum(Enum):
 	CDA_MGMT_STATUS_MSG_RESOURCE	  = ConfigConst.CDA_MGMT_STATUS_MSG_RESOURCE
 	CDA_MGMT_STATUS_CMD_RESOURCE	  = ConfigConst.CDA_MGMT_CMD_MSG_RESOURCE
 	CDA_SYSTEM_PERF_MSG_RESOURCE	  = ConfigConst.CDA_SYSTEM_PERF_MSG_RESOURCE
+	CDA_CONN_STATE_MSG_RESOURCE       = ConfigConst.CDA_CONN_STATE_MSG_RESOURCE
 	CDA_UPDATE_NOTIFICATIONS_RESOURCE = ConfigConst.CDA_UPDATE_NOTIFICATIONS_MSG_RESOURCE
 	CDA_REGISTRATION_REQUEST_RESOURCE = ConfigConst.CDA_REGISTRATION_REQUEST_RESOURCE
 	SYSTEM_REQUEST_RESOURCE           = ConfigConst.SYSTEM_REQUEST_RESOURCE
+	CDA_SENSOR_ROLLUP_1M_RESOURCE     = ConfigConst.CDA_SENSOR_ROLLUP_1M_MSG_RESOURCE
+	CDA_SENSOR_ROLLUP_15M_RESOURCE    = ConfigConst.CDA_SENSOR_ROLLUP_15M_MSG_RESOURCE
+	CDA_SENSOR_ROLLUP_1H_RESOURCE     = ConfigConst.CDA_SENSOR_ROLLUP_1H_MSG_RESOURCE
 
 	def getResourceNameByValue(self, val: str) -> str:
 		"""
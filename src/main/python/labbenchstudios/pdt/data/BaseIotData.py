@@ -217,6 +217,17 @@ class BaseIotData(object):
 		if val < 0:
 			self.hasError = True
 			
+	def setTimeStamp(self, epochSecs: float):
+		"""
+		Sets the internal time stamp to 'epochSecs' in Zulu time, using
+		the same ISO 8601 format as updateTimeStamp().
+		
+		@param epochSecs The time since Epoch in seconds.
+		"""
+		t = datetime.fromtimestamp(epochSecs, timezone.utc) + timedelta(seconds = self.timeOffsetSeconds)
+		
+		self.timeStamp = str(t.isoformat())
+		
 	def setTypeID(self, val: int):
 		"""
 		Sets the type ID value.
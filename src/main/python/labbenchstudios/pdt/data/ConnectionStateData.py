@@ -46,6 +46,16 @@ class ConnectionStateData(IotDataContext):
 		self.isDisconnected = True
 		self.isConnecting = False
 		self.isConnected = False
+		self.connectTime = ConfigConst.NOT_SET
+		self.disconnectTime = ConfigConst.NOT_SET
+		self.reconnectCount = 0
+		self.roundTripLatency = 0.0
+	
+	def getConnectTime(self) -> str:
+		return self.connectTime
+	
+	def getDisconnectTime(self) -> str:
+		return self.disconnectTime
 	
 	def getHostName(self) -> str:
 		return self.hostName
@@ -59,6 +69,17 @@ class ConnectionStateData(IotDataContext):
 	def getMessageOutCount(self) -> int:
 		return self.msgOutCount
 	
+	def getReconnectCount(self) -> int:
+		return self.reconnectCount
+	
+	def getRoundTripLatency(self) -> float:
+		"""
+		Returns the smoothed round trip latency, in milliseconds.
+		
+		@return float
+		"""
+		return self.roundTripLatency
+	
 	def isClientConnecting(self) -> bool:
 		return self.isConnecting
 	
@@ -68,6 +89,14 @@ class ConnectionStateData(IotDataContext):
 	def isClientDisconnected(self) -> bool:
 		return self.isDisconnected
 	
+	def setConnectTime(self, timeStamp: str):
+		self.connectTime = timeStamp
+		self.updateTimeStamp()
+
+	def setDisconnectTime(self, timeStamp: str):
+		self.disconnectTime = timeStamp
+		self.updateTimeStamp()
+
 	def setHostName(self, hostName: str):
 		self.hostName = hostName
 		self.updateTimeStamp()
@@ -84,6 +113,14 @@ class ConnectionStateData(IotDataContext):
 		self.msgOutCount = val
 		self.updateTimeStamp()
 
+	def setReconnectCount(self, val: int):
+		self.reconnectCount = val
+		self.updateTimeStamp()
+
+	def setRoundTripLatency(self, val: float):
+		self.roundTripLatency = val
+		self.updateTimeStamp()
+
 	def setIsClientConnectingFlag(self, flag: bool):
 		self.isConnecting = flag
 		self.updateTimeStamp()
@@ -117,13 +154,17 @@ class ConnectionStateData(IotDataContext):
 			self.isConnecting = data.isClientConnecting()
 			self.isConnected = data.isClientConnected()
 			self.isDisconnected = data.isClientDisconnected()
+			self.connectTime = data.getConnectTime()
+			self.disconnectTime = data.getDisconnectTime()
+			self.reconnectCount = data.getReconnectCount()
+			self.roundTripLatency = data.getRoundTripLatency()
 
 	def __str__(self):
 		"""
 		String override function.
 		
 		"""
-		s = IotDataContext.__str__(self) + ',{}={},{}={},{}={},{}={},{}={},{}={},{}={}'
+		s = IotDataContext.__str__(self) + ',{}={},{}={},{}={},{}={},{}={},{}={},{}={},{}={},{}={},{}={},{}={}'
 		
 		return s.format(
 			ConfigConst.HOST_NAME_PROP, self.hostName,
@@ -132,4 +173,8 @@ class ConnectionStateData(IotDataContext):
 			ConfigConst.MESSAGE_OUT_COUNT_PROP, self.msgOutCount,
 			ConfigConst.IS_CONNECTING_PROP, self.isConnecting,
 			ConfigConst.IS_CONNECTED_PROP, self.isConnected,
-			ConfigConst.IS_DISCONNECTED_PROP, self.isDisconnected)
+			ConfigConst.IS_DISCONNECTED_PROP, self.isDisconnected,
+			ConfigConst.CONNECT_TIME_PROP, self.connectTime,
+			ConfigConst.DISCONNECT_TIME_PROP, self.disconnectTime,
+			ConfigConst.RECONNECT_COUNT_PROP, self.reconnectCount,
+			ConfigConst.ROUND_TRIP_LATENCY_PROP, self.roundTripLatency)
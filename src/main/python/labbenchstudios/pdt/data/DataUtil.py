@@ -27,8 +27,14 @@ import logging
 
 from decimal import Decimal
 from json import JSONEncoder
+from time import perf_counter_ns
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.MetricsRegistry import MetricsRegistry
 
 from labbenchstudios.pdt.data.ActuatorData import ActuatorData
+from labbenchstudios.pdt.data.ConnectionStateData import ConnectionStateData
 from labbenchstudios.pdt.data.SensorData import SensorData
 from labbenchstudios.pdt.data.SystemPerformanceData import SystemPerformanceData
 
@@ -46,6 +52,9 @@ class DataUtil():
 		"""
 		self.encodeToUtf8 = encodeToUtf8
 		
+		self.encodeHistogram = MetricsRegistry().getHistogram(ConfigConst.DATA_ENCODE_SPAN)
+		self.decodeHistogram = MetricsRegistry().getHistogram(ConfigConst.DATA_DECODE_SPAN)
+		
 		logging.info("Created DataUtil instance.")
 	
 	def actuatorDataToJson(self, data: ActuatorData = None, useDecForFloat: bool = False):
@@ -61,11 +70,32 @@ class DataUtil():
 			logging.debug("ActuatorData is null. Returning empty string.")
 			return ""
 		
-		logging.debug("Encoding ActuatorData to JSON [pre]  --> " + str(data))
+		logging.debug("Encoding ActuatorData to JSON [pre]  --> %s", data)
+		
+		jsonData = self._generateJsonData(obj = data, useDecForFloat = False)
+		
+		logging.info("Encoding ActuatorData to JSON [post] --> %s", jsonData)
+		
+		return jsonData
+	
+	def connectionStateDataToJson(self, data: ConnectionStateData = None, useDecForFloat: bool = False):
+		"""
+		Convert ConnectionStateData object to JSON string.
+		
+		@param data The ConnectionStateData object to convert.
+		@param useDecForFloat If true, any float value will be replaced as a Decimal.
+		@return A JSON text string representing 'connStateData',
+		if ConnectionStateData is valid.
+		"""
+		if not data:
+			logging.debug("ConnectionStateData is null. Returning empty string.")
+			return ""
+		
+		logging.debug("Encoding ConnectionStateData to JSON [pre]  --> %s", data)
 		
 		jsonData = self._generateJsonData(obj = data, useDecForFloat = False)
 		
-		logging.info("Encoding ActuatorData to JSON [post] --> " + str(jsonData))
+		logging.debug("Encoding ConnectionStateData to JSON [post] --> %s", jsonData)
 		
 		return jsonData
 	
@@ -82,11 +112,11 @@ class DataUtil():
 			logging.debug("SensorData is null. Returning empty string.")
 			return ""
 		
-		logging.debug("Encoding SensorData to JSON [pre]  --> " + str(data))
+		logging.debug("Encoding SensorData to JSON [pre]  --> %s", data)
 		
 		jsonData = self._generateJsonData(obj = data, useDecForFloat = False)
 		
-		logging.debug("Encoding SensorData to JSON [post] --> " + str(jsonData))
+		logging.debug("Encoding SensorData to JSON [post] --> %s", jsonData)
 		
 		return jsonData
 
@@ -103,11 +133,11 @@ class DataUtil():
 			logging.debug("SystemPerformanceData is null. Returning empty string.")
 			return ""
 		
-		logging.debug("Encoding SystemPerformanceData to JSON [pre]  --> " + str(data))
+		logging.debug("Encoding SystemPerformanceData to JSON [pre]  --> %s", data)
 		
 		jsonData = self._generateJsonData(obj = data, useDecForFloat = False)
 		
-		logging.debug("Encoding SystemPerformanceData to JSON [post] --> " + str(jsonData))
+		logging.debug("Encoding SystemPerformanceData to JSON [post] --> %s", jsonData)
 		
 		return jsonData
 	
@@ -127,16 +157,42 @@ class DataUtil():
 		
 		jsonStruct = self._formatDataAndLoadDictionary(jsonData, useDecForFloat = useDecForFloat)
 		
-		logging.debug("Converting JSON to ActuatorData [pre]  --> " + str(jsonStruct))
+		logging.debug("Converting JSON to ActuatorData [pre]  --> %s", jsonStruct)
 		
 		ad = ActuatorData()
 		
 		self._updateIotData(jsonStruct, ad)
 		
-		logging.debug("Converted JSON to ActuatorData [post] --> " + str(ad))
+		logging.debug("Converted JSON to ActuatorData [post] --> %s", ad)
 		
 		return ad
 	
+	def jsonToConnectionStateData(self, jsonData: str = None, useDecForFloat: bool = False):
+		"""
+		Convert JSON string to ConnectionStateData object.
+		
+		@param jsonData The JSON string data to convert into a
+		ConnectionStateData instance.
+		@param useDecForFloat If true, any float value will be replaced as a Decimal.
+		@return ConnectionStateData A ConnectionStateData object representing 'jsonData',
+		if jsonData is valid.
+		"""
+		if not jsonData:
+			logging.warning("JSON data is empty or null. Returning null.")
+			return None
+		
+		jsonStruct = self._formatDataAndLoadDictionary(jsonData, useDecForFloat = useDecForFloat)
+		
+		logging.debug("Converting JSON to ConnectionStateData [pre]  --> %s", jsonStruct)
+		
+		csd = ConnectionStateData()
+		
+		self._updateIotData(jsonStruct, csd)
+		
+		logging.debug("Converted JSON to ConnectionStateData [post] --> %s", csd)
+		
+		return csd
+	
 	def jsonToSensorData(self, jsonData: str = None, useDecForFloat: bool = False):
 		"""
 		Convert JSON string to SensorData object.
@@ -153,13 +209,13 @@ class DataUtil():
 		
 		jsonStruct = self._formatDataAndLoadDictionary(jsonData, useDecForFloat = useDecForFloat)
 		
-		logging.debug("Converting JSON to SensorData [pre]  --> " + str(jsonStruct))
+		logging.debug("Converting JSON to SensorData [pre]  --> %s", jsonStruct)
 		
 		sd = SensorData()
 		
 		self._updateIotData(jsonStruct, sd)
 		
-		logging.debug("Converted JSON to SensorData [post] --> " + str(sd))
+		logging.debug("Converted JSON to SensorData [post] --> %s", sd)
 		
 		return sd
 	
@@ -179,13 +235,13 @@ class DataUtil():
 		
 		jsonStruct = self._formatDataAndLoadDictionary(jsonData, useDecForFloat = useDecForFloat)
 		
-		logging.debug("Converting JSON to SystemPerformanceData [pre]  --> " + str(jsonStruct))
+		logging.debug("Converting JSON to SystemPerformanceData [pre]  --> %s", jsonStruct)
 		
 		sp = SystemPerformanceData()
 		
 		self._updateIotData(jsonStruct, sp)
 		
-		logging.debug("Converted JSON to SystemPerformanceData [post] --> " + str(sp))
+		logging.debug("Converted JSON to SystemPerformanceData [post] --> %s", sp)
 		
 		return sp
 	
@@ -202,6 +258,8 @@ class DataUtil():
 		@param useDecForFloat If true, any float value will be replaced as a Decimal.
 		@return dict
 		"""
+		startNs = perf_counter_ns()
+		
 		jsonData = jsonData.replace("\'", "\"").replace('False', 'false').replace('True', 'true')
 		
 		jsonStruct = None
@@ -211,6 +269,8 @@ class DataUtil():
 		else:
 			jsonStruct = json.loads(jsonData)
 		
+		self.decodeHistogram.recordSince(startNs)
+		
 		return jsonStruct
 		
 	def _generateJsonData(self, obj, useDecForFloat: bool = False) -> str:
@@ -223,6 +283,8 @@ class DataUtil():
 		this class is used within a FaaS component.
 		@return The JSON string.
 		"""
+		startNs = perf_counter_ns()
+		
 		jsonData = None
 		
 		if self.encodeToUtf8:
@@ -235,12 +297,14 @@ class DataUtil():
 		if jsonData:
 			if useDecForFloat:
 				tmpData = json.loads(jsonData, parse_float = Decimal)
-				logging.info("\n\nBEFORE:\n\n" + str(jsonData))
-				logging.info("\n\nAFTER:\n\n" + str(tmpData))
+				logging.info("\n\nBEFORE:\n\n%s", jsonData)
+				logging.info("\n\nAFTER:\n\n%s", tmpData)
 				#jsonData = json.dumps(tmpData, cls = JsonDataEncoder)
 			
 			jsonData = jsonData.replace("\'", "\"").replace('False', 'false').replace('True', 'true')
 		
+		self.encodeHistogram.recordSince(startNs)
+		
 		return jsonData
 	
 	def _updateIotData(self, jsonStruct, obj):
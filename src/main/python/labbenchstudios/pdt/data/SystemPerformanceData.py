@@ -42,38 +42,119 @@ class SystemPerformanceData(IotDataContext):
 		self.cpuUtil = ConfigConst.DEFAULT_VAL
 		self.memUtil = ConfigConst.DEFAULT_VAL
 		self.diskUtil = ConfigConst.DEFAULT_VAL
+		
+		# per-core CPU utilization, and I/O rates in bytes / sec
+		self.cpuCoreUtil   = []
+		self.diskReadRate  = ConfigConst.DEFAULT_VAL
+		self.diskWriteRate = ConfigConst.DEFAULT_VAL
+		self.netRxRate     = ConfigConst.DEFAULT_VAL
+		self.netTxRate     = ConfigConst.DEFAULT_VAL
+		
+		# process resident set size in bytes, and thread count
+		self.processRss         = 0
+		self.processThreadCount = 0
+		
+		# optional MetricsRegistry snapshot - metric name -> value
+		self.pipelineMetrics = {}
+	
+	def getCpuCoreUtilization(self) -> list:
+		return self.cpuCoreUtil
 	
 	def getCpuUtilization(self):
 		return self.cpuUtil
 	
+	def getDiskReadRate(self) -> float:
+		return self.diskReadRate
+	
 	def getDiskUtilization(self):
 		return self.diskUtil
 	
+	def getDiskWriteRate(self) -> float:
+		return self.diskWriteRate
+	
 	def getMemoryUtilization(self):
 		return self.memUtil
 	
+	def getNetworkRxRate(self) -> float:
+		return self.netRxRate
+	
+	def getNetworkTxRate(self) -> float:
+		return self.netTxRate
+	
+	def getPipelineMetrics(self) -> dict:
+		return self.pipelineMetrics
+	
+	def getProcessRss(self) -> int:
+		return self.processRss
+	
+	def getProcessThreadCount(self) -> int:
+		return self.processThreadCount
+	
+	def setCpuCoreUtilization(self, cpuCoreUtil: list):
+		self.cpuCoreUtil = list(cpuCoreUtil) if cpuCoreUtil else []
+	
 	def setCpuUtilization(self, cpuUtil):
 		self.cpuUtil = cpuUtil
 	
+	def setDiskReadRate(self, diskReadRate: float):
+		self.diskReadRate = diskReadRate
+	
 	def setDiskUtilization(self, diskUtil):
 		self.diskUtil = diskUtil
 	
+	def setDiskWriteRate(self, diskWriteRate: float):
+		self.diskWriteRate = diskWriteRate
+	
 	def setMemoryUtilization(self, memUtil):
 		self.memUtil = memUtil
 	
+	def setNetworkRxRate(self, netRxRate: float):
+		self.netRxRate = netRxRate
+	
+	def setNetworkTxRate(self, netTxRate: float):
+		self.netTxRate = netTxRate
+	
+	def setPipelineMetrics(self, pipelineMetrics: dict):
+		self.pipelineMetrics = dict(pipelineMetrics) if pipelineMetrics else {}
+	
+	def setProcessRss(self, processRss: int):
+		self.processRss = processRss
+	
+	def setProcessThreadCount(self, processThreadCount: int):
+		self.processThreadCount = processThreadCount
+	
 	def _handleUpdateData(self, data):
 		if data and isinstance(data, SystemPerformanceData):
 			self.cpuUtil = data.getCpuUtilization()
 			self.memUtil = data.getMemoryUtilization()
 			self.diskUtil = data.getDiskUtilization()
 			
+			self.cpuCoreUtil   = list(data.getCpuCoreUtilization())
+			self.diskReadRate  = data.getDiskReadRate()
+			self.diskWriteRate = data.getDiskWriteRate()
+			self.netRxRate     = data.getNetworkRxRate()
+			self.netTxRate     = data.getNetworkTxRate()
+			
+			self.processRss         = data.getProcessRss()
+			self.processThreadCount = data.getProcessThreadCount()
+			
+			self.pipelineMetrics = dict(data.getPipelineMetrics())
+			
 	def __str__(self):
 		"""
 		String override function.
 		
 		"""
-		s = IotDataContext.__str__(self) + ',{}={},{}={}'
+		s = IotDataContext.__str__(self) + ',{}={},{}={},{}={},{}={},{}={},{}={},{}={},{}={},{}={},{}={}'
 		
 		return s.format(
 			ConfigConst.CPU_UTIL_PROP, self.cpuUtil,
-			ConfigConst.MEM_UTIL_PROP, self.memUtil)
+			ConfigConst.MEM_UTIL_PROP, self.memUtil,
+			ConfigConst.DISK_UTIL_PROP, self.diskUtil,
+			ConfigConst.CPU_CORE_UTIL_PROP, self.cpuCoreUtil,
+			ConfigConst.DISK_READ_RATE_PROP, self.diskReadRate,
+			ConfigConst.DISK_WRITE_RATE_PROP, self.diskWriteRate,
+			ConfigConst.NET_RX_RATE_PROP, self.netRxRate,
+			ConfigConst.NET_TX_RATE_PROP, self.netTxRate,
+			ConfigConst.PROCESS_RSS_PROP, self.processRss,
+			ConfigConst.PROCESS_THREAD_COUNT_PROP, self.processThreadCount)
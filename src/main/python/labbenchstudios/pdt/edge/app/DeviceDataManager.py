@@ -23,28 +23,33 @@
 #
 
 import logging
-from time import sleep
+import threading
 
-from labbenchstudios.pdt.edge.connection.InfluxClientConnector import InfluxClientConnector
-from labbenchstudios.pdt.edge.connection.MqttClientConnector import MqttClientConnector
+from importlib import import_module
+from time import perf_counter, perf_counter_ns, sleep
 
-from labbenchstudios.pdt.edge.system.WindTurbineAdapterManager import WindTurbineAdapterManager
-from labbenchstudios.pdt.edge.system.ActuatorAdapterManager import ActuatorAdapterManager
-from labbenchstudios.pdt.edge.system.SensorAdapterManager import SensorAdapterManager
-from labbenchstudios.pdt.edge.system.SystemPerformanceManager import SystemPerformanceManager
+from apscheduler.schedulers.background import BackgroundScheduler
 
 import labbenchstudios.pdt.common.ConfigConst as ConfigConst
 
+from labbenchstudios.pdt.common.ConfigSnapshot import ConfigSnapshot
 from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
+from labbenchstudios.pdt.common.IConfigUpdateListener import IConfigUpdateListener
 from labbenchstudios.pdt.common.IDataMessageListener import IDataMessageListener
+from labbenchstudios.pdt.common.MetricsRegistry import MetricsRegistry
+from labbenchstudios.pdt.common.ResourceNameContainer import ResourceNameContainer
 from labbenchstudios.pdt.common.ResourceNameEnum import ResourceNameEnum
 
+from labbenchstudios.pdt.edge.app.EventJournal import EventJournal
+from labbenchstudios.pdt.edge.app.SensorDataFilter import SensorDataFilter
+
 from labbenchstudios.pdt.data.DataUtil import DataUtil
 from labbenchstudios.pdt.data.ActuatorData import ActuatorData
+from labbenchstudios.pdt.data.ConnectionStateData import ConnectionStateData
 from labbenchstudios.pdt.data.SensorData import SensorData
 from labbenchstudios.pdt.data.SystemPerformanceData import SystemPerformanceData
 
-class DeviceDataManager(IDataMessageListener):
+class DeviceDataManager(IDataMessageListener, IConfigUpdateListener):
 	"""
 	This class is the entry point for all other managers, such as the SystemPerformanceManager,
 	Connection Client(s), and Persistence Utilities used by the main application.
@@ -54,8 +59,49 @@ class DeviceDataManager(IDataMessageListener):
 	via one of the implemented callbacks, it can be packaged appropriately and sent
 	on to one of the communication mechanisms implemented in the connection client.
 	
+	The connectors and managers are registered - not created - by the constructor.
+	Each is imported and created on demand: enabled components when startManager()
+	is called, and the others (e.g. the actuator manager) when first used. The
+	time spent importing, creating and starting each component is recorded, and
+	can be retrieved via getStartupTimeline().
+	
+	If 'configWatchPollSecs' is > 0, the config file is watched while the
+	manager is running, and the HVAC trigger thresholds are updated when it
+	changes (the managers update their own poll rates).
+	
+	If 'enableSensorRollup' is set, every incoming SensorData (whether or
+	not the sensor data filter passes it) is also aggregated into 1m, 15m
+	and 1h rollups, which are stored in their own buckets and published
+	to their own resources.
+	
+	If 'connStatePollSecs' is > 0, the connection state of the MQTT and
+	TSDB clients (message counts, connect / disconnect times, reconnects
+	and round trip latency) is published and stored at that rate.
+	
+	If 'enableEventJournal' is set, every inbound command and message, sensor
+	and system performance reading, actuation and publish result is recorded
+	in an EventJournal while the manager is running. EventJournalReplayer
+	can feed the journal back through a DeviceDataManager.
+	
 	"""
 	
+	TSDB_CLIENT          = 'tsdbClient'
+	MQTT_CLIENT          = 'mqttClient'
+	WIND_TURBINE_MGR     = 'windTurbineMgr'
+	SYS_PERF_MGR         = 'sysPerfMgr'
+	SENSOR_ADAPTER_MGR   = 'sensorAdapterMgr'
+	ACTUATOR_ADAPTER_MGR = 'actuatorAdapterMgr'
+	ROLLUP_MGR           = 'rollupMgr'
+	
+	ROLLUP_PERSISTENCE_NAMES = { \
+		ResourceNameEnum.CDA_SENSOR_ROLLUP_1M_RESOURCE:  ConfigConst.SENSOR_ROLLUP_1M_PERSISTENCE_NAME, \
+		ResourceNameEnum.CDA_SENSOR_ROLLUP_15M_RESOURCE: ConfigConst.SENSOR_ROLLUP_15M_PERSISTENCE_NAME, \
+		ResourceNameEnum.CDA_SENSOR_ROLLUP_1H_RESOURCE:  ConfigConst.SENSOR_ROLLUP_1H_PERSISTENCE_NAME }
+	
+	IMPORT_PHASE = 'import'
+	CREATE_PHASE = 'create'
+	START_PHASE  = 'start'
+	
 	def __init__(self):
 		"""
 		Constructor.
@@ -83,43 +129,96 @@ class DeviceDataManager(IDataMessageListener):
 			self.configUtil.getBoolean( \
 				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.ENABLE_TSDB_CLIENT_KEY)
 		
+		self.enableAsyncActuation = \
+			self.configUtil.getBoolean( \
+				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.ENABLE_ASYNC_ACTUATION_KEY)
+		
+		self.configWatchPollSecs = \
+			self.configUtil.getFloat( \
+				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.CONFIG_WATCH_POLL_SECS_KEY)
+		
+		self.connStatePollSecs = \
+			self.configUtil.getFloat( \
+				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.CONN_STATE_POLL_SECS_KEY)
+		
+		self.connStateScheduler = None
+		self.connStateJob       = None
+		
+		self.enableEventJournal = \
+			self.configUtil.getBoolean( \
+				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.ENABLE_EVENT_JOURNAL_KEY)
+		
+		# created (and opened) by startManager()
+		self.eventJournal = None
+		
+		# set by the app - see setSamplingProfiler()
+		self.samplingProfiler = None
+		
+		self.sensorDataFilter = None
+		
+		if self.configUtil.getBoolean(section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.ENABLE_SENSOR_DATA_FILTER_KEY):
+			self.sensorDataFilter = SensorDataFilter()
+		
+		self.enableSensorRollup = \
+			self.configUtil.getBoolean( \
+				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.ENABLE_SENSOR_ROLLUP_KEY)
+		
+		# one container per rollup resource, so each window has its own bucket
+		self.rollupResourceContainers = {}
+		
+		for resource, persistenceName in self.ROLLUP_PERSISTENCE_NAMES.items():
+			container = ResourceNameContainer(resource = resource)
+			container.setPersistenceName(persistenceName)
+			
+			self.rollupResourceContainers[resource] = container
+		
 		# NOTE: this can also be retrieved from the configuration file
 		self.enableActuation    = True
 		
+		# DataUtil holds no per-call state, so one instance is shared
+		self.dataUtil = DataUtil()
+		
+		self.actuatorResponseCache = {}
+		self.sensorDataCache       = {}
+		self.sysPerfDataCache      = {}
+		self.connStateDataCache    = {}
+		
 		self.tsdbClient         = None
 		self.mqttClient         = None
 		self.windTurbineMgr        = None
 		self.sysPerfMgr         = None
 		self.sensorAdapterMgr   = None
 		self.actuatorAdapterMgr = None
-				
-		if self.enableTsdbClient:
-			self.tsdbClient = InfluxClientConnector()
-			logging.info("TSDB connector enabled")
-
-		if self.enableMqttClient:
-			self.mqttClient = MqttClientConnector()
-			self.mqttClient.setDataMessageListener(self)
-			logging.info("MQTT connector enabled")
-			
-		if self.enablePowerGeneration:
-			self.windTurbineMgr = WindTurbineAdapterManager()
-			self.windTurbineMgr.setDataMessageListener(self)
-			logging.info("Local wind turbine management enabled")
-		
-		if self.enableSystemPerf:
-			self.sysPerfMgr = SystemPerformanceManager()
-			self.sysPerfMgr.setDataMessageListener(self)
-			logging.info("Local system performance tracking enabled")
-		
-		if self.enableSensing:
-			self.sensorAdapterMgr = SensorAdapterManager()
-			self.sensorAdapterMgr.setDataMessageListener(self)
-			logging.info("Local sensor tracking enabled")
-			
-		if self.enableActuation:
-			self.actuatorAdapterMgr = ActuatorAdapterManager(dataMsgListener = self)
-			logging.info("Local actuation capabilities enabled")
+		self.rollupMgr          = None
+		
+		metricsRegistry = MetricsRegistry()
+		
+		self.sensorMsgCounter          = metricsRegistry.getCounter(ConfigConst.SENSOR_MSG_COUNTER)
+		self.actuatorCmdCounter        = metricsRegistry.getCounter(ConfigConst.ACTUATOR_CMD_COUNTER)
+		self.sysPerfMsgCounter         = metricsRegistry.getCounter(ConfigConst.SYS_PERF_MSG_COUNTER)
+		self.actuatorDispatchHistogram = metricsRegistry.getHistogram(ConfigConst.ACTUATOR_DISPATCH_SPAN)
+		
+		self.componentLock     = threading.RLock()
+		self.componentRegistry = {}
+		self.startupTimeline   = []
+		
+		# components are created in registration order by startManager()
+		self._registerComponent(self.TSDB_CLIENT, \
+			'labbenchstudios.pdt.edge.connection.InfluxClientConnector', 'InfluxClientConnector', self.enableTsdbClient)
+		self._registerComponent(self.MQTT_CLIENT, \
+			'labbenchstudios.pdt.edge.connection.MqttClientConnector', 'MqttClientConnector', self.enableMqttClient)
+		self._registerComponent(self.WIND_TURBINE_MGR, \
+			'labbenchstudios.pdt.edge.system.WindTurbineAdapterManager', 'WindTurbineAdapterManager', self.enablePowerGeneration)
+		self._registerComponent(self.SYS_PERF_MGR, \
+			'labbenchstudios.pdt.edge.system.SystemPerformanceManager', 'SystemPerformanceManager', self.enableSystemPerf)
+		self._registerComponent(self.SENSOR_ADAPTER_MGR, \
+			'labbenchstudios.pdt.edge.system.SensorAdapterManager', 'SensorAdapterManager', self.enableSensing)
+		self._registerComponent(self.ROLLUP_MGR, \
+			'labbenchstudios.pdt.edge.system.RollupAggregationManager', 'RollupAggregationManager', self.enableSensorRollup)
+		
+		# the actuator manager isn't created until the first actuator command
+		self._registerComponent(self.ACTUATOR_ADAPTER_MGR, \
+			'labbenchstudios.pdt.edge.system.ActuatorAdapterManager', 'ActuatorAdapterManager', self.enableActuation)
 		
 		self.deviceID     = \
 			self.configUtil.getProperty( \
@@ -129,17 +228,106 @@ class DeviceDataManager(IDataMessageListener):
 			self.configUtil.getProperty( \
 				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.DEVICE_LOCATION_ID_KEY, defaultVal = ConfigConst.NOT_SET)
 		
-		self.handleTempChangeOnDevice = \
-			self.configUtil.getBoolean( \
-				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.HANDLE_TEMP_CHANGE_ON_DEVICE_KEY)
+		self._loadTriggerThresholds(self.configUtil.getConfigSnapshot())
+	
+	def getComponent(self, name: str = None):
+		"""
+		Returns the named component (e.g. TSDB_CLIENT), importing and creating
+		it first if it's enabled and hasn't yet been created. The component's
+		data message listener is set to this instance.
+		
+		@param name The component name.
+		@return The component instance, or None if unknown, disabled or it failed to load.
+		"""
+		component = getattr(self, name, None) if name in self.componentRegistry else None
+		
+		if component:
+			return component
+		
+		moduleName, className, enabled = self.componentRegistry.get(name, (None, None, False))
+		
+		if not enabled:
+			return None
+		
+		with self.componentLock:
+			component = getattr(self, name)
 			
-		self.triggerHvacTempFloor     = \
-			self.configUtil.getFloat( \
-				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.TRIGGER_HVAC_TEMP_FLOOR_KEY)
+			if component:
+				return component
+			
+			try:
+				startTime = perf_counter()
 				
-		self.triggerHvacTempCeiling   = \
-			self.configUtil.getFloat( \
-				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.TRIGGER_HVAC_TEMP_CEILING_KEY)
+				compModule = import_module(moduleName, className)
+				compClazz = getattr(compModule, className)
+				
+				self._addStartupTimelineEntry(name, self.IMPORT_PHASE, startTime)
+				
+				startTime = perf_counter()
+				
+				component = compClazz()
+				component.setDataMessageListener(self)
+				
+				self._addStartupTimelineEntry(name, self.CREATE_PHASE, startTime)
+			except Exception as e:
+				logging.error("Failed to load component %s (%s). Disabling it. Exception: %s", name, className, str(e))
+				
+				self.componentRegistry[name] = (moduleName, className, False)
+				
+				return None
+			
+			setattr(self, name, component)
+			logging.info("Created component %s: %s", name, className)
+			
+			return component
+	
+	def getSensorDataFilterStats(self) -> dict:
+		"""
+		Returns the sensor data filter's per sensor stats (see SensorDataFilter.getStats()).
+		
+		@return dict The stats, or an empty dict if the filter is disabled.
+		"""
+		return self.sensorDataFilter.getStats() if self.sensorDataFilter else {}
+	
+	def getStartupTimeline(self) -> list:
+		"""
+		Returns the time spent importing, creating and starting each
+		component, in the order it occurred.
+		
+		@return list A list of (componentName, phase, millis) tuples.
+		"""
+		return list(self.startupTimeline)
+	
+	def getStartupTimelineReport(self) -> str:
+		"""
+		Returns a human readable table of the startup timeline, including
+		the total time per component.
+		
+		@return str
+		"""
+		totals = {}
+		
+		for name, phase, millis in self.startupTimeline:
+			totals[name] = totals.get(name, 0.0) + millis
+		
+		report = "Startup timeline (ms):"
+		
+		for name, phase, millis in self.startupTimeline:
+			report += "\n\t%-20s %-8s %10.1f" % (name, phase, millis)
+		
+		for name, millis in totals.items():
+			report += "\n\t%-20s %-8s %10.1f" % (name, 'total', millis)
+		
+		return report
+	
+	def isComponentEnabled(self, name: str = None) -> bool:
+		"""
+		Checks if the named component is registered and enabled.
+		
+		@param name The component name.
+		@return bool
+		"""
+		return self.componentRegistry.get(name, (None, None, False))[2]
 	
 	def getLatestActuatorDataResponseFromCache(self, name: str = None) -> ActuatorData:
 		"""
@@ -154,6 +342,18 @@ class DeviceDataManager(IDataMessageListener):
 			
 		return None
 		
+	def getLatestConnectionStateDataFromCache(self, name: str = None) -> ConnectionStateData:
+		"""
+		Retrieves the named connection state data from the cache.
+		
+		@param name The client's connection state name (e.g. ConfigConst.MQTT_CONN_STATE_NAME).
+		@return ConnectionStateData The latest connection state, or None if not yet emitted.
+		"""
+		if name in self.connStateDataCache:
+			return self.connStateDataCache[name]
+		
+		return None
+	
 	def getLatestSensorDataFromCache(self, name: str = None) -> SensorData:
 		"""
 		Retrieves the named sensor data item from the internal data cache.
@@ -184,36 +384,17 @@ class DeviceDataManager(IDataMessageListener):
 		"""
 		Callback function to handle an actuator command message packaged as a ActuatorData object.
 		
+		If 'enableAsyncActuation' is set, the command is queued on the target
+		actuator and None is returned - the response will be delivered
+		to handleActuatorCommandResponse() once the actuator completes.
+		
 		@param data The ActuatorData message received.
-		@return bool True on success; False otherwise.
+		@return ActuatorData The actuator response, or None if queued or rejected.
 		"""
-		logging.info("Actuator data: " + str(data))
+		if data and self.eventJournal:
+			self.eventJournal.recordEvent(EventJournal.ACTUATOR_CMD_EVENT, self.dataUtil.actuatorDataToJson(data))
 		
-		if data:
-			logging.info( \
-				"\n\nvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvv" \
-				"\n\nProcessing actuator command message." \
-				"\n\tState: " + str(data.getStateData()) + \
-				"\n\tValue: " + str(data.getValue()) + \
-				"\n\n^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^\n\n")
-			
-			# we need to do two things:
-			# - notify our simulation engine (if it's running),
-			#   as this command may reset the simulation dataset
-			# - notify our actuator manager so it can handle
-			#   the actuation event
-			if self.sensorAdapterMgr:
-				self.sensorAdapterMgr.updateSimulationData(data = data)
-
-			if self.windTurbineMgr:
-				if (data.getTypeCategoryID() == ConfigConst.ENERGY_TYPE_CATEGORY):
-					self.windTurbineMgr.updateSimulationData(data = data)
-
-			return self.actuatorAdapterMgr.sendActuatorCommand(data = data)
-		else:
-			logging.warning("Incoming actuator command is invalid (null). Ignoring.")
-			
-			return None
+		return self._handleActuatorCommand(data)
 		
 	def handleActuatorCommandResponse(self, data: ActuatorData = None) -> bool:
 		"""
@@ -223,7 +404,7 @@ class DeviceDataManager(IDataMessageListener):
 		@return bool True on success; False otherwise.
 		"""
 		if data:
-			logging.debug("Incoming actuator response received (from actuator manager): " + str(data))
+			logging.debug("Incoming actuator response received (from actuator manager): %s", data)
 			
 			# store the data in the cache
 			self.actuatorResponseCache[data.getName()] = data
@@ -233,9 +414,12 @@ class DeviceDataManager(IDataMessageListener):
 				self.tsdbClient.storeActuatorData(data = data)
 			
 			# convert ActuatorData to JSON and get the msg resource
-			actuatorMsg = DataUtil().actuatorDataToJson(data)
+			actuatorMsg = self.dataUtil.actuatorDataToJson(data)
 			resourceName = ResourceNameEnum.CDA_ACTUATOR_RESPONSE_RESOURCE
 			
+			if self.eventJournal:
+				self.eventJournal.recordEvent(EventJournal.ACTUATOR_RESPONSE_EVENT, actuatorMsg)
+			
 			# delegate to the transmit function any potential upstream comm's
 			self._handleUpstreamTransmission(resource = resourceName, msg = actuatorMsg)
 			
@@ -245,6 +429,53 @@ class DeviceDataManager(IDataMessageListener):
 			
 			return False
 	
+	def handleConfigUpdate(self, configSnapshot: ConfigSnapshot = None) -> bool:
+		"""
+		Callback function to handle a config file reload. Updates the
+		HVAC trigger thresholds.
+		
+		@param configSnapshot The new ConfigSnapshot.
+		@return bool True on success; False otherwise.
+		"""
+		if configSnapshot:
+			self._loadTriggerThresholds(configSnapshot)
+			
+			logging.info( \
+				"Updated HVAC trigger thresholds. Enabled: %s, floor: %s, ceiling: %s", \
+				str(self.handleTempChangeOnDevice), str(self.triggerHvacTempFloor), str(self.triggerHvacTempCeiling))
+			
+			return True
+		
+		return False
+	
+	def handleConnectionStateTelemetry(self):
+		"""
+		Creates the connection state for each enabled client, and publishes
+		it and stores it in the TSDB. Called at the 'connStatePollSecs' rate.
+		
+		"""
+		for client in (self.mqttClient, self.tsdbClient):
+			if not client:
+				continue
+			
+			data = client.getConnectionState()
+			data.setDeviceID(self.deviceID)
+			data.setLocationID(self.locationID)
+			
+			self.connStateDataCache[data.getName()] = data
+			
+			logging.debug("Connection state: %s", data)
+			
+			# publish first, so the TSDB state is still sent when the TSDB is unreachable
+			jsonData = self.dataUtil.connectionStateDataToJson(data = data)
+			self._handleUpstreamTransmission(resource = ResourceNameEnum.CDA_CONN_STATE_MSG_RESOURCE, msg = jsonData)
+			
+			if self.tsdbClient:
+				try:
+					self.tsdbClient.storeConnectionStateData(data = data)
+				except Exception as e:
+					logging.warning("Failed to store connection state %s: %s", data.getName(), str(e))
+	
 	def handleIncomingMessage(self, resource = None, msg: str = None) -> bool:
 		"""
 		Callback function to handle incoming messages on a given topic with
@@ -255,10 +486,13 @@ class DeviceDataManager(IDataMessageListener):
 		@return bool True on success; False otherwise.
 		"""
 		if resource and msg:
-			logging.info("Incoming msg received. Topic: %s  Payload: %s", str(resource), msg)
+			logging.info("Incoming msg received. Topic: %s  Payload: %s", resource, msg)
+			
+			if self.eventJournal:
+				self.eventJournal.recordIncomingMessage(resource = resource, msg = msg)
 			
 			# delegate the internal analysis / action of the message
-			self._handleIncomingDataAnalysis(msg)
+			self._handleIncomingDataAnalysis(resource = resource, msg = msg)
 			
 			return True
 		else:
@@ -270,22 +504,26 @@ class DeviceDataManager(IDataMessageListener):
 		"""
 		Callback function to handle a sensor message packaged as a SensorData object.
 		
+		If the sensor data filter is enabled, storage and upstream transmission
+		only happen when the filter allows them (local analysis always happens).
+		
+		Local analysis - which may trigger an actuation event - is only done
+		for data from this device's location ID (or without a location ID).
+		
 		@param data The SensorData message received.
 		@return bool True on success; False otherwise.
 		"""
 		
 		if data:
-			logging.info("Incoming sensor data received (from sensor manager): " + str(data))
+			logging.info("Incoming sensor data received (from sensor manager): %s", data)
 			
-			# store the data in the TSDB (if enabled)
-			if (self.tsdbClient):
-				self.tsdbClient.storeSensorData(data = data)
+			self._handleSensorData(data)
 			
 			# handle any local data analysis (this may trigger an actuation event)
-			self._handleSensorDataAnalysis(data)
-			
-			jsonData = DataUtil().sensorDataToJson(data = data)
-			self._handleUpstreamTransmission(resource = ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE, msg = jsonData)
+			if not data.getLocationID() or data.getLocationID() == self.locationID:
+				self._handleSensorDataAnalysis(data)
+			else:
+				logging.debug("Sensor data is from location ID %s. Skipping local analysis.", data.getLocationID())
 			
 			return True
 		else:
@@ -293,6 +531,63 @@ class DeviceDataManager(IDataMessageListener):
 			
 			return False
 		
+	def handleSensorMessageBatch(self, dataList: list = None) -> bool:
+		"""
+		Callback function to handle a batch of sensor messages, each packaged
+		as a SensorData object - e.g. a tick of SensorFleetSimulator. Each
+		message is journaled, filtered, stored, rolled up and transmitted as
+		in handleSensorMessage(), but as the batch represents other devices,
+		there's no local analysis (and so no actuation), and no per message
+		logging.
+		
+		@param dataList The list of SensorData messages received.
+		@return bool True if all messages were handled successfully; False otherwise.
+		"""
+		if dataList:
+			logging.debug("Incoming sensor data batch received. Count: %s", len(dataList))
+			
+			success = True
+			
+			for data in dataList:
+				if data:
+					self._handleSensorData(data)
+				else:
+					success = False
+			
+			return success
+		else:
+			logging.warning("Incoming sensor data batch is invalid (null or empty). Ignoring.")
+			
+			return False
+	
+	def handleSensorRollupMessage(self, resource: ResourceNameEnum = None, dataList: list = None) -> bool:
+		"""
+		Callback function to handle the rollups for a closed aggregation window,
+		each packaged as a SensorData object. Each rollup is stored in the
+		window's bucket (if the TSDB is enabled) and published to the
+		window's resource.
+		
+		@param resource The rollup window's resource.
+		@param dataList The list of rollup SensorData messages.
+		@return bool True on success; False otherwise.
+		"""
+		if resource and dataList:
+			logging.debug("Incoming sensor rollup received (from rollup manager): %s", resource)
+			
+			for data in dataList:
+				# store the data in the TSDB (if enabled)
+				if (self.tsdbClient):
+					self.tsdbClient.storeSensorData(resource = self.rollupResourceContainers.get(resource), data = data)
+				
+				jsonData = self.dataUtil.sensorDataToJson(data = data)
+				self._handleUpstreamTransmission(resource = resource, msg = jsonData)
+			
+			return True
+		else:
+			logging.warning("Incoming sensor rollup is invalid (null or empty). Ignoring.")
+			
+			return False
+		
 	def handleSystemPerformanceMessage(self, data: SystemPerformanceData = None) -> bool:
 		"""
 		Callback function to handle a system performance message packaged as
@@ -302,13 +597,19 @@ class DeviceDataManager(IDataMessageListener):
 		@return bool True on success; False otherwise.
 		"""
 		if data:
-			logging.info("Incoming system performance message received (from sys perf manager): " + str(data))
+			self.sysPerfMsgCounter.increment()
+			
+			logging.info("Incoming system performance message received (from sys perf manager): %s", data)
+			
+			jsonData = self.dataUtil.systemPerformanceDataToJson(data = data)
+			
+			if self.eventJournal:
+				self.eventJournal.recordEvent(EventJournal.SYS_PERF_DATA_EVENT, jsonData)
 			
 			# store the data in the TSDB (if enabled)
 			if (self.tsdbClient):
 				self.tsdbClient.storeSystemPerformanceData(data = data)
 			
-			jsonData = DataUtil().systemPerformanceDataToJson(data = data)
 			self._handleUpstreamTransmission(resource = ResourceNameEnum.CDA_SYSTEM_PERF_MSG_RESOURCE, msg = jsonData)
 			
 			return True
@@ -317,6 +618,19 @@ class DeviceDataManager(IDataMessageListener):
 		
 			return False
 	
+	def setSamplingProfiler(self, profiler = None):
+		"""
+		Sets the sampling profiler controlled by management commands,
+		and publishes the name of each profile it writes to the
+		CDA_MGMT_STATUS_MSG_RESOURCE.
+		
+		@param profiler The SamplingProfiler instance.
+		"""
+		self.samplingProfiler = profiler
+		
+		if self.samplingProfiler:
+			self.samplingProfiler.setCompletionListener(self._handleProfileComplete)
+	
 	def startManager(self):
 		"""
 		Starts the manager - this will invoke the start methods on
@@ -325,21 +639,71 @@ class DeviceDataManager(IDataMessageListener):
 		"""
 		logging.info("Starting DeviceDataManager...")
 		
+		# opened first, so the managers' first messages are recorded
+		if self.enableEventJournal and not self.eventJournal:
+			eventJournal = \
+				EventJournal( \
+					journalPath = self.configUtil.getProperty( \
+						section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.EVENT_JOURNAL_PATH_KEY), \
+					maxSegmentBytes = self.configUtil.getInteger( \
+						section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.EVENT_JOURNAL_SEGMENT_BYTES_KEY, \
+						defaultVal = EventJournal.DEFAULT_MAX_SEGMENT_BYTES), \
+					maxSegmentCount = self.configUtil.getInteger( \
+						section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.EVENT_JOURNAL_SEGMENT_COUNT_KEY, \
+						defaultVal = EventJournal.DEFAULT_MAX_SEGMENT_COUNT))
+			
+			if eventJournal.open():
+				self.eventJournal = eventJournal
+		
+		# create everything that's enabled before starting anything, as
+		# the managers may generate messages as soon as they're started
+		for name in self.componentRegistry.keys():
+			if name != self.ACTUATOR_ADAPTER_MGR:
+				self.getComponent(name)
+		
 		if self.mqttClient:
+			startTime = perf_counter()
 			self.mqttClient.connectClient()
+			self._addStartupTimelineEntry(self.MQTT_CLIENT, self.START_PHASE, startTime)
 		
 		if self.windTurbineMgr:
+			startTime = perf_counter()
 			self.windTurbineMgr.startManager()
+			self._addStartupTimelineEntry(self.WIND_TURBINE_MGR, self.START_PHASE, startTime)
 
 		if self.sysPerfMgr:
+			startTime = perf_counter()
 			self.sysPerfMgr.startManager()
+			self._addStartupTimelineEntry(self.SYS_PERF_MGR, self.START_PHASE, startTime)
 		
 		if self.sensorAdapterMgr:
+			startTime = perf_counter()
 			self.sensorAdapterMgr.startManager()
+			self._addStartupTimelineEntry(self.SENSOR_ADAPTER_MGR, self.START_PHASE, startTime)
+		
+		if self.rollupMgr:
+			startTime = perf_counter()
+			self.rollupMgr.startManager()
+			self._addStartupTimelineEntry(self.ROLLUP_MGR, self.START_PHASE, startTime)
 
 		if self.tsdbClient:
+			startTime = perf_counter()
 			self.tsdbClient.connectClient()
+			self._addStartupTimelineEntry(self.TSDB_CLIENT, self.START_PHASE, startTime)
 			
+		self.configUtil.addConfigUpdateListener(self)
+		
+		if self.configWatchPollSecs > 0.0:
+			self.configUtil.startConfigWatcher(pollSecs = self.configWatchPollSecs)
+		
+		if self.connStatePollSecs > 0.0 and (self.mqttClient or self.tsdbClient):
+			self.connStateScheduler = BackgroundScheduler()
+			self.connStateJob = self.connStateScheduler.add_job( \
+				self.handleConnectionStateTelemetry, 'interval', seconds = self.connStatePollSecs, \
+				max_instances = 1, coalesce = True)
+			self.connStateScheduler.start()
+			
+		logging.info(self.getStartupTimelineReport())
 		logging.info("Started DeviceDataManager.")
 		
 	def stopManager(self):
@@ -350,6 +714,14 @@ class DeviceDataManager(IDataMessageListener):
 		"""
 		logging.info("Stopping DeviceDataManager...")
 		
+		self.configUtil.removeConfigUpdateListener(self)
+		self.configUtil.stopConfigWatcher()
+		
+		if self.connStateScheduler:
+			self.connStateScheduler.shutdown()
+			self.connStateScheduler = None
+			self.connStateJob = None
+		
 		if self.windTurbineMgr:
 			self.windTurbineMgr.stopManager()
 
@@ -358,6 +730,13 @@ class DeviceDataManager(IDataMessageListener):
 		
 		if self.sensorAdapterMgr:	
 			self.sensorAdapterMgr.stopManager()
+		
+		# this sends the rollups for all open windows
+		if self.rollupMgr:
+			self.rollupMgr.stopManager()
+		
+		if self.actuatorAdapterMgr:
+			self.actuatorAdapterMgr.stopManager()
 			
 		if self.mqttClient:
 			self.mqttClient.unsubscribeFromTopic(ResourceNameEnum.CDA_ACTUATOR_CMD_RESOURCE)
@@ -365,9 +744,23 @@ class DeviceDataManager(IDataMessageListener):
 				
 		if self.tsdbClient:
 			self.tsdbClient.disconnectClient()
+		
+		if self.eventJournal:
+			self.eventJournal.close()
+			self.eventJournal = None
 			
 		logging.info("Stopped DeviceDataManager.")
 		
+	def _addStartupTimelineEntry(self, name: str, phase: str, startTime: float):
+		"""
+		Records the time elapsed since 'startTime' for the named component and phase.
+		
+		@param name The component name.
+		@param phase The phase (IMPORT_PHASE, CREATE_PHASE or START_PHASE).
+		@param startTime The perf_counter() value at the start of the phase.
+		"""
+		self.startupTimeline.append((name, phase, (perf_counter() - startTime) * 1000.0))
+		
 	def _handleIncomingDataAnalysis(self, resource = None, msg: str = None):
 		"""
 		Check the incoming msg data against known JSON schema's and see
@@ -381,21 +774,192 @@ class DeviceDataManager(IDataMessageListener):
 		sent to the actuator manager for processing; on failure,
 		a warning message will be logged.
 		
+		Management commands (received on CDA_MGMT_STATUS_CMD_RESOURCE)
+		are handled locally instead - see _handleMgmtCommand().
+		
+		@param resource The resource the message was received on.
 		@param msg The JSON data (presumably) that represents an
 		ActuatorData formatted object (presumably).
 		"""
 		try:
-			ad = DataUtil().jsonToActuatorData(msg)
+			ad = self.dataUtil.jsonToActuatorData(msg)
 			
-			if ad:
-				logging.info("Sending actuator command to actuator manager: ", msg)
+			if ad and resource == ResourceNameEnum.CDA_MGMT_STATUS_CMD_RESOURCE:
+				self._handleMgmtCommand(ad)
+			elif ad:
+				logging.info("Sending actuator command to actuator manager: %s", msg)
 				
-				self.actuatorAdapterMgr.sendActuatorCommand(ad)
+				self._sendActuatorCommand(ad)
 			else:
-				logging.warning("Conversion of message to ActuatorData resulted in null ref: ", msg)
+				logging.warning("Conversion of message to ActuatorData resulted in null ref: %s", msg)
 		except:
-			logging.warning("Failed to convert message to ActuatorData: ", msg)
+			logging.warning("Failed to convert message to ActuatorData: %s", msg)
+		
+	def _handleActuatorCommand(self, data: ActuatorData = None) -> ActuatorData:
+		"""
+		Handles an actuator command - whether received via handleActuatorCommandMessage()
+		or created by the local sensor data analysis.
+		
+		@param data The ActuatorData command.
+		@return ActuatorData The actuator response, or None if queued or rejected.
+		"""
+		logging.info("Actuator data: %s", data)
+		
+		if data:
+			self.actuatorCmdCounter.increment()
+			
+			logging.info( \
+				"\n\nvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvvv" \
+				"\n\nProcessing actuator command message." \
+				"\n\tState: %s" \
+				"\n\tValue: %s" \
+				"\n\n^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^\n\n", \
+				data.getStateData(), data.getValue())
+			
+			# we need to do two things:
+			# - notify our simulation engine (if it's running),
+			#   as this command may reset the simulation dataset
+			# - notify our actuator manager so it can handle
+			#   the actuation event
+			if self.sensorAdapterMgr:
+				self.sensorAdapterMgr.updateSimulationData(data = data)
+
+			if self.windTurbineMgr:
+				if (data.getTypeCategoryID() == ConfigConst.ENERGY_TYPE_CATEGORY):
+					self.windTurbineMgr.updateSimulationData(data = data)
+
+			return self._sendActuatorCommand(data)
+		else:
+			logging.warning("Incoming actuator command is invalid (null). Ignoring.")
+			
+			return None
+		
+	def _sendActuatorCommand(self, data: ActuatorData = None) -> ActuatorData:
+		"""
+		Delegates the actuator command to the actuator manager, either
+		synchronously or via the actuator's command queue, depending
+		on the 'enableAsyncActuation' flag.
 		
+		@param data The ActuatorData command.
+		@return ActuatorData The actuator response if synchronous; None otherwise.
+		"""
+		actuatorAdapterMgr = self.actuatorAdapterMgr or self.getComponent(self.ACTUATOR_ADAPTER_MGR)
+		
+		if not actuatorAdapterMgr:
+			logging.warning("Actuation is disabled. Ignoring actuator command: %s", data.getName())
+			
+			return None
+		
+		if self.eventJournal:
+			self.eventJournal.recordEvent(EventJournal.ACTUATION_EVENT, self.dataUtil.actuatorDataToJson(data))
+		
+		startNs = perf_counter_ns()
+		
+		if self.enableAsyncActuation:
+			actuatorAdapterMgr.sendActuatorCommandAsync(data = data)
+			self.actuatorDispatchHistogram.recordSince(startNs)
+			
+			return None
+		
+		responseData = actuatorAdapterMgr.sendActuatorCommand(data = data)
+		self.actuatorDispatchHistogram.recordSince(startNs)
+		
+		if responseData and self.eventJournal:
+			self.eventJournal.recordEvent(EventJournal.ACTUATOR_RESPONSE_EVENT, self.dataUtil.actuatorDataToJson(responseData))
+		
+		return responseData
+	
+	def _handleMgmtCommand(self, data: ActuatorData = None):
+		"""
+		Handles a management command. The only command currently supported
+		is SAMPLING_PROFILER_NAME: COMMAND_ON starts a profiling run, using
+		the command's value as the duration (limited to the profiler's
+		maximum duration), and COMMAND_OFF ends it. The result is published
+		as a response to CDA_MGMT_STATUS_MSG_RESOURCE.
+		
+		As every device subscribes to the management command topic, the
+		command is only accepted if its location ID matches this device's.
+		
+		@param data The ActuatorData management command.
+		"""
+		if data.getLocationID() != self.locationID:
+			logging.info( \
+				"Management command location ID doesn't match local. Ignoring: %s != %s", \
+				str(self.locationID), str(data.getLocationID()))
+			
+			return
+		
+		if data.getName() != ConfigConst.SAMPLING_PROFILER_NAME:
+			logging.warning("Unsupported management command. Ignoring: %s", data.getName())
+			
+			return
+		
+		if not self.samplingProfiler:
+			logging.warning("Sampling profiler isn't available. Ignoring management command.")
+			
+			return
+		
+		if data.getCommand() == ConfigConst.COMMAND_ON:
+			success = self.samplingProfiler.startProfiling(durationSecs = data.getValue())
+			stateData = 'Profiling started.' if success else 'Profiling is already running.'
+		elif data.getCommand() == ConfigConst.COMMAND_OFF:
+			success = self.samplingProfiler.isRunning()
+			stateData = 'Profiling stopping.' if success else 'Profiling isn\'t running.'
+			
+			# the output is written (and published) by the profiler thread
+			self.samplingProfiler.stopProfiling(wait = False)
+		else:
+			logging.warning("Unsupported sampling profiler command. Ignoring: %s", data.getCommand())
+			
+			return
+		
+		self._publishProfilerStatus(command = data.getCommand(), success = success, stateData = stateData)
+	
+	def _handleProfileComplete(self, outputFile: str = None):
+		"""
+		Callback invoked by the sampling profiler when a profiling run ends.
+		
+		@param outputFile The collapsed stack file name, or None if it couldn't be written.
+		"""
+		self._publishProfilerStatus( \
+			command = ConfigConst.COMMAND_OFF, success = outputFile is not None, \
+			stateData = 'Profile written: ' + str(outputFile))
+	
+	def _handleSensorData(self, data: SensorData):
+		"""
+		Journals, filters, stores, rolls up and transmits 'data' (see
+		handleSensorMessage()). Doesn't do any local analysis.
+		
+		@param data The SensorData message received.
+		"""
+		self.sensorMsgCounter.increment()
+		
+		jsonData = None
+		
+		if self.eventJournal:
+			jsonData = self.dataUtil.sensorDataToJson(data = data)
+			self.eventJournal.recordEvent(EventJournal.SENSOR_DATA_EVENT, jsonData)
+		
+		if self.sensorDataFilter:
+			persistList, transmit = self.sensorDataFilter.filterSensorData(data)
+		else:
+			persistList, transmit = (data,), True
+		
+		# store the data in the TSDB (if enabled)
+		if (self.tsdbClient):
+			for persistData in persistList:
+				self.tsdbClient.storeSensorData(data = persistData)
+		
+		# rollups are computed from all data, not just what's been filtered
+		if self.rollupMgr:
+			self.rollupMgr.handleSensorData(data = data)
+		
+		if transmit:
+			if not jsonData:
+				jsonData = self.dataUtil.sensorDataToJson(data = data)
+			
+			self._handleUpstreamTransmission(resource = ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE, msg = jsonData)
+	
 	def _handleSensorDataAnalysis(self, data: SensorData = None):
 		"""
 		Check if the data requires any internal action (such as
@@ -416,7 +980,7 @@ class DeviceDataManager(IDataMessageListener):
 		
 		if self.handleTempChangeOnDevice and data.getTypeID() == ConfigConst.TEMP_SENSOR_TYPE:
 			logging.info("Handle temp change: %s - type ID: %s", \
-				str(self.handleTempChangeOnDevice), str(data.getTypeID()))
+				self.handleTempChangeOnDevice, data.getTypeID())
 			
 			ad = ActuatorData( \
 				name = ConfigConst.HVAC_ACTUATOR_NAME, \
@@ -441,7 +1005,7 @@ class DeviceDataManager(IDataMessageListener):
 			# of this exercise, the logic for filtering commands is
 			# left to ActuatorAdapterManager and its associated actuator
 			# task implementations, and not this function
-			self.handleActuatorCommandMessage(ad)
+			self._handleActuatorCommand(ad)
 		else:
 			ad = ActuatorData( \
 				name = ConfigConst.LED_ACTUATOR_NAME, \
@@ -455,7 +1019,7 @@ class DeviceDataManager(IDataMessageListener):
 			ad.setCommand(ConfigConst.COMMAND_MSG_ONLY)
 			ad.setStateData(data.getName() + ': ' + str(data.getValue()))
 			
-			self.handleActuatorCommandMessage(ad)
+			self._handleActuatorCommand(ad)
 	
 	def _handleUpstreamTransmission(self, resource = None, msg: str = None):
 		"""
@@ -477,8 +1041,68 @@ class DeviceDataManager(IDataMessageListener):
 
 		# NOTE: If using MQTT, the following will attempt to publish the message to the broker
 		if self.mqttClient:
-			if self.mqttClient.publishMessage(resource = resource, msg = msg):
-				logging.debug("Published incoming data to resource (MQTT): %s", str(resource))
+			success = self.mqttClient.publishMessage(resource = resource, msg = msg)
+			
+			if self.eventJournal:
+				self.eventJournal.recordPublishResult(resource = resource, success = success, msgSize = len(msg) if msg else 0)
+			
+			if success:
+				logging.debug("Published incoming data to resource (MQTT): %s", resource)
 			else:
 				logging.warning("Failed to publish incoming data to resource (MQTT): %s", str(resource))
+	
+	def _loadTriggerThresholds(self, configSnapshot: ConfigSnapshot):
+		"""
+		Loads the HVAC trigger flag and thresholds from 'configSnapshot'.
+		
+		@param configSnapshot The ConfigSnapshot to read.
+		"""
+		self.handleTempChangeOnDevice = \
+			configSnapshot.getBoolean( \
+				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.HANDLE_TEMP_CHANGE_ON_DEVICE_KEY)
+			
+		self.triggerHvacTempFloor     = \
+			configSnapshot.getFloat( \
+				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.TRIGGER_HVAC_TEMP_FLOOR_KEY)
+				
+		self.triggerHvacTempCeiling   = \
+			configSnapshot.getFloat( \
+				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.TRIGGER_HVAC_TEMP_CEILING_KEY)
+		
+	def _publishProfilerStatus(self, command: int, success: bool, stateData: str):
+		"""
+		Publishes a sampling profiler response to CDA_MGMT_STATUS_MSG_RESOURCE.
+		
+		@param command The command the response is for.
+		@param success If False, the response's status code is set to an error.
+		@param stateData The status description.
+		"""
+		ad = ActuatorData( \
+			name = ConfigConst.SAMPLING_PROFILER_NAME, \
+			typeCategoryID = ConfigConst.SYSTEM_MGMT_TYPE_CATEGORY, \
+			typeID = ConfigConst.SAMPLING_PROFILER_TYPE)
+		
+		ad.setDeviceID(self.deviceID)
+		ad.setLocationID(self.locationID)
+		ad.setCommand(command)
+		ad.setStateData(stateData)
+		ad.setStatusCode(0 if success else -1)
+		ad.setAsResponse()
+		
+		self._handleUpstreamTransmission( \
+			resource = ResourceNameEnum.CDA_MGMT_STATUS_MSG_RESOURCE, msg = self.dataUtil.actuatorDataToJson(ad))
+	
+	def _registerComponent(self, name: str, moduleName: str, className: str, enabled: bool = False):
+		"""
+		Registers a component for on demand creation. The component is
+		stored as the attribute 'name' of this instance once created.
+		
+		@param name The component (and attribute) name.
+		@param moduleName The fully qualified name of the component's module.
+		@param className The name of the component's class within the module.
+		@param enabled If False, the component will never be created.
+		"""
+		self.componentRegistry[name] = (moduleName, className, enabled)
+		
+		logging.info("Registered component %s (%s). Enabled: %s", name, className, str(enabled))
 			
\ No newline at end of file
@@ -23,13 +23,18 @@
 #
 
 import logging
+import signal
+import threading
 
+from importlib import import_module
 from time import sleep
 
 import labbenchstudios.pdt.common.ConfigConst as ConfigConst
 
+from labbenchstudios.pdt.common.AsyncLoggingManager import AsyncLoggingManager
 from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
 from labbenchstudios.pdt.edge.app.DeviceDataManager import DeviceDataManager
+from labbenchstudios.pdt.edge.app.SamplingProfiler import SamplingProfiler
 
 logging.basicConfig(format = '%(asctime)s:%(name)s:%(levelname)s:%(message)s', level = logging.DEBUG)
 
@@ -45,9 +50,31 @@ class EdgeDeviceApp():
 		
 		@param path The name of the resource to apply to the URI.
 		"""
+		# set the log level, and move console output to a background thread
+		self.loggingMgr = AsyncLoggingManager()
+		self.loggingMgr.start()
+		
 		logging.info("Initializing EDA...")
 		
 		self.dataMgr = DeviceDataManager()
+		self.metricsServer = None
+		
+		# idle until started by SIGUSR1, a management command or the config
+		self.samplingProfiler = SamplingProfiler()
+		self.dataMgr.setSamplingProfiler(self.samplingProfiler)
+		
+		self.enableSamplingProfiler = \
+			ConfigUtil().getBoolean(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.ENABLE_SAMPLING_PROFILER_KEY)
+		
+		self._installProfilerSignalHandler()
+		
+		enableMetricsServer = \
+			ConfigUtil().getBoolean(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.ENABLE_METRICS_SERVER_KEY)
+		
+		if enableMetricsServer:
+			# only load the HTTP server modules if the endpoint is enabled
+			serverModule = import_module('labbenchstudios.pdt.edge.app.PrometheusMetricsServer')
+			self.metricsServer = serverModule.PrometheusMetricsServer()
 
 	def startApp(self):
 		"""
@@ -56,8 +83,15 @@ class EdgeDeviceApp():
 		"""
 		logging.info("Starting EDA...")
 		
+		if self.enableSamplingProfiler:
+			# profiles startup too - limited to the max duration
+			self.samplingProfiler.startProfiling()
+		
 		self.dataMgr.startManager()
 		
+		if self.metricsServer:
+			self.metricsServer.startServer()
+		
 		logging.info("EDA started.")
 
 	def stopApp(self, code: int):
@@ -67,10 +101,19 @@ class EdgeDeviceApp():
 		"""
 		logging.info("EDA stopping...")
 		
+		if self.metricsServer:
+			self.metricsServer.stopServer()
+		
+		# writes the profile of a run that's still in progress
+		self.samplingProfiler.stopProfiling()
+		
 		self.dataMgr.stopManager()
 		
 		logging.info("EDA stopped with exit code %s.", str(code))
 		
+		# flushes any queued log records
+		self.loggingMgr.stop()
+		
 	def parseArgs(self, args):
 		"""
 		Parse command line args.
@@ -78,6 +121,32 @@ class EdgeDeviceApp():
 		@param args The arguments to parse.
 		"""
 		logging.info("Parsing command line args...")
+	
+	def _handleProfilerSignal(self, signum, frame):
+		"""
+		SIGUSR1 handler. Starts a sampling profiler run if there isn't one
+		running; otherwise, ends the current run.
+		
+		@param signum The signal number.
+		@param frame The interrupted stack frame.
+		"""
+		self.samplingProfiler.toggleProfiling()
+	
+	def _installProfilerSignalHandler(self):
+		"""
+		Installs the SIGUSR1 handler used to toggle the sampling profiler
+		(e.g. 'kill -USR1 <pid>'). Signal handlers can only be installed
+		from the main thread, and SIGUSR1 isn't available on Windows.
+		
+		"""
+		if not hasattr(signal, 'SIGUSR1'):
+			logging.info("SIGUSR1 isn't supported. Sampling profiler signal handler not installed.")
+		elif threading.current_thread() is not threading.main_thread():
+			logging.info("Not running on the main thread. Sampling profiler signal handler not installed.")
+		else:
+			signal.signal(signal.SIGUSR1, self._handleProfilerSignal)
+			
+			logging.info("Sampling profiler signal handler installed. Toggle using SIGUSR1.")
 
 
 def main():
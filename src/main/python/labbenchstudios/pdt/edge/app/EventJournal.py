@@ -0,0 +1,503 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+import zlib
+
+from time import monotonic_ns
+
+class EventJournal():
+	"""
+	Append-only binary journal of the events handled by DeviceDataManager,
+	for post-mortem analysis and replay (see EventJournalReplayer).
+	
+	The journal is a directory of segment files. Each segment starts with
+	a header - the magic bytes, format version, and the wall clock and
+	monotonic times the segment was opened (so monotonic record times can
+	be mapped to wall clock time) - followed by length-prefixed records:
+	
+	  uint32 payload length
+	  uint32 CRC-32 of the event type, time and payload
+	  uint8  event type
+	  uint64 monotonic time (ns)
+	  bytes  payload
+	
+	Data payloads are the UTF-8 JSON created by DataUtil. All integers are
+	little endian.
+	
+	Segments are preallocated to 'maxSegmentBytes' and written via a memory
+	map, so appending a record is a memory copy - no write() call per
+	record. Written pages belong to the OS, so records survive a crash of
+	this process (but not of the host). A zero length marks the end of a
+	segment that wasn't closed; the reader also stops at the first record
+	that fails its CRC check (a torn write). When a segment is full it's
+	truncated to its used length and a new one is started; the oldest
+	segments are removed once there are more than 'maxSegmentCount'.
+	"""
+	
+	MAGIC   = b'PDTJ'
+	VERSION = 1
+	
+	# magic, version, reserved, wall clock ns, monotonic ns
+	SEGMENT_HEADER = struct.Struct('<4sHHQQ')
+	
+	# payload length, CRC-32, event type, monotonic ns
+	RECORD_HEADER  = struct.Struct('<IIBQ')
+	
+	# the CRC covers everything after the CRC field
+	RECORD_CRC_OFFSET = 8
+	
+	SEGMENT_FILE_PREFIX = 'pdt-journal-'
+	SEGMENT_FILE_SUFFIX = '.pdtj'
+	
+	DEFAULT_JOURNAL_PATH      = os.path.join(tempfile.gettempdir(), 'pdt-event-journal')
+	DEFAULT_MAX_SEGMENT_BYTES = 4 * 1024 * 1024
+	DEFAULT_MAX_SEGMENT_COUNT = 8
+	
+	MIN_SEGMENT_BYTES = 4096
+	
+	# inbound events - these are replayed
+	ACTUATOR_CMD_EVENT      = 1
+	INCOMING_MSG_EVENT      = 2
+	SENSOR_DATA_EVENT       = 3
+	SYS_PERF_DATA_EVENT     = 4
+	
+	# outcome events - these are recreated by a replay
+	ACTUATION_EVENT         = 10
+	ACTUATOR_RESPONSE_EVENT = 11
+	PUBLISH_RESULT_EVENT    = 12
+	
+	EVENT_NAMES = { \
+		ACTUATOR_CMD_EVENT: 'ActuatorCmd', \
+		INCOMING_MSG_EVENT: 'IncomingMsg', \
+		SENSOR_DATA_EVENT: 'SensorData', \
+		SYS_PERF_DATA_EVENT: 'SysPerfData', \
+		ACTUATION_EVENT: 'Actuation', \
+		ACTUATOR_RESPONSE_EVENT: 'ActuatorResponse', \
+		PUBLISH_RESULT_EVENT: 'PublishResult' }
+	
+	# name length, followed by the name and the remaining payload
+	NAME_HEADER = struct.Struct('<H')
+	
+	# success flag and msg length, following the resource name
+	PUBLISH_RESULT = struct.Struct('<?I')
+	
+	def __init__(self, \
+			journalPath: str = None, \
+			maxSegmentBytes: int = DEFAULT_MAX_SEGMENT_BYTES, \
+			maxSegmentCount: int = DEFAULT_MAX_SEGMENT_COUNT):
+		"""
+		Constructor. No files are created until open() is called.
+		
+		@param journalPath The directory to write the segment files to.
+		Defaults to DEFAULT_JOURNAL_PATH. Will be created if it doesn't exist.
+		@param maxSegmentBytes The size of each segment file.
+		@param maxSegmentCount The number of segment files to keep. 0 keeps all.
+		"""
+		self.journalPath     = journalPath if journalPath else self.DEFAULT_JOURNAL_PATH
+		self.maxSegmentBytes = max(maxSegmentBytes, self.MIN_SEGMENT_BYTES)
+		self.maxSegmentCount = max(maxSegmentCount, 0)
+		
+		self.journalLock = threading.Lock()
+		
+		self.segmentFile     = None
+		self.segmentFileName = None
+		self.segmentMap      = None
+		self.segmentPos      = 0
+		self.segmentSeq      = 0
+		
+		self.recordCount  = 0
+		self.droppedCount = 0
+	
+	def close(self):
+		"""
+		Closes the current segment, truncating it to its used length.
+		
+		"""
+		with self.journalLock:
+			self._closeSegment()
+	
+	def getDroppedCount(self) -> int:
+		"""
+		Returns the number of records that couldn't be written (too large
+		for a segment, or the journal wasn't open).
+		
+		@return int
+		"""
+		return self.droppedCount
+	
+	def getJournalPath(self) -> str:
+		"""
+		Returns the directory the segment files are written to.
+		
+		@return str
+		"""
+		return self.journalPath
+	
+	def getRecordCount(self) -> int:
+		"""
+		Returns the number of records written since this instance was created.
+		
+		@return int
+		"""
+		return self.recordCount
+	
+	def isOpen(self) -> bool:
+		"""
+		Checks if a segment is open for writing.
+		
+		@return bool
+		"""
+		return self.segmentMap is not None
+	
+	def open(self) -> bool:
+		"""
+		Creates the journal directory (if needed) and opens a new segment.
+		Existing segments are kept, and new segments are numbered after them.
+		
+		@return bool True on success; False otherwise.
+		"""
+		with self.journalLock:
+			if self.segmentMap:
+				return True
+			
+			try:
+				os.makedirs(self.journalPath, exist_ok = True)
+				
+				segmentFileNames = self.getSegmentFileNames(self.journalPath)
+				
+				if segmentFileNames:
+					self.segmentSeq = self._getSegmentSeq(segmentFileNames[-1])
+				
+				self._openSegment()
+				
+				logging.info("Opened event journal: %s", self.segmentFileName)
+				
+				return True
+			except OSError as e:
+				logging.warning("Failed to open event journal in %s: %s", self.journalPath, str(e))
+				
+				self._closeSegment()
+		
+		return False
+	
+	def recordEvent(self, eventType: int, payload = b'') -> bool:
+		"""
+		Appends a record to the journal, time stamped with the monotonic clock.
+		
+		@param eventType The event type (one of the *_EVENT values).
+		@param payload The payload, as bytes or str (which is UTF-8 encoded).
+		@return bool True if written; False otherwise.
+		"""
+		if isinstance(payload, str):
+			payload = payload.encode('utf-8')
+		
+		headerSize = self.RECORD_HEADER.size
+		recordSize = headerSize + len(payload)
+		
+		if recordSize > self.maxSegmentBytes - self.SEGMENT_HEADER.size:
+			logging.warning("Event journal record too large (%s bytes). Dropping.", recordSize)
+			
+			self.droppedCount += 1
+			
+			return False
+		
+		timestampNs = monotonic_ns()
+		
+		with self.journalLock:
+			if not self.segmentMap:
+				self.droppedCount += 1
+				
+				return False
+			
+			try:
+				if self.segmentPos + recordSize > self.maxSegmentBytes:
+					self._closeSegment()
+					self._openSegment()
+				
+				pos = self.segmentPos
+				
+				# write the payload before the header, so the length isn't
+				# visible to a reader (e.g. after a crash) until it's complete
+				self.segmentMap[pos + headerSize:pos + recordSize] = payload
+				
+				header = self.RECORD_HEADER.pack(len(payload), 0, eventType, timestampNs)
+				crc = zlib.crc32(payload, zlib.crc32(header[self.RECORD_CRC_OFFSET:]))
+				
+				self.segmentMap[pos:pos + headerSize] = \
+					self.RECORD_HEADER.pack(len(payload), crc, eventType, timestampNs)
+				
+				self.segmentPos  += recordSize
+				self.recordCount += 1
+				
+				return True
+			except (OSError, ValueError) as e:
+				logging.warning("Failed to write event journal record: %s", str(e))
+				
+				self.droppedCount += 1
+				self._closeSegment()
+		
+		return False
+	
+	def recordIncomingMessage(self, resource = None, msg: str = None) -> bool:
+		"""
+		Appends an INCOMING_MSG_EVENT record for 'msg' received on 'resource'.
+		
+		@param resource The ResourceNameEnum (or str) the message was received on.
+		@param msg The message.
+		@return bool True if written; False otherwise.
+		"""
+		return self.recordEvent( \
+			self.INCOMING_MSG_EVENT, self.encodeNamedPayload(self._getResourceName(resource), msg))
+	
+	def recordPublishResult(self, resource = None, success: bool = False, msgSize: int = 0) -> bool:
+		"""
+		Appends a PUBLISH_RESULT_EVENT record.
+		
+		@param resource The ResourceNameEnum (or str) the message was published to.
+		@param success True if the publish succeeded (or was queued).
+		@param msgSize The size of the published message.
+		@return bool True if written; False otherwise.
+		"""
+		return self.recordEvent( \
+			self.PUBLISH_RESULT_EVENT, \
+			self.encodeNamedPayload(self._getResourceName(resource), self.PUBLISH_RESULT.pack(success, msgSize)))
+	
+	@classmethod
+	def decodeNamedPayload(cls, payload: bytes) -> tuple:
+		"""
+		Splits a payload created by encodeNamedPayload().
+		
+		@param payload The payload.
+		@return tuple The (name, remaining payload bytes).
+		"""
+		nameEnd = cls.NAME_HEADER.size + cls.NAME_HEADER.unpack_from(payload)[0]
+		
+		return (payload[cls.NAME_HEADER.size:nameEnd].decode('utf-8'), payload[nameEnd:])
+	
+	@classmethod
+	def decodePublishResult(cls, payload: bytes) -> tuple:
+		"""
+		Decodes a PUBLISH_RESULT_EVENT payload.
+		
+		@param payload The payload.
+		@return tuple The (resource name, success flag, msg size).
+		"""
+		name, data = cls.decodeNamedPayload(payload)
+		success, msgSize = cls.PUBLISH_RESULT.unpack(data)
+		
+		return (name, success, msgSize)
+	
+	@classmethod
+	def encodeNamedPayload(cls, name: str, data = b'') -> bytes:
+		"""
+		Creates a payload containing 'name' followed by 'data'.
+		
+		@param name The name (e.g. a resource name).
+		@param data The remaining payload, as bytes or str (which is UTF-8 encoded).
+		@return bytes
+		"""
+		nameBytes = name.encode('utf-8') if name else b''
+		
+		if isinstance(data, str):
+			data = data.encode('utf-8')
+		elif data is None:
+			data = b''
+		
+		return cls.NAME_HEADER.pack(len(nameBytes)) + nameBytes + data
+	
+	@classmethod
+	def getEventName(cls, eventType: int) -> str:
+		"""
+		Returns the display name of 'eventType'.
+		
+		@param eventType The event type.
+		@return str
+		"""
+		return cls.EVENT_NAMES.get(eventType, 'Unknown(' + str(eventType) + ')')
+	
+	@classmethod
+	def getSegmentFileNames(cls, journalPath: str) -> list:
+		"""
+		Returns the segment files in 'journalPath', oldest first.
+		
+		@param journalPath The journal directory.
+		@return list The fully qualified segment file names.
+		"""
+		if not os.path.isdir(journalPath):
+			return []
+		
+		fileNames = [ \
+			fileName for fileName in os.listdir(journalPath) \
+				if fileName.startswith(cls.SEGMENT_FILE_PREFIX) and fileName.endswith(cls.SEGMENT_FILE_SUFFIX)]
+		
+		return [os.path.join(journalPath, fileName) for fileName in sorted(fileNames, key = cls._getSegmentSeq)]
+	
+	@classmethod
+	def readEvents(cls, path: str):
+		"""
+		Generator that yields each record from a segment file, or from all
+		segment files (oldest first) if 'path' is a directory.
+		
+		Each segment is read via a read-only memory map, and reading stops
+		at the end of its records, or at the first record that fails its
+		CRC check.
+		
+		@param path The segment file or journal directory.
+		@return Yields (eventType, monotonic ns, payload bytes) tuples.
+		"""
+		fileNames = cls.getSegmentFileNames(path) if os.path.isdir(path) else [path]
+		
+		for fileName in fileNames:
+			yield from cls._readSegment(fileName)
+	
+	def _closeSegment(self):
+		"""
+		Closes the current segment (if open). Must be called with the lock held.
+		
+		"""
+		if self.segmentMap:
+			try:
+				self.segmentMap.flush()
+				self.segmentMap.close()
+			except (OSError, ValueError) as e:
+				logging.warning("Failed to flush event journal segment %s: %s", self.segmentFileName, str(e))
+			
+		if self.segmentFile:
+			try:
+				self.segmentFile.truncate(self.segmentPos)
+				self.segmentFile.close()
+			except OSError as e:
+				logging.warning("Failed to close event journal segment %s: %s", self.segmentFileName, str(e))
+		
+		self.segmentMap  = None
+		self.segmentFile = None
+		self.segmentPos  = 0
+	
+	def _openSegment(self):
+		"""
+		Creates, preallocates and maps the next segment, and removes the
+		oldest segments if there are too many. Must be called with the lock held.
+		
+		"""
+		self.segmentSeq += 1
+		self.segmentFileName = \
+			os.path.join(self.journalPath, '%s%08d%s' % (self.SEGMENT_FILE_PREFIX, self.segmentSeq, self.SEGMENT_FILE_SUFFIX))
+		
+		self.segmentFile = open(self.segmentFileName, 'w+b')
+		self.segmentFile.truncate(self.maxSegmentBytes)
+		
+		self.segmentMap = mmap.mmap(self.segmentFile.fileno(), self.maxSegmentBytes)
+		self.segmentMap[0:self.SEGMENT_HEADER.size] = \
+			self.SEGMENT_HEADER.pack(self.MAGIC, self.VERSION, 0, time.time_ns(), monotonic_ns())
+		
+		self.segmentPos = self.SEGMENT_HEADER.size
+		
+		if self.maxSegmentCount > 0:
+			segmentFileNames = self.getSegmentFileNames(self.journalPath)
+			
+			for fileName in segmentFileNames[:-self.maxSegmentCount]:
+				try:
+					os.remove(fileName)
+				except OSError as e:
+					logging.warning("Failed to remove event journal segment %s: %s", fileName, str(e))
+	
+	@classmethod
+	def _getResourceName(cls, resource) -> str:
+		"""
+		Returns the name of 'resource' (the enum name for a ResourceNameEnum).
+		
+		@param resource The ResourceNameEnum (or str).
+		@return str
+		"""
+		if resource is None:
+			return ''
+		
+		return getattr(resource, 'name', str(resource))
+	
+	@classmethod
+	def _getSegmentSeq(cls, fileName: str) -> int:
+		"""
+		Returns the sequence number from a segment file name.
+		
+		@param fileName The segment file name (with or without the path).
+		@return int The sequence number, or 0 if it has none.
+		"""
+		match = re.search(r'(\d+)' + re.escape(cls.SEGMENT_FILE_SUFFIX) + '$', os.path.basename(fileName))
+		
+		return int(match.group(1)) if match else 0
+	
+	@classmethod
+	def _readSegment(cls, fileName: str):
+		"""
+		Generator that yields each valid record from a single segment file.
+		
+		@param fileName The segment file name.
+		@return Yields (eventType, monotonic ns, payload bytes) tuples.
+		"""
+		try:
+			with open(fileName, 'rb') as segmentFile:
+				fileSize = os.fstat(segmentFile.fileno()).st_size
+				
+				if fileSize < cls.SEGMENT_HEADER.size:
+					logging.warning("Event journal segment is too small: %s", fileName)
+					return
+				
+				with mmap.mmap(segmentFile.fileno(), 0, access = mmap.ACCESS_READ) as segmentMap:
+					magic, version, reserved, wallNs, monoNs = cls.SEGMENT_HEADER.unpack_from(segmentMap)
+					
+					if magic != cls.MAGIC or version != cls.VERSION:
+						logging.warning("Not a version %s event journal segment: %s", cls.VERSION, fileName)
+						return
+					
+					pos = cls.SEGMENT_HEADER.size
+					headerSize = cls.RECORD_HEADER.size
+					
+					while pos + headerSize <= fileSize:
+						length, crc, eventType, timestampNs = cls.RECORD_HEADER.unpack_from(segmentMap, pos)
+						
+						# a zero header is the unused space of an open (or crashed) segment
+						if length == 0 and crc == 0:
+							return
+						
+						end = pos + headerSize + length
+						
+						if end > fileSize or \
+							zlib.crc32(segmentMap[pos + headerSize:end], \
+								zlib.crc32(segmentMap[pos + cls.RECORD_CRC_OFFSET:pos + headerSize])) != crc:
+							logging.warning("Invalid event journal record at offset %s. Skipping rest of segment: %s", pos, fileName)
+							return
+						
+						yield (eventType, timestampNs, segmentMap[pos + headerSize:end])
+						
+						pos = end
+		except OSError as e:
+			logging.warning("Failed to read event journal segment %s: %s", fileName, str(e))
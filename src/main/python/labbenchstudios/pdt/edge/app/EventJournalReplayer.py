@@ -0,0 +1,291 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import sys
+import threading
+
+from time import perf_counter_ns, monotonic
+
+from labbenchstudios.pdt.common.IDataMessageListener import IDataMessageListener
+from labbenchstudios.pdt.common.ResourceNameEnum import ResourceNameEnum
+
+from labbenchstudios.pdt.data.DataUtil import DataUtil
+
+from labbenchstudios.pdt.edge.app.EventJournal import EventJournal
+
+class EventJournalReplayer(object):
+	"""
+	Feeds the inbound events recorded by EventJournal (actuator commands,
+	incoming messages, sensor and system performance data) back through a
+	data message listener - typically a DeviceDataManager - so an incident
+	can be reproduced and profiled offline.
+	
+	The recorded gaps between events are divided by the speedup, and any
+	gap is capped at 'maxGapSecs' (so idle periods, and the jump between
+	segments written by different runs, don't stall the replay). Use a
+	speedup of 0 to replay as fast as possible.
+	
+	Outcome events (actuations, actuator responses, publish results) are
+	not replayed - they're recreated by the listener - but they're counted,
+	so the recorded and replayed outcomes can be compared.
+	
+	Run this module directly to replay a journal through a DeviceDataManager
+	that hasn't been started (so nothing is sent upstream or stored).
+	"""
+	
+	AS_FAST_AS_POSSIBLE = 0.0
+	DEFAULT_SPEEDUP     = 10.0
+	DEFAULT_MAX_GAP_SECS = 1.0
+	
+	def __init__(self, \
+			listener: IDataMessageListener = None, \
+			speedup: float = DEFAULT_SPEEDUP, \
+			maxGapSecs: float = DEFAULT_MAX_GAP_SECS):
+		"""
+		Constructor.
+		
+		@param listener The data message listener to replay the events to.
+		@param speedup The replay speed multiplier. 0 (or less) replays as fast as possible.
+		@param maxGapSecs The maximum wait between two events (after the speedup).
+		"""
+		self.listener   = listener
+		self.speedup    = speedup if speedup > 0.0 else self.AS_FAST_AS_POSSIBLE
+		self.maxGapSecs = max(maxGapSecs, 0.0)
+		
+		self.dataUtil  = DataUtil()
+		self.stopEvent = threading.Event()
+		
+		self.eventCounts  = {}
+		self.replayCounts = {}
+		self.handleTimeNs = {}
+		self.failedCount  = 0
+		
+		self.replayHandlers = { \
+			EventJournal.ACTUATOR_CMD_EVENT: self._replayActuatorCommand, \
+			EventJournal.INCOMING_MSG_EVENT: self._replayIncomingMessage, \
+			EventJournal.SENSOR_DATA_EVENT: self._replaySensorData, \
+			EventJournal.SYS_PERF_DATA_EVENT: self._replaySystemPerformanceData }
+	
+	def getEventCounts(self) -> dict:
+		"""
+		Returns the number of events read from the journal, by event type.
+		
+		@return dict
+		"""
+		return self.eventCounts
+	
+	def getFailedCount(self) -> int:
+		"""
+		Returns the number of events that couldn't be decoded or that the
+		listener failed to handle.
+		
+		@return int
+		"""
+		return self.failedCount
+	
+	def getHandleTimeNs(self) -> dict:
+		"""
+		Returns the total time spent in the listener, by event type.
+		
+		@return dict
+		"""
+		return self.handleTimeNs
+	
+	def getReplayCounts(self) -> dict:
+		"""
+		Returns the number of events replayed to the listener, by event type.
+		
+		@return dict
+		"""
+		return self.replayCounts
+	
+	def replay(self, path: str, maxEvents: int = 0) -> int:
+		"""
+		Replays the journal at 'path'. This blocks the calling thread until
+		the journal has been replayed, 'maxEvents' have been replayed, or
+		stopReplay() is called.
+		
+		@param path A segment file, or a journal directory (all segments are replayed, oldest first).
+		@param maxEvents The maximum number of events to replay. 0 (default) means no limit.
+		@return int The number of events replayed.
+		"""
+		self.stopEvent.clear()
+		
+		self.eventCounts  = {}
+		self.replayCounts = {}
+		self.handleTimeNs = {}
+		self.failedCount  = 0
+		
+		replayCount = 0
+		targetTime  = monotonic()
+		prevTimeNs  = None
+		
+		for eventType, timestampNs, payload in EventJournal.readEvents(path):
+			if self.stopEvent.is_set():
+				break
+			
+			self.eventCounts[eventType] = self.eventCounts.get(eventType, 0) + 1
+			
+			replayHandler = self.replayHandlers.get(eventType)
+			
+			if not replayHandler:
+				continue
+			
+			if self.speedup != self.AS_FAST_AS_POSSIBLE:
+				if prevTimeNs is not None:
+					gapSecs = (timestampNs - prevTimeNs) / 1000000000.0 / self.speedup
+					targetTime += min(max(gapSecs, 0.0), self.maxGapSecs)
+				
+				prevTimeNs = timestampNs
+				delay = targetTime - monotonic()
+				
+				if delay > 0.0 and self.stopEvent.wait(delay):
+					break
+			
+			startNs = perf_counter_ns()
+			
+			try:
+				if not replayHandler(payload):
+					self.failedCount += 1
+			except Exception as e:
+				logging.warning("Failed to replay %s event: %s", EventJournal.getEventName(eventType), str(e))
+				
+				self.failedCount += 1
+			
+			self.handleTimeNs[eventType] = self.handleTimeNs.get(eventType, 0) + perf_counter_ns() - startNs
+			self.replayCounts[eventType] = self.replayCounts.get(eventType, 0) + 1
+			
+			replayCount += 1
+			
+			if maxEvents > 0 and replayCount >= maxEvents:
+				break
+		
+		logging.info("Replayed %s events from event journal: %s", replayCount, path)
+		
+		return replayCount
+	
+	def stopReplay(self):
+		"""
+		Interrupts a blocking replay() call.
+		
+		"""
+		self.stopEvent.set()
+	
+	def _replayActuatorCommand(self, payload: bytes) -> bool:
+		"""
+		Decodes an ACTUATOR_CMD_EVENT payload (ActuatorData JSON) and passes it to the listener.
+		
+		@param payload The record payload.
+		@return bool True on success; False otherwise.
+		"""
+		data = self.dataUtil.jsonToActuatorData(payload.decode('utf-8'))
+		
+		if self.listener:
+			self.listener.handleActuatorCommandMessage(data)
+		
+		return True
+	
+	def _replayIncomingMessage(self, payload: bytes) -> bool:
+		"""
+		Decodes an INCOMING_MSG_EVENT payload (resource name and message) and passes it to the listener.
+		
+		@param payload The record payload.
+		@return bool True on success; False otherwise.
+		"""
+		name, msg = EventJournal.decodeNamedPayload(payload)
+		resource = ResourceNameEnum.__members__.get(name, name)
+		
+		if self.listener:
+			return self.listener.handleIncomingMessage(resource, msg.decode('utf-8'))
+		
+		return True
+	
+	def _replaySensorData(self, payload: bytes) -> bool:
+		"""
+		Decodes a SENSOR_DATA_EVENT payload (SensorData JSON) and passes it to the listener.
+		
+		@param payload The record payload.
+		@return bool True on success; False otherwise.
+		"""
+		data = self.dataUtil.jsonToSensorData(payload.decode('utf-8'))
+		
+		if self.listener:
+			return self.listener.handleSensorMessage(data)
+		
+		return True
+	
+	def _replaySystemPerformanceData(self, payload: bytes) -> bool:
+		"""
+		Decodes a SYS_PERF_DATA_EVENT payload (SystemPerformanceData JSON) and passes it to the listener.
+		
+		@param payload The record payload.
+		@return bool True on success; False otherwise.
+		"""
+		data = self.dataUtil.jsonToSystemPerformanceData(payload.decode('utf-8'))
+		
+		if self.listener:
+			return self.listener.handleSystemPerformanceMessage(data)
+		
+		return True
+	
+def main():
+	"""
+	Main function definition for running as an application.
+	
+	Usage: EventJournalReplayer.py journalPath [speedup]
+	"""
+	if len(sys.argv) < 2:
+		print("Usage: EventJournalReplayer.py journalPath [speedup]")
+		sys.exit(1)
+	
+	# imported here, so the journal classes can be used without the app's dependencies
+	from labbenchstudios.pdt.edge.app.DeviceDataManager import DeviceDataManager
+	
+	speedup = float(sys.argv[2]) if len(sys.argv) > 2 else EventJournalReplayer.DEFAULT_SPEEDUP
+	
+	replayer = EventJournalReplayer(listener = DeviceDataManager(), speedup = speedup)
+	replayer.replay(sys.argv[1])
+	
+	eventCounts  = replayer.getEventCounts()
+	replayCounts = replayer.getReplayCounts()
+	handleTimeNs = replayer.getHandleTimeNs()
+	
+	print("%-18s %10s %10s %12s" % ("event", "recorded", "replayed", "us / event"))
+	
+	for eventType in sorted(eventCounts.keys()):
+		replayCount = replayCounts.get(eventType, 0)
+		usPerEvent  = handleTimeNs.get(eventType, 0) / replayCount / 1000.0 if replayCount else 0.0
+		
+		print("%-18s %10d %10d %12.1f" % \
+			(EventJournal.getEventName(eventType), eventCounts[eventType], replayCount, usPerEvent))
+	
+	print("Failed: %d" % replayer.getFailedCount())
+	
+if __name__ == '__main__':
+	"""
+	Attribute definition for when invoking as app via command line
+	
+	"""
+	main()
@@ -0,0 +1,192 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import os
+import re
+import subprocess
+import sys
+
+class ImportTimeProfiler(object):
+	"""
+	Measures the import cost of a module by running it in a fresh
+	interpreter with '-X importtime' and parsing the per-module timings
+	written to stderr.
+	
+	Each timing line has the form:
+	  import time: <self us> | <cumulative us> | <indent><module name>
+	where the indent (two spaces per level) is the import nesting depth.
+	
+	Run this module directly to check EdgeDeviceApp against the import
+	budget; the process exits with a non-zero status if it's exceeded.
+	"""
+	
+	DEFAULT_MODULE_NAME = 'labbenchstudios.pdt.edge.app.EdgeDeviceApp'
+	DEFAULT_BUDGET_MILLIS = 250.0
+	DEFAULT_TOP_COUNT = 15
+	
+	IMPORT_TIME_PATTERN = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)\s*$')
+	
+	def __init__(self, moduleName: str = DEFAULT_MODULE_NAME, budgetMillis: float = DEFAULT_BUDGET_MILLIS):
+		"""
+		Constructor.
+		
+		@param moduleName The fully qualified name of the module to import.
+		@param budgetMillis The maximum allowed cumulative import time, in milliseconds.
+		"""
+		self.moduleName = moduleName
+		self.budgetMillis = budgetMillis
+		self.importTimes = []
+		
+	def getBudgetMillis(self) -> float:
+		"""
+		Returns the import budget in milliseconds.
+		
+		@return float
+		"""
+		return self.budgetMillis
+	
+	def getImportTimes(self) -> list:
+		"""
+		Returns the parsed import timings from the last call to
+		profileImports(), in the order they were reported.
+		
+		@return list A list of (moduleName, selfMicros, cumulativeMicros, depth) tuples.
+		"""
+		return self.importTimes
+	
+	def getTopImports(self, count: int = DEFAULT_TOP_COUNT) -> list:
+		"""
+		Returns the 'count' most expensive imports by cumulative time.
+		
+		@param count The number of entries to return.
+		@return list A list of (moduleName, selfMicros, cumulativeMicros, depth) tuples.
+		"""
+		return sorted(self.importTimes, key = lambda entry: entry[2], reverse = True)[:count]
+	
+	def getTotalImportMillis(self) -> float:
+		"""
+		Returns the cumulative import time of the profiled module, in
+		milliseconds.
+		
+		@return float The time, or 0.0 if the module wasn't found in the profile.
+		"""
+		for moduleName, selfMicros, cumulativeMicros, depth in self.importTimes:
+			if moduleName == self.moduleName:
+				return cumulativeMicros / 1000.0
+		
+		return 0.0
+	
+	def hasImport(self, moduleName: str) -> bool:
+		"""
+		Checks if 'moduleName' (or any of its submodules) was imported.
+		
+		@param moduleName The fully qualified module name.
+		@return bool
+		"""
+		prefix = moduleName + '.'
+		
+		for entry in self.importTimes:
+			if entry[0] == moduleName or entry[0].startswith(prefix):
+				return True
+		
+		return False
+	
+	def isWithinBudget(self) -> bool:
+		"""
+		Checks if the profiled module's cumulative import time is within budget.
+		
+		@return bool
+		"""
+		return self.getTotalImportMillis() <= self.budgetMillis
+	
+	def profileImports(self) -> list:
+		"""
+		Imports the module in a new interpreter process and parses the
+		resulting '-X importtime' output. The current sys.path is passed
+		to the child process via PYTHONPATH.
+		
+		@return list The parsed import timings (see getImportTimes()).
+		"""
+		env = dict(os.environ)
+		env['PYTHONPATH'] = os.pathsep.join([path for path in sys.path if path])
+		
+		result = subprocess.run( \
+			[sys.executable, '-X', 'importtime', '-c', 'import ' + self.moduleName], \
+			env = env, capture_output = True, text = True)
+		
+		if result.returncode != 0:
+			logging.warning("Failed to import module %s: %s", self.moduleName, result.stderr.strip().splitlines()[-1:])
+		
+		self.importTimes = self._parseImportTimes(result.stderr)
+		
+		return self.importTimes
+	
+	def _parseImportTimes(self, output: str) -> list:
+		"""
+		Parses '-X importtime' output.
+		
+		@param output The stderr text of the profiled interpreter.
+		@return list A list of (moduleName, selfMicros, cumulativeMicros, depth) tuples.
+		"""
+		importTimes = []
+		
+		for line in output.splitlines():
+			match = self.IMPORT_TIME_PATTERN.match(line)
+			
+			if match:
+				depth = (len(match.group(3)) - 1) // 2
+				importTimes.append((match.group(4), int(match.group(1)), int(match.group(2)), depth))
+		
+		return importTimes
+	
+def main():
+	"""
+	Main function definition for running as an application.
+	
+	Usage: ImportTimeProfiler.py [budgetMillis] [moduleName]
+	"""
+	budgetMillis = float(sys.argv[1]) if len(sys.argv) > 1 else ImportTimeProfiler.DEFAULT_BUDGET_MILLIS
+	moduleName = sys.argv[2] if len(sys.argv) > 2 else ImportTimeProfiler.DEFAULT_MODULE_NAME
+	
+	profiler = ImportTimeProfiler(moduleName = moduleName, budgetMillis = budgetMillis)
+	profiler.profileImports()
+	
+	print("%10s %12s  %s" % ("self (ms)", "cumul. (ms)", "module"))
+	
+	for name, selfMicros, cumulativeMicros, depth in profiler.getTopImports():
+		print("%10.1f %12.1f  %s%s" % (selfMicros / 1000.0, cumulativeMicros / 1000.0, '  ' * depth, name))
+	
+	print("Total import time for %s: %.1f ms (budget: %.1f ms)" % (moduleName, profiler.getTotalImportMillis(), budgetMillis))
+	
+	if not profiler.isWithinBudget():
+		print("Import time budget exceeded.")
+		sys.exit(1)
+	
+if __name__ == '__main__':
+	"""
+	Attribute definition for when invoking as app via command line
+	
+	"""
+	main()
@@ -0,0 +1,158 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import os
+import sys
+
+from time import perf_counter_ns
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.AsyncLoggingManager import AsyncLoggingManager
+from labbenchstudios.pdt.edge.app.DeviceDataManager import DeviceDataManager
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+
+class LoggingOverheadProfiler(object):
+	"""
+	Measures the per-message cost of DeviceDataManager.handleSensorMessage()
+	(the sensor hot path: counters, analysis, JSON encoding and upstream
+	transmission) at each log level, with both synchronous and async
+	(QueueHandler) console output. Output is written to os.devnull, so
+	the terminal's speed doesn't skew the results.
+	
+	Run this module directly to print the results table.
+	"""
+	
+	DEFAULT_MSG_COUNT = 2000
+	WARM_UP_COUNT     = 100
+	
+	LOG_LEVELS = ('DEBUG', 'INFO', 'WARNING')
+	
+	def __init__(self, msgCount: int = DEFAULT_MSG_COUNT):
+		"""
+		Constructor.
+		
+		@param msgCount The number of messages to time for each level and mode.
+		"""
+		self.msgCount = max(msgCount, 1)
+		self.results  = []
+		
+		# no clients or managers are created until startManager()
+		self.dataMgr = DeviceDataManager()
+		
+		self.sensorData = \
+			SensorData(typeID = ConfigConst.HUMIDITY_SENSOR_TYPE, name = ConfigConst.HUMIDITY_SENSOR_NAME)
+		self.sensorData.setValue(42.0)
+	
+	def getResults(self) -> list:
+		"""
+		Returns the results from the last call to profileLevels().
+		
+		@return list A list of (levelName, isAsync, nanosPerMsg) tuples.
+		"""
+		return self.results
+	
+	def profileLevel(self, levelName: str, isAsync: bool = False) -> float:
+		"""
+		Times handleSensorMessage() at the given log level. The root logger's
+		level and handlers are restored afterwards.
+		
+		@param levelName The log level name (e.g. 'INFO').
+		@param isAsync If True, output is written by a QueueListener thread.
+		@return float The mean time per message, in nanoseconds.
+		"""
+		rootLogger   = logging.getLogger()
+		rootLevel    = rootLogger.level
+		rootHandlers = list(rootLogger.handlers)
+		
+		with open(os.devnull, 'w') as nullFile:
+			for handler in rootHandlers:
+				rootLogger.removeHandler(handler)
+			
+			rootLogger.addHandler(logging.StreamHandler(nullFile))
+			
+			loggingMgr = AsyncLoggingManager(logLevel = levelName, enableAsyncLogging = isAsync)
+			loggingMgr.start()
+			
+			try:
+				for i in range(self.WARM_UP_COUNT):
+					self.dataMgr.handleSensorMessage(self.sensorData)
+				
+				startNs = perf_counter_ns()
+				
+				for i in range(self.msgCount):
+					self.dataMgr.handleSensorMessage(self.sensorData)
+				
+				elapsedNs = perf_counter_ns() - startNs
+			finally:
+				loggingMgr.stop()
+				
+				for handler in list(rootLogger.handlers):
+					rootLogger.removeHandler(handler)
+				
+				for handler in rootHandlers:
+					rootLogger.addHandler(handler)
+				
+				rootLogger.setLevel(rootLevel)
+		
+		return elapsedNs / self.msgCount
+	
+	def profileLevels(self) -> list:
+		"""
+		Runs profileLevel() for each of LOG_LEVELS, sync and async.
+		
+		@return list A list of (levelName, isAsync, nanosPerMsg) tuples.
+		"""
+		self.results = []
+		
+		for levelName in self.LOG_LEVELS:
+			for isAsync in (False, True):
+				self.results.append((levelName, isAsync, self.profileLevel(levelName, isAsync)))
+		
+		return self.results
+	
+def main():
+	"""
+	Main function definition for running as an application.
+	
+	Usage: LoggingOverheadProfiler.py [msgCount]
+	"""
+	msgCount = int(sys.argv[1]) if len(sys.argv) > 1 else LoggingOverheadProfiler.DEFAULT_MSG_COUNT
+	
+	profiler = LoggingOverheadProfiler(msgCount = msgCount)
+	profiler.profileLevels()
+	
+	print("%-8s %-6s %12s" % ("level", "mode", "us / msg"))
+	
+	for levelName, isAsync, nanosPerMsg in profiler.getResults():
+		print("%-8s %-6s %12.1f" % (levelName, 'async' if isAsync else 'sync', nanosPerMsg / 1000.0))
+	
+if __name__ == '__main__':
+	"""
+	Attribute definition for when invoking as app via command line
+	
+	"""
+	main()
@@ -0,0 +1,317 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import os
+import re
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import monotonic
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
+from labbenchstudios.pdt.common.MetricsRegistry import MetricsRegistry
+
+class PrometheusMetricsServer():
+	"""
+	Serves the MetricsRegistry contents, along with process resource
+	usage, at '/metrics' in the Prometheus text exposition format.
+	
+	The server runs on its own (daemon) threads, and only reads the
+	registry - the telemetry threads never wait on it. The rendered text
+	is cached for 'cacheSecs', so frequent or concurrent scrapes don't
+	re-render it, and each metric's HELP / TYPE header block is only
+	built once.
+	
+	Metric names are converted from the registry's camel case, and
+	prefixed with METRIC_PREFIX - e.g. the 'mqttPublish' histogram is
+	rendered as the 'pdt_mqtt_publish_seconds' summary.
+	
+	"""
+	
+	METRICS_PATH  = '/metrics'
+	CONTENT_TYPE  = 'text/plain; version=0.0.4; charset=utf-8'
+	METRIC_PREFIX = 'pdt_'
+	
+	SUMMARY_QUANTILES = (50.0, 90.0, 99.0)
+	
+	def __init__(self, host: str = None, port: int = None, cacheSecs: float = None):
+		"""
+		Constructor. Any parameter that's None is loaded from the configuration file.
+		
+		@param host The address to listen on.
+		@param port The port to listen on. Use 0 to pick a free port.
+		@param cacheSecs The number of seconds to reuse the rendered text.
+		"""
+		configUtil = ConfigUtil()
+		
+		if host is None:
+			host = configUtil.getProperty( \
+				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.METRICS_SERVER_HOST_KEY, \
+				defaultVal = ConfigConst.DEFAULT_METRICS_SERVER_HOST)
+		
+		if port is None:
+			port = configUtil.getInteger( \
+				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.METRICS_SERVER_PORT_KEY, \
+				defaultVal = ConfigConst.DEFAULT_METRICS_SERVER_PORT)
+		
+		if cacheSecs is None:
+			cacheSecs = configUtil.getFloat( \
+				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.METRICS_CACHE_SECS_KEY, \
+				defaultVal = ConfigConst.DEFAULT_METRICS_CACHE_SECS)
+		
+		self.host      = host
+		self.port      = port
+		self.cacheSecs = max(cacheSecs, 0.0)
+		
+		self.metricsRegistry = MetricsRegistry()
+		
+		self.renderLock     = threading.Lock()
+		self.cachedText     = None
+		self.cacheTime      = 0.0
+		self.headerBlocks   = {}
+		self.metricNames    = {}
+		self.renderCount    = 0
+		
+		self.httpServer   = None
+		self.serverThread = None
+	
+	def getMetricsText(self) -> bytes:
+		"""
+		Returns the rendered metrics, re-rendering them only if the cached
+		text is older than 'cacheSecs'.
+		
+		@return bytes The UTF-8 encoded exposition text.
+		"""
+		with self.renderLock:
+			now = monotonic()
+			
+			if self.cachedText is None or now - self.cacheTime >= self.cacheSecs:
+				self.cachedText = self.renderMetrics().encode('utf-8')
+				self.cacheTime  = now
+			
+			return self.cachedText
+	
+	def getRenderCount(self) -> int:
+		"""
+		Returns the number of times the metrics have been rendered.
+		
+		@return int
+		"""
+		return self.renderCount
+	
+	def getServerPort(self) -> int:
+		"""
+		Returns the port the server is listening on (which may differ from
+		the configured port if it's 0), or the configured port if stopped.
+		
+		@return int
+		"""
+		return self.httpServer.server_address[1] if self.httpServer else self.port
+	
+	def isServerRunning(self) -> bool:
+		return self.httpServer is not None
+	
+	def renderMetrics(self) -> str:
+		"""
+		Renders all registry metrics and the process metrics.
+		
+		@return str The exposition text.
+		"""
+		registry = self.metricsRegistry
+		blocks   = []
+		
+		with registry.lock:
+			counters   = list(registry.counters.values())
+			gauges     = list(registry.gauges.values())
+			histograms = list(registry.histograms.values())
+		
+		for counter in counters:
+			name = self._getMetricName(counter.getName(), '_total')
+			blocks.append(self._getHeaderBlock(name, 'counter', counter.getName()))
+			blocks.append('%s %d\n' % (name, counter.getValue()))
+		
+		for gauge in gauges:
+			name = self._getMetricName(gauge.getName())
+			blocks.append(self._getHeaderBlock(name, 'gauge', gauge.getName()))
+			blocks.append('%s %s\n' % (name, self._formatValue(gauge.getValue())))
+		
+		for histogram in histograms:
+			name  = self._getMetricName(histogram.getName(), '_seconds')
+			stats = histogram.getStats(percentiles = self.SUMMARY_QUANTILES)
+			
+			blocks.append(self._getHeaderBlock(name, 'summary', histogram.getName()))
+			
+			for quantile in self.SUMMARY_QUANTILES:
+				blocks.append('%s{quantile="%g"} %s\n' % ( \
+					name, quantile / 100.0, self._formatValue(stats['p%g' % quantile] / 1e9)))
+			
+			blocks.append('%s_sum %s\n' % (name, self._formatValue(stats['mean'] * stats['count'] / 1e9)))
+			blocks.append('%s_count %d\n' % (name, stats['count']))
+		
+		blocks.append(self._renderProcessMetrics())
+		
+		self.renderCount += 1
+		
+		return ''.join(blocks)
+	
+	def startServer(self) -> bool:
+		"""
+		Starts the HTTP server on a daemon thread.
+		
+		@return bool True on success; False otherwise.
+		"""
+		if self.httpServer:
+			logging.warning("Metrics server already started. Ignoring.")
+			
+			return False
+		
+		try:
+			self.httpServer = ThreadingHTTPServer((self.host, self.port), MetricsRequestHandler)
+			self.httpServer.daemon_threads = True
+			self.httpServer.metricsServer  = self
+		except OSError as e:
+			logging.error("Failed to start metrics server on %s:%s: %s", self.host, str(self.port), str(e))
+			
+			self.httpServer = None
+			
+			return False
+		
+		self.serverThread = threading.Thread( \
+			target = self.httpServer.serve_forever, name = 'MetricsServer', daemon = True)
+		self.serverThread.start()
+		
+		logging.info("Started metrics server: http://%s:%s%s", self.host, str(self.getServerPort()), self.METRICS_PATH)
+		
+		return True
+	
+	def stopServer(self):
+		"""
+		Stops the HTTP server, if running.
+		
+		"""
+		if self.httpServer:
+			self.httpServer.shutdown()
+			self.httpServer.server_close()
+			self.serverThread.join()
+			
+			self.httpServer   = None
+			self.serverThread = None
+			
+			logging.info("Stopped metrics server.")
+	
+	def _formatValue(self, value) -> str:
+		"""
+		Formats a sample value - ints as is, and floats using repr (which
+		round trips, and is much cheaper than fixed precision formatting).
+		
+		"""
+		return str(value) if isinstance(value, int) else repr(float(value))
+	
+	def _getHeaderBlock(self, name: str, metricType: str, sourceName: str) -> str:
+		"""
+		Returns the (cached) HELP and TYPE lines for the metric.
+		
+		"""
+		headerBlock = self.headerBlocks.get(name)
+		
+		if not headerBlock:
+			headerBlock = '# HELP %s Pipeline metric %s.\n# TYPE %s %s\n' % (name, sourceName, name, metricType)
+			self.headerBlocks[name] = headerBlock
+		
+		return headerBlock
+	
+	def _getMetricName(self, sourceName: str, suffix: str = '') -> str:
+		"""
+		Returns the (cached) Prometheus metric name for the registry name -
+		e.g. 'sensorMsgCount' with suffix '_total' is 'pdt_sensor_msg_count_total'.
+		
+		"""
+		key = (sourceName, suffix)
+		name = self.metricNames.get(key)
+		
+		if not name:
+			name = re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', sourceName).lower()
+			name = self.METRIC_PREFIX + re.sub(r'[^a-z0-9_]', '_', name) + suffix
+			
+			self.metricNames[key] = name
+		
+		return name
+	
+	def _renderProcessMetrics(self) -> str:
+		"""
+		Renders the standard Prometheus process metrics that are available.
+		
+		"""
+		times = os.times()
+		lines = [ \
+			self._getHeaderBlock('process_cpu_seconds_total', 'counter', 'process user and system CPU time'), \
+			'process_cpu_seconds_total %s\n' % self._formatValue(times.user + times.system), \
+			self._getHeaderBlock('process_threads', 'gauge', 'process thread count'), \
+			'process_threads %d\n' % threading.active_count()]
+		
+		try:
+			with open('/proc/self/statm', 'rb') as statmFile:
+				rssBytes = int(statmFile.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+			
+			lines.append(self._getHeaderBlock('process_resident_memory_bytes', 'gauge', 'process resident memory'))
+			lines.append('process_resident_memory_bytes %d\n' % rssBytes)
+			
+			openFds = len(os.listdir('/proc/self/fd'))
+			
+			lines.append(self._getHeaderBlock('process_open_fds', 'gauge', 'process open file descriptors'))
+			lines.append('process_open_fds %d\n' % openFds)
+		except (OSError, ValueError, IndexError):
+			# not Linux - the memory and fd metrics are skipped
+			pass
+		
+		return ''.join(lines)
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+	"""
+	Request handler for PrometheusMetricsServer. Only GET on the
+	metrics path is supported.
+	
+	"""
+	
+	def do_GET(self):
+		metricsServer = self.server.metricsServer
+		
+		if self.path.split('?', 1)[0] != metricsServer.METRICS_PATH:
+			self.send_error(404)
+			
+			return
+		
+		body = metricsServer.getMetricsText()
+		
+		self.send_response(200)
+		self.send_header('Content-Type', metricsServer.CONTENT_TYPE)
+		self.send_header('Content-Length', str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+	
+	def log_message(self, format, *args):
+		logging.debug("Metrics request from %s: %s", self.address_string(), format % args)
@@ -0,0 +1,319 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import os
+import sys
+import threading
+
+from time import monotonic, perf_counter_ns, strftime
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
+
+class SamplingProfiler():
+	"""
+	Low overhead, in-process sampling profiler for use on field devices
+	where an external profiler can't be attached.
+	
+	While running, a daemon thread walks the stack of every other thread
+	(via sys._current_frames()) once per sample interval, and counts each
+	distinct stack. Nothing is hooked into the profiled code, so the cost
+	is limited to the sampling thread itself.
+	
+	Each run is limited to the configured maximum duration, so a profile
+	can't be left running. When a run ends, the counts are written in the
+	'collapsed stack' format - one 'thread;frame;...;frame count' line per
+	stack, outermost frame first - which can be rendered directly by
+	flamegraph.pl, inferno or speedscope.
+	
+	"""
+	
+	DEFAULT_SAMPLE_SECS       = 0.01
+	DEFAULT_MAX_DURATION_SECS = 60.0
+	DEFAULT_OUTPUT_PATH       = '/tmp/pdt-profiles'
+	
+	FILE_NAME_PREFIX = 'pdt-profile-'
+	FILE_NAME_EXT    = '.folded'
+	
+	def __init__(self, sampleSecs: float = None, maxDurationSecs: float = None, outputPath: str = None):
+		"""
+		Constructor. Any parameter that's None is loaded from the configuration file.
+		
+		@param sampleSecs The time between samples.
+		@param maxDurationSecs The maximum duration of a single profiling run.
+		@param outputPath The directory the collapsed stack files are written to.
+		"""
+		configUtil = ConfigUtil()
+		
+		if sampleSecs is None:
+			sampleSecs = configUtil.getFloat( \
+				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.PROFILER_SAMPLE_SECS_KEY, \
+				defaultVal = self.DEFAULT_SAMPLE_SECS)
+		
+		if maxDurationSecs is None:
+			maxDurationSecs = configUtil.getFloat( \
+				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.PROFILER_MAX_DURATION_SECS_KEY, \
+				defaultVal = self.DEFAULT_MAX_DURATION_SECS)
+		
+		if outputPath is None:
+			outputPath = configUtil.getProperty( \
+				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.PROFILER_OUTPUT_PATH_KEY, \
+				defaultVal = self.DEFAULT_OUTPUT_PATH)
+		
+		self.sampleSecs      = sampleSecs if sampleSecs > 0.0 else self.DEFAULT_SAMPLE_SECS
+		self.maxDurationSecs = maxDurationSecs if maxDurationSecs > 0.0 else self.DEFAULT_MAX_DURATION_SECS
+		self.outputPath      = outputPath
+		
+		self.stackCounts    = {}
+		self.frameLabels    = {}
+		self.sampleCount    = 0
+		self.samplingNs     = 0
+		self.lastOutputFile = None
+		
+		self.completionListener = None
+		self.profilerThread     = None
+		
+		self.stopEvent    = threading.Event()
+		
+		# re-entrant, as toggleProfiling() may be called from a signal
+		# handler that interrupts the main thread while it holds the lock
+		self.profilerLock = threading.RLock()
+	
+	def getCollapsedStacks(self) -> dict:
+		"""
+		Returns a copy of the stack counts of the current (or last) run.
+		
+		@return dict The count for each collapsed ('frame;frame;...') stack.
+		"""
+		return dict(self.stackCounts)
+	
+	def getLastOutputFile(self) -> str:
+		return self.lastOutputFile
+	
+	def getMaxDurationSecs(self) -> float:
+		return self.maxDurationSecs
+	
+	def getSampleCount(self) -> int:
+		return self.sampleCount
+	
+	def isRunning(self) -> bool:
+		return self.profilerThread is not None and self.profilerThread.is_alive()
+	
+	def setCompletionListener(self, listener = None):
+		"""
+		Sets the callback invoked (from the profiler thread) with the name
+		of the collapsed stack file each time a profiling run ends.
+		
+		@param listener A function that accepts the file name (or None if it couldn't be written).
+		"""
+		self.completionListener = listener
+	
+	def startProfiling(self, durationSecs: float = 0.0) -> bool:
+		"""
+		Starts a profiling run, unless one is already running.
+		
+		@param durationSecs The run duration. Values <= 0, or greater than
+		the maximum duration, are replaced by the maximum duration.
+		@return bool True if a run was started; False otherwise.
+		"""
+		with self.profilerLock:
+			if self.isRunning():
+				logging.warning("Sampling profiler is already running.")
+				
+				return False
+			
+			if not durationSecs or durationSecs <= 0.0 or durationSecs > self.maxDurationSecs:
+				durationSecs = self.maxDurationSecs
+			
+			self.stackCounts = {}
+			self.sampleCount = 0
+			self.samplingNs  = 0
+			
+			self.stopEvent.clear()
+			
+			self.profilerThread = threading.Thread( \
+				target = self._runProfiler, args = (durationSecs, ), name = 'SamplingProfiler', daemon = True)
+			self.profilerThread.start()
+		
+		logging.info("Sampling profiler started. Duration: %s secs. Interval: %s secs.", durationSecs, self.sampleSecs)
+		
+		return True
+	
+	def stopProfiling(self, wait: bool = True) -> str:
+		"""
+		Ends the current profiling run, if any, which writes its output.
+		
+		@param wait If True, blocks until the output is written. Use False
+		from signal handlers and message callbacks.
+		@return str The output file name if 'wait' is True and it was written; None otherwise.
+		"""
+		with self.profilerLock:
+			profilerThread = self.profilerThread
+			
+			if not profilerThread:
+				return None
+			
+			self.stopEvent.set()
+		
+		if wait and profilerThread is not threading.current_thread():
+			profilerThread.join()
+			
+			return self.lastOutputFile
+		
+		return None
+	
+	def toggleProfiling(self) -> bool:
+		"""
+		Starts a profiling run (for the maximum duration) if there isn't
+		one running; otherwise, ends the current run without waiting.
+		
+		@return bool True if a run was started; False if one was stopped.
+		"""
+		with self.profilerLock:
+			if self.isRunning():
+				self.stopProfiling(wait = False)
+				
+				return False
+			
+			return self.startProfiling()
+	
+	def writeCollapsedStacks(self, fileName: str = None) -> str:
+		"""
+		Writes the stack counts of the current (or last) run, most frequent
+		stack first.
+		
+		@param fileName The file to write. If None, a time stamped file is
+		created within the output path.
+		@return str The file name, or None if it couldn't be written.
+		"""
+		try:
+			if not fileName:
+				os.makedirs(self.outputPath, exist_ok = True)
+				
+				fileName = os.path.join( \
+					self.outputPath, self.FILE_NAME_PREFIX + strftime('%Y%m%d-%H%M%S') + self.FILE_NAME_EXT)
+			
+			stackCounts = sorted(self.stackCounts.items(), key = lambda item: item[1], reverse = True)
+			
+			with open(fileName, 'w', encoding = 'utf-8') as outFile:
+				for stack, count in stackCounts:
+					outFile.write(stack + ' ' + str(count) + '\n')
+			
+			return fileName
+		except OSError as e:
+			logging.error("Failed to write collapsed stacks to %s: %s", fileName, str(e))
+			
+			return None
+	
+	def _getFrameLabel(self, code) -> str:
+		"""
+		Returns the flamegraph label for the code object, formatted as
+		'function (file.py:line)'. Labels are cached, as the same code
+		objects are seen in nearly every sample.
+		
+		@param code The frame's code object.
+		@return str
+		"""
+		label = self.frameLabels.get(code)
+		
+		if not label:
+			label = '%s (%s:%s)' % (code.co_name, os.path.basename(code.co_filename), code.co_firstlineno)
+			label = label.replace(';', ':')
+			
+			self.frameLabels[code] = label
+		
+		return label
+	
+	def _runProfiler(self, durationSecs: float):
+		"""
+		The profiler thread's run loop. Samples until 'durationSecs' has
+		elapsed or stopProfiling() is called, then writes the output.
+		
+		@param durationSecs The run duration.
+		"""
+		profilerIdent = threading.get_ident()
+		startTime = monotonic()
+		endTime = startTime + durationSecs
+		
+		while not self.stopEvent.is_set():
+			sampleStartNs = perf_counter_ns()
+			
+			self._takeSample(profilerIdent)
+			
+			sampleNs = perf_counter_ns() - sampleStartNs
+			
+			self.sampleCount += 1
+			self.samplingNs  += sampleNs
+			
+			remainingSecs = endTime - monotonic()
+			
+			if remainingSecs <= 0.0:
+				logging.info("Sampling profiler duration limit reached: %s secs.", durationSecs)
+				break
+			
+			self.stopEvent.wait(min(max(self.sampleSecs - sampleNs / 1e9, 0.0), remainingSecs))
+		
+		elapsedSecs = monotonic() - startTime
+		
+		self.lastOutputFile = self.writeCollapsedStacks()
+		
+		logging.info( \
+			"Sampling profiler stopped. Samples: %s. Stacks: %s. Elapsed: %.1f secs. Sampling overhead: %.2f%%. Output: %s", \
+			self.sampleCount, len(self.stackCounts), elapsedSecs, \
+			(self.samplingNs / 1e7) / elapsedSecs if elapsedSecs > 0.0 else 0.0, self.lastOutputFile)
+		
+		if self.completionListener:
+			try:
+				self.completionListener(self.lastOutputFile)
+			except Exception:
+				logging.exception("Sampling profiler completion listener failed: ")
+	
+	def _takeSample(self, profilerIdent: int):
+		"""
+		Adds one count to the collapsed stack of each thread, other than
+		the profiler thread itself.
+		
+		@param profilerIdent The profiler thread's ident.
+		"""
+		threadNames = {thread.ident: thread.name for thread in threading.enumerate()}
+		
+		for ident, frame in sys._current_frames().items():
+			if ident == profilerIdent:
+				continue
+			
+			labels = []
+			
+			while frame:
+				labels.append(self._getFrameLabel(frame.f_code))
+				frame = frame.f_back
+			
+			labels.append(threadNames.get(ident, str(ident)).replace(';', ':'))
+			labels.reverse()
+			
+			stack = ';'.join(labels)
+			
+			self.stackCounts[stack] = self.stackCounts.get(stack, 0) + 1
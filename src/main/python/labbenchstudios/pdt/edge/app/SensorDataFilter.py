@@ -0,0 +1,249 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import threading
+
+from time import time
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+
+class SensorDataFilter(object):
+	"""
+	Report-by-exception filter for SensorData, applied per sensor - that
+	is, per location ID (device) and sensor name, as readings from several
+	devices may share the same sensor name.
+	
+	Transmission and persistence are gated separately:
+	
+	  - A reading is transmitted if it's the first for its sensor, if it
+	    differs from the last transmitted reading by more than the deadband,
+	    or if nothing has been transmitted for 'maxSilenceSecs' (heartbeat).
+	  - Persistence uses the same rules, unless swinging door compression
+	    is enabled. In that case, a reading is stored only once a straight
+	    line from the last stored reading can no longer represent the
+	    readings since to within the deadband. The stored reading is the
+	    last one before that happened - so it's delayed by one reading.
+	
+	The deadband is either absolute or a percent of the last reading.
+	"""
+	
+	RECEIVED_STAT    = 'received'
+	PERSISTED_STAT   = 'persisted'
+	TRANSMITTED_STAT = 'transmitted'
+	
+	def __init__(self, \
+			deadband: float = None, \
+			useDeadbandPct: bool = None, \
+			maxSilenceSecs: float = None, \
+			enableSwingingDoor: bool = None):
+		"""
+		Constructor. Any parameter that's None is loaded from the config.
+		
+		@param deadband The deadband (sensorDeadband). 0.0 filters repeated values only.
+		@param useDeadbandPct If True, 'deadband' is a percent of the last reading (useSensorDeadbandPct).
+		@param maxSilenceSecs The max time without a transmitted (or persisted) reading
+		before one is sent regardless (sensorMaxSilenceSecs). 0.0 disables the heartbeat.
+		@param enableSwingingDoor If True, persistence uses swinging door compression (enableSwingingDoor).
+		"""
+		configUtil = ConfigUtil()
+		section = ConfigConst.CONSTRAINED_DEVICE
+		
+		if deadband is None:
+			deadband = configUtil.getFloat(section, ConfigConst.SENSOR_DEADBAND_KEY, 0.0)
+		
+		if useDeadbandPct is None:
+			useDeadbandPct = configUtil.getBoolean(section, ConfigConst.USE_SENSOR_DEADBAND_PCT_KEY)
+		
+		if maxSilenceSecs is None:
+			maxSilenceSecs = configUtil.getFloat(section, ConfigConst.SENSOR_MAX_SILENCE_SECS_KEY, 0.0)
+		
+		if enableSwingingDoor is None:
+			enableSwingingDoor = configUtil.getBoolean(section, ConfigConst.ENABLE_SWINGING_DOOR_KEY)
+		
+		self.deadband = max(deadband, 0.0)
+		self.useDeadbandPct = useDeadbandPct
+		self.maxSilenceSecs = max(maxSilenceSecs, 0.0)
+		self.enableSwingingDoor = enableSwingingDoor
+		
+		self.filterLock = threading.Lock()
+		
+		# (location ID, sensor name) -> [lastValue, lastTime]
+		self.transmitStates = {}
+		
+		# (location ID, sensor name) -> [lastValue, lastTime] (deadband), or
+		# [anchorValue, anchorTime, heldData, heldValue, heldTime, minUpperSlope, maxLowerSlope] (swinging door)
+		self.persistStates = {}
+		
+		# (location ID, sensor name) -> [received, persisted, transmitted]
+		self.stats = {}
+		
+		logging.info( \
+			"Sensor data filter: deadband %s%s; max silence %s secs; swinging door: %s", \
+			str(self.deadband), '%' if self.useDeadbandPct else '', str(self.maxSilenceSecs), str(self.enableSwingingDoor))
+	
+	def filterSensorData(self, data: SensorData, now: float = None) -> tuple:
+		"""
+		Applies the filter to 'data'.
+		
+		@param data The SensorData reading.
+		@param now The receipt time (seconds since the Epoch). Defaults to time.time().
+		@return tuple (persistList, transmit) - the list of SensorData to persist
+		(zero or more entries) and whether 'data' should be transmitted.
+		"""
+		if now is None:
+			now = time()
+		
+		key = (data.getLocationID(), data.getName())
+		value = data.getValue()
+		
+		with self.filterLock:
+			counts = self.stats.get(key)
+			
+			if not counts:
+				counts = self.stats[key] = [0, 0, 0]
+			
+			counts[0] += 1
+			
+			transmit = self._isOutsideDeadband(self.transmitStates, key, value, now)
+			
+			if self.enableSwingingDoor:
+				persistList = self._applySwingingDoor(data, key, value, now)
+			elif self._isOutsideDeadband(self.persistStates, key, value, now):
+				persistList = [data]
+			else:
+				persistList = []
+			
+			if transmit:
+				counts[2] += 1
+			
+			counts[1] += len(persistList)
+		
+		return (persistList, transmit)
+	
+	def getStats(self) -> dict:
+		"""
+		Returns the received, persisted and transmitted counts per sensor,
+		along with the suppression ratio of each (the fraction of readings
+		that weren't persisted / transmitted).
+		
+		@return dict A dict of (location ID, sensor name) -> dict of stats.
+		"""
+		stats = {}
+		
+		with self.filterLock:
+			for key, counts in self.stats.items():
+				received = counts[0]
+				
+				stats[key] = { \
+					self.RECEIVED_STAT: received, \
+					self.PERSISTED_STAT: counts[1], \
+					self.TRANSMITTED_STAT: counts[2], \
+					'persistSuppressionRatio': 1.0 - (counts[1] / received) if received else 0.0, \
+					'transmitSuppressionRatio': 1.0 - (counts[2] / received) if received else 0.0}
+		
+		return stats
+	
+	def _applySwingingDoor(self, data: SensorData, key: tuple, value: float, now: float) -> list:
+		"""
+		Swinging door compression for persistence.
+		
+		@param data The SensorData reading.
+		@param key The (location ID, sensor name) key.
+		@param value The reading's value.
+		@param now The receipt time.
+		@return list The SensorData to persist (zero or more entries).
+		"""
+		state = self.persistStates.get(key)
+		
+		if not state or (self.maxSilenceSecs > 0.0 and now - state[1] >= self.maxSilenceSecs):
+			self.persistStates[key] = [value, now, None, value, now, float('inf'), float('-inf')]
+			
+			# on heartbeat, the held reading is stored too, so the gap is bounded
+			return [state[2], data] if state and state[2] else [data]
+		
+		deviation = self._getDeadband(state[0])
+		persistList = []
+		
+		elapsed = now - state[1]
+		
+		if elapsed > 0.0:
+			minUpperSlope = min(state[5], (value + deviation - state[0]) / elapsed)
+			maxLowerSlope = max(state[6], (value - deviation - state[0]) / elapsed)
+			
+			if maxLowerSlope > minUpperSlope and state[2]:
+				# the doors have opened: store the held reading and restart from it
+				persistList.append(state[2])
+				
+				state[0], state[1] = state[3], state[4]
+				
+				elapsed = max(now - state[1], 1e-9)
+				deviation = self._getDeadband(state[0])
+				
+				minUpperSlope = (value + deviation - state[0]) / elapsed
+				maxLowerSlope = (value - deviation - state[0]) / elapsed
+			
+			state[5] = minUpperSlope
+			state[6] = maxLowerSlope
+		
+		state[2], state[3], state[4] = data, value, now
+		
+		return persistList
+	
+	def _getDeadband(self, lastValue: float) -> float:
+		"""
+		Returns the absolute deadband relative to 'lastValue'.
+		
+		@param lastValue The last reported value.
+		@return float
+		"""
+		if self.useDeadbandPct:
+			return abs(lastValue) * self.deadband / 100.0
+		
+		return self.deadband
+	
+	def _isOutsideDeadband(self, states: dict, key: tuple, value: float, now: float) -> bool:
+		"""
+		Checks 'value' against the last reported value for 'key' in 'states',
+		and records it as the last reported value if it should be reported.
+		
+		@param states The transmit or persist state dict.
+		@param key The (location ID, sensor name) key.
+		@param value The reading's value.
+		@param now The receipt time.
+		@return bool True if the reading should be reported; False otherwise.
+		"""
+		state = states.get(key)
+		
+		if state and abs(value - state[0]) <= self._getDeadband(state[0]) and \
+			(self.maxSilenceSecs <= 0.0 or now - state[1] < self.maxSilenceSecs):
+			return False
+		
+		states[key] = [value, now]
+		
+		return True
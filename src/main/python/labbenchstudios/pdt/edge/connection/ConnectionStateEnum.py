@@ -0,0 +1,42 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+from enum import Enum
+
+class ConnectionStateEnum(Enum):
+	"""
+	Enum declaration for the states of a client connection.
+	
+	DISCONNECTED: not started, or stopped by request.
+	CONNECTING: the first connection attempt is in progress.
+	CONNECTED: connected to the server.
+	RECONNECTING: the connection was lost (or an attempt failed), and the
+	client is waiting out its backoff delay before the next attempt.
+	
+	"""
+	
+	DISCONNECTED = 'Disconnected'
+	CONNECTING   = 'Connecting'
+	CONNECTED    = 'Connected'
+	RECONNECTING = 'Reconnecting'
@@ -0,0 +1,234 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import threading
+
+from datetime import datetime, timezone
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.MetricCounter import MetricCounter
+
+from labbenchstudios.pdt.edge.connection.ConnectionStateEnum import ConnectionStateEnum
+
+from labbenchstudios.pdt.data.ConnectionStateData import ConnectionStateData
+
+class ConnectionStateTracker():
+	"""
+	Tracks the live connection state of a client connector: the current
+	state, the last connect / disconnect time, the number of reconnects,
+	the message in / out counts, and a smoothed round trip latency.
+	
+	The message counts are read from the given counters (which are
+	lock free to increment), so the connectors can pass in the counters
+	they already update for the metrics registry. The remaining state
+	changes rarely, and is guarded by a lock, so a snapshot taken by
+	createConnectionStateData() is always consistent. Other threads can
+	query the state, or block until it changes, via waitForState().
+	
+	The round trip latency is smoothed the same way TCP smooths its RTT
+	estimate - each sample moves the estimate 1/8th of the way.
+	
+	"""
+	
+	RTT_SMOOTHING_FACTOR = 0.125
+	
+	def __init__(self, name: str = None, hostName: str = None, hostPort: int = 0, \
+		msgInCounter: MetricCounter = None, msgOutCounter: MetricCounter = None):
+		"""
+		Constructor.
+		
+		@param name The name to use for each ConnectionStateData instance.
+		@param hostName The remote host name.
+		@param hostPort The remote host port.
+		@param msgInCounter The incoming message counter. If None, one is created.
+		@param msgOutCounter The outgoing message counter. If None, one is created.
+		"""
+		self.name     = name
+		self.hostName = hostName
+		self.hostPort = hostPort
+		
+		self.msgInCounter  = msgInCounter if msgInCounter else MetricCounter(name)
+		self.msgOutCounter = msgOutCounter if msgOutCounter else MetricCounter(name)
+		
+		self.stateLock      = threading.Lock()
+		self.stateCondition = threading.Condition(self.stateLock)
+		
+		self.state          = ConnectionStateEnum.DISCONNECTED
+		self.connectCount   = 0
+		self.connectTime    = ConfigConst.NOT_SET
+		self.disconnectTime = ConfigConst.NOT_SET
+		self.reconnectDelay = 0.0
+		self.roundTripMs    = 0.0
+	
+	def createConnectionStateData(self) -> ConnectionStateData:
+		"""
+		Creates a ConnectionStateData instance from the current state.
+		
+		@return ConnectionStateData
+		"""
+		data = ConnectionStateData(typeID = ConfigConst.SYSTEM_CONN_STATE_TYPE, name = self.name)
+		
+		with self.stateLock:
+			data.hostName         = self.hostName
+			data.hostPort         = self.hostPort
+			data.isConnecting     = self.state in (ConnectionStateEnum.CONNECTING, ConnectionStateEnum.RECONNECTING)
+			data.isConnected      = self.state == ConnectionStateEnum.CONNECTED
+			data.isDisconnected   = self.state == ConnectionStateEnum.DISCONNECTED
+			data.connectTime      = self.connectTime
+			data.disconnectTime   = self.disconnectTime
+			data.reconnectCount   = self.getReconnectCount()
+			data.roundTripLatency = self.roundTripMs
+		
+		data.msgInCount  = self.msgInCounter.getValue()
+		data.msgOutCount = self.msgOutCounter.getValue()
+		
+		return data
+	
+	def getReconnectDelay(self) -> float:
+		"""
+		Returns the most recent reconnect backoff delay, in seconds.
+		
+		@return float
+		"""
+		return self.reconnectDelay
+	
+	def getReconnectCount(self) -> int:
+		"""
+		Returns the number of successful connects after the first.
+		
+		@return int
+		"""
+		return max(self.connectCount - 1, 0)
+	
+	def getRoundTripLatency(self) -> float:
+		"""
+		Returns the smoothed round trip latency, in milliseconds.
+		
+		@return float
+		"""
+		return self.roundTripMs
+	
+	def getState(self) -> ConnectionStateEnum:
+		"""
+		Returns the current connection state.
+		
+		@return ConnectionStateEnum
+		"""
+		return self.state
+	
+	def isClientConnected(self) -> bool:
+		return self.state == ConnectionStateEnum.CONNECTED
+	
+	def markConnecting(self):
+		"""
+		Records that a connection attempt has started. Ignored if connected.
+		
+		"""
+		with self.stateLock:
+			if self.state != ConnectionStateEnum.CONNECTED:
+				self._setState(ConnectionStateEnum.CONNECTING)
+	
+	def markConnected(self):
+		"""
+		Records a successful connection. Ignored if already connected.
+		
+		"""
+		with self.stateLock:
+			if self.state != ConnectionStateEnum.CONNECTED:
+				self.connectCount += 1
+				self.connectTime  = self._getTimeStamp()
+				
+				self._setState(ConnectionStateEnum.CONNECTED)
+	
+	def markDisconnected(self):
+		"""
+		Records a disconnect (or failed connection attempt). Ignored if
+		already disconnected.
+		
+		"""
+		with self.stateLock:
+			if self.state != ConnectionStateEnum.DISCONNECTED:
+				if self.state == ConnectionStateEnum.CONNECTED:
+					self.disconnectTime = self._getTimeStamp()
+				
+				self._setState(ConnectionStateEnum.DISCONNECTED)
+	
+	def markReconnecting(self, delay: float = 0.0):
+		"""
+		Records a lost connection (or failed attempt) that will be retried
+		after 'delay' seconds.
+		
+		@param delay The reconnect backoff delay, in seconds.
+		"""
+		with self.stateLock:
+			if self.state == ConnectionStateEnum.CONNECTED:
+				self.disconnectTime = self._getTimeStamp()
+			
+			self.reconnectDelay = delay
+			
+			self._setState(ConnectionStateEnum.RECONNECTING)
+	
+	def recordRoundTrip(self, elapsedNs: int):
+		"""
+		Adds a round trip latency sample to the smoothed estimate.
+		
+		@param elapsedNs The round trip time, in nanoseconds.
+		"""
+		sampleMs = elapsedNs / 1000000.0
+		
+		with self.stateLock:
+			if self.roundTripMs == 0.0:
+				self.roundTripMs = sampleMs
+			else:
+				self.roundTripMs += (sampleMs - self.roundTripMs) * self.RTT_SMOOTHING_FACTOR
+	
+	def setHost(self, hostName: str = None, hostPort: int = 0):
+		"""
+		Updates the remote host (e.g. if the port changes for TLS).
+		
+		@param hostName The remote host name.
+		@param hostPort The remote host port.
+		"""
+		self.hostName = hostName
+		self.hostPort = hostPort
+	
+	def waitForState(self, state: ConnectionStateEnum, timeout: float = None) -> bool:
+		"""
+		Blocks until the connection is in 'state', or 'timeout' elapses.
+		
+		@param state The ConnectionStateEnum to wait for.
+		@param timeout The maximum time to wait, in seconds. None means wait indefinitely.
+		@return bool True if the connection is in 'state'; False otherwise.
+		"""
+		with self.stateCondition:
+			return self.stateCondition.wait_for(lambda: self.state == state, timeout)
+	
+	def _getTimeStamp(self) -> str:
+		return datetime.now(timezone.utc).isoformat()
+	
+	def _setState(self, state: ConnectionStateEnum):
+		# the caller must hold 'stateLock'
+		self.state = state
+		self.stateCondition.notify_all()
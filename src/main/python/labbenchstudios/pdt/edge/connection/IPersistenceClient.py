@@ -57,6 +57,15 @@ class IPersistenceClient(IDataLoader):
 		"""
 		pass
 	
+	def getConnectionState(self) -> ConnectionStateData:
+		"""
+		Returns a snapshot of the connection state, including the message
+		in / out counts, reconnect count and round trip latency.
+		
+		@return ConnectionStateData The current connection state.
+		"""
+		pass
+	
 	def storeActuatorData(self, resource: ResourceNameContainer = None, qos: int = 0, data: ActuatorData = None) -> bool:
 		"""
 		Attempts to write the source data instance to the persistence server.
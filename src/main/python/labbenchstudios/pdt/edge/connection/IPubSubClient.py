@@ -51,6 +51,15 @@ class IPubSubClient():
 		"""
 		pass
 
+	def getConnectionState(self):
+		"""
+		Returns a snapshot of the connection state, including the message
+		in / out counts, reconnect count and round trip latency.
+		
+		@return ConnectionStateData The current connection state.
+		"""
+		pass
+
 	def publishMessage(self, resource: ResourceNameContainer = None, payload: str = None, qos: int = ConfigConst.DEFAULT_QOS) -> bool:
 		"""
 		Attempts to publish a message to the given topic with the given qos
@@ -25,9 +25,10 @@
 import logging
 import datetime
 import dateutil
-import socket
 import traceback
 
+from time import perf_counter_ns
+
 from influxdb_client import InfluxDBClient, Point
 from influxdb_client.client.write_api import SYNCHRONOUS
 
@@ -35,9 +36,11 @@ import labbenchstudios.pdt.common.ConfigConst as ConfigConst
 
 from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
 from labbenchstudios.pdt.common.IDataMessageListener import IDataMessageListener
+from labbenchstudios.pdt.common.MetricsRegistry import MetricsRegistry
 from labbenchstudios.pdt.common.ResourceNameContainer import ResourceNameContainer
 from labbenchstudios.pdt.common.ResourceNameEnum import ResourceNameEnum
 
+from labbenchstudios.pdt.edge.connection.ConnectionStateTracker import ConnectionStateTracker
 from labbenchstudios.pdt.edge.connection.IPersistenceClient import IPersistenceClient
 
 from labbenchstudios.pdt.data.DataUtil import DataUtil
@@ -100,25 +103,26 @@ class InfluxClientConnector(IPersistenceClient):
 		self.dbClient = None
 		self.dbClientWriteApi = None
 		self.dbClientQueryApi = None
+		
+		self.tsdbStoreHistogram = MetricsRegistry().getHistogram(ConfigConst.TSDB_STORE_SPAN)
+		self.msgOutCounter      = MetricsRegistry().getCounter(ConfigConst.TSDB_MSG_OUT_COUNTER)
+		
+		# the HTTP API is connectionless, so the client is considered
+		# connected while its writes succeed - each recovery from a failed
+		# write counts as a reconnect
+		self.connStateTracker = \
+			ConnectionStateTracker( \
+				name = ConfigConst.TSDB_CONN_STATE_NAME, hostName = self.host, hostPort = self.port, \
+				msgOutCounter = self.msgOutCounter)
 
 		self.uriPath = "http://" + self.host + ":" + str(self.port)
 		
+		# the host name is resolved by the HTTP client when it connects - a
+		# lookup here could block the constructor for several seconds (e.g. if
+		# DNS is unavailable)
 		logging.info('\tInfluxDB Host:Port: %s:%s', self.host, str(self.port))
 		
-		try:
-			tmpHost = socket.gethostbyname(self.host)
-			
-			if tmpHost:
-				self.host = tmpHost
-			else:
-				logging.error("Can't resolve host: " + self.host)
-			
-		except socket.gaierror:
-			logging.info("Failed to resolve host: " + self.host)
-			
-		logging.info('\tInfluxDB Broker Host: ' + self.host)
-		logging.info('\tInfluxDB Broker Port: ' + str(self.port))
-		
+
 	def connectClient(self) -> bool:
 		"""
 		Connects to the persistence server using configuration parameters
@@ -132,6 +136,8 @@ class InfluxClientConnector(IPersistenceClient):
 			self.dbClientQueryApi = self.dbClient.query_api()
 
 			logging.info('Created Influx DB client instance and write / query API instances.')
+			
+			self.connStateTracker.markConnecting()
 
 		return True
 	
@@ -144,8 +150,19 @@ class InfluxClientConnector(IPersistenceClient):
 		"""
 		if not self.dbClient:
 			logging.warning('InfluxDB client not yet created / connected. Ignoring.')
+		
+		self.connStateTracker.markDisconnected()
 
 		return True
+	
+	def getConnectionState(self) -> ConnectionStateData:
+		"""
+		Returns a snapshot of the TSDB connection state. The round trip
+		latency is that of the (synchronous) writes.
+		
+		@return ConnectionStateData
+		"""
+		return self.connStateTracker.createConnectionStateData()
 
 	def loadActuatorData(self, resource: ResourceNameContainer = None, typeID: int = 0, startDate: datetime = None, endDate: datetime = None) -> ActuatorData:
 		"""
@@ -219,7 +236,7 @@ class InfluxClientConnector(IPersistenceClient):
 			if (resource):
 				if (resource.getPersistenceName()) : bucketName = resource.getPersistenceName()
 
-			self.dbClientWriteApi.write(bucket = bucketName, record = dataPoint)
+			self._writeDataPoint(bucketName, dataPoint)
 
 			logging.debug('Wrote ActuatorData instance %s to bucket %s', deviceID, bucketName)
 
@@ -247,7 +264,7 @@ class InfluxClientConnector(IPersistenceClient):
 			if (resource):
 				if (resource.getPersistenceName()) : bucketName = resource.getPersistenceName()
 
-			self.dbClientWriteApi.write(bucket = bucketName, record = dataPoint)
+			self._writeDataPoint(bucketName, dataPoint)
 
 			logging.debug('Wrote ConnectionStateData instance %s to bucket %s', deviceID, bucketName)
 
@@ -275,7 +292,7 @@ class InfluxClientConnector(IPersistenceClient):
 			if (resource):
 				if (resource.getPersistenceName()) : bucketName = resource.getPersistenceName()
 
-			self.dbClientWriteApi.write(bucket = bucketName, record = dataPoint)
+			self._writeDataPoint(bucketName, dataPoint)
 
 			logging.debug('Wrote SensorData instance %s to bucket %s', deviceID, bucketName)
 			
@@ -303,7 +320,7 @@ class InfluxClientConnector(IPersistenceClient):
 			if (resource):
 				if (resource.getPersistenceName()) : bucketName = resource.getPersistenceName()
 
-			self.dbClientWriteApi.write(bucket = bucketName, record = dataPoint)
+			self._writeDataPoint(bucketName, dataPoint)
 
 			logging.debug('Wrote SystemPerformanceData instance %s to bucket %s', deviceID, bucketName)
 			
@@ -327,6 +344,30 @@ class InfluxClientConnector(IPersistenceClient):
 
 		return timeStampMillis
 
+	def _writeDataPoint(self, bucketName: str, dataPoint: Point):
+		"""
+		Writes the data point, and updates the write metrics and
+		connection state. Any write exception is re-raised.
+		
+		@param bucketName The target bucket name.
+		@param dataPoint The Point to write.
+		"""
+		startNs = perf_counter_ns()
+		
+		try:
+			self.dbClientWriteApi.write(bucket = bucketName, record = dataPoint)
+		except Exception:
+			self.connStateTracker.markDisconnected()
+			raise
+		
+		elapsedNs = perf_counter_ns() - startNs
+		
+		self.tsdbStoreHistogram.record(elapsedNs)
+		self.msgOutCounter.increment()
+		
+		self.connStateTracker.markConnected()
+		self.connStateTracker.recordRoundTrip(elapsedNs)
+
 	def _createActuatorDataPoint(self, data: ActuatorData = None) -> Point:
 		"""
 		Creates an InfluxDB Point instance for the given type.
@@ -367,11 +408,15 @@ class InfluxClientConnector(IPersistenceClient):
 				.tag(ConfigConst.TYPE_CATEGORY_ID_PROP, data.getTypeCategoryID()) \
 				.tag(ConfigConst.HOST_NAME_PROP, data.getHostName()) \
 				.tag(ConfigConst.PORT_KEY, data.getHostPort()) \
-				.tag(ConfigConst.MESSAGE_IN_COUNT_PROP, data.getMessageInCount()) \
-				.tag(ConfigConst.MESSAGE_OUT_COUNT_PROP, data.getMessageOutCount()) \
-				.tag(ConfigConst.IS_CONNECTING_PROP, data.isClientConnecting()) \
-				.tag(ConfigConst.IS_CONNECTED_PROP, data.isClientConnected()) \
-				.tag(ConfigConst.IS_DISCONNECTED_PROP, data.isClientDisconnected()) \
+				.field(ConfigConst.MESSAGE_IN_COUNT_PROP, data.getMessageInCount()) \
+				.field(ConfigConst.MESSAGE_OUT_COUNT_PROP, data.getMessageOutCount()) \
+				.field(ConfigConst.IS_CONNECTING_PROP, data.isClientConnecting()) \
+				.field(ConfigConst.IS_CONNECTED_PROP, data.isClientConnected()) \
+				.field(ConfigConst.IS_DISCONNECTED_PROP, data.isClientDisconnected()) \
+				.field(ConfigConst.CONNECT_TIME_PROP, data.getConnectTime()) \
+				.field(ConfigConst.DISCONNECT_TIME_PROP, data.getDisconnectTime()) \
+				.field(ConfigConst.RECONNECT_COUNT_PROP, data.getReconnectCount()) \
+				.field(ConfigConst.ROUND_TRIP_LATENCY_PROP, data.getRoundTripLatency()) \
 				.time(timeStampMillis, write_precision = "ms")
 
 		return dataPoint
@@ -414,6 +459,19 @@ class InfluxClientConnector(IPersistenceClient):
 				.field(ConfigConst.CPU_UTIL_PROP, data.getCpuUtilization()) \
 				.field(ConfigConst.MEM_UTIL_PROP, data.getMemoryUtilization()) \
 				.field(ConfigConst.DISK_UTIL_PROP, data.getDiskUtilization()) \
+				.field(ConfigConst.DISK_READ_RATE_PROP, data.getDiskReadRate()) \
+				.field(ConfigConst.DISK_WRITE_RATE_PROP, data.getDiskWriteRate()) \
+				.field(ConfigConst.NET_RX_RATE_PROP, data.getNetworkRxRate()) \
+				.field(ConfigConst.NET_TX_RATE_PROP, data.getNetworkTxRate()) \
+				.field(ConfigConst.PROCESS_RSS_PROP, data.getProcessRss()) \
+				.field(ConfigConst.PROCESS_THREAD_COUNT_PROP, data.getProcessThreadCount()) \
 				.time(timeStampMillis, write_precision = "ms")
+		
+		# Influx fields are scalars, so each core is a separate field (e.g. cpuCoreUtil0)
+		for coreIndex, coreUtil in enumerate(data.getCpuCoreUtilization()):
+			dataPoint.field(ConfigConst.CPU_CORE_UTIL_PROP + str(coreIndex), coreUtil)
+		
+		for metricName, metricVal in data.getPipelineMetrics().items():
+			dataPoint.field(metricName, metricVal)
 
 		return dataPoint
@@ -23,8 +23,11 @@
 #
 
 import logging
+import threading
 import traceback
 
+from time import perf_counter_ns
+
 import paho.mqtt.client as mqttClient
 
 import ssl
@@ -33,17 +36,31 @@ import labbenchstudios.pdt.common.ConfigConst as ConfigConst
 
 from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
 from labbenchstudios.pdt.common.IDataMessageListener import IDataMessageListener
+from labbenchstudios.pdt.common.MetricsRegistry import MetricsRegistry
 from labbenchstudios.pdt.common.ResourceNameContainer import ResourceNameContainer
 from labbenchstudios.pdt.common.ResourceNameEnum import ResourceNameEnum
 
+from labbenchstudios.pdt.edge.connection.ConnectionStateEnum import ConnectionStateEnum
+from labbenchstudios.pdt.edge.connection.ConnectionStateTracker import ConnectionStateTracker
 from labbenchstudios.pdt.edge.connection.IPubSubClient import IPubSubClient
+from labbenchstudios.pdt.edge.connection.ReconnectBackoff import ReconnectBackoff
 
+from labbenchstudios.pdt.data.ConnectionStateData import ConnectionStateData
 from labbenchstudios.pdt.data.DataUtil import DataUtil
 
 class MqttClientConnector(IPubSubClient):
 	"""
 	Shell representation of class for student implementation.
 	
+	The connection is managed by the paho network thread: connectClient()
+	returns immediately, and if the broker isn't reachable (or the
+	connection is later lost) the client keeps retrying, waiting an
+	exponentially growing, jittered delay between attempts. Every topic
+	subscribed via this class is re-subscribed on each (re)connect, and
+	QoS 1 / 2 messages published while disconnected are queued (up to
+	'maxQueuedMsgs') and sent once reconnected. The connection state can
+	be queried via getConnectionStatus() and waitForConnection().
+	
 	"""
 
 	def __init__(self, clientID: str = None):
@@ -85,7 +102,34 @@ class MqttClientConnector(IPubSubClient):
 			self.config.getProperty( \
 				ConfigConst.MQTT_GATEWAY_SERVICE, ConfigConst.CERT_FILE_KEY)
 		
+		self.maxQueuedMsgs = \
+			self.config.getInteger( \
+				ConfigConst.MQTT_GATEWAY_SERVICE, ConfigConst.MAX_QUEUED_MSGS_KEY, ConfigConst.DEFAULT_MAX_QUEUED_MSGS)
+		
+		self.reconnectBackoff = \
+			ReconnectBackoff( \
+				minDelay = self.config.getFloat( \
+					ConfigConst.MQTT_GATEWAY_SERVICE, ConfigConst.RECONNECT_MIN_DELAY_KEY, ConfigConst.DEFAULT_RECONNECT_MIN_DELAY), \
+				maxDelay = self.config.getFloat( \
+					ConfigConst.MQTT_GATEWAY_SERVICE, ConfigConst.RECONNECT_MAX_DELAY_KEY, ConfigConst.DEFAULT_RECONNECT_MAX_DELAY))
+		
 		self.mqttClient = None
+		self.dataUtil   = DataUtil()
+		
+		# topic -> (qos, callback) for every subscription, so they can be
+		# restored on reconnect
+		self.subscriptionLock = threading.Lock()
+		self.subscriptions    = {}
+		
+		self.publishHistogram     = MetricsRegistry().getHistogram(ConfigConst.MQTT_PUBLISH_SPAN)
+		self.publishFailedCounter = MetricsRegistry().getCounter(ConfigConst.MQTT_PUBLISH_FAILED_COUNTER)
+		self.msgInCounter         = MetricsRegistry().getCounter(ConfigConst.MQTT_MSG_IN_COUNTER)
+		self.msgOutCounter        = MetricsRegistry().getCounter(ConfigConst.MQTT_MSG_OUT_COUNTER)
+		
+		self.connStateTracker = \
+			ConnectionStateTracker( \
+				name = ConfigConst.MQTT_CONN_STATE_NAME, hostName = self.host, hostPort = self.port, \
+				msgInCounter = self.msgInCounter, msgOutCounter = self.msgOutCounter)
 		
 		self.deviceID = \
 			self.config.getProperty( \
@@ -95,12 +139,18 @@ class MqttClientConnector(IPubSubClient):
 			self.config.getProperty( \
 				ConfigConst.CONSTRAINED_DEVICE, ConfigConst.DEVICE_LOCATION_ID_KEY, 'EdgeDeviceApp')
 		
-		logging.info('\tMQTT Client ID:   ' + self.clientID)
-		logging.info('\tMQTT Broker Host: ' + self.host)
-		logging.info('\tMQTT Broker Port: ' + str(self.port))
-		logging.info('\tMQTT Keep Alive:  ' + str(self.keepAlive))
+		logging.info('\tMQTT Client ID:   %s', self.clientID)
+		logging.info('\tMQTT Broker Host: %s', self.host)
+		logging.info('\tMQTT Broker Port: %s', self.port)
+		logging.info('\tMQTT Keep Alive:  %s', self.keepAlive)
 		
 	def connectClient(self) -> bool:
+		"""
+		Starts connecting to the broker in the background, and returns
+		immediately. Use waitForConnection() to block until connected.
+		
+		@return bool True if connecting was started; False otherwise.
+		"""
 		if not self.mqttClient:
 			# TODO: make clean_session configurable
 			self.mqttClient = mqttClient.Client(client_id = self.clientID, clean_session = False)
@@ -114,27 +164,44 @@ class MqttClientConnector(IPubSubClient):
 							ConfigConst.MQTT_GATEWAY_SERVICE, ConfigConst.SECURE_PORT_KEY, ConfigConst.DEFAULT_MQTT_SECURE_PORT)
 		
 					self.mqttClient.tls_set(self.pemFileName, tls_version = ssl.PROTOCOL_TLS)
+					self.connStateTracker.setHost(self.host, self.port)
 
 			except Exception as e:
 				logging.warning("Failed to enable TLS encryption. Using unencrypted connection.")
 				traceback.print_exception(type(e), e, e.__traceback__)
 		
 		if self.mqttClient:
-			if not self.mqttClient.is_connected():
+			if self.connStateTracker.getState() == ConnectionStateEnum.DISCONNECTED:
 				self.mqttClient.on_connect = self.onConnect
+				self.mqttClient.on_connect_fail = self.onConnectFail
 				self.mqttClient.on_disconnect = self.onDisconnect
 				self.mqttClient.on_message = self.onMessage
 				self.mqttClient.on_publish = self.onPublish
 				self.mqttClient.on_subscribe = self.onSubscribe
+				
+				self.mqttClient.max_queued_messages_set(max(self.maxQueuedMsgs, 0))
+				
+				actuatorCmdTopic = \
+					ConfigConst.PRODUCT_NAME + '/' + self.deviceID + '/' + ConfigConst.ACTUATOR_CMD
+				
+				# NOTE: Be sure to set `self.defaultQos` during instantiation!
+				self._addSubscription(actuatorCmdTopic, self.defaultQos, self.onActuatorCommandMessage)
+				self._addSubscription( \
+					ResourceNameEnum.CDA_MGMT_STATUS_CMD_RESOURCE.value, self.defaultQos, self.onMgmtCommandMessage)
 
-				logging.info('MQTT client connecting to broker at host: ' + self.host)
+				logging.info('MQTT client connecting to broker at host: %s', self.host)
 
-				self.mqttClient.connect(self.host, self.port, self.keepAlive)
+				self.connStateTracker.markConnecting()
+				self.reconnectBackoff.reset()
+				
+				# the first attempt is made by the network thread, which
+				# keeps retrying until connected or disconnectClient()
+				self.mqttClient.connect_async(self.host, self.port, self.keepAlive)
 				self.mqttClient.loop_start()
 				
 				return True
 			else:
-				logging.warning('MQTT client is already connected. Ignoring connect request.')
+				logging.warning('MQTT client is already connected or connecting. Ignoring connect request.')
 
 		else:
 			logging.error('MQTT client could not be created. Check logs and exceptions for details.')
@@ -144,10 +211,14 @@ class MqttClientConnector(IPubSubClient):
 	def disconnectClient(self) -> bool:
 		"""
 		"""
-		if self.mqttClient and self.mqttClient.is_connected():
-			logging.info('Disconnecting MQTT client from broker: ' + self.host)
-			self.mqttClient.loop_stop()
+		if self.mqttClient and self.connStateTracker.getState() != ConnectionStateEnum.DISCONNECTED:
+			logging.info('Disconnecting MQTT client from broker: %s', self.host)
+			
+			# this also stops any pending reconnect
 			self.mqttClient.disconnect()
+			self.mqttClient.loop_stop()
+			
+			self.connStateTracker.markDisconnected()
 			
 			return True
 		else:
@@ -155,36 +226,85 @@ class MqttClientConnector(IPubSubClient):
 			
 			return False
 			
+	def getConnectionState(self) -> ConnectionStateData:
+		"""
+		Returns a snapshot of the broker connection state.
+		
+		@return ConnectionStateData
+		"""
+		return self.connStateTracker.createConnectionStateData()
+	
+	def getConnectionStatus(self) -> ConnectionStateEnum:
+		"""
+		Returns the current connection state.
+		
+		@return ConnectionStateEnum
+		"""
+		return self.connStateTracker.getState()
+	
+	def waitForConnection(self, timeout: float = None) -> bool:
+		"""
+		Blocks until connected to the broker, or 'timeout' elapses.
+		
+		@param timeout The maximum time to wait, in seconds. None means wait indefinitely.
+		@return bool True if connected; False otherwise.
+		"""
+		return self.connStateTracker.waitForState(ConnectionStateEnum.CONNECTED, timeout)
+	
 	def onConnect(self, client, userdata, flags, rc):
-		logging.info('[Callback] Connected to MQTT broker. Result code: ' + str(rc))
+		logging.info('[Callback] Connected to MQTT broker. Result code: %s', rc)
 		
-		actuatorCmdTopic = \
-			ConfigConst.PRODUCT_NAME + '/' + self.deviceID + '/' + ConfigConst.ACTUATOR_CMD
-
-		# NOTE: Be sure to set `self.defaultQos` during instantiation!
-		self.mqttClient.subscribe( \
-			topic = actuatorCmdTopic, qos = self.defaultQos)
+		if rc != 0:
+			# the broker closes the connection, so onDisconnect() schedules the retry
+			logging.warning('MQTT broker refused connection: %s', mqttClient.connack_string(rc))
+			
+			return
+		
+		self.reconnectBackoff.reset()
 		
-		self.mqttClient.message_callback_add( \
-			sub = actuatorCmdTopic, \
-			callback = self.onActuatorCommandMessage)
+		# the broker may still hold the subscriptions (if the session was
+		# resumed), but re-subscribing is harmless, and covers any that
+		# were added while disconnected
+		with self.subscriptionLock:
+			subscriptions = list(self.subscriptions.items())
 		
-		logging.info('Subscribed to incoming command topic: ' + actuatorCmdTopic)
+		for topic, (qos, callback) in subscriptions:
+			self.mqttClient.subscribe(topic = topic, qos = qos)
+			
+			logging.info('Subscribed to topic: %s', topic)
+		
+		self.connStateTracker.markConnected()
+	
+	def onConnectFail(self, client, userdata):
+		"""
+		Callback for a failed connection attempt (e.g. broker not up yet).
+		
+		"""
+		self._handleConnectionLoss('MQTT client failed to connect to broker')
 		
 	def onDisconnect(self, client, userdata, rc):
 		"""
 		"""
-		logging.info('MQTT client disconnected from broker: ' + str(client))
+		if rc == mqttClient.MQTT_ERR_SUCCESS:
+			logging.info('MQTT client disconnected from broker: %s', client)
+			
+			self.connStateTracker.markDisconnected()
+		else:
+			self._handleConnectionLoss('MQTT client lost connection to broker (' + mqttClient.error_string(rc) + ')')
 		
 	def onMessage(self, client, userdata, msg):
 		"""
 		"""
+		self.msgInCounter.increment()
+		
 		payload = msg.payload
 		
+		# the decode is skipped unless the message will actually be logged
 		if payload:
-			logging.info('MQTT message received with payload: ' + str(payload.decode("utf-8")))
+			if logging.getLogger().isEnabledFor(logging.INFO):
+				logging.info('MQTT message received with payload: %s', payload.decode("utf-8"))
 		else:
-			logging.info('MQTT message received with no payload: ' + str(msg))
+			logging.info('MQTT message received with no payload: %s', msg)
 			
 		if self.dataMsgListener:
 			self.dataMsgListener.handleIncomingMessage(resource = ResourceNameEnum.CDA_UPDATE_NOTIFICATIONS_RESOURCE, msg = payload)
@@ -198,17 +318,41 @@ class MqttClientConnector(IPubSubClient):
 		@param userdata The user reference context.
 		@param msg The message context, including the embedded payload.
 		"""
+		self.msgInCounter.increment()
+		
 		logging.info('[Callback] Actuator command message received. Topic: %s.', msg.topic)
 		
 		if self.dataMsgListener:
 			try:
 				# assumes all data is encoded using UTF-8 and that the data
 				# is in a JSON format that DataUtil can deserialize
-				actuatorData = DataUtil().jsonToActuatorData(msg.payload.decode('utf-8'))
+				actuatorData = self.dataUtil.jsonToActuatorData(msg.payload.decode('utf-8'))
 				
 				self.dataMsgListener.handleActuatorCommandMessage(data = actuatorData)
 			except:
 				logging.exception("Failed to convert incoming actuation command payload to ActuatorData: ")
+	
+	def onMgmtCommandMessage(self, client, userdata, msg):
+		"""
+		This callback is used to process incoming management commands
+		(e.g. starting the sampling profiler) from the subscribed
+		MgmtStatusCmd topic. The payload is passed as-is to the data
+		message listener's handleIncomingMessage().
+		
+		@param client The client reference context.
+		@param userdata The user reference context.
+		@param msg The message context, including the embedded payload.
+		"""
+		self.msgInCounter.increment()
+		
+		logging.info('[Callback] Management command message received. Topic: %s.', msg.topic)
+		
+		if self.dataMsgListener:
+			try:
+				self.dataMsgListener.handleIncomingMessage( \
+					resource = ResourceNameEnum.CDA_MGMT_STATUS_CMD_RESOURCE, msg = msg.payload.decode('utf-8'))
+			except:
+				logging.exception("Failed to handle incoming management command: ")
 					
 	def onPublish(self, client, userdata, mid):
 		"""
@@ -218,7 +362,7 @@ class MqttClientConnector(IPubSubClient):
 	def onSubscribe(self, client, userdata, mid, granted_qos):
 		"""
 		"""
-		logging.info('MQTT client subscribed to topic on broker: ' + str(client))
+		logging.info('MQTT client subscribed to topic on broker: %s', client)
 		
 	def publishMessage(self, resource: ResourceNameContainer = None, msg: str = None, qos: int = ConfigConst.DEFAULT_QOS) -> bool:
 		"""
@@ -230,7 +374,7 @@ class MqttClientConnector(IPubSubClient):
 		
 		# check validity of message
 		if not msg:
-			logging.warning('No message specified. Cannot publish message to topic: ' + resource.value)
+			logging.warning('No message specified. Cannot publish message to topic: %s', resource.value)
 			return False
 					
 		# check validity of QoS - set to default if necessary
@@ -239,12 +383,37 @@ class MqttClientConnector(IPubSubClient):
 		
 		# publish message, and wait for publish to complete before returning
 		if self.mqttClient:
+			startNs = perf_counter_ns()
+			
 			msgInfo = self.mqttClient.publish(topic = resource.value, payload = msg, qos = qos)
+			
+			if msgInfo.rc == mqttClient.MQTT_ERR_NO_CONN and qos > 0:
+				# queued by the client, and sent once reconnected
+				logging.debug('MQTT client not connected. Queued message for topic: %s', resource.value)
+				
+				return True
+			
+			if msgInfo.rc != mqttClient.MQTT_ERR_SUCCESS:
+				logging.warning('Failed to publish message to topic %s: %s', resource.value, mqttClient.error_string(msgInfo.rc))
+				self.publishFailedCounter.increment()
+				
+				return False
+			
 			msgInfo.wait_for_publish()
+			
+			elapsedNs = perf_counter_ns() - startNs
+			
+			self.publishHistogram.record(elapsedNs)
+			self.msgOutCounter.increment()
+			
+			# QoS 0 has no acknowledgement, so only QoS 1 and 2 are round trips
+			if qos > 0:
+				self.connStateTracker.recordRoundTrip(elapsedNs)
 
 			return True
 		else:
 			logging.warning('MQTT client not yet created. Call connectClient() first.')
+			self.publishFailedCounter.increment()
 			return False
 	
 	def subscribeToTopic(self, resource: ResourceNameContainer = None, callback = None, qos: int = ConfigConst.DEFAULT_QOS) -> bool:
@@ -260,15 +429,7 @@ class MqttClientConnector(IPubSubClient):
 			qos = ConfigConst.DEFAULT_QOS
 		
 		# subscribe to topic
-		if self.mqttClient:
-			logging.info('Subscribing to topic %s', resource.value)
-			self.mqttClient.subscribe(resource.value, qos)
-
-			return True
-
-		else:
-			logging.warning('MQTT client not yet created. Call connectClient() first.')
-			return False
+		return self.subscribeToTopicByName(resource = resource.value, callback = callback, qos = qos)
 	
 	def subscribeToTopicByName(self, resource: str = None, callback = None, qos: int = ConfigConst.DEFAULT_QOS) -> bool:
 		"""
@@ -282,10 +443,13 @@ class MqttClientConnector(IPubSubClient):
 		if qos < 0 or qos > 2:
 			qos = ConfigConst.DEFAULT_QOS
 		
-		# subscribe to topic
+		# subscribe to topic - if not connected, this happens on connect
 		if self.mqttClient:
-			logging.info('Subscribing to topic %s', resource)
-			self.mqttClient.subscribe(resource, qos)
+			self._addSubscription(resource, qos, callback)
+			
+			if self.connStateTracker.isClientConnected():
+				logging.info('Subscribing to topic %s', resource)
+				self.mqttClient.subscribe(resource, qos)
 		
 			return True
 
@@ -304,6 +468,13 @@ class MqttClientConnector(IPubSubClient):
 		# unsubscribe from topic
 		if self.mqttClient:
 			logging.info('Unsubscribing from topic %s', resource.value)
+			
+			with self.subscriptionLock:
+				subscription = self.subscriptions.pop(resource.value, None)
+			
+			if subscription and subscription[1]:
+				self.mqttClient.message_callback_remove(resource.value)
+			
 			self.mqttClient.unsubscribe(resource.value)
 
 			return True
@@ -317,3 +488,34 @@ class MqttClientConnector(IPubSubClient):
 		"""
 		if listener:
 			self.dataMsgListener = listener
+	
+	def _addSubscription(self, topic: str, qos: int, callback = None):
+		"""
+		Records the subscription, so it's restored on reconnect, and
+		registers its message callback (if any).
+		
+		@param topic The topic name.
+		@param qos The subscription QoS.
+		@param callback The topic's message callback, or None for onMessage().
+		"""
+		with self.subscriptionLock:
+			self.subscriptions[topic] = (qos, callback)
+		
+		if callback:
+			self.mqttClient.message_callback_add(sub = topic, callback = callback)
+	
+	def _handleConnectionLoss(self, reason: str):
+		"""
+		Sets the delay before the network thread's next connection attempt,
+		and updates the connection state. Called from the network thread.
+		
+		@param reason The log message describing the loss.
+		"""
+		delay = self.reconnectBackoff.nextDelay()
+		
+		# with equal min and max, paho waits exactly 'delay' before the next attempt
+		self.mqttClient.reconnect_delay_set(min_delay = delay, max_delay = delay)
+		
+		self.connStateTracker.markReconnecting(delay)
+		
+		logging.warning('%s. Reconnect attempt %d in %.2f secs.', reason, self.reconnectBackoff.getAttemptCount(), delay)
@@ -0,0 +1,92 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import random
+
+class ReconnectBackoff():
+	"""
+	Calculates reconnect delays that grow exponentially from 'minDelay'
+	up to 'maxDelay', with random jitter - each delay is picked uniformly
+	between 'minDelay' and the current exponential ceiling. The jitter
+	keeps a fleet of devices from reconnecting in lock step after a
+	broker restart.
+	
+	"""
+	
+	DEFAULT_MULTIPLIER = 2.0
+	
+	def __init__(self, minDelay: float = 1.0, maxDelay: float = 120.0, multiplier: float = DEFAULT_MULTIPLIER, seed: int = None):
+		"""
+		Constructor.
+		
+		@param minDelay The minimum delay, in seconds.
+		@param maxDelay The maximum delay, in seconds.
+		@param multiplier The factor the ceiling grows by after each attempt.
+		@param seed The random seed. None (default) seeds from the OS.
+		"""
+		self.minDelay   = max(float(minDelay), 0.0)
+		self.maxDelay   = max(float(maxDelay), self.minDelay)
+		self.multiplier = max(float(multiplier), 1.0)
+		
+		self.rng = random.Random(seed)
+		
+		self.attemptCount = 0
+	
+	def getAttemptCount(self) -> int:
+		"""
+		Returns the number of delays handed out since the last reset().
+		
+		@return int
+		"""
+		return self.attemptCount
+	
+	def getDelayCeiling(self) -> float:
+		"""
+		Returns the ceiling for the next delay.
+		
+		@return float
+		"""
+		# cap the exponent, so a long outage can't overflow the float
+		exponent = min(self.attemptCount, 64)
+		
+		return min(self.minDelay * (self.multiplier ** exponent), self.maxDelay)
+	
+	def nextDelay(self) -> float:
+		"""
+		Returns the next delay, in seconds, and raises the ceiling.
+		
+		@return float
+		"""
+		delay = self.rng.uniform(self.minDelay, self.getDelayCeiling())
+		
+		self.attemptCount += 1
+		
+		return delay
+	
+	def reset(self):
+		"""
+		Resets the ceiling to 'minDelay' (e.g. once connected).
+		
+		"""
+		self.attemptCount = 0
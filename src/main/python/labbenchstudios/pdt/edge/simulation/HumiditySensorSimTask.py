@@ -38,11 +38,12 @@ class HumiditySensorSimTask(BaseSensorTask):
 	
 	"""
 	
-	def __init__(self, dataSet = None):
+	def __init__(self, dataSet = None, randomGenerator = None):
 		"""
 		Constructor.
 		
 		@param dataSet The SensorDataSet to use for this task simulator.
+		@param randomGenerator The numpy Generator to use if there's no data set.
 		"""
 		super( \
 			HumiditySensorSimTask, self).__init__( \
@@ -51,5 +52,6 @@ class HumiditySensorSimTask(BaseSensorTask):
 				typeCategoryID = ConfigConst.ENV_TYPE_CATEGORY, \
 				dataSet = dataSet, \
 				minVal = SensorDataGenerator.LOW_NORMAL_ENV_HUMIDITY, \
-				maxVal = SensorDataGenerator.HI_NORMAL_ENV_HUMIDITY)
+				maxVal = SensorDataGenerator.HI_NORMAL_ENV_HUMIDITY, \
+				randomGenerator = randomGenerator)
 	
\ No newline at end of file
@@ -38,11 +38,12 @@ class PressureSensorSimTask(BaseSensorTask):
 	
 	"""
 
-	def __init__(self, dataSet = None):
+	def __init__(self, dataSet = None, randomGenerator = None):
 		"""
 		Constructor.
 		
 		@param dataSet The SensorDataSet to use for this task simulator.
+		@param randomGenerator The numpy Generator to use if there's no data set.
 		"""
 		super( \
 			PressureSensorSimTask, self).__init__( \
@@ -51,4 +52,5 @@ class PressureSensorSimTask(BaseSensorTask):
 				typeCategoryID = ConfigConst.ENV_TYPE_CATEGORY, \
 				dataSet = dataSet, \
 				minVal = SensorDataGenerator.LOW_NORMAL_ENV_PRESSURE, \
-				maxVal = SensorDataGenerator.HI_NORMAL_ENV_PRESSURE)
+				maxVal = SensorDataGenerator.HI_NORMAL_ENV_PRESSURE, \
+				randomGenerator = randomGenerator)
@@ -24,8 +24,15 @@
 
 import logging
 import math
+import os
+import sys
 import numpy as calcLib
-import matplotlib.pyplot as plotLib
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from importlib import import_module
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from numpy.random import Generator, PCG64, SeedSequence
 
 class SensorDataGenerator(object):
 	"""
@@ -83,7 +90,7 @@ class SensorDataGenerator(object):
 	DEFAULT_HUMIDITY_CURVE = BELL_CURVE
 	DEFAULT_PRESSURE_CURVE = INVERSE_CURVE
 	
-	def __init__(self, epochOffsetSeconds: float = 0.0, useCurrentTime: bool = True, alignGeneratorToDay: bool = True):
+	def __init__(self, epochOffsetSeconds: float = 0.0, useCurrentTime: bool = True, alignGeneratorToDay: bool = True, dataSetCache = None, chunkSize: int = 0, randomGenerator: Generator = None):
 		"""
 		Constructor.
 		
@@ -97,11 +104,28 @@ class SensorDataGenerator(object):
 		generator logic will be aligned to create a single sine wave for
 		a day - meaning the 24 hr start and end values will be approximately
 		the same.
+		@param dataSetCache Defaults to None. If set, must be a SensorDataSetCache
+		instance, which will be used to load (and store) the data sets created by
+		generateDailySensorDataSet() instead of regenerating them.
+		@param chunkSize Defaults to 0 (disabled). If > 0, generateDailySensorDataSet()
+		will return a ChunkedSensorDataSet that lazily generates 'chunkSize' entries
+		at a time, instead of generating all entries up front. The cache isn't used
+		for chunked data sets.
+		@param randomGenerator Defaults to None. The numpy Generator used for noise
+		(see SimRandomStreams). If None, a new (randomly seeded) PCG64 Generator is used,
+		and the cache is only used for data sets without noise. Only pass a cache
+		with a randomly seeded generator if that's the intent, as every noisy data
+		set it generates will be stored under a new key.
 		"""
 		self.epochOffsetSeconds = epochOffsetSeconds
 		self.useCurrentTime = useCurrentTime
 		self.alignGeneratorToDay = alignGeneratorToDay
+		self.dataSetCache = dataSetCache
+		self.chunkSize = chunkSize
+		self.randomGenerator = randomGenerator if randomGenerator else Generator(PCG64())
+		self.isSeeded = randomGenerator is not None
 		self.dayDenominator = (1 - (calcLib.pi / 10)) + calcLib.pi
+		self.visualizer = None
 		
 	def generateDailyEnvironmentHumidityDataSet(self, noiseLevel: int = DEFAULT_NOISE, minValue: float = MIN_ENV_HUMIDITY, maxValue: float = MAX_ENV_HUMIDITY, useSeconds: bool = False):
 		"""
@@ -314,29 +338,51 @@ class SensorDataGenerator(object):
 		if useSeconds: totalDataPoints = totalDataPoints * 60
 		if totalDataPoints == 0: totalDataPoints = 1
 		
+		if self.chunkSize > 0:
+			return \
+				ChunkedSensorDataSet( \
+					epochOffsetSeconds = self.epochOffsetSeconds, useCurrentTime = self.useCurrentTime, \
+					startHour = startHour, endHour = endHour, totalDataPoints = totalDataPoints, \
+					curveDenominator = self._getCurveDenominator(curveType), noiseLevel = noiseLevel, \
+					minValue = minValue, maxValue = maxValue, chunkSize = self.chunkSize, \
+					seed = int(self.randomGenerator.integers(0, 2 ** 32)))
+		
+		# the noise has its own stream, seeded by a single draw that's made whether
+		# or not the cache is hit - so this generator's stream state (and every
+		# data set it generates later) doesn't depend on the cache state
+		noiseSeed = int(self.randomGenerator.integers(0, 2 ** 63))
+		
+		# check the cache before generating anything
+		cacheParams = None
+		
+		if self.dataSetCache and (self.isSeeded or noiseLevel == self.NO_NOISE):
+			cacheParams = { \
+				'curveType': curveType, 'noiseLevel': noiseLevel, \
+				'minValue': float(minValue), 'maxValue': float(maxValue), \
+				'startHour': startHour, 'endHour': endHour, 'totalDataPoints': totalDataPoints, \
+				'alignGeneratorToDay': self.alignGeneratorToDay }
+			
+			if noiseLevel != self.NO_NOISE:
+				# the noise depends on the stream's seed and its position in the stream
+				seedSequence = self.randomGenerator.bit_generator.seed_seq
+				
+				cacheParams['seedEntropy']  = str(getattr(seedSequence, 'entropy', None))
+				cacheParams['seedSpawnKey'] = [int(key) for key in getattr(seedSequence, 'spawn_key', ())]
+				cacheParams['noiseSeed']    = noiseSeed
+			
+			dataSet = \
+				self.dataSetCache.loadDataSet( \
+					cacheParams, epochOffsetSeconds = self.epochOffsetSeconds, useCurrentTime = self.useCurrentTime)
+			
+			if dataSet:
+				return dataSet
+		
 		# create evenly spaced number of 'totalDataPoints' between 'startHour' and 'endHour'
 		timeEntries = calcLib.linspace(start = startHour, stop = endHour, num = totalDataPoints)
 		
 		# generate the distribution data for each point - quick ramp up curve
 		# followed by a more gradual ramp down
-		if self.alignGeneratorToDay:
-			if curveType > 0:
-				denominator = (curveType + self.dayDenominator)
-			elif curveType == 0:
-				denominator = self.dayDenominator
-			else:
-				denominator = abs(curveType) * self.dayDenominator
-				
-			dataValuesClean = calcLib.sin(timeEntries / denominator)
-		else:
-			if curveType > 0:
-				denominator = curveType
-			elif curveType == 0:
-				denominator = 1
-			else:
-				denominator = 1 / abs(curveType)
-				
-			dataValuesClean = calcLib.sin(timeEntries / denominator)
+		dataValuesClean = calcLib.sin(timeEntries / self._getCurveDenominator(curveType))
 		
 		# re-scale array with 'minValue' as floor and 'maxValue' as ceiling
 		scaledValuesClean = calcLib.interp(dataValuesClean, (dataValuesClean.min(), dataValuesClean.max()), (minValue, maxValue))
@@ -351,7 +397,7 @@ class SensorDataGenerator(object):
 			# the generated noisyness aligns with the magnitude of the values
 			meanMag = int(math.log10(meanValue))
 			noiseScale = ((noiseLevel / 100) * ((10 ** meanMag) / 10))
-			noisyTemp = calcLib.random.normal(0, noiseScale, len(scaledValuesClean))
+			noisyTemp = Generator(PCG64(noiseSeed)).normal(0, noiseScale, len(scaledValuesClean))
 			
 			logging.debug("Noise=%f; Noise Scale=%f; Mean Magnitude=%f" % (noiseLevel, noiseScale, meanMag))
 			
@@ -362,8 +408,62 @@ class SensorDataGenerator(object):
 		else:
 			dataSet.setDataEntries(scaledValuesClean)
 		
+		if cacheParams:
+			self.dataSetCache.storeDataSet(cacheParams, dataSet)
+		
 		return dataSet
 		
+	def generateSensorDataSetBatch(self, dataSetSpecs: list = None, maxWorkers: int = None) -> list:
+		"""
+		Generates a batch of data sets in parallel using a process pool. Each
+		spec is a dict of generateDailySensorDataSet() parameters, e.g.
+		{'curveType': SensorDataGenerator.BELL_CURVE, 'minValue': 35.0, 'maxValue': 45.0, 'useSeconds': True}.
+		
+		Each worker writes its time and data entries into a shared memory block,
+		which is read (and released) here, instead of pickling the arrays back
+		to this process.
+		
+		Each spec gets its own random stream, spawned from this generator's
+		random generator in spec order, so the results are the same regardless
+		of the number of workers or the order in which the workers finish.
+		
+		@param dataSetSpecs The list of data set specs (dicts).
+		@param maxWorkers The maximum number of worker processes. Defaults to None
+		(the number of CPUs).
+		@return list The list of SensorDataSet instances, in the same order as
+		dataSetSpecs. Any spec that fails will have a None entry.
+		"""
+		if not dataSetSpecs:
+			return []
+		
+		seedSequences = SeedSequence(int(self.randomGenerator.integers(0, 2 ** 63))).spawn(len(dataSetSpecs))
+		dataSets = [None] * len(dataSetSpecs)
+		
+		# start the resource tracker before the workers are created, so they
+		# share it - otherwise each worker's tracker reports the blocks it
+		# created (and that are unlinked here) as leaked
+		resource_tracker.ensure_running()
+		
+		with ProcessPoolExecutor(max_workers = maxWorkers) as executor:
+			futures = {}
+			
+			for i, dataSetSpec in enumerate(dataSetSpecs):
+				future = \
+					executor.submit( \
+						_generateSharedSensorDataSet, dataSetSpec, seedSequences[i], self.alignGeneratorToDay)
+				futures[future] = i
+			
+			for future in as_completed(futures):
+				i = futures[future]
+				
+				try:
+					sharedMemoryName, entryCount = future.result()
+					dataSets[i] = self._loadSharedSensorDataSet(sharedMemoryName, entryCount)
+				except Exception as e:
+					logging.warning("Failed to generate data set for spec %s: %s", str(dataSetSpecs[i]), str(e))
+		
+		return dataSets
+	
 	def generateOnScreenGraph(self, dataSet = None, chartTitle: str = "Sample Data", chartXLabel: str = "X Axis", chartYLabel: str = "Y Axis"):
 		"""
 		A simple graph generator using the title info passed in
@@ -372,19 +472,73 @@ class SensorDataGenerator(object):
 		This will generate a graph, so there must be a window manager
 		running on the system for this to function correctly.
 		
+		The plotting library is loaded on first use only, so headless
+		processes that import this module never pay for it.
+		
 		@param dataSet The SensorDataSet instance.
 		@param chartTitle The string representing the title of the chart. Should be no more than 100 characters.
 		@param chartXLabel The string to use for the X Label.
 		@param chartYLabel The string to use for the Y Label.
 		"""
-		self.plotter = plotLib
+		if not self.visualizer:
+			vizModule = import_module('labbenchstudios.pdt.edge.simulation.SensorDataVisualizer', 'SensorDataVisualizer')
+			vizClazz = getattr(vizModule, 'SensorDataVisualizer')
+			self.visualizer = vizClazz()
+		
+		self.visualizer.generateOnScreenGraph( \
+			dataSet = dataSet, chartTitle = chartTitle, chartXLabel = chartXLabel, chartYLabel = chartYLabel)
+		
+	def _getCurveDenominator(self, curveType: int = FULL_WAVE) -> float:
+		"""
+		Returns the divisor to apply to each time entry before calculating its
+		sine value, based on the curve type and day alignment setting.
+		
+		@param curveType The type of curve - FULL_WAVE, CURVE_UP, CURVE_DOWN,
+		BELL_CURVE, INVERSE_CURVE.
+		@return float
+		"""
+		if self.alignGeneratorToDay:
+			if curveType > 0:
+				return (curveType + self.dayDenominator)
+			elif curveType == 0:
+				return self.dayDenominator
+			else:
+				return abs(curveType) * self.dayDenominator
+		else:
+			if curveType > 0:
+				return curveType
+			elif curveType == 0:
+				return 1
+			else:
+				return 1 / abs(curveType)
+		
+	def _loadSharedSensorDataSet(self, sharedMemoryName: str, entryCount: int):
+		"""
+		Creates a SensorDataSet from the time and data entries in the named
+		shared memory block (written by a batch worker), and then releases it.
+		
+		@param sharedMemoryName The name of the shared memory block.
+		@param entryCount The number of time (and data) entries.
+		@return SensorDataSet
+		"""
+		sharedMemory = SharedMemory(name = sharedMemoryName)
+		
+		try:
+			sharedEntries = calcLib.ndarray((2, entryCount), dtype = calcLib.float64, buffer = sharedMemory.buf)
+			
+			timeEntries = sharedEntries[0].copy()
+			dataEntries = sharedEntries[1].copy()
+			
+			# the view must be released before the shared memory can be closed
+			del sharedEntries
+		finally:
+			sharedMemory.close()
+			sharedMemory.unlink()
 		
-		self.plotter.plot(dataSet.getTimeEntries(), dataSet.getDataEntries())
-		self.plotter.title(chartTitle)
-		self.plotter.ylabel(chartYLabel)
-		self.plotter.xlabel(chartXLabel)
-		self.plotter.grid(True, which = 'both')
-		self.plotter.show()
+		return \
+			SensorDataSet( \
+				epochOffsetSeconds = self.epochOffsetSeconds, useCurrentTime = self.useCurrentTime, \
+				timeEntries = timeEntries, dataEntries = dataEntries)
 		
 
 from time import time, ctime
@@ -426,7 +580,7 @@ class SensorDataSet():
 		
 		self.currentTimeStamp = ctime(self.currentTime)
 		
-		logging.info("Current time set to: " + self.currentTimeStamp)
+		logging.info("Current time set to: %s", self.currentTimeStamp)
 			
 		self.setTimeEntries(timeEntries)
 		self.setDataEntries(dataEntries)
@@ -504,8 +658,9 @@ class SensorDataSet():
 		(evenly spaced from start to end) that should correspond to dataEntries - element by element.
 		"""
 		if not timeEntries is None:
-			# data generator uses a single dimension array, so it's safe to flatten
-			self.timeEntries = timeEntries.flatten()
+			# data generator uses a single dimension array, so it's safe to flatten -
+			# ravel() avoids copying (e.g. memory mapped) arrays that are already flat
+			self.timeEntries = timeEntries.ravel()
 			logging.info("timeEntries tuple. Array Size: %s  ND Size: %s  Dimensions: %s  Shape: %s  Type: %s", self.timeEntries.size, timeEntries.size, timeEntries.ndim, timeEntries.shape, timeEntries.dtype)
 		
 	def setDataEntries(self, dataEntries):
@@ -516,10 +671,299 @@ class SensorDataSet():
 		that should correspond to timeEntries - element by element.
 		"""
 		if not dataEntries is None:
-			# data generator uses a single dimension array, so it's safe to flatten
-			self.dataEntries = dataEntries.flatten()
+			# data generator uses a single dimension array, so it's safe to flatten -
+			# ravel() avoids copying (e.g. memory mapped) arrays that are already flat
+			self.dataEntries = dataEntries.ravel()
 			logging.info("dataEntries tuple. Array Size: %s  ND Size: %s  Dimensions: %s  Shape: %s  Type: %s", self.dataEntries.size, dataEntries.size, dataEntries.ndim, dataEntries.shape, dataEntries.dtype)
 		
+class ChunkedSensorDataSet(SensorDataSet):
+	"""
+	Lazy variant of SensorDataSet that generates its time and data entries
+	in fixed-size chunks on demand, using the same curve parameters as
+	SensorDataGenerator.generateDailySensorDataSet().
+	
+	Only the most recently accessed chunk is held in memory, so memory use
+	is bounded by the chunk size instead of the simulated time horizon.
+	Entries can be accessed in any order via getTimeEntry() and getDataEntry().
+	
+	The scaling of each chunk uses the min, max and mean of the full (clean)
+	curve, which are calculated in a single chunked pass on creation, so
+	the clean values are identical to those of the equivalent eager data set.
+	Noise for each chunk is seeded from 'seed' and the chunk index, so it is
+	repeatable regardless of access order.
+	
+	NOTE: getTimeEntries() and getDataEntries() are supported for compatibility
+	(e.g. graphing), but will materialize the full arrays.
+	"""
+	
+	DEFAULT_CHUNK_SIZE = 1024
+	
+	def __init__(self, \
+			epochOffsetSeconds: float = 0.0, useCurrentTime: bool = True, \
+			startHour: int = 0, endHour: int = 24, totalDataPoints: int = 1, curveDenominator: float = 1.0, \
+			noiseLevel: int = 0, minValue: float = 0.0, maxValue: float = 100.0, \
+			chunkSize: int = DEFAULT_CHUNK_SIZE, seed: int = None):
+		"""
+		Constructor.
+		
+		@param epochOffsetSeconds See SensorDataSet.
+		@param useCurrentTime See SensorDataSet.
+		@param startHour The beginning hour of the curve.
+		@param endHour The ending hour of the curve.
+		@param totalDataPoints The number of evenly spaced entries between startHour and endHour.
+		@param curveDenominator The divisor applied to each time entry before calculating its sine.
+		@param noiseLevel Any positive integer between 0 (no noise) and 100 (max noise).
+		@param minValue The floor of the (clean) data values.
+		@param maxValue The ceiling of the (clean) data values.
+		@param chunkSize The number of entries to generate at a time.
+		@param seed The base seed for the noise generator. If None, a random seed will be used.
+		"""
+		super(ChunkedSensorDataSet, self).__init__(epochOffsetSeconds = epochOffsetSeconds, useCurrentTime = useCurrentTime)
+		
+		self.startHour = startHour
+		self.endHour = endHour
+		self.totalDataPoints = max(1, totalDataPoints)
+		self.curveDenominator = curveDenominator
+		self.noiseLevel = noiseLevel
+		self.minValue = minValue
+		self.maxValue = maxValue
+		self.chunkSize = chunkSize if chunkSize > 0 else self.DEFAULT_CHUNK_SIZE
+		self.seed = seed if seed is not None else int(Generator(PCG64()).integers(0, 2 ** 32))
+		
+		self.timeStep = 0.0
+		
+		if self.totalDataPoints > 1:
+			self.timeStep = (endHour - startHour) / (self.totalDataPoints - 1)
+		
+		self.chunkIndex = -1
+		self.timeChunk = None
+		self.dataChunk = None
+		
+		self._initCurveStats()
+		
+		logging.info( \
+			"Chunked data set. Size: %s  Chunk Size: %s  Chunks: %s", \
+			self.totalDataPoints, self.chunkSize, self.getChunkCount())
+	
+	def getChunkDataEntries(self, chunkIndex: int = 0):
+		"""
+		Returns the data entries of 'chunkIndex', generating them if they're
+		not the currently held chunk.
+		
+		@param chunkIndex The chunk to retrieve.
+		@return ndarray
+		"""
+		return self._getChunk(chunkIndex)[1]
+	
+	def getChunkCount(self) -> int:
+		"""
+		Returns the number of chunks needed to cover all entries.
+		
+		@return int
+		"""
+		return (self.totalDataPoints + self.chunkSize - 1) // self.chunkSize
+	
+	def getChunkSize(self) -> int:
+		"""
+		Returns the maximum number of entries generated at a time.
+		
+		@return int
+		"""
+		return self.chunkSize
+	
+	def getTimeEntries(self):
+		"""
+		Returns the full time entries array. This will materialize all entries.
+		"""
+		return self._calcTimeEntries(0, self.totalDataPoints)
+	
+	def getTimeEntry(self, index: int = 0) -> float:
+		"""
+		Returns the float value at 'index' in the time entries array.
+		If index is < 0 or > size - 1, 0 will be used.
+		
+		@return float
+		"""
+		if index < 0 or index > self.totalDataPoints - 1:
+			index = 0
+		
+		return self._getChunk(index // self.chunkSize)[0][index % self.chunkSize]
+	
+	def getDataEntries(self):
+		"""
+		Returns the full data entries array. This will materialize all entries.
+		"""
+		return calcLib.concatenate([self._calcChunk(i)[1] for i in range(self.getChunkCount())])
+	
+	def getDataEntry(self, index = 0) -> float:
+		"""
+		Returns the float value at 'index' in the data entries array.
+		If index is < 0 or > size - 1, 0 will be used.
+		
+		@return float
+		"""
+		if index < 0 or index > self.totalDataPoints - 1:
+			index = 0
+		
+		return self._getChunk(index // self.chunkSize)[1][index % self.chunkSize]
+	
+	def getDataEntryCount(self) -> int:
+		"""
+		Returns the number of data entries.
+		
+		@return int
+		"""
+		return self.totalDataPoints
+	
+	def _calcChunk(self, chunkIndex: int) -> tuple:
+		"""
+		Generates the time and data entries for 'chunkIndex'.
+		
+		@param chunkIndex The chunk to generate.
+		@return tuple The (time entries, data entries) arrays for the chunk.
+		"""
+		startIndex = chunkIndex * self.chunkSize
+		endIndex = min(startIndex + self.chunkSize, self.totalDataPoints)
+		
+		timeEntries = self._calcTimeEntries(startIndex, endIndex)
+		dataEntries = calcLib.interp( \
+			calcLib.sin(timeEntries / self.curveDenominator), (self.curveMin, self.curveMax), (self.minValue, self.maxValue))
+		
+		if self.noiseScale > 0.0:
+			noiseGenerator = Generator(PCG64([self.seed, chunkIndex]))
+			dataEntries = dataEntries + noiseGenerator.normal(0, self.noiseScale, len(dataEntries))
+		
+		return (timeEntries, dataEntries)
+	
+	def _calcTimeEntries(self, startIndex: int, endIndex: int):
+		"""
+		Generates the time entries from 'startIndex' up to (but not including)
+		'endIndex', using the same spacing as numpy.linspace().
+		
+		@param startIndex The first index.
+		@param endIndex The index after the last.
+		@return ndarray
+		"""
+		timeEntries = calcLib.arange(startIndex, endIndex) * self.timeStep + self.startHour
+		
+		# linspace sets the final entry to the end value exactly
+		if endIndex == self.totalDataPoints and self.totalDataPoints > 1:
+			timeEntries[-1] = self.endHour
+		
+		return timeEntries
+	
+	def _getChunk(self, chunkIndex: int) -> tuple:
+		"""
+		Returns the time and data entries for 'chunkIndex', generating
+		them if they're not the currently held chunk.
+		
+		@param chunkIndex The chunk to retrieve.
+		@return tuple The (time entries, data entries) arrays for the chunk.
+		"""
+		if chunkIndex != self.chunkIndex:
+			self.timeChunk, self.dataChunk = self._calcChunk(chunkIndex)
+			self.chunkIndex = chunkIndex
+		
+		return (self.timeChunk, self.dataChunk)
+	
+	def _initCurveStats(self):
+		"""
+		Calculates the min and max of the raw curve, and the noise scale
+		based on the mean of the scaled curve, one chunk at a time.
+		
+		"""
+		self.curveMin = None
+		self.curveMax = None
+		self.noiseScale = 0.0
+		
+		for chunkIndex in range(self.getChunkCount()):
+			startIndex = chunkIndex * self.chunkSize
+			rawValues = calcLib.sin(self._calcTimeEntries(startIndex, min(startIndex + self.chunkSize, self.totalDataPoints)) / self.curveDenominator)
+			
+			self.curveMin = rawValues.min() if self.curveMin is None else min(self.curveMin, rawValues.min())
+			self.curveMax = rawValues.max() if self.curveMax is None else max(self.curveMax, rawValues.max())
+		
+		if self.noiseLevel != SensorDataGenerator.NO_NOISE:
+			scaledSum = 0.0
+			
+			for chunkIndex in range(self.getChunkCount()):
+				startIndex = chunkIndex * self.chunkSize
+				rawValues = calcLib.sin(self._calcTimeEntries(startIndex, min(startIndex + self.chunkSize, self.totalDataPoints)) / self.curveDenominator)
+				scaledSum += calcLib.interp(rawValues, (self.curveMin, self.curveMax), (self.minValue, self.maxValue)).sum()
+			
+			meanMag = int(math.log10(scaledSum / self.totalDataPoints))
+			self.noiseScale = ((self.noiseLevel / 100) * ((10 ** meanMag) / 10))
+		
+def _generateSharedSensorDataSet(dataSetSpec: dict, seedSequence: SeedSequence, alignGeneratorToDay: bool = True) -> tuple:
+	"""
+	Batch worker function (see SensorDataGenerator.generateSensorDataSetBatch()).
+	Generates the data set for 'dataSetSpec' and writes its time and data
+	entries into a new shared memory block.
+	
+	@param dataSetSpec The dict of generateDailySensorDataSet() parameters.
+	@param seedSequence The seed sequence for this spec's random stream.
+	@param alignGeneratorToDay See SensorDataGenerator.
+	@return tuple The (shared memory block name, entry count).
+	"""
+	dataGenerator = \
+		SensorDataGenerator(alignGeneratorToDay = alignGeneratorToDay, randomGenerator = Generator(PCG64(seedSequence)))
+	dataSet = dataGenerator.generateDailySensorDataSet(**dataSetSpec)
+	
+	entryCount = dataSet.getDataEntryCount()
+	sharedMemory = SharedMemory(create = True, size = 2 * entryCount * calcLib.dtype(calcLib.float64).itemsize)
+	
+	try:
+		sharedEntries = calcLib.ndarray((2, entryCount), dtype = calcLib.float64, buffer = sharedMemory.buf)
+		sharedEntries[0] = dataSet.getTimeEntries()
+		sharedEntries[1] = dataSet.getDataEntries()
+		
+		del sharedEntries
+	finally:
+		# the caller is responsible for unlinking the block
+		sharedMemory.close()
+	
+	return (sharedMemory.name, entryCount)
+
+def runBatchBenchmark():
+	"""
+	Benchmark for generateSensorDataSetBatch(), reporting the time to generate
+	a batch of week-long, second resolution data sets using 1 worker up to
+	the number of CPUs.
+	
+	"""
+	logging.basicConfig(format = '%(asctime)s:%(levelname)s:%(message)s', level = logging.WARNING)
+	
+	dataSetSpecs = []
+	
+	for curveType in (SensorDataGenerator.FULL_WAVE, SensorDataGenerator.BELL_CURVE, SensorDataGenerator.INVERSE_CURVE, SensorDataGenerator.CURVE_UP):
+		for i in range(2):
+			dataSetSpecs.append({'curveType': curveType, 'minValue': 10.0, 'maxValue': 30.0, 'endHour': SensorDataGenerator.MAX_HOURS, 'useSeconds': True})
+	
+	cpuCount = os.cpu_count() or 1
+	workerCounts = sorted(set([1, 2, 4, 8, cpuCount]))
+	
+	print("CPUs: %d  Data sets: %d  Entries per data set: %d" % (cpuCount, len(dataSetSpecs), SensorDataGenerator.MAX_HOURS * 3600))
+	
+	dataGenerator = SensorDataGenerator(randomGenerator = Generator(PCG64(0)))
+	
+	startTime = time()
+	
+	for dataSetSpec in dataSetSpecs:
+		dataGenerator.generateDailySensorDataSet(**dataSetSpec)
+	
+	print("Sequential   Batch time (sec): %8.3f" % (time() - startTime))
+	
+	for workerCount in workerCounts:
+		if workerCount > cpuCount:
+			continue
+		
+		dataGenerator = SensorDataGenerator(randomGenerator = Generator(PCG64(0)))
+		
+		startTime = time()
+		dataGenerator.generateSensorDataSetBatch(dataSetSpecs, maxWorkers = workerCount)
+		
+		print("Workers: %2d  Batch time (sec): %8.3f" % (workerCount, time() - startTime))
+	
 def main():
 	"""
 	Main function definition for running as an application.
@@ -552,5 +996,8 @@ if __name__ == '__main__':
 	Attribute definition for when invoking as app via command line
 	
 	"""
-	main()
+	if '--benchmark' in sys.argv:
+		runBatchBenchmark()
+	else:
+		main()
 	
\ No newline at end of file
@@ -0,0 +1,395 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import json
+import logging
+import os
+import threading
+
+from time import monotonic
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.IDataMessageListener import IDataMessageListener
+from labbenchstudios.pdt.edge.system.BaseSensorTask import BaseSensorTask
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+
+class SensorDataReplayTask(BaseSensorTask):
+	"""
+	Sensor task that replays previously recorded SensorData from a JSON
+	file in the 'sensorDataList' format used by the files in simTestData.
+
+	The file is parsed incrementally - one record at a time - so memory
+	use is bounded by the read chunk size, not the size of the file.
+
+	The 'timeOffsetSeconds' of each record is honored based on the
+	playback rate:
+	  REAL_TIME (1.0): records are released as their offset elapses.
+	  N (> 1.0): records are released N times faster than recorded.
+	  AS_FAST_AS_POSSIBLE (0.0): each call releases the next record.
+
+	When timed (REAL_TIME or N), generateTelemetry() samples and holds,
+	as a physical sensor would: each call returns the latest record that
+	is due, so if more than one record became due since the previous call,
+	the earlier ones are skipped (see getSkippedRecordCount()). Use
+	replay() - or AS_FAST_AS_POSSIBLE - to receive every record in order.
+
+	The name, type ID and type category ID of the generated SensorData
+	are those of this task (not the recorded values), which allows this
+	task to be used in place of the equivalent sensor sim task.
+	"""
+
+	AS_FAST_AS_POSSIBLE = 0.0
+	REAL_TIME = 1.0
+
+	DEFAULT_CHUNK_SIZE = 64 * 1024
+
+	SENSOR_DATA_LIST_KEY = 'sensorDataList'
+	TIME_OFFSET_SECONDS_KEY = 'timeOffsetSeconds'
+
+	HUMIDITY_DATA_FILE_NAME = 'PIOT_SimulatedTestData_IndoorHumidity.json'
+	PRESSURE_DATA_FILE_NAME = 'PIOT_SimulatedTestData_EnvironmentPressure.json'
+	TEMP_DATA_FILE_NAME     = 'PIOT_SimulatedTestData_IndoorTemperature.json'
+
+	def __init__(self, \
+			dataFileName: str = None, \
+			name: str = ConfigConst.NOT_SET, \
+			typeID: int = ConfigConst.DEFAULT_SENSOR_TYPE, \
+			typeCategoryID: int = ConfigConst.DEFAULT_TYPE_CATEGORY_ID, \
+			playbackRate: float = REAL_TIME, \
+			chunkSize: int = DEFAULT_CHUNK_SIZE):
+		"""
+		Constructor.
+
+		@param dataFileName The fully qualified name of the JSON file to replay.
+		@param name The name to use for the generated SensorData.
+		@param typeID The type ID to use for the generated SensorData.
+		@param typeCategoryID The type category ID to use for the generated SensorData.
+		@param playbackRate The playback rate multiplier. Defaults to REAL_TIME.
+		Use AS_FAST_AS_POSSIBLE (or any value <= 0) to ignore the recorded offsets.
+		@param chunkSize The number of characters to read from the file at a time.
+		"""
+		super( \
+			SensorDataReplayTask, self).__init__( \
+				name = name, \
+				typeID = typeID, \
+				typeCategoryID = typeCategoryID)
+
+		# the base class enables the randomizer when there's no data set
+		self.useRandomizer = False
+
+		self.dataFileName = dataFileName
+		self.playbackRate = playbackRate if playbackRate > 0.0 else self.AS_FAST_AS_POSSIBLE
+		self.chunkSize = chunkSize if chunkSize > 0 else self.DEFAULT_CHUNK_SIZE
+
+		self.recordCount = 0
+		self.rolloverCount = 0
+		self.skippedRecordCount = 0
+		self.stopEvent = threading.Event()
+
+		self._resetReplayState()
+
+	def generateTelemetry(self) -> SensorData:
+		"""
+		Creates a SensorData instance from the replayed record that is
+		current for the configured playback rate. When timed, any records
+		that became due before it since the previous call are skipped.
+
+		If the end of the file is reached, replay will start over from
+		the beginning if data rollover is enabled (default); otherwise,
+		the last record will continue to be used.
+
+		@return The SensorData instance, or None if the file has no records.
+		"""
+		if self.playbackRate == self.AS_FAST_AS_POSSIBLE or not self.currentRecord:
+			record = self._nextRecord()
+
+			if record:
+				self.currentRecord = record
+
+				# the first record establishes the replay time base
+				self._getRecordOffset(record)
+				self.replayStartTime = monotonic()
+		else:
+			elapsedOffset = (monotonic() - self.replayStartTime) * self.playbackRate
+			rolloverCount = self.rolloverCount
+			advanceCount = 0
+
+			while True:
+				if not self.pendingRecord:
+					self.pendingRecord = self._nextRecord()
+
+				if not self.pendingRecord:
+					break
+
+				if self.rolloverCount != rolloverCount:
+					# the rollover reset the replay time base, so 'elapsedOffset'
+					# is stale - restart from the first record, and let the next
+					# call catch up against the new time base
+					self.currentRecord = self.pendingRecord
+					self.pendingRecord = None
+					advanceCount += 1
+
+					self._getRecordOffset(self.currentRecord)
+
+					break
+
+				if self._getRecordOffset(self.pendingRecord) > elapsedOffset:
+					break
+
+				self.currentRecord = self.pendingRecord
+				self.pendingRecord = None
+				advanceCount += 1
+
+			# only the last record advanced to is returned
+			if advanceCount > 1:
+				self.skippedRecordCount += advanceCount - 1
+
+		if not self.currentRecord:
+			logging.warning("No replay records available from file: %s", self.dataFileName)
+
+			return None
+
+		self.latestSensorData = self._createSensorData(self.currentRecord)
+
+		return self.latestSensorData
+
+	def getPlaybackRate(self) -> float:
+		"""
+		Returns the playback rate multiplier.
+
+		@return float
+		"""
+		return self.playbackRate
+
+	def getReplayedRecordCount(self) -> int:
+		"""
+		Returns the number of records read from the file so far (across
+		all rollovers).
+
+		@return int
+		"""
+		return self.recordCount
+
+	def getSkippedRecordCount(self) -> int:
+		"""
+		Returns the number of records that became due but were never
+		returned by generateTelemetry(), as a later record was also due
+		by the time it was called (timed playback only).
+
+		@return int
+		"""
+		return self.skippedRecordCount
+
+	def replay(self, listener: IDataMessageListener = None, maxRecords: int = 0) -> int:
+		"""
+		Pushes each record from the file to the listener's handleSensorMessage()
+		callback, pacing the calls using the recorded offsets and the playback
+		rate. This blocks the calling thread until the file has been replayed,
+		'maxRecords' have been sent, or stopReplay() is called.
+
+		Data rollover is ignored - the file is replayed once.
+
+		@param listener The data message listener to receive each SensorData.
+		@param maxRecords The maximum number of records to replay. 0 (default) means no limit.
+		@return int The number of records replayed.
+		"""
+		self.stopEvent.clear()
+
+		sentCount = 0
+		startTime = monotonic()
+		baseOffset = None
+
+		for record in self._readRecords():
+			if self.stopEvent.is_set():
+				break
+
+			if self.playbackRate != self.AS_FAST_AS_POSSIBLE:
+				offset = self._getRecordOffset(record)
+
+				if baseOffset is None:
+					baseOffset = offset
+
+				delay = startTime + ((offset - baseOffset) / self.playbackRate) - monotonic()
+
+				if delay > 0.0 and self.stopEvent.wait(delay):
+					break
+
+			self.currentRecord = record
+			self.latestSensorData = self._createSensorData(record)
+
+			if listener:
+				listener.handleSensorMessage(self.latestSensorData)
+
+			sentCount += 1
+
+			if maxRecords > 0 and sentCount >= maxRecords:
+				break
+
+		logging.info("Replayed %s records from file: %s", sentCount, self.dataFileName)
+
+		return sentCount
+
+	def resetReplay(self):
+		"""
+		Restarts the replay from the beginning of the file.
+
+		"""
+		self._resetReplayState()
+
+	def stopReplay(self):
+		"""
+		Interrupts a blocking replay() call.
+
+		"""
+		self.stopEvent.set()
+
+	def _createSensorData(self, record: dict) -> SensorData:
+		"""
+		Creates a SensorData instance using this task's name and type
+		information, and the recorded value.
+
+		@param record The record dict read from the file.
+		@return SensorData
+		"""
+		sensorData = SensorData(typeID = self.typeID, typeCategoryID = self.typeCategoryID, name = self.name)
+		sensorData.setValue(self._generateSensorReading(record.get(ConfigConst.VALUE_PROP, ConfigConst.DEFAULT_VAL)))
+
+		return sensorData
+
+	def _getRecordOffset(self, record: dict) -> float:
+		"""
+		Returns the recorded offset of 'record' relative to the first record.
+
+		@param record The record dict read from the file.
+		@return float The offset in seconds.
+		"""
+		offset = float(record.get(self.TIME_OFFSET_SECONDS_KEY, 0.0))
+
+		if self.baseOffset is None:
+			self.baseOffset = offset
+
+		return offset - self.baseOffset
+
+	def _nextRecord(self) -> dict:
+		"""
+		Returns the next record from the file, starting over from the
+		beginning if the end is reached and data rollover is enabled.
+
+		@return dict The next record, or None if there are no more records.
+		"""
+		for attempt in range(2):
+			try:
+				return next(self.recordIter)
+			except StopIteration:
+				if not self.enableDataRoll or attempt > 0:
+					return None
+
+				logging.debug("End of replay file reached. Rolling over: %s", self.dataFileName)
+
+				self.rolloverCount += 1
+
+				self._resetReplayState()
+
+		return None
+
+	def _readRecords(self):
+		"""
+		Generator that incrementally parses the 'sensorDataList' array
+		within the file, yielding one record dict at a time.
+
+		The file is read in 'chunkSize' blocks and each record is decoded
+		using JSONDecoder.raw_decode(), so only the current (partial) record
+		is held in memory.
+		"""
+		if not self.dataFileName or not os.path.isfile(self.dataFileName):
+			logging.warning("Replay file doesn't exist: %s", self.dataFileName)
+			return
+
+		decoder = json.JSONDecoder()
+
+		with open(self.dataFileName, 'r', encoding = 'utf-8') as dataFile:
+			buf = ''
+			pos = 0
+			eof = False
+			inList = False
+
+			while True:
+				if not inList:
+					keyPos = buf.find('"' + self.SENSOR_DATA_LIST_KEY + '"')
+					listPos = buf.find('[', keyPos) if keyPos >= 0 else -1
+
+					if listPos >= 0:
+						inList = True
+						pos = listPos + 1
+					elif eof:
+						logging.warning("No '%s' array found in replay file: %s", self.SENSOR_DATA_LIST_KEY, self.dataFileName)
+						return
+
+				if inList:
+					# skip whitespace and separators between records
+					while pos < len(buf) and buf[pos] in ' \t\r\n,':
+						pos += 1
+
+					if pos < len(buf):
+						if buf[pos] == ']':
+							return
+
+						try:
+							record, pos = decoder.raw_decode(buf, pos)
+
+							self.recordCount += 1
+
+							yield record
+
+							continue
+						except json.JSONDecodeError:
+							if eof:
+								logging.warning("Truncated record in replay file: %s", self.dataFileName)
+								return
+					elif eof:
+						return
+
+					# discard what's been consumed before reading more
+					buf = buf[pos:]
+					pos = 0
+
+				chunk = dataFile.read(self.chunkSize)
+
+				if chunk:
+					buf += chunk
+				else:
+					eof = True
+
+	def _resetReplayState(self):
+		"""
+		Resets the record iterator and timing state.
+
+		"""
+		self.recordIter = self._readRecords()
+		self.currentRecord = None
+		self.pendingRecord = None
+		self.baseOffset = None
+		self.replayStartTime = monotonic()
@@ -0,0 +1,209 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+import numpy as calcLib
+
+from labbenchstudios.pdt.edge.simulation.SensorDataGenerator import SensorDataSet
+
+class SensorDataSetCache():
+	"""
+	File-based cache for the time and data entry arrays of a SensorDataSet.
+	
+	Each data set is stored as a pair of .npy files named using a digest
+	of the generator parameters that produced it (curve type, noise level,
+	min / max, resolution, seed, etc.). Cached arrays are loaded using a
+	read-only memory map, so the OS will page in only the entries that
+	are actually read by a sensor task.
+	
+	NOTE: A data set generated with noise is only cached if the generator's
+	random stream is seeded (see SensorDataGenerator). Its key then also
+	includes the stream's seed entropy and spawn key, and the noise seed
+	drawn from the stream for that data set - so a cached noisy data set is
+	only reused by a run that would have generated the same noise.
+	"""
+	
+	CACHE_VERSION = 1
+	
+	DEFAULT_CACHE_PATH = os.path.join(tempfile.gettempdir(), 'pdt-sim-data-cache')
+	
+	TIME_ENTRIES_SUFFIX = '.time.npy'
+	DATA_ENTRIES_SUFFIX = '.data.npy'
+	
+	def __init__(self, cachePath: str = None):
+		"""
+		Constructor.
+		
+		@param cachePath The directory to store the cached data sets in.
+		Defaults to DEFAULT_CACHE_PATH. Will be created if it doesn't exist.
+		"""
+		self.cachePath = cachePath if cachePath else self.DEFAULT_CACHE_PATH
+		
+		try:
+			os.makedirs(self.cachePath, exist_ok = True)
+		except OSError as e:
+			logging.warning("Failed to create sim data cache path %s: %s", self.cachePath, str(e))
+	
+	def clearCache(self) -> int:
+		"""
+		Removes all cached data set files from the cache path.
+		
+		@return int The number of files removed.
+		"""
+		removeCount = 0
+		
+		if os.path.isdir(self.cachePath):
+			for fileName in os.listdir(self.cachePath):
+				if fileName.endswith(self.TIME_ENTRIES_SUFFIX) or fileName.endswith(self.DATA_ENTRIES_SUFFIX):
+					try:
+						os.remove(os.path.join(self.cachePath, fileName))
+						removeCount += 1
+					except OSError as e:
+						logging.warning("Failed to remove cached data set file %s: %s", fileName, str(e))
+		
+		return removeCount
+	
+	def getCacheKey(self, params: dict) -> str:
+		"""
+		Returns the cache key for the given generator parameters.
+		
+		@param params The dict of generator parameters. Values must be JSON serializable.
+		@return str The hex digest to use as the cache key.
+		"""
+		keyData = dict(params)
+		keyData['cacheVersion'] = self.CACHE_VERSION
+		
+		return hashlib.sha1(json.dumps(keyData, sort_keys = True).encode('utf-8')).hexdigest()
+	
+	def getCachePath(self) -> str:
+		"""
+		Returns the directory used to store the cached data sets.
+		
+		@return str
+		"""
+		return self.cachePath
+	
+	def hasDataSet(self, params: dict) -> bool:
+		"""
+		Checks if a data set for the given generator parameters is cached.
+		
+		@param params The dict of generator parameters.
+		@return bool True if cached; False otherwise.
+		"""
+		timeFileName, dataFileName = self._getFileNames(params)
+		
+		return os.path.isfile(timeFileName) and os.path.isfile(dataFileName)
+	
+	def loadDataSet(self, params: dict, epochOffsetSeconds: float = 0.0, useCurrentTime: bool = True) -> SensorDataSet:
+		"""
+		Loads the cached data set for the given generator parameters, if it exists.
+		The time and data entries will be read-only memory mapped arrays.
+		
+		@param params The dict of generator parameters.
+		@param epochOffsetSeconds The start time to use for the returned SensorDataSet.
+		@param useCurrentTime If True (default), the current time will be used as the start time.
+		@return SensorDataSet The cached data set, or None if not cached (or not readable).
+		"""
+		if not self.hasDataSet(params):
+			return None
+		
+		timeFileName, dataFileName = self._getFileNames(params)
+		
+		try:
+			timeEntries = calcLib.load(timeFileName, mmap_mode = 'r')
+			dataEntries = calcLib.load(dataFileName, mmap_mode = 'r')
+			
+			logging.info("Loaded cached sim data set: %s", os.path.basename(dataFileName))
+			
+			return \
+				SensorDataSet( \
+					epochOffsetSeconds = epochOffsetSeconds, useCurrentTime = useCurrentTime, \
+					timeEntries = timeEntries, dataEntries = dataEntries)
+		except Exception as e:
+			logging.warning("Failed to load cached sim data set %s: %s", os.path.basename(dataFileName), str(e))
+		
+		return None
+	
+	def storeDataSet(self, params: dict, dataSet: SensorDataSet) -> bool:
+		"""
+		Stores the time and data entries of 'dataSet' using the given generator
+		parameters as the key. Each file is written to a temporary file first
+		and then moved into place, so concurrent readers never see a partial file.
+		
+		@param params The dict of generator parameters.
+		@param dataSet The SensorDataSet to store.
+		@return bool True on success; False otherwise.
+		"""
+		if not dataSet:
+			return False
+		
+		timeFileName, dataFileName = self._getFileNames(params)
+		
+		try:
+			self._writeArray(timeFileName, dataSet.getTimeEntries())
+			self._writeArray(dataFileName, dataSet.getDataEntries())
+			
+			logging.info("Stored sim data set in cache: %s", os.path.basename(dataFileName))
+			
+			return True
+		except Exception as e:
+			logging.warning("Failed to store sim data set %s: %s", os.path.basename(dataFileName), str(e))
+		
+		return False
+	
+	def _getFileNames(self, params: dict) -> tuple:
+		"""
+		Returns the time entry and data entry file names for the given generator parameters.
+		
+		@param params The dict of generator parameters.
+		@return tuple The (time entries, data entries) file names.
+		"""
+		fileNamePrefix = os.path.join(self.cachePath, self.getCacheKey(params))
+		
+		return (fileNamePrefix + self.TIME_ENTRIES_SUFFIX, fileNamePrefix + self.DATA_ENTRIES_SUFFIX)
+	
+	def _writeArray(self, fileName: str, entries):
+		"""
+		Writes 'entries' to 'fileName' in .npy format via a temporary file.
+		
+		@param fileName The target file name.
+		@param entries The array to write.
+		"""
+		fd, tmpFileName = tempfile.mkstemp(dir = self.cachePath, suffix = '.tmp')
+		
+		try:
+			with os.fdopen(fd, 'wb') as tmpFile:
+				calcLib.save(tmpFile, calcLib.asarray(entries))
+			
+			os.replace(tmpFileName, fileName)
+		except:
+			if os.path.exists(tmpFileName):
+				os.remove(tmpFileName)
+			
+			raise
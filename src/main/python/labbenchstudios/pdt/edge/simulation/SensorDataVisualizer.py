@@ -0,0 +1,62 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import matplotlib.pyplot as plotLib
+
+class SensorDataVisualizer(object):
+	"""
+	Simple on-screen graph generator for SensorDataSet instances.
+	
+	This module imports matplotlib, which is expensive to load, so it
+	should only be imported when a graph is actually needed (see
+	SensorDataGenerator.generateOnScreenGraph()).
+	
+	"""
+	
+	def __init__(self):
+		"""
+		Constructor.
+		
+		"""
+		self.plotter = plotLib
+		
+	def generateOnScreenGraph(self, dataSet = None, chartTitle: str = "Sample Data", chartXLabel: str = "X Axis", chartYLabel: str = "Y Axis"):
+		"""
+		A simple graph generator using the title info passed in
+		and the sample data set, which must be of type SensorDataSet.
+		
+		This will generate a graph, so there must be a window manager
+		running on the system for this to function correctly.
+		
+		@param dataSet The SensorDataSet instance.
+		@param chartTitle The string representing the title of the chart. Should be no more than 100 characters.
+		@param chartXLabel The string to use for the X Label.
+		@param chartYLabel The string to use for the Y Label.
+		"""
+		self.plotter.plot(dataSet.getTimeEntries(), dataSet.getDataEntries())
+		self.plotter.title(chartTitle)
+		self.plotter.ylabel(chartYLabel)
+		self.plotter.xlabel(chartXLabel)
+		self.plotter.grid(True, which = 'both')
+		self.plotter.show()
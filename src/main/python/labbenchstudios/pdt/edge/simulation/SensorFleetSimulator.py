@@ -0,0 +1,248 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+
+from time import perf_counter
+
+import numpy as calcLib
+
+from numpy.random import Generator, PCG64
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.IDataMessageListener import IDataMessageListener
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+
+from labbenchstudios.pdt.edge.simulation.SensorDataGenerator import SensorDataGenerator
+
+class SensorFleetSimulator():
+	"""
+	Simulates a fleet of N sensors of the same type - for example, to
+	generate load for a gateway.
+	
+	Instead of one BaseSensorTask (and SensorDataSet) per sensor, the
+	curves for all sensors are stored as a single 2-D array with one row
+	per time step and one column per device, so each call to
+	generateTelemetry() advances every sensor with one (contiguous) row read.
+	
+	Each device's curve is the same daily curve generated by SensorDataGenerator,
+	shifted by a random phase offset, with independent noise added.
+	"""
+	
+	DEFAULT_DEVICE_ID_PREFIX = 'simdevice'
+	
+	def __init__(self, \
+			deviceCount: int = 100, \
+			name: str = ConfigConst.TEMP_SENSOR_NAME, \
+			typeID: int = ConfigConst.TEMP_SENSOR_TYPE, \
+			typeCategoryID: int = ConfigConst.ENV_TYPE_CATEGORY, \
+			curveType: int = SensorDataGenerator.DEFAULT_TEMP_CURVE, \
+			noiseLevel: int = SensorDataGenerator.DEFAULT_NOISE, \
+			minValue: float = SensorDataGenerator.LOW_NORMAL_INDOOR_TEMP, \
+			maxValue: float = SensorDataGenerator.HI_NORMAL_INDOOR_TEMP, \
+			deviceIDPrefix: str = DEFAULT_DEVICE_ID_PREFIX, \
+			locationIDPrefix: str = None, \
+			seed: int = None, \
+			randomGenerator: Generator = None):
+		"""
+		Constructor.
+		
+		@param deviceCount The number of simulated devices (one sensor each).
+		@param name The name to use for each generated SensorData.
+		@param typeID The type ID to use for each generated SensorData.
+		@param typeCategoryID The type category ID to use for each generated SensorData.
+		@param curveType The SensorDataGenerator curve type.
+		@param noiseLevel Any positive integer between 0 (no noise) and 100 (max noise).
+		@param minValue The floor of the (clean) curve.
+		@param maxValue The ceiling of the (clean) curve.
+		@param deviceIDPrefix The prefix for each device ID. The device index is appended.
+		@param locationIDPrefix The prefix for each location ID. Defaults to deviceIDPrefix.
+		@param seed The seed for the phase offsets and noise. If None, a random seed is used.
+		@param randomGenerator The numpy Generator for the phase offsets and noise
+		(see SimRandomStreams). If set, 'seed' is ignored.
+		"""
+		self.deviceCount = max(1, deviceCount)
+		self.name = name
+		self.typeID = typeID
+		self.typeCategoryID = typeCategoryID
+		
+		if not locationIDPrefix:
+			locationIDPrefix = deviceIDPrefix
+		
+		self.deviceIDs = [deviceIDPrefix + str(i).zfill(5) for i in range(self.deviceCount)]
+		self.locationIDs = [locationIDPrefix + str(i).zfill(5) for i in range(self.deviceCount)]
+		
+		self.dataMsgListener = None
+		self.dataSetIndex = 0
+		self.latestValues = None
+		
+		if not randomGenerator:
+			randomGenerator = Generator(PCG64(seed))
+		
+		# generate the base curve once, then shift it for each device
+		dataGenerator = SensorDataGenerator(randomGenerator = randomGenerator)
+		baseDataSet = \
+			dataGenerator.generateDailySensorDataSet( \
+				curveType = curveType, noiseLevel = SensorDataGenerator.NO_NOISE, \
+				minValue = minValue, maxValue = maxValue, startHour = 0, endHour = 24)
+		
+		baseCurve = calcLib.asarray(baseDataSet.getDataEntries(), dtype = calcLib.float32)
+		
+		self.stepCount = baseCurve.size
+		
+		phaseOffsets = randomGenerator.integers(0, self.stepCount, self.deviceCount)
+		stepIndexes = (calcLib.arange(self.stepCount)[:, None] + phaseOffsets[None, :]) % self.stepCount
+		
+		# shape is (steps, devices) so each step reads a contiguous row
+		self.dataEntries = baseCurve[stepIndexes]
+		
+		if noiseLevel > SensorDataGenerator.NO_NOISE:
+			noiseScale = self._calcNoiseScale(noiseLevel, float(baseCurve.mean()))
+			self.dataEntries += randomGenerator.normal(0, noiseScale, self.dataEntries.shape).astype(calcLib.float32)
+		
+		logging.info( \
+			"Created sensor fleet simulator. Devices: %s  Steps: %s  Size (MB): %.1f", \
+			self.deviceCount, self.stepCount, self.dataEntries.nbytes / (1024 * 1024))
+	
+	def generateTelemetry(self):
+		"""
+		Advances every simulated sensor by one step.
+		
+		@return ndarray The current value for each device, indexed by device.
+		This is a read-only view into the fleet's data, not a copy.
+		"""
+		self.latestValues = self.dataEntries[self.dataSetIndex]
+		self.latestValues.flags.writeable = False
+		self.dataSetIndex = (self.dataSetIndex + 1) % self.stepCount
+		
+		return self.latestValues
+	
+	def generateSensorDataBatch(self) -> list:
+		"""
+		Advances every simulated sensor by one step and packages each
+		value as a SensorData instance with its device and location ID.
+		
+		@return list The list of SensorData, indexed by device.
+		"""
+		values = self.generateTelemetry().tolist()
+		batch = []
+		
+		for i in range(self.deviceCount):
+			sensorData = SensorData(typeID = self.typeID, typeCategoryID = self.typeCategoryID, name = self.name)
+			sensorData.setValue(values[i])
+			sensorData.setDeviceID(self.deviceIDs[i])
+			sensorData.setLocationID(self.locationIDs[i])
+			
+			batch.append(sensorData)
+		
+		return batch
+	
+	def getDeviceCount(self) -> int:
+		"""
+		Returns the number of simulated devices.
+		
+		@return int
+		"""
+		return self.deviceCount
+	
+	def getDeviceIDs(self) -> list:
+		"""
+		Returns the list of simulated device IDs.
+		
+		@return list
+		"""
+		return list(self.deviceIDs)
+	
+	def handleTelemetry(self):
+		"""
+		Generates a batch of SensorData for all devices and passes it to
+		the data message listener (if set).
+		
+		"""
+		batch = self.generateSensorDataBatch()
+		
+		if self.dataMsgListener:
+			self.dataMsgListener.handleSensorMessageBatch(batch)
+	
+	def setDataMessageListener(self, listener: IDataMessageListener):
+		"""
+		Sets the data message listener reference, assuming listener is non-null.
+		
+		@param listener The data message listener instance to receive each batch.
+		"""
+		if listener:
+			self.dataMsgListener = listener
+	
+	def _calcNoiseScale(self, noiseLevel: int, meanValue: float) -> float:
+		"""
+		Calculates the noise scale using the same approach as SensorDataGenerator,
+		so the noise aligns with the order of magnitude of the values.
+		
+		@param noiseLevel Any positive integer between 1 and 100.
+		@param meanValue The mean of the clean curve.
+		@return float
+		"""
+		meanMag = int(calcLib.log10(abs(meanValue))) if meanValue != 0.0 else 0
+		
+		return ((min(noiseLevel, SensorDataGenerator.MAX_NOISE) / 100) * ((10 ** meanMag) / 10))
+
+def main():
+	"""
+	Main function definition for running as an application. Runs a simple
+	benchmark reporting simulated readings per second.
+	
+	"""
+	logging.basicConfig(format = '%(asctime)s:%(levelname)s:%(message)s', level = logging.WARNING)
+	
+	stepCount = 100
+	
+	for deviceCount in (100, 1000, 10000):
+		fleetSim = SensorFleetSimulator(deviceCount = deviceCount, seed = 0)
+		
+		startTime = perf_counter()
+		
+		# include conversion to Python floats so each reading is actually consumed
+		for i in range(stepCount):
+			fleetSim.generateTelemetry().tolist()
+		
+		stepRate = (deviceCount * stepCount) / (perf_counter() - startTime)
+		
+		startTime = perf_counter()
+		
+		for i in range(10):
+			fleetSim.generateSensorDataBatch()
+		
+		batchRate = (deviceCount * 10) / (perf_counter() - startTime)
+		
+		print("Devices: %6d  Vectorized readings/sec: %14.0f  SensorData readings/sec: %10.0f" % (deviceCount, stepRate, batchRate))
+	
+if __name__ == '__main__':
+	"""
+	Attribute definition for when invoking as app via command line
+	
+	"""
+	main()
+	
@@ -0,0 +1,106 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+
+from numpy.random import Generator, PCG64, SeedSequence
+
+class SimRandomStreams():
+	"""
+	Factory for the independent, reproducible random number streams used by
+	the simulators (SensorDataGenerator, sensor sim tasks, fleet and wind farm
+	simulators).
+	
+	All streams are numpy Generator instances backed by PCG64, each seeded by
+	a child spawned from a single root SeedSequence. Using the same root seed
+	- and creating streams in the same order - reproduces the same simulation.
+	Child seed sequences can be passed to worker processes, which guarantees
+	each worker an independent stream.
+	"""
+	
+	def __init__(self, seed = None):
+		"""
+		Constructor.
+		
+		@param seed The root seed - either an int or a SeedSequence (e.g. one
+		spawned by spawnSeedSequences() and passed to a worker process). If None
+		(or negative), a random root seed is chosen, which can be retrieved using
+		getSeed() to reproduce the run.
+		"""
+		if isinstance(seed, SeedSequence):
+			# copy it, since spawning children changes the state of a SeedSequence
+			self.seedSequence = SeedSequence(seed.entropy, spawn_key = seed.spawn_key, pool_size = seed.pool_size)
+		else:
+			if seed is not None and seed < 0:
+				seed = None
+			
+			self.seedSequence = SeedSequence(seed)
+		
+		self.seeded = seed is not None
+		
+		logging.info("Created sim random streams with root seed: %s", str(self.getSeed()))
+	
+	def createGenerator(self) -> Generator:
+		"""
+		Creates a new Generator using the next child seed.
+		
+		@return Generator
+		"""
+		return Generator(PCG64(self.seedSequence.spawn(1)[0]))
+	
+	def createGenerators(self, count: int = 1) -> list:
+		"""
+		Creates 'count' new Generator instances, each using the next child seed.
+		
+		@param count The number of generators to create.
+		@return list
+		"""
+		return [Generator(PCG64(childSeed)) for childSeed in self.seedSequence.spawn(max(0, count))]
+	
+	def getSeed(self) -> int:
+		"""
+		Returns the root seed (entropy) used by this instance.
+		
+		@return int
+		"""
+		return self.seedSequence.entropy
+	
+	def isSeeded(self) -> bool:
+		"""
+		Checks if the root seed was given (rather than randomly chosen), which
+		means a new instance with the same seed reproduces the same streams.
+		
+		@return bool
+		"""
+		return self.seeded
+	
+	def spawnSeedSequences(self, count: int = 1) -> list:
+		"""
+		Spawns 'count' child seed sequences - e.g. to pass to worker processes,
+		which can create their own streams using SimRandomStreams(seed = childSeedSequence).
+		
+		@param count The number of child seed sequences to spawn.
+		@return list
+		"""
+		return self.seedSequence.spawn(max(0, count))
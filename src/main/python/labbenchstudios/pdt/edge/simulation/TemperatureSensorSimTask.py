@@ -38,11 +38,12 @@ class TemperatureSensorSimTask(BaseSensorTask):
 	
 	"""
 
-	def __init__(self, dataSet = None):
+	def __init__(self, dataSet = None, randomGenerator = None):
 		"""
 		Constructor.
 		
 		@param dataSet The SensorDataSet to use for this task simulator.
+		@param randomGenerator The numpy Generator to use if there's no data set.
 		"""
 		super( \
 			TemperatureSensorSimTask, self).__init__( \
@@ -51,4 +52,5 @@ class TemperatureSensorSimTask(BaseSensorTask):
 				typeCategoryID = ConfigConst.ENV_TYPE_CATEGORY, \
 				dataSet = dataSet, \
 				minVal = SensorDataGenerator.MIN_INDOOR_TEMP, \
-				maxVal = SensorDataGenerator.MAX_INDOOR_TEMP)
+				maxVal = SensorDataGenerator.MAX_INDOOR_TEMP, \
+				randomGenerator = randomGenerator)
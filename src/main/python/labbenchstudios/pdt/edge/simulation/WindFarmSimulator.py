@@ -0,0 +1,255 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+
+from time import perf_counter
+
+import numpy as calcLib
+
+from numpy.random import Generator, PCG64
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+
+from labbenchstudios.pdt.edge.simulation.SensorDataGenerator import SensorDataGenerator
+from labbenchstudios.pdt.edge.simulation.WindTurbineSensorSimTask import WindTurbineSensorSimTask
+
+class WindFarmSimulator():
+	"""
+	Simulates a wind farm of N turbines sharing a single wind field.
+	
+	Every turbine is advanced in one vectorized step by the turbine model
+	of WindTurbineSensorSimTask (see calcPowerCurve()), with one rotor
+	diameter per turbine. The other rotor parameters are the model's.
+	
+	Turbines are laid out in rows perpendicular to the wind. Each row
+	downwind sees the shared wind field later (lag) and slower (wake
+	deficit) than the row before it.
+	"""
+	
+	DEFAULT_TURBINES_PER_ROW = 10
+	DEFAULT_LAG_STEPS_PER_ROW = 1
+	DEFAULT_WAKE_DEFICIT_PER_ROW = 0.05
+	MAX_WAKE_DEFICIT = 0.5
+	
+	def __init__(self, \
+			turbineCount: int = 100, \
+			windSpeedDataSet = None, \
+			turbinesPerRow: int = DEFAULT_TURBINES_PER_ROW, \
+			lagStepsPerRow: int = DEFAULT_LAG_STEPS_PER_ROW, \
+			wakeDeficitPerRow: float = DEFAULT_WAKE_DEFICIT_PER_ROW, \
+			rotorDiameterVariance: float = 0.0, \
+			applyCutInCutOut: bool = False, \
+			seed: int = None, \
+			randomGenerator: Generator = None):
+		"""
+		Constructor.
+		
+		@param turbineCount The number of turbines in the farm.
+		@param windSpeedDataSet The SensorDataSet containing the shared wind field
+		(wind speeds in m/sec). If None, an oscillating data set between 2 and 20
+		m/sec will be generated.
+		@param turbinesPerRow The number of turbines in each row.
+		@param lagStepsPerRow The number of wind field steps each row lags behind the previous row.
+		@param wakeDeficitPerRow The fractional wind speed reduction for each row downwind.
+		Capped at MAX_WAKE_DEFICIT.
+		@param rotorDiameterVariance The fractional (+/-) random variation of each
+		turbine's rotor diameter. Defaults to 0.0 (all turbines are the same).
+		@param applyCutInCutOut If True, rotors are stopped outside the cut-in and
+		cut-out speeds. Defaults to False, since the DTA manages cut-in and cut-out.
+		@param seed The seed for the rotor diameter variation. If None, a random seed is used.
+		@param randomGenerator The numpy Generator for the rotor diameter variation
+		(see SimRandomStreams). If set, 'seed' is ignored.
+		"""
+		self.turbineCount = max(1, turbineCount)
+		self.applyCutInCutOut = applyCutInCutOut
+		
+		if not randomGenerator:
+			randomGenerator = Generator(PCG64(seed))
+		
+		if windSpeedDataSet is None:
+			windSpeedDataSet = \
+				SensorDataGenerator(randomGenerator = randomGenerator).generateOscillatingSensorDataSet(minValue = 2.0, maxValue = 20.0)
+		
+		self.windField = calcLib.asarray(windSpeedDataSet.getDataEntries(), dtype = calcLib.float64)
+		self.windFieldIndex = 0
+		
+		turbinesPerRow = max(1, turbinesPerRow)
+		rowIndexes = calcLib.arange(self.turbineCount) // turbinesPerRow
+		
+		self.lagSteps = rowIndexes * max(0, lagStepsPerRow)
+		self.wakeFactors = 1.0 - calcLib.minimum(rowIndexes * wakeDeficitPerRow, self.MAX_WAKE_DEFICIT)
+		
+		# the model has no data set - it's only used to calculate the power curve
+		self.turbineModel = WindTurbineSensorSimTask(randomGenerator = randomGenerator)
+		
+		# one rotor diameter per turbine
+		self.rotorDiameters = \
+			WindTurbineSensorSimTask.DEFAULT_ROTOR_DIAMETER * \
+				(1.0 + randomGenerator.uniform(-rotorDiameterVariance, rotorDiameterVariance, self.turbineCount))
+		
+		self.brakingMask = calcLib.zeros(self.turbineCount, dtype = bool)
+		
+		self.windSpeeds     = calcLib.zeros(self.turbineCount)
+		self.powerOutputs   = calcLib.zeros(self.turbineCount)
+		self.rotorHubRpms   = calcLib.zeros(self.turbineCount)
+		self.rotorTipSpeeds = calcLib.zeros(self.turbineCount)
+		
+		logging.info( \
+			"Created wind farm simulator. Turbines: %s  Rows: %s  Wind field steps: %s", \
+			self.turbineCount, int(rowIndexes[-1]) + 1, self.windField.size)
+	
+	def enableBrakingSystem(self, enable: bool = False, turbineIndexes = None):
+		"""
+		Enables (or disables) braking for the given turbines.
+		
+		@param enable If True, the turbines will be braked.
+		@param turbineIndexes The list (or array) of turbine indexes. If None, all turbines.
+		"""
+		if turbineIndexes is None:
+			self.brakingMask[:] = enable
+		else:
+			self.brakingMask[calcLib.asarray(turbineIndexes, dtype = int)] = enable
+	
+	def generateTelemetry(self):
+		"""
+		Advances every turbine by one wind field step, calculating the wind speed,
+		power output, rotor hub RPM and rotor tip speed arrays.
+		
+		@return ndarray The power output of each turbine in watts.
+		"""
+		fieldIndexes = (self.windFieldIndex - self.lagSteps) % self.windField.size
+		
+		self.windSpeeds = self.windField[fieldIndexes] * self.wakeFactors
+		self.windFieldIndex = (self.windFieldIndex + 1) % self.windField.size
+		
+		self.powerOutputs, self.rotorHubRpms, self.rotorTipSpeeds = \
+			self.turbineModel.calcPowerCurve( \
+				self.windSpeeds, brakingMask = self.brakingMask, \
+				applyCutInCutOut = self.applyCutInCutOut, rotorDiameters = self.rotorDiameters)
+		
+		return self.powerOutputs
+	
+	def getActiveTurbineCount(self) -> int:
+		"""
+		Returns the number of turbines generating power as of the last step.
+		
+		@return int
+		"""
+		return int(calcLib.count_nonzero(self.powerOutputs))
+	
+	def getFarmTelemetry(self) -> list:
+		"""
+		Returns the farm-level aggregate telemetry as of the last step:
+		total power output (watts), mean rotor hub RPM of the active turbines
+		and mean wind speed (m/sec) across all turbines.
+		
+		@return list The list of SensorData instances.
+		"""
+		activeCount = self.getActiveTurbineCount()
+		meanHubRpm = float(self.rotorHubRpms.sum() / activeCount) if activeCount > 0 else 0.0
+		
+		return [ \
+			self._createSensorData(ConfigConst.WIND_TURBINE_POWER_OUTPUT_SENSOR_TYPE, float(self.powerOutputs.sum())), \
+			self._createSensorData(ConfigConst.WIND_TURBINE_HUB_SPEED_SENSOR_TYPE, meanHubRpm), \
+			self._createSensorData(ConfigConst.WIND_TURBINE_AIR_SPEED_SENSOR_TYPE, float(self.windSpeeds.mean())) ]
+	
+	def getPowerOutputs(self):
+		"""
+		Returns the power output (watts) of each turbine as of the last step.
+		
+		@return ndarray
+		"""
+		return self.powerOutputs
+	
+	def getRotorHubRpms(self):
+		"""
+		Returns the rotor hub RPM of each turbine as of the last step.
+		
+		@return ndarray
+		"""
+		return self.rotorHubRpms
+	
+	def getTurbineCount(self) -> int:
+		"""
+		Returns the number of turbines in the farm.
+		
+		@return int
+		"""
+		return self.turbineCount
+	
+	def getWindSpeeds(self):
+		"""
+		Returns the wind speed (m/sec) at each turbine as of the last step.
+		
+		@return ndarray
+		"""
+		return self.windSpeeds
+	
+	def _createSensorData(self, typeID: int, val: float) -> SensorData:
+		"""
+		Creates a farm-level SensorData instance.
+		
+		@param typeID The sensor type ID.
+		@param val The value.
+		@return SensorData
+		"""
+		sensorData = SensorData(typeID = typeID, typeCategoryID = ConfigConst.ENERGY_TYPE_CATEGORY, name = ConfigConst.WIND_FARM_NAME)
+		sensorData.setValue(val)
+		
+		return sensorData
+
+def main():
+	"""
+	Main function definition for running as an application. Runs a simple
+	benchmark reporting the time for each farm step (one poll cycle tick).
+	
+	"""
+	logging.basicConfig(format = '%(asctime)s:%(levelname)s:%(message)s', level = logging.WARNING)
+	
+	stepCount = 1000
+	
+	for turbineCount in (10, 100, 500, 1000):
+		windFarm = WindFarmSimulator(turbineCount = turbineCount, rotorDiameterVariance = 0.1, seed = 0)
+		windFarm.enableBrakingSystem(enable = True, turbineIndexes = range(0, turbineCount, 7))
+		
+		startTime = perf_counter()
+		
+		for i in range(stepCount):
+			windFarm.generateTelemetry()
+			windFarm.getFarmTelemetry()
+		
+		stepTime = (perf_counter() - startTime) / stepCount
+		
+		print("Turbines: %5d  Time per tick (ms): %8.4f  Turbine updates/sec: %12.0f" % (turbineCount, stepTime * 1000, turbineCount / stepTime))
+	
+if __name__ == '__main__':
+	"""
+	Attribute definition for when invoking as app via command line
+	
+	"""
+	main()
+	
@@ -24,10 +24,12 @@
 
 import logging
 import math
-import random
+
+import numpy as calcLib
 
 import labbenchstudios.pdt.common.ConfigConst as ConfigConst
 
+from labbenchstudios.pdt.edge.simulation.SensorDataGenerator import ChunkedSensorDataSet
 from labbenchstudios.pdt.edge.system.BaseSensorTask import BaseSensorTask
 from labbenchstudios.pdt.data.SensorData import SensorData
 
@@ -37,8 +39,17 @@ class WindTurbineSensorSimTask(BaseSensorTask):
 	a container for the simulator's state, value, name, and status.
 	
 	"""
+	
+	# rotor model defaults - shared with WindFarmSimulator
+	DEFAULT_ROTOR_DIAMETER  = 8.0
+	DEFAULT_HUB_DIAMETER    = 2.0
+	DEFAULT_AIR_DENSITY     = 1.225
+	DEFAULT_MAX_POWER_COEFF = 0.35
+	DEFAULT_OPTIMAL_TSR     = 5.0
+	DEFAULT_CUT_IN_SPEED    = 5.0
+	DEFAULT_CUT_OUT_SPEED   = 55.0
 
-	def __init__(self, dataSet = None):
+	def __init__(self, dataSet = None, randomGenerator = None):
 		super( \
 			WindTurbineSensorSimTask, self).__init__( \
 				name = ConfigConst.WIND_TURBINE_NAME, \
@@ -46,14 +57,99 @@ class WindTurbineSensorSimTask(BaseSensorTask):
 				typeCategoryID = ConfigConst.ENERGY_TYPE_CATEGORY, \
 				dataSet = dataSet,
 				minVal = 5.0,
-				maxVal = 9.0)
+				maxVal = 9.0,
+				randomGenerator = randomGenerator)
 		
 		self._initDefaultValues()
+		self._initPowerCurve()
 
+	def calcPowerCurve(self, windSpeeds = None, brakingMask = None, applyCutInCutOut: bool = None, rotorDiameters = None) -> tuple:
+		"""
+		Calculates the power output, rotor hub RPM and rotor tip speed for
+		an array of wind speeds in one vectorized step, using the same
+		formulas as the per-tick calculation (see _generateSensorReading()).
+		
+		When a turbine is braked, or the wind speed is below the cut-in speed
+		or above the cut-out speed (if applied), the rotor is stopped and no
+		power is generated.
+		
+		@param windSpeeds A numpy array (or list) of wind speeds in m/sec, or a
+		SensorDataSet, in which case its data entries will be used.
+		@param brakingMask Defaults to None (no braking). Either a bool, applied
+		to all entries, or a bool array of the same length as windSpeeds.
+		@param applyCutInCutOut If None (default), the current cut-in / cut-out
+		setting is used (see enableCutInCutOutLimits()).
+		@param rotorDiameters Defaults to None (this turbine's rotor diameter).
+		Either a float, or an array of the same length as windSpeeds - e.g. one
+		entry per turbine of a wind farm.
+		@return tuple The (power output in watts, rotor hub RPM, rotor tip speed)
+		arrays, each the same length as windSpeeds.
+		"""
+		if windSpeeds is None:
+			windSpeeds = []
+		elif hasattr(windSpeeds, 'getDataEntries'):
+			windSpeeds = windSpeeds.getDataEntries()
+		
+		windSpeeds = calcLib.asarray(windSpeeds, dtype = calcLib.float64)
+		
+		if applyCutInCutOut is None:
+			applyCutInCutOut = self.enableCutInCutOut
+		
+		rotorCircumference = self.rotorCircumference
+		rotorSweptArea     = self.rotorSweptArea
+		
+		if rotorDiameters is not None:
+			rotorDiameters     = calcLib.asarray(rotorDiameters, dtype = calcLib.float64)
+			rotorCircumference = math.pi * rotorDiameters
+			rotorSweptArea     = (math.pi * (rotorDiameters ** 2)) / 4
+		
+		rotorTipSpeeds = (60 * windSpeeds * self.optimalTSR) / rotorCircumference
+		rotorHubRpms   = rotorTipSpeeds / self.hubCircumference
+		powerOutputs   = self.maxPowerCoeff * (self.airDensity / 2) * rotorSweptArea * (windSpeeds ** 3)
+		
+		stoppedMask = calcLib.zeros(windSpeeds.shape, dtype = bool)
+		
+		if brakingMask is not None:
+			stoppedMask |= calcLib.broadcast_to(calcLib.asarray(brakingMask, dtype = bool), windSpeeds.shape)
+		
+		if applyCutInCutOut:
+			stoppedMask |= (windSpeeds < self.cutInSpeed) | (windSpeeds > self.cutOutSpeed)
+		
+		rotorTipSpeeds[stoppedMask] = 0.0
+		rotorHubRpms[stoppedMask]   = 0.0
+		powerOutputs[stoppedMask]   = 0.0
+		
+		return (powerOutputs, rotorHubRpms, rotorTipSpeeds)
+	
 	def enableBrakingSystem(self, enable: bool = False):
 		"""
 		"""
 		self.enableBraking = enable
+	
+	def enableCutInCutOutLimits(self, enable: bool = True):
+		"""
+		Enables (or disables) stopping the rotor when the wind speed is
+		below the cut-in speed or above the cut-out speed. Disabled by
+		default, since cut-in and cut-out are managed by the DTA.
+		
+		@param enable If True, the cut-in and cut-out speeds will be applied.
+		"""
+		self.enableCutInCutOut = enable
+		self._initPowerCurve()
+	
+	def generateTelemetry(self) -> SensorData:
+		"""
+		Generates the next wind speed reading, and the power output, rotor hub
+		RPM and rotor tip speed for it. If a data set is used, these are read
+		from the arrays precomputed for the data set's wind speeds (or for
+		the current chunk's wind speeds, if the data set is chunked).
+		
+		@return The SensorData instance.
+		"""
+		# the base class advances dataSetIndex before calling _generateSensorReading()
+		self.powerCurveIndex = self.dataSetIndex if self.powerCurve or self.powerCurveChunkSize else None
+		
+		return super(WindTurbineSensorSimTask, self).generateTelemetry()
 
 	def getPowerOutputTelemetry(self) -> SensorData:
 		"""
@@ -159,44 +255,62 @@ class WindTurbineSensorSimTask(BaseSensorTask):
 		  A = Rotor swept area (m2 or (pi * D^2) / 4, where D is rotor diameter in m)
 		  V = Wind speed in m/sec
 
-		@return The SensorData instance.
+		@return The wind speed.
 		"""
-		sensorData = SensorData(typeID = self.typeID, typeCategoryID = self.typeCategoryID, name = self.name)
-
 		self.windSpeed = windSpeed
 
 		# actual hub rotation will be different in a real life scenario
 		# for now, just use the optimalTSR and windspeed to generate a value
 		#
-		# important: this does NOT factor in cut-in speed or cut-out speed
-		#            for Digital Twin testing, cut-in and cut-out processes
-		#            will be managed in the DTA
+		# important: by default, this does NOT factor in cut-in speed or
+		#            cut-out speed - for Digital Twin testing, cut-in and
+		#            cut-out processes will be managed in the DTA
 
-		if (self.enableBraking):
+		if self.enableBraking:
 			self.rotorTipSpeed = 0.0
-			self.rotorHubRpm = 0.0
+			self.rotorHubRpm   = 0.0
+			self.powerOutput   = 0.0
+		elif self.powerCurveIndex is not None:
+			curveIndex = self._getPowerCurveEntryIndex(self.powerCurveIndex)
+			
+			powerOutputs, rotorHubRpms, rotorTipSpeeds = self.powerCurve
+			
+			self.rotorTipSpeed = float(rotorTipSpeeds[curveIndex])
+			self.rotorHubRpm   = float(rotorHubRpms[curveIndex])
+			self.powerOutput   = float(powerOutputs[curveIndex])
 		else:
-			self.rotorTipSpeed = (60 * self.windSpeed * self.optimalTSR) / self.rotorCircumference
-			self.rotorHubRpm = self.rotorTipSpeed / self.hubCircumference
-
-		self.powerOutput = \
-			self.maxPowerCoeff * (self.airDensity / 2) * self.rotorSweptArea * (pow(self.windSpeed, 3))
+			powerOutputs, rotorHubRpms, rotorTipSpeeds = self.calcPowerCurve([self.windSpeed])
+			
+			self.rotorTipSpeed = float(rotorTipSpeeds[0])
+			self.rotorHubRpm   = float(rotorHubRpms[0])
+			self.powerOutput   = float(powerOutputs[0])
 		
-		logging.debug("\nCalculated wind turbine power output:" \
-				"\n\tmaxPowerCoeff:    " + str(self.getMaxPowerCoefficient()) +
-				"\n\tairDensity:       " + str(self.getAirDensity()) +
-				"\n\trotorSweptArea:   " + str(self.getRotorSweptArea()) +
-				"\n\twindSpeed:        " + str(self.getWindSpeed()) +
-				"\n\tpowerOutputWatts: " + str(self.getPowerOutput()) +
-				"\n\trotorTipSpeed:    " + str(self.getCalculatedRotorTipSpeed()) +
-				"\n\thubRpm:           " + str(self.getCalculatedRotorHubRpm()) +
-				"\n\tenableBraking:    " + str(self.enableBraking) +
-				"\n\t")
-
-		self.latestSensorData = sensorData
+		logging.debug( \
+			"Calculated wind turbine power output. Wind speed: %s, power output (W): %s, tip speed: %s, hub RPM: %s, braking: %s", \
+			self.windSpeed, self.powerOutput, self.rotorTipSpeed, self.rotorHubRpm, self.enableBraking)
 		
 		return self.windSpeed
 	
+	def _getPowerCurveEntryIndex(self, index: int) -> int:
+		"""
+		Returns the index into the power curve arrays for the data set entry
+		at 'index'. For a chunked data set, the power curve for the entry's
+		chunk is calculated first, if it's not the current one.
+		
+		@param index The data set entry index.
+		@return int
+		"""
+		if not self.powerCurveChunkSize:
+			return index
+		
+		chunkIndex = index // self.powerCurveChunkSize
+		
+		if chunkIndex != self.powerCurveChunkIndex:
+			self.powerCurve = self.calcPowerCurve(self.dataSet.getChunkDataEntries(chunkIndex))
+			self.powerCurveChunkIndex = chunkIndex
+		
+		return index % self.powerCurveChunkSize
+	
 	def _initDefaultValues(self):
 		"""
 		Initialize default values for:
@@ -224,25 +338,47 @@ class WindTurbineSensorSimTask(BaseSensorTask):
         see https://www.energy.gov/eere/articles/how-do-wind-turbines-survive-severe-storms
 		"""
 		self.enableBraking = False
+		self.enableCutInCutOut = False
 		self.powerOutput   = 0.0
 		self.rotorHubRpm   = 0
 		self.rotorTipSpeed = 0
 		self.windSpeed     = 0.0
 
 		# TODO: pull these from the config file
-		self.rotorDiameter      = 8
+		self.rotorDiameter      = self.DEFAULT_ROTOR_DIAMETER
 		self.rotorCircumference = math.pi * self.rotorDiameter
-		self.hubDiameter        = 2
+		self.hubDiameter        = self.DEFAULT_HUB_DIAMETER
 		self.hubCircumference   = math.pi * self.hubDiameter
 		
-		self.airDensity         = 1.225
-		self.maxPowerCoeff      = 0.35
-		self.optimalTSR         = 5
+		self.airDensity         = self.DEFAULT_AIR_DENSITY
+		self.maxPowerCoeff      = self.DEFAULT_MAX_POWER_COEFF
+		self.optimalTSR         = self.DEFAULT_OPTIMAL_TSR
 
 		self.minRndWindSpeed = 5.0
 		self.maxRndWindSpeed = 9.0
 
-		self.cutInSpeed  = 5.0
-		self.cutOutSpeed = 55.0
+		self.cutInSpeed  = self.DEFAULT_CUT_IN_SPEED
+		self.cutOutSpeed = self.DEFAULT_CUT_OUT_SPEED
 
 		self.rotorSweptArea  = (math.pi * (pow(self.rotorDiameter, 2))) / 4
+	
+	def _initPowerCurve(self):
+		"""
+		Precomputes the power output, rotor hub RPM and rotor tip speed for
+		each wind speed in the data set (if any), so each tick is an index
+		into these arrays instead of a new calculation.
+		
+		A chunked data set's power curve is calculated one chunk at a time
+		as the entries are read (see _getPowerCurveEntryIndex()), so memory
+		use stays bounded by the chunk size.
+		
+		"""
+		self.powerCurve = None
+		self.powerCurveIndex = None
+		self.powerCurveChunkIndex = -1
+		self.powerCurveChunkSize = 0
+		
+		if isinstance(self.dataSet, ChunkedSensorDataSet):
+			self.powerCurveChunkSize = self.dataSet.getChunkSize()
+		elif self.dataSet:
+			self.powerCurve = self.calcPowerCurve(self.dataSet)
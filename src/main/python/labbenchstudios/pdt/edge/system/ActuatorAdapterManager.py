@@ -24,6 +24,7 @@
 
 import logging
 
+from concurrent.futures import Future
 from importlib import import_module
 
 import labbenchstudios.pdt.common.ConfigConst as ConfigConst
@@ -32,6 +33,7 @@ from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
 from labbenchstudios.pdt.common.IActuatorTask import IActuatorTask
 from labbenchstudios.pdt.common.IDataManager import IDataManager
 from labbenchstudios.pdt.common.IDataMessageListener import IDataMessageListener
+from labbenchstudios.pdt.common.MetricsRegistry import MetricsRegistry
 from labbenchstudios.pdt.common.ResourceNameEnum import ResourceNameEnum
 
 from labbenchstudios.pdt.edge.simulation.SensorDataGenerator import SensorDataGenerator
@@ -95,10 +97,22 @@ class ActuatorAdapterManager(IDataManager):
 		
 		# TODO: make these configurable
 		self.isEnvActuationActive = False
+		self.isEnvSensingActive   = False
 		
 		# see PIOT-CDA-03-007 description for thoughts on the next line of code
 		self._initEnvironmentalActuationTasks()
 		
+		MetricsRegistry().getGauge(ConfigConst.ACTUATOR_QUEUE_DEPTH_GAUGE).setValueSupplier(self.getQueuedCommandCount)
+		
+	def getQueuedCommandCount(self) -> int:
+		"""
+		Returns the number of actuator commands queued (via sendActuatorCommandAsync())
+		but not yet processed, across all actuators.
+		
+		@return int
+		"""
+		return sum(actuator.getQueuedCommandCount() for actuator in self._getActuatorTasks())
+		
 	def sendActuatorCommand(self, data: ActuatorData) -> ActuatorData:
 		"""
 		Sends the command (and potential payload) specified within the
@@ -107,120 +121,221 @@ class ActuatorAdapterManager(IDataManager):
 		True, the command issuance will be ignored and False will
 		be returned.
 		
-		For now, this is a synchronous call, but could be asynchronous
-		in a future implementation if the underlying actuator (or
-		actuator emulator) requires an arbitrary amount of time to
-		execute the command.
-		
+		This is a synchronous call - the caller's thread is blocked until
+		the underlying actuator (or actuator emulator) completes the
+		command. Use sendActuatorCommandAsync() if the caller must not
+		be blocked (e.g., when invoked from the MQTT network thread).
+
 		On success, a new ActuatorData message is created from the
 		original, with the isResponse flag set to true on the message.
-		
+
 		@param data The ActuatorData containing the command and other
 		parameters (including payload) necessary for the actuation.
 		@return ActuatorData A newly instanced ActuatorData object that
 		contains the original ActuatorData message with the response flag
 		enabled.
 		"""
+		actuator = self._getTargetActuator(data)
 
-		# check if the data is valid and whether or not it's not a response
-		# (if it is a response, ignore)
+		if actuator:
+			responseData = actuator.updateActuator(data)
+
+			displayData = self._getDisplayUpdateData(data, actuator)
+
+			if displayData:
+				self.ledDisplayActuator.updateActuator(displayData)
+
+			if responseData:
+				responseData.setDeviceID(self.deviceID)
+
+				return responseData
+
+		return None
+
+	def sendActuatorCommandAsync(self, data: ActuatorData) -> Future:
+		"""
+		Queues the command (and potential payload) specified within the
+		ActuatorData message on the target actuator's command queue and
+		returns immediately. The same validation rules as sendActuatorCommand()
+		apply.
+
+		Each actuator processes its queued commands in order on its own
+		worker thread, so a slow actuator (e.g., a scrolling LED display)
+		will not delay commands destined for a different actuator.
+
+		When the command completes, the response (if any) is passed to
+		the data message listener's handleActuatorCommandResponse().
+
+		@param data The ActuatorData containing the command and other
+		parameters (including payload) necessary for the actuation.
+		@return Future A future whose result is the ActuatorData response
+		(or None), or None if the command was rejected.
+		"""
+		actuator = self._getTargetActuator(data)
+
+		if actuator:
+			# the display update must be derived before the command is queued,
+			# since the queued command may not be processed right away
+			displayData = self._getDisplayUpdateData(data, actuator)
+
+			future = \
+				actuator.submitActuatorUpdate( \
+					data = data, responseHandler = self._handleActuatorResponse)
+			future.add_done_callback(self._handleActuatorCommandFailure)
+
+			if displayData:
+				self.ledDisplayActuator.submitActuatorUpdate(data = displayData)
+
+			return future
+
+		return None
+
+	def setDataMessageListener(self, listener: IDataMessageListener = None):
+		"""
+		Sets the data message listener reference, assuming listener is non-null.
+		
+		@param listener The data message listener instance to use for passing relevant
+		messages, such as those received from a subscription event.
+		"""
+		if listener:
+			self.dataMsgListener = listener
+			
+	def startManager(self) -> bool:
+		"""
+		Starts the manager. This simply registers the current actuator state and - depending on
+		the configuration - may activate the actuator command listeners.
+		
+		@return bool True on success; False otherwise
+		"""
+		
+		return True
+	
+	def stopManager(self) -> bool:
+		"""
+		Stops the manager. This will stop each actuator's command queue
+		worker (if started), waiting for any queued commands to complete.
+		
+		@return bool True on success; False otherwise
+		"""
+		for actuator in self._getActuatorTasks():
+			actuator.stopCommandQueue(wait = True)
+		
+		return True
+	
+	def _getActuatorTasks(self) -> list:
+		"""
+		Returns the list of actuator tasks that have been instanced.
+		
+		@return list
+		"""
+		actuators = [ \
+			self.humidifierActuator, self.hvacActuator, \
+			self.thermostatActuator, self.ledDisplayActuator]
+		
+		return [actuator for actuator in actuators if actuator]
+	
+	def _getDisplayUpdateData(self, data: ActuatorData, actuator: IActuatorTask) -> ActuatorData:
+		"""
+		Creates the LED display update that accompanies an actuation event
+		if the 'updateDisplayOnActuation' flag is enabled.
+		
+		@param data The original ActuatorData command.
+		@param actuator The actuator task targeted by the command.
+		@return ActuatorData A copy of 'data' with the display state set, or None
+		if no display update is needed.
+		"""
 		updateDisplayOnActuation = \
 			self.configUtil.getBoolean(\
 				ConfigConst.CONSTRAINED_DEVICE, ConfigConst.UPDATE_DISPLAY_ON_ACTUATION_KEY)
-
+		
+		if updateDisplayOnActuation and self.ledDisplayActuator and actuator is not self.ledDisplayActuator:
+			displayData = ActuatorData()
+			displayData.updateData(data)
+			displayData.setStateData(data.getName() + ': ' + str(data.getValue()))
+			
+			return displayData
+		
+		return None
+	
+	def _getTargetActuator(self, data: ActuatorData) -> IActuatorTask:
+		"""
+		Validates the ActuatorData command and determines which actuator
+		task it is destined for.
+		
+		@param data The ActuatorData containing the command.
+		@return IActuatorTask The target actuator task, or None if the
+		command is invalid, is a response, or targets another location.
+		"""
+		# check if the data is valid and whether or not it's not a response
+		# (if it is a response, ignore)
 		if data and not data.isResponseFlagEnabled():
 			# check if the actuation event is destined for this device
 			# via the location ID property
 			if data.getLocationID() == self.locationID:
-				logging.info("Actuator command received for location ID %s. Processing...", str(data.getLocationID()))
-
+				logging.info("Actuator command received for location ID %s. Processing...", data.getLocationID())
+				
 				aType = data.getTypeID()
-				responseData = None
-
+				
 				if self.isEnvSensingActive:
 					# and yes, there is a more elegant way to do this using a dict[]
 					# with int index and function pointers for each of these sections -
 					# this 	is merely to keep things clear considering we have a limited
 					# number of actuator emulator types
-					# TODO: implement appropriate logging and error handling
 					if aType == \
 						ConfigConst.HUMIDIFIER_ACTUATOR_TYPE and self.humidifierActuator:
-						responseData = self.humidifierActuator.updateActuator(data)
-
-						if updateDisplayOnActuation:
-							data.setStateData(data.getName() + ': ' + str(data.getValue()))
-							self.ledDisplayActuator.updateActuator(data)
-							
+						return self.humidifierActuator
+					
 					elif aType == \
 						ConfigConst.HVAC_ACTUATOR_TYPE and self.hvacActuator:
-						responseData = self.hvacActuator.updateActuator(data)
-
-						if updateDisplayOnActuation:
-							data.setStateData(data.getName() + ': ' + str(data.getValue()))
-							self.ledDisplayActuator.updateActuator(data)
-
+						return self.hvacActuator
+					
 					elif aType == \
 						ConfigConst.THERMOSTAT_TYPE and self.thermostatActuator:
-						responseData = self.thermostatActuator.updateActuator(data)
-
-						if updateDisplayOnActuation:
-							data.setStateData(data.getName() + ': ' + str(data.getValue()))
-							self.ledDisplayActuator.updateActuator(data)
-
+						return self.thermostatActuator
+					
 					elif aType == \
 						ConfigConst.LED_DISPLAY_ACTUATOR_TYPE and self.ledDisplayActuator:
-						responseData = self.ledDisplayActuator.updateActuator(data)
-
+						return self.ledDisplayActuator
+					
 					else:
 						logging.warning("No valid actuator type. Ignoring actuation for type: -%s- : -%s-", data.getTypeID(), aType)
-
+				
 				elif aType == \
 					ConfigConst.LED_DISPLAY_ACTUATOR_TYPE and self.ledDisplayActuator:
-					responseData = self.ledDisplayActuator.updateActuator(data)
-				
-				if responseData:
-					responseData.setDeviceID(self.deviceID)
-
-					return responseData
+					return self.ledDisplayActuator
 				
 			else:
 				logging.warning( \
 					"Location ID doesn't match local. Ignoring: %s != %s", \
 					str(self.locationID), str(data.getLocationID()))
-					
+				
 		else:
 			logging.warning( \
 				"Actuator request received. Message is empty or response. Ignoring.")
 		
 		return None
 	
-	def setDataMessageListener(self, listener: IDataMessageListener = None):
+	def _handleActuatorCommandFailure(self, future: Future):
 		"""
-		Sets the data message listener reference, assuming listener is non-null.
+		Done callback for queued actuator commands. Logs any exception
+		raised by the actuator while processing the command.
 		
-		@param listener The data message listener instance to use for passing relevant
-		messages, such as those received from a subscription event.
+		@param future The completed future.
 		"""
-		if listener:
-			self.dataMsgListener = listener
-			
-	def startManager(self) -> bool:
-		"""
-		Starts the manager. This simply registers the current actuator state and - depending on
-		the configuration - may activate the actuator command listeners.
-		
-		@return bool True on success; False otherwise
-		"""
-		
-		return True
+		if not future.cancelled() and future.exception():
+			logging.error("Queued actuator command failed: %s", str(future.exception()))
 	
-	def stopManager(self) -> bool:
+	def _handleActuatorResponse(self, responseData: ActuatorData):
 		"""
-		Stops the manager. Currently does nothing.
+		Response handler for queued actuator commands. This is invoked
+		on the actuator's worker thread once the command completes.
 		
-		@return bool True on success; False otherwise
+		@param responseData The ActuatorData response.
 		"""
-		return True
+		responseData.setDeviceID(self.deviceID)
+		
+		if self.dataMsgListener:
+			self.dataMsgListener.handleActuatorCommandResponse(responseData)
 	
 	def _initEnvironmentalActuationTasks(self):
 		"""
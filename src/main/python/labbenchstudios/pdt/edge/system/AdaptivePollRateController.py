@@ -0,0 +1,260 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+
+from time import monotonic
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
+from labbenchstudios.pdt.common.MetricsRegistry import MetricsRegistry
+
+class AdaptivePollRateController(object):
+	"""
+	Tracks a sampling interval per sensor (or other named value) and
+	adjusts it based on how quickly the sampled value is changing:
+	
+	  - If the change since the last sample is within the deadband, the
+	    interval is multiplied by 'backoffFactor' (up to maxPollSecs).
+	  - If the rate of change exceeds the rate threshold, the interval
+	    is reset to minPollSecs.
+	  - Otherwise, the interval is divided by 'backoffFactor' (down to
+	    minPollSecs).
+	
+	The deadband and rate threshold are percentages of the previous
+	sample's magnitude (or of 1.0, if that's smaller), so one setting
+	works across sensors with different value ranges.
+	
+	The owning manager is expected to poll at minPollSecs, and only
+	sample the sensors for which isSampleDue() returns True.
+	
+	Each sensor's current interval and decision counts are registered
+	with the MetricsRegistry (see ConfigConst.POLL_INTERVAL_GAUGE and
+	the POLL_*_COUNTER names), so they're included in the pipeline
+	metrics telemetry and the Prometheus endpoint.
+	"""
+	
+	DEFAULT_BACKOFF_FACTOR = 2.0
+	
+	BACKOFF_DECISION = 'backoff'
+	TIGHTEN_DECISION = 'tighten'
+	SPEEDUP_DECISION = 'speedup'
+	
+	def __init__(self, \
+			basePollSecs: float = None, \
+			minPollSecs: float = None, \
+			maxPollSecs: float = None, \
+			deadbandPct: float = None, \
+			rateThresholdPct: float = None, \
+			backoffFactor: float = DEFAULT_BACKOFF_FACTOR):
+		"""
+		Constructor. Any parameter that's None is loaded from the config.
+		
+		@param basePollSecs The initial interval for each sensor (pollCycleSecs).
+		@param minPollSecs The minimum interval (minPollCycleSecs).
+		@param maxPollSecs The maximum interval (maxPollCycleSecs).
+		@param deadbandPct The deadband, as a percent of the previous value (pollDeadbandPct).
+		@param rateThresholdPct The rate of change threshold, as a percent of the previous
+		value per second (pollRateThresholdPct).
+		@param backoffFactor The interval multiplier (and divisor). Must be > 1.0.
+		"""
+		configUtil = ConfigUtil()
+		section = ConfigConst.CONSTRAINED_DEVICE
+		
+		if basePollSecs is None:
+			basePollSecs = configUtil.getFloat(section, ConfigConst.POLL_CYCLES_KEY, ConfigConst.DEFAULT_POLL_CYCLES)
+		
+		if minPollSecs is None:
+			minPollSecs = configUtil.getFloat(section, ConfigConst.MIN_POLL_CYCLES_KEY, basePollSecs)
+		
+		if maxPollSecs is None:
+			maxPollSecs = configUtil.getFloat(section, ConfigConst.MAX_POLL_CYCLES_KEY, basePollSecs)
+		
+		if deadbandPct is None:
+			deadbandPct = configUtil.getFloat(section, ConfigConst.POLL_DEADBAND_PCT_KEY, 0.0)
+		
+		if rateThresholdPct is None:
+			rateThresholdPct = configUtil.getFloat(section, ConfigConst.POLL_RATE_THRESHOLD_PCT_KEY, 0.0)
+		
+		self.minPollSecs = minPollSecs if minPollSecs > 0.0 else 1.0
+		self.maxPollSecs = max(maxPollSecs, self.minPollSecs)
+		self.deadbandPct = max(deadbandPct, 0.0)
+		self.rateThresholdPct = max(rateThresholdPct, 0.0)
+		self.backoffFactor = backoffFactor if backoffFactor > 1.0 else self.DEFAULT_BACKOFF_FACTOR
+		
+		self.setBasePollSecs(basePollSecs)
+		
+		# key -> [lastValue, lastSampleTime, intervalSecs, sampleCount, backoffCount, tightenCount, speedupCount]
+		self.sampleStates = {}
+		
+		# key -> (interval gauge, decision -> counter)
+		self.sampleMetrics = {}
+		
+		logging.info( \
+			"Adaptive poll rate: base %s, min %s, max %s secs; deadband %s%%; rate threshold %s%%/sec", \
+			str(self.basePollSecs), str(self.minPollSecs), str(self.maxPollSecs), str(self.deadbandPct), str(self.rateThresholdPct))
+	
+	def getMinPollSecs(self) -> float:
+		"""
+		Returns the minimum interval, which is the rate at which the owning
+		manager should check isSampleDue().
+		
+		@return float
+		"""
+		return self.minPollSecs
+	
+	def getPollSecs(self, key: str) -> float:
+		"""
+		Returns the current interval for 'key'.
+		
+		@param key The sensor name.
+		@return float The interval, or the base interval if 'key' hasn't been sampled.
+		"""
+		state = self.sampleStates.get(key)
+		
+		return state[2] if state else self.basePollSecs
+	
+	def getStats(self) -> dict:
+		"""
+		Returns the current interval and decision counts for each key.
+		
+		@return dict A dict of key -> dict with 'pollSecs', 'samples',
+		'backoff', 'tighten' and 'speedup' entries.
+		"""
+		stats = {}
+		
+		for key, state in list(self.sampleStates.items()):
+			stats[key] = { \
+				'pollSecs': state[2], \
+				'samples': state[3], \
+				self.BACKOFF_DECISION: state[4], \
+				self.TIGHTEN_DECISION: state[5], \
+				self.SPEEDUP_DECISION: state[6]}
+		
+		return stats
+	
+	def isSampleDue(self, key: str, now: float = None) -> bool:
+		"""
+		Checks if 'key' should be sampled now.
+		
+		@param key The sensor name.
+		@param now The current monotonic time. Defaults to time.monotonic().
+		@return bool True if 'key' hasn't been sampled, or its interval has elapsed.
+		"""
+		state = self.sampleStates.get(key)
+		
+		if not state:
+			return True
+		
+		if now is None:
+			now = monotonic()
+		
+		# allow for scheduler jitter, as the owner polls at minPollSecs
+		return now - state[1] >= state[2] - (self.minPollSecs / 2.0)
+	
+	def setBasePollSecs(self, basePollSecs: float):
+		"""
+		Sets the initial interval used for keys that haven't been sampled.
+		
+		@param basePollSecs The interval, which is clamped to the min / max.
+		"""
+		self.basePollSecs = min(max(basePollSecs, self.minPollSecs), self.maxPollSecs)
+	
+	def updateSample(self, key: str, value: float, now: float = None) -> str:
+		"""
+		Records a new sample for 'key' and adjusts its interval.
+		
+		@param key The sensor name.
+		@param value The sampled value.
+		@param now The current monotonic time. Defaults to time.monotonic().
+		@return str The decision: BACKOFF_DECISION, TIGHTEN_DECISION or SPEEDUP_DECISION
+		(or None for the first sample of 'key').
+		"""
+		if now is None:
+			now = monotonic()
+		
+		state = self.sampleStates.get(key)
+		
+		if not state:
+			self.sampleStates[key] = [value, now, self.basePollSecs, 1, 0, 0, 0]
+			self._getSampleMetrics(key)[0].setValue(self.basePollSecs)
+			
+			return None
+		
+		lastValue, lastTime, pollSecs = state[0], state[1], state[2]
+		
+		scale = max(abs(lastValue), 1.0) / 100.0
+		delta = abs(value - lastValue)
+		elapsed = max(now - lastTime, 1e-6)
+		
+		if delta <= self.deadbandPct * scale:
+			decision = self.BACKOFF_DECISION
+			pollSecs = min(pollSecs * self.backoffFactor, self.maxPollSecs)
+			state[4] += 1
+		elif self.rateThresholdPct > 0.0 and delta / elapsed > self.rateThresholdPct * scale:
+			decision = self.SPEEDUP_DECISION
+			pollSecs = self.minPollSecs
+			state[6] += 1
+		else:
+			decision = self.TIGHTEN_DECISION
+			pollSecs = max(pollSecs / self.backoffFactor, self.minPollSecs)
+			state[5] += 1
+		
+		if pollSecs != state[2]:
+			logging.debug("Poll interval for %s: %s -> %s secs (%s)", key, state[2], pollSecs, decision)
+		
+		state[0] = value
+		state[1] = now
+		state[2] = pollSecs
+		state[3] += 1
+		
+		intervalGauge, decisionCounters = self._getSampleMetrics(key)
+		intervalGauge.setValue(pollSecs)
+		decisionCounters[decision].increment()
+		
+		return decision
+	
+	def _getSampleMetrics(self, key: str) -> tuple:
+		"""
+		Returns the interval gauge and decision counters for 'key',
+		registering them on first use.
+		
+		"""
+		sampleMetrics = self.sampleMetrics.get(key)
+		
+		if not sampleMetrics:
+			metricsRegistry = MetricsRegistry()
+			separator = ConfigConst.SUB_TYPE_SEPARATOR_CHAR
+			
+			sampleMetrics = ( \
+				metricsRegistry.getGauge(ConfigConst.POLL_INTERVAL_GAUGE + separator + key), \
+				{ \
+					self.BACKOFF_DECISION: metricsRegistry.getCounter(ConfigConst.POLL_BACKOFF_COUNTER + separator + key), \
+					self.TIGHTEN_DECISION: metricsRegistry.getCounter(ConfigConst.POLL_TIGHTEN_COUNTER + separator + key), \
+					self.SPEEDUP_DECISION: metricsRegistry.getCounter(ConfigConst.POLL_SPEEDUP_COUNTER + separator + key)})
+			
+			self.sampleMetrics[key] = sampleMetrics
+		
+		return sampleMetrics
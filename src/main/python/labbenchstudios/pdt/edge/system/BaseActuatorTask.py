@@ -23,6 +23,9 @@
 #
 
 import logging
+import threading
+
+from concurrent.futures import Future, ThreadPoolExecutor
 
 import labbenchstudios.pdt.common.ConfigConst as ConfigConst
 
@@ -48,6 +51,13 @@ class BaseActuatorTask(IActuatorTask):
 		self.lastKnownValue = ConfigConst.DEFAULT_VAL
 		self.ignoreTypeID = False
 		
+		# the command queue is created on first use - a single worker
+		# thread guarantees commands for this actuator are applied in
+		# the order they were submitted
+		self.cmdExecutor = None
+		self.cmdExecutorLock = threading.Lock()
+		self.queuedCommandCount = 0
+		
 		self.latestActuatorResponse = ActuatorData(typeID = self.typeID, typeCategoryID = self.typeCategoryID, name = self.name)
 		self.latestActuatorResponse.setAsResponse()
 		
@@ -74,6 +84,14 @@ class BaseActuatorTask(IActuatorTask):
 		"""
 		return self.name
 	
+	def getQueuedCommandCount(self) -> int:
+		"""
+		Returns the number of submitted commands that haven't yet been processed.
+		
+		@return int
+		"""
+		return self.queuedCommandCount
+	
 	def getSimpleName(self) -> str:
 		"""
 		Returns the simplified name passed in from the sub-class.
@@ -98,6 +116,42 @@ class BaseActuatorTask(IActuatorTask):
 		"""
 		return self.typeCategoryID
 	
+	def stopCommandQueue(self, wait: bool = True):
+		"""
+		Stops the command queue worker for this actuator, if it was
+		started. Any commands already queued will still be processed
+		unless the executor is shut down before they are dequeued.
+		
+		@param wait If True (default), blocks until queued commands complete.
+		"""
+		with self.cmdExecutorLock:
+			if self.cmdExecutor:
+				self.cmdExecutor.shutdown(wait = wait)
+				self.cmdExecutor = None
+	
+	def submitActuatorUpdate(self, data: ActuatorData, responseHandler = None) -> Future:
+		"""
+		Queues the given ActuatorData for processing by updateActuator()
+		on this actuator's worker thread, and returns immediately.
+		
+		Commands submitted to the same actuator are processed in order;
+		commands submitted to different actuators run in parallel.
+		
+		@param data The ActuatorData to process.
+		@param responseHandler Optional callable that will be invoked on the
+		worker thread with the ActuatorData response (if any) before the
+		returned future completes.
+		@return Future A future whose result is the ActuatorData response, or None.
+		"""
+		with self.cmdExecutorLock:
+			if not self.cmdExecutor:
+				self.cmdExecutor = \
+					ThreadPoolExecutor(max_workers = 1, thread_name_prefix = self.simpleName)
+			
+			self.queuedCommandCount += 1
+			
+			return self.cmdExecutor.submit(self._processQueuedUpdate, data, responseHandler)
+	
 	def updateActuator(self, data: ActuatorData) -> ActuatorData:
 		"""
 		Updates the actuator state using the given ActuatorData.
@@ -212,6 +266,25 @@ class BaseActuatorTask(IActuatorTask):
 				
 		return 0
 	
+	def _processQueuedUpdate(self, data: ActuatorData, responseHandler = None) -> ActuatorData:
+		"""
+		Worker thread entry point for queued actuator commands.
+		
+		@param data The ActuatorData to process.
+		@param responseHandler Optional callable to receive the response.
+		@return ActuatorData The response from updateActuator(), or None.
+		"""
+		try:
+			actuatorResponse = self.updateActuator(data)
+		finally:
+			with self.cmdExecutorLock:
+				self.queuedCommandCount -= 1
+		
+		if actuatorResponse and responseHandler:
+			responseHandler(actuatorResponse)
+		
+		return actuatorResponse
+	
 	def _setDisableTypeCheckFlag(self, enable: bool = False):
 		"""
 		"""
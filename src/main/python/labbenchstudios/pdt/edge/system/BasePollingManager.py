@@ -0,0 +1,156 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+
+from apscheduler.schedulers.background import BackgroundScheduler
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.ConfigSnapshot import ConfigSnapshot
+from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
+from labbenchstudios.pdt.common.IConfigUpdateListener import IConfigUpdateListener
+from labbenchstudios.pdt.common.IDataManager import IDataManager
+
+from labbenchstudios.pdt.edge.simulation.SensorDataSetCache import SensorDataSetCache
+from labbenchstudios.pdt.edge.simulation.SimRandomStreams import SimRandomStreams
+
+from labbenchstudios.pdt.edge.system.AdaptivePollRateController import AdaptivePollRateController
+from labbenchstudios.pdt.edge.system.SchedulerLagMonitor import SchedulerLagMonitor
+
+class BasePollingManager(IDataManager, IConfigUpdateListener):
+	"""
+	Base class for the managers that poll their sensors (or system
+	utilities) from a scheduled telemetry job. Loads the poll rate, creates
+	the scheduler and (if enabled) the adaptive poll rate controller, and
+	reschedules the telemetry job when a config reload changes the poll rate.
+	
+	Sub-classes must implement handleTelemetry(), and add / remove themselves
+	as a config update listener when started / stopped.
+	
+	"""
+	
+	def __init__(self, schedulerLagName: str = None):
+		"""
+		Constructor.
+		
+		@param schedulerLagName The metric name for the scheduler lag monitor.
+		"""
+		self.configUtil = ConfigUtil()
+		
+		self.pollRate = \
+			self.configUtil.getInteger( \
+				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.POLL_CYCLES_KEY, defaultVal = ConfigConst.DEFAULT_POLL_CYCLES)
+		
+		if self.pollRate <= 0:
+			self.pollRate = ConfigConst.DEFAULT_POLL_CYCLES
+		
+		self.pollRateController = None
+		
+		if self.configUtil.getBoolean(section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.ENABLE_ADAPTIVE_POLLING_KEY):
+			self.pollRateController = AdaptivePollRateController(basePollSecs = self.pollRate)
+		
+		# with adaptive polling, the scheduler always runs at the min interval
+		schedulerPollSecs = self.pollRateController.getMinPollSecs() if self.pollRateController else self.pollRate
+		
+		# technically we only need 1 instance - important to set coalesce
+		# to True and allow for misfire grace period
+		self.scheduler = BackgroundScheduler()
+		self.telemetryJob = self.scheduler.add_job( \
+			self.handleTelemetry, 'interval', seconds = schedulerPollSecs, \
+			max_instances = 2, coalesce = True, misfire_grace_time = 15)
+		self.schedulerLagMonitor = SchedulerLagMonitor(self.scheduler, schedulerLagName)
+	
+	def handleTelemetry(self):
+		"""
+		Callback function used by the scheduler. Sub-classes must override.
+		
+		"""
+		pass
+	
+	def handleConfigUpdate(self, configSnapshot: ConfigSnapshot = None) -> bool:
+		"""
+		Callback function to handle a config file reload. Reschedules the
+		telemetry job (or resets the adaptive base interval) if the poll
+		rate has changed.
+		
+		@param configSnapshot The new ConfigSnapshot.
+		@return bool True on success; False otherwise.
+		"""
+		if not configSnapshot:
+			return False
+		
+		pollRate = \
+			configSnapshot.getInteger( \
+				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.POLL_CYCLES_KEY, defaultVal = ConfigConst.DEFAULT_POLL_CYCLES)
+		
+		if pollRate <= 0:
+			pollRate = ConfigConst.DEFAULT_POLL_CYCLES
+		
+		if pollRate != self.pollRate:
+			logging.info("%s poll rate changed from %s to %s secs.", self.__class__.__name__, str(self.pollRate), str(pollRate))
+			
+			self.pollRate = pollRate
+			
+			if self.pollRateController:
+				self.pollRateController.setBasePollSecs(self.pollRate)
+			else:
+				self.telemetryJob.reschedule(trigger = 'interval', seconds = self.pollRate)
+		
+		return True
+	
+	def _createSimRandomStreams(self) -> SimRandomStreams:
+		"""
+		Creates the root random streams for any simulator tasks, using the
+		sim random seed from the configuration file (if set).
+		
+		@return SimRandomStreams
+		"""
+		return \
+			SimRandomStreams( \
+				seed = self.configUtil.getInteger( \
+					section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.SIM_RANDOM_SEED_KEY, defaultVal = -1))
+	
+	def _createDataSetCache(self, simRandomStreams: SimRandomStreams = None) -> SensorDataSetCache:
+		"""
+		Creates the sim data set cache if enabled in the configuration file,
+		and the sim random seed is set - a cached data set would otherwise
+		replay the noise of the run that stored it.
+		
+		@param simRandomStreams The random streams the data sets are generated from.
+		@return SensorDataSetCache The cache instance, or None if disabled.
+		"""
+		if self.configUtil.getBoolean(section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.ENABLE_SIM_DATA_CACHE_KEY):
+			if not simRandomStreams or not simRandomStreams.isSeeded():
+				logging.info("Sim random seed isn't set. Sim data set cache disabled.")
+				
+				return None
+			
+			cachePath = \
+				self.configUtil.getProperty( \
+					section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.SIM_DATA_CACHE_PATH_KEY, defaultVal = SensorDataSetCache.DEFAULT_CACHE_PATH)
+			
+			return SensorDataSetCache(cachePath = cachePath)
+		
+		return None
@@ -23,7 +23,8 @@
 #
 
 import logging
-import random
+
+from numpy.random import Generator, PCG64
 
 import labbenchstudios.pdt.common.ConfigConst as ConfigConst
 
@@ -34,18 +35,24 @@ class BaseSensorTask(ISensorTask):
 	DEFAULT_MIN_VAL = 0.0
 	DEFAULT_MAX_VAL = 1000.0
 	
+	RANDOM_BLOCK_SIZE = 256
+	
 	def __init__(self, \
 	    	name = ConfigConst.NOT_SET, \
 			typeID: int = ConfigConst.DEFAULT_SENSOR_TYPE, \
 			typeCategoryID: int = ConfigConst.DEFAULT_TYPE_CATEGORY_ID, \
 			dataSet = None, \
 			minVal: float = DEFAULT_MIN_VAL, \
-			maxVal: float = DEFAULT_MAX_VAL):
+			maxVal: float = DEFAULT_MAX_VAL, \
+			randomGenerator: Generator = None):
 		"""
 		Constructor.
 		
 		@param dataSet Defaults to None. Instance of SensorDataSet containing
 		time-series data represented by timeEntries array and dataEntries array.
+		@param randomGenerator Defaults to None. The numpy Generator to use for
+		random values when there's no data set (see SimRandomStreams). If None,
+		a new (randomly seeded) PCG64 Generator is used.
 		"""
 		self.dataSet = dataSet
 		self.name = name
@@ -57,6 +64,10 @@ class BaseSensorTask(ISensorTask):
 		
 		self.latestSensorData = None
 		
+		self.randomGenerator = randomGenerator if randomGenerator else Generator(PCG64())
+		self.randomBlock = None
+		self.randomBlockIndex = 0
+		
 		if not self.dataSet:
 			self.useRandomizer = True
 			self.minVal = minVal
@@ -83,7 +94,7 @@ class BaseSensorTask(ISensorTask):
 		sensorVal = ConfigConst.DEFAULT_VAL
 		
 		if self.useRandomizer:
-			sensorVal = random.uniform(self.minVal, self.maxVal)
+			sensorVal = self._getRandomValue()
 		else:
 			sensorVal = self.dataSet.getDataEntry(index = self.dataSetIndex)
 			self.dataSetIndex = self.dataSetIndex + 1
@@ -155,6 +166,23 @@ class BaseSensorTask(ISensorTask):
 		
 		return self.latestSensorData.getValue()
 
+	def _getRandomValue(self) -> float:
+		"""
+		Returns the next random value between self.minVal and self.maxVal.
+		Values are drawn from the random generator in blocks of
+		RANDOM_BLOCK_SIZE, rather than one call per value.
+		
+		@return float
+		"""
+		if self.randomBlock is None or self.randomBlockIndex >= self.randomBlock.size:
+			self.randomBlock = self.randomGenerator.uniform(self.minVal, self.maxVal, self.RANDOM_BLOCK_SIZE)
+			self.randomBlockIndex = 0
+		
+		val = float(self.randomBlock[self.randomBlockIndex])
+		self.randomBlockIndex += 1
+		
+		return val
+	
 	def _generateSensorReading(self, val: float) -> float:
 		"""
 		"""
@@ -0,0 +1,311 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import threading
+
+from time import time
+
+from apscheduler.schedulers.background import BackgroundScheduler
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.IDataManager import IDataManager
+from labbenchstudios.pdt.common.IDataMessageListener import IDataMessageListener
+from labbenchstudios.pdt.common.ResourceNameEnum import ResourceNameEnum
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+
+class RollupAggregationManager(IDataManager):
+	"""
+	Aggregates raw SensorData into min / max / mean / count / last rollups
+	over tumbling windows - by default 1 minute, 15 minutes and 1 hour.
+	Windows are aligned to the epoch (e.g. 12:15:00 - 12:29:59 UTC for
+	the 15 minute window), so rollups from different devices line up.
+	
+	Each series (location ID, sensor name and window) holds a single fixed
+	size accumulator, so memory use per series is constant regardless of
+	the sample rate. Keying by location ID keeps readings from devices that
+	share a sensor name apart.
+	
+	A window is closed when the first sample for a later window arrives,
+	or when the scheduled check finds it has expired (so the last window
+	of a sensor that stops reporting is still rolled up). stopManager()
+	closes all open windows.
+	
+	Rollups for a closed window are sent to the listener's
+	handleSensorRollupMessage() callback as a list of SensorData, one per
+	statistic, each named '<sensor name>-<window name>-<stat name>' - e.g.
+	'Thermostat-15m-mean' - along with the window's resource. Each rollup
+	carries the location ID of its series, and is time stamped with the
+	start of its window.
+	"""
+	
+	DEFAULT_WINDOWS = ( \
+		(ConfigConst.ROLLUP_1M_NAME,    60, ResourceNameEnum.CDA_SENSOR_ROLLUP_1M_RESOURCE), \
+		(ConfigConst.ROLLUP_15M_NAME,  900, ResourceNameEnum.CDA_SENSOR_ROLLUP_15M_RESOURCE), \
+		(ConfigConst.ROLLUP_1H_NAME,  3600, ResourceNameEnum.CDA_SENSOR_ROLLUP_1H_RESOURCE))
+	
+	DEFAULT_CHECK_SECS = 5
+	
+	# accumulator slots
+	WINDOW_START = 0
+	COUNT        = 1
+	MIN          = 2
+	MAX          = 3
+	SUM          = 4
+	LAST         = 5
+	
+	def __init__(self, windows: tuple = DEFAULT_WINDOWS, checkSecs: int = DEFAULT_CHECK_SECS):
+		"""
+		Constructor.
+		
+		@param windows A tuple of (windowName, windowSecs, ResourceNameEnum) tuples.
+		@param checkSecs The interval for checking for expired windows.
+		"""
+		self.windows   = tuple(windows)
+		self.checkSecs = checkSecs if checkSecs > 0 else self.DEFAULT_CHECK_SECS
+		
+		self.lock = threading.Lock()
+		
+		# (location ID, sensor name) -> list of accumulators (one per window, or None)
+		self.seriesTable = {}
+		
+		# (location ID, sensor name) -> (typeCategoryID, typeID) used for the rollups
+		self.seriesTypes = {}
+		
+		self.rollupCount = 0
+		
+		self.scheduler = BackgroundScheduler()
+		self.telemetryJob = self.scheduler.add_job( \
+			self.closeExpiredWindows, 'interval', seconds = self.checkSecs, \
+			max_instances = 1, coalesce = True, misfire_grace_time = 15)
+		
+		self.dataMsgListener = None
+	
+	def closeExpiredWindows(self, now: float = None) -> int:
+		"""
+		Closes each open window that ended at or before 'now', and sends
+		its rollups to the listener.
+		
+		@param now The current epoch time in seconds. Defaults to time().
+		@return int The number of windows closed.
+		"""
+		now = time() if now is None else now
+		closedWindows = []
+		
+		with self.lock:
+			for key, accList in self.seriesTable.items():
+				for i, (windowName, windowSecs, resource) in enumerate(self.windows):
+					acc = accList[i]
+					
+					if acc and acc[self.WINDOW_START] + windowSecs <= now:
+						closedWindows.append((i, key, acc))
+						accList[i] = None
+		
+		self._sendRollups(closedWindows)
+		
+		return len(closedWindows)
+	
+	def flushWindows(self) -> int:
+		"""
+		Closes all open windows - expired or not - and sends their rollups
+		to the listener.
+		
+		@return int The number of windows closed.
+		"""
+		closedWindows = []
+		
+		with self.lock:
+			for key, accList in self.seriesTable.items():
+				for i in range(len(self.windows)):
+					if accList[i]:
+						closedWindows.append((i, key, accList[i]))
+						accList[i] = None
+		
+		self._sendRollups(closedWindows)
+		
+		return len(closedWindows)
+	
+	def getRollupCount(self) -> int:
+		"""
+		Returns the number of rollup SensorData instances sent so far.
+		
+		@return int
+		"""
+		return self.rollupCount
+	
+	def getSeriesCount(self) -> int:
+		"""
+		Returns the number of series (location ID, sensor name and window) being tracked.
+		
+		@return int
+		"""
+		return len(self.seriesTable) * len(self.windows)
+	
+	def handleSensorData(self, data: SensorData = None, now: float = None) -> bool:
+		"""
+		Adds the value of 'data' to each window's accumulator for its location
+		ID and sensor name. If this sample falls in a later window than an accumulator's,
+		that window is closed first and its rollups sent to the listener.
+		
+		@param data The SensorData to aggregate.
+		@param now The sample's epoch time in seconds. Defaults to time().
+		@return bool True on success; False otherwise.
+		"""
+		if not data:
+			return False
+		
+		now   = time() if now is None else now
+		key   = (data.getLocationID(), data.getName())
+		value = data.getValue()
+		
+		closedWindows = []
+		
+		with self.lock:
+			accList = self.seriesTable.get(key)
+			
+			if not accList:
+				accList = [None] * len(self.windows)
+				self.seriesTable[key] = accList
+			
+			self.seriesTypes[key] = (data.getTypeCategoryID(), data.getTypeID())
+			
+			for i, (windowName, windowSecs, resource) in enumerate(self.windows):
+				windowStart = now - (now % windowSecs)
+				acc = accList[i]
+				
+				if acc and acc[self.WINDOW_START] != windowStart:
+					closedWindows.append((i, key, acc))
+					acc = None
+				
+				if not acc:
+					accList[i] = [windowStart, 1, value, value, value, value]
+				else:
+					acc[self.COUNT] += 1
+					acc[self.SUM]   += value
+					acc[self.LAST]   = value
+					
+					if value < acc[self.MIN]:
+						acc[self.MIN] = value
+					elif value > acc[self.MAX]:
+						acc[self.MAX] = value
+		
+		self._sendRollups(closedWindows)
+		
+		return True
+	
+	def setDataMessageListener(self, listener: IDataMessageListener = None) -> bool:
+		"""
+		Sets the data message listener that will receive the rollups.
+		
+		@param listener The data message listener.
+		@return bool True on success; False otherwise.
+		"""
+		if listener:
+			self.dataMsgListener = listener
+			
+			return True
+		
+		return False
+	
+	def startManager(self):
+		"""
+		Starts the scheduled check for expired windows.
+		
+		"""
+		logging.info("Starting rollup aggregation manager...")
+		
+		if not self.scheduler.running:
+			self.scheduler.start()
+		else:
+			logging.warning("RollupAggregationManager scheduler already started. Ignoring.")
+	
+	def stopManager(self):
+		"""
+		Stops the scheduled check for expired windows, and closes all open windows.
+		
+		"""
+		logging.info("Stopping rollup aggregation manager...")
+		
+		try:
+			if self.scheduler.running:
+				self.scheduler.shutdown()
+			else:
+				logging.warning("RollupAggregationManager scheduler already stopped. Ignoring.")
+		except:
+			logging.warning("RollupAggregationManager scheduler already stopped. Ignoring.")
+		
+		self.flushWindows()
+	
+	def _createRollupData(self, key: tuple, windowName: str, windowStart: float, statName: str, value: float) -> SensorData:
+		"""
+		Creates a SensorData instance for a single rollup statistic.
+		
+		@param key The series' (location ID, sensor name) key.
+		@param windowName The window name (e.g. '15m').
+		@param windowStart The window's start, as epoch time in seconds.
+		@param statName The statistic name (e.g. 'mean').
+		@param value The statistic value.
+		@return SensorData
+		"""
+		locationID, name = key
+		typeCategoryID, typeID = self.seriesTypes.get(key, (ConfigConst.DEFAULT_TYPE_CATEGORY_ID, ConfigConst.DEFAULT_SENSOR_TYPE))
+		separator = ConfigConst.SUB_TYPE_SEPARATOR_CHAR
+		
+		rollupData = SensorData( \
+			typeCategoryID = typeCategoryID, typeID = typeID, \
+			name = name + separator + windowName + separator + statName)
+		rollupData.setLocationID(locationID)
+		rollupData.setValue(value)
+		
+		# setValue() stamps the current time, so this must follow it
+		rollupData.setTimeStamp(windowStart)
+		
+		return rollupData
+	
+	def _sendRollups(self, closedWindows: list):
+		"""
+		Converts each closed window's accumulator into rollup SensorData
+		and sends them to the listener, one call per window.
+		
+		@param closedWindows A list of (windowIndex, (locationID, sensorName), accumulator) tuples.
+		"""
+		for i, key, acc in closedWindows:
+			windowName, windowSecs, resource = self.windows[i]
+			windowStart = acc[self.WINDOW_START]
+			
+			dataList = [ \
+				self._createRollupData(key, windowName, windowStart, ConfigConst.ROLLUP_MIN_NAME, acc[self.MIN]), \
+				self._createRollupData(key, windowName, windowStart, ConfigConst.ROLLUP_MAX_NAME, acc[self.MAX]), \
+				self._createRollupData(key, windowName, windowStart, ConfigConst.ROLLUP_MEAN_NAME, acc[self.SUM] / acc[self.COUNT]), \
+				self._createRollupData(key, windowName, windowStart, ConfigConst.ROLLUP_COUNT_NAME, acc[self.COUNT]), \
+				self._createRollupData(key, windowName, windowStart, ConfigConst.ROLLUP_LAST_NAME, acc[self.LAST])]
+			
+			self.rollupCount += len(dataList)
+			
+			logging.debug("Closed %s rollup window for %s. Count: %s", windowName, key, acc[self.COUNT])
+			
+			if self.dataMsgListener:
+				self.dataMsgListener.handleSensorRollupMessage(resource = resource, dataList = dataList)
@@ -0,0 +1,63 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+from datetime import datetime
+
+from apscheduler.events import EVENT_JOB_SUBMITTED
+
+from labbenchstudios.pdt.common.MetricsRegistry import MetricsRegistry
+
+class SchedulerLagMonitor():
+	"""
+	Records the lag between each job's scheduled run time and the time
+	the scheduler actually submitted it for execution, in the named
+	MetricsRegistry histogram. A growing lag means the scheduler (or
+	the host) isn't keeping up with the configured poll rates.
+	
+	"""
+	
+	def __init__(self, scheduler = None, name: str = None):
+		"""
+		Constructor. Registers this monitor as a listener on 'scheduler'.
+		
+		@param scheduler The APScheduler scheduler to monitor.
+		@param name The MetricsRegistry histogram name.
+		"""
+		self.lagHistogram = MetricsRegistry().getHistogram(name)
+		
+		if scheduler:
+			scheduler.add_listener(self.handleJobSubmitted, EVENT_JOB_SUBMITTED)
+	
+	def handleJobSubmitted(self, event):
+		"""
+		Scheduler listener callback. Records the lag for the most recent
+		scheduled run time of the submitted job.
+		
+		@param event The JobSubmissionEvent.
+		"""
+		if event.scheduled_run_times:
+			scheduledTime = event.scheduled_run_times[-1]
+			lagSecs = (datetime.now(scheduledTime.tzinfo) - scheduledTime).total_seconds()
+			
+			self.lagHistogram.record(max(int(lagSecs * 1000000000), 0))
@@ -23,16 +23,16 @@
 #
 
 import logging
+import os
 
-from importlib import import_module
+from time import monotonic, perf_counter_ns
 
-from apscheduler.schedulers.background import BackgroundScheduler
+from importlib import import_module
 
 import labbenchstudios.pdt.common.ConfigConst as ConfigConst
 
-from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
-from labbenchstudios.pdt.common.IDataManager import IDataManager
 from labbenchstudios.pdt.common.IDataMessageListener import IDataMessageListener
+from labbenchstudios.pdt.common.MetricsRegistry import MetricsRegistry
 from labbenchstudios.pdt.common.ResourceNameEnum import ResourceNameEnum
 
 from labbenchstudios.pdt.data.ActuatorData import ActuatorData
@@ -42,8 +42,11 @@ from labbenchstudios.pdt.edge.simulation.SensorDataGenerator import SensorDataGe
 from labbenchstudios.pdt.edge.simulation.HumiditySensorSimTask import HumiditySensorSimTask
 from labbenchstudios.pdt.edge.simulation.TemperatureSensorSimTask import TemperatureSensorSimTask
 from labbenchstudios.pdt.edge.simulation.PressureSensorSimTask import PressureSensorSimTask
+from labbenchstudios.pdt.edge.simulation.SensorDataReplayTask import SensorDataReplayTask
+
+from labbenchstudios.pdt.edge.system.BasePollingManager import BasePollingManager
 
-class SensorAdapterManager(IDataManager):
+class SensorAdapterManager(BasePollingManager):
 	"""
 	Manager class for running any sensor simulators or actual
 	sensor integration logic within a scheduled polling system.
@@ -55,12 +58,8 @@ class SensorAdapterManager(IDataManager):
 		Constructor.
 		
 		"""
-		self.configUtil = ConfigUtil()
+		super().__init__(schedulerLagName = ConfigConst.SENSOR_SCHEDULER_LAG)
 		
-		self.pollRate     = \
-			self.configUtil.getInteger( \
-				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.POLL_CYCLES_KEY, defaultVal = ConfigConst.DEFAULT_POLL_CYCLES)
-			
 		self.useEmulator  = \
 			self.configUtil.getBoolean( \
 				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.ENABLE_EMULATOR_KEY)
@@ -68,18 +67,11 @@ class SensorAdapterManager(IDataManager):
 		self.locationID   = \
 			self.configUtil.getProperty( \
 				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.DEVICE_LOCATION_ID_KEY, defaultVal = ConfigConst.NOT_SET)
-			
-		if self.pollRate <= 0:
-			self.pollRate = ConfigConst.DEFAULT_POLL_CYCLES
-			
-		# technically we only need 1 instance - important to set coalesce
-		# to True and allow for misfire grace period
-		self.scheduler = BackgroundScheduler()
-		self.scheduler.add_job( \
-			self.handleTelemetry, 'interval', seconds = self.pollRate, max_instances = 2, coalesce = True, misfire_grace_time = 15)
 		
 		self.dataMsgListener = None
 		
+		self.sensorGenerateHistogram = MetricsRegistry().getHistogram(ConfigConst.SENSOR_GENERATE_SPAN)
+		
 		#
 		# NOTE: New config property added into baseline
 		#
@@ -100,6 +92,11 @@ class SensorAdapterManager(IDataManager):
 		#
 		self.useSenseHatI2CBus = False
 		
+		# replay of recorded sensor data is only used with the simulator
+		self.useSimDataReplay = \
+			self.configUtil.getBoolean( \
+				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.ENABLE_SIM_DATA_REPLAY_KEY)
+		
 		self.resource = ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE
 		#self.resource.setAsSensingResource(True)
 		#self.resource.setDeviceName(self.deviceID)
@@ -107,6 +104,8 @@ class SensorAdapterManager(IDataManager):
 		
 		self.isEnvSensingActive = False
 		
+		self.simRandomStreams = self._createSimRandomStreams()
+		
 		# see PIOT-CDA-03-006 description for thoughts on the next line of code
 		self._initEnvironmentalSensorTasks()
 		
@@ -116,29 +115,33 @@ class SensorAdapterManager(IDataManager):
 		of telemetry from any simulated or actual sensors. Once data
 		is retrieved, the data listener will be invoked.
 		
+		If adaptive polling is enabled, only the sensors that are due
+		are sampled.
+		
 		"""
 		if self.isEnvSensingActive:
-			humidityData = self.humidityAdapter.generateTelemetry()
-			pressureData = self.pressureAdapter.generateTelemetry()
-			tempData     = self.tempAdapter.generateTelemetry()
-			
-			humidityData.setDeviceID(self.deviceID)
-			humidityData.setLocationID(self.locationID)
-
-			pressureData.setDeviceID(self.deviceID)
-			pressureData.setLocationID(self.locationID)
-			
-			tempData.setDeviceID(self.deviceID)
-			tempData.setLocationID(self.locationID)
+			now = monotonic()
 			
-			logging.debug('Generated humidity data: ' + str(humidityData.getValue()))
-			logging.debug('Generated pressure data: ' + str(pressureData.getValue()))
-			logging.debug('Generated temp data: ' + str(tempData.getValue()))
-			
-			if self.dataMsgListener:
-				self.dataMsgListener.handleSensorMessage(humidityData)
-				self.dataMsgListener.handleSensorMessage(pressureData)
-				self.dataMsgListener.handleSensorMessage(tempData)
+			for sensorAdapter in (self.humidityAdapter, self.pressureAdapter, self.tempAdapter):
+				if self.pollRateController and not self.pollRateController.isSampleDue(sensorAdapter.getName(), now):
+					continue
+				
+				startNs = perf_counter_ns()
+				sensorData = sensorAdapter.generateTelemetry()
+				self.sensorGenerateHistogram.recordSince(startNs)
+				
+				# replay tasks return None if there's no recorded data to use
+				if sensorData:
+					if self.pollRateController:
+						self.pollRateController.updateSample(sensorAdapter.getName(), sensorData.getValue(), now)
+					
+					sensorData.setDeviceID(self.deviceID)
+					sensorData.setLocationID(self.locationID)
+					
+					logging.debug('Generated %s data: %s', sensorData.getName(), sensorData.getValue())
+					
+					if self.dataMsgListener:
+						self.dataMsgListener.handleSensorMessage(sensorData)
 		else:
 			logging.debug('Environmental sensing is not active. Ignoring handle telemetry call.')
 			
@@ -159,6 +162,8 @@ class SensorAdapterManager(IDataManager):
 		"""
 		logging.info("Started SensorAdapterManager.")
 		
+		self.configUtil.addConfigUpdateListener(self)
+		
 		if not self.scheduler.running:
 			self.scheduler.start()
 			
@@ -175,6 +180,8 @@ class SensorAdapterManager(IDataManager):
 		"""
 		logging.info("Stopped SensorAdapterManager.")
 		
+		self.configUtil.removeConfigUpdateListener(self)
+		
 		try:
 			self.scheduler.shutdown()
 			
@@ -188,7 +195,13 @@ class SensorAdapterManager(IDataManager):
 		"""
 		"""
 		if data and self.useSimulator:
-			logging.info("Updating simulator data set: " + data.getName())
+			if self.useSimDataReplay:
+				# keep the recorded data intact so replays are repeatable
+				logging.info("Replaying recorded sensor data. Ignoring simulator data update: %s", data.getName())
+				
+				return
+			
+			logging.info("Updating simulator data set: %s", data.getName())
 
 			if data.getTypeID() == ConfigConst.THERMOSTAT_TYPE:
 				simData = \
@@ -196,7 +209,7 @@ class SensorAdapterManager(IDataManager):
 						self.tempAdapter.getLatestTelemetry(), data.getValue())
 				
 				self.tempAdapter = None
-				self.tempAdapter = TemperatureSensorSimTask(dataSet = simData)
+				self.tempAdapter = TemperatureSensorSimTask(dataSet = simData, randomGenerator = self.simRandomStreams.createGenerator())
 				self.tempAdapter.enableSimulatedDataRollover(enable = False)
 
 			elif data.getTypeID() == ConfigConst.HUMIDIFIER_TYPE:
@@ -205,14 +218,14 @@ class SensorAdapterManager(IDataManager):
 						self.humidityAdapter.getLatestTelemetry(), data.getValue())
 				
 				self.humidityAdapter = None
-				self.humidityAdapter = HumiditySensorSimTask(dataSet = simData)
+				self.humidityAdapter = HumiditySensorSimTask(dataSet = simData, randomGenerator = self.simRandomStreams.createGenerator())
 				self.humidityAdapter.enableSimulatedDataRollover(enable = False)
 
 	def _generateTrendingSimulationData(self, sensorData: SensorData = None, targetVal: float = 0.0):
 		"""
 		"""
 		if sensorData:
-			self.dataGenerator = SensorDataGenerator()
+			self.dataGenerator = SensorDataGenerator(randomGenerator = self.simRandomStreams.createGenerator())
 
 			curVal = sensorData.getValue()
 			minVal = curVal
@@ -269,8 +282,20 @@ class SensorAdapterManager(IDataManager):
 			self.configUtil.getFloat( \
 				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.TEMP_SIM_CEILING_KEY, defaultVal = SensorDataGenerator.HI_NORMAL_INDOOR_TEMP)
 		
-		if self.useSimulator:
-			self.dataGenerator = SensorDataGenerator()
+		if self.useSimulator and self.useSimDataReplay:
+			self._initSensorDataReplayTasks()
+			
+			self.isEnvSensingActive = True
+			
+		elif self.useSimulator:
+			chunkSize = \
+				self.configUtil.getInteger( \
+					section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.SIM_DATA_CHUNK_SIZE_KEY, defaultVal = 0)
+			
+			self.dataGenerator = \
+				SensorDataGenerator( \
+					dataSetCache = self._createDataSetCache(self.simRandomStreams), chunkSize = chunkSize, \
+					randomGenerator = self.simRandomStreams.createGenerator())
 			
 			humidityData = \
 				self.dataGenerator.generateDailyEnvironmentHumidityDataSet( \
@@ -282,9 +307,11 @@ class SensorAdapterManager(IDataManager):
 				self.dataGenerator.generateDailyIndoorTemperatureDataSet( \
 					minValue = tempFloor, maxValue = tempCeiling, useSeconds = False)
 			
-			self.humidityAdapter = HumiditySensorSimTask(dataSet = humidityData)
-			self.pressureAdapter = PressureSensorSimTask(dataSet = pressureData)
-			self.tempAdapter     = TemperatureSensorSimTask(dataSet = tempData)
+			humidityRandom, pressureRandom, tempRandom = self.simRandomStreams.createGenerators(3)
+			
+			self.humidityAdapter = HumiditySensorSimTask(dataSet = humidityData, randomGenerator = humidityRandom)
+			self.pressureAdapter = PressureSensorSimTask(dataSet = pressureData, randomGenerator = pressureRandom)
+			self.tempAdapter     = TemperatureSensorSimTask(dataSet = tempData, randomGenerator = tempRandom)
 			
 			self.isEnvSensingActive = True
 			
@@ -333,4 +360,43 @@ class SensorAdapterManager(IDataManager):
 			self.tempAdapter = tiClazz()
 			
 			self.isEnvSensingActive = True
-			
\ No newline at end of file
+			
+	
+	def _initSensorDataReplayTasks(self):
+		"""
+		Instantiates replay tasks for each environmental sensor, using the
+		recorded data files within the configured replay path. Each task
+		generates SensorData with the same name and type as the simulator
+		task it replaces.
+		
+		"""
+		replayPath = \
+			self.configUtil.getProperty( \
+				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.SIM_DATA_REPLAY_PATH_KEY, defaultVal = 'simTestData')
+		replayRate = \
+			self.configUtil.getFloat( \
+				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.SIM_DATA_REPLAY_RATE_KEY, defaultVal = SensorDataReplayTask.REAL_TIME)
+		
+		logging.info("Replaying recorded sensor data from %s at rate %s", replayPath, str(replayRate))
+		
+		self.humidityAdapter = \
+			SensorDataReplayTask( \
+				dataFileName = os.path.join(replayPath, SensorDataReplayTask.HUMIDITY_DATA_FILE_NAME), \
+				name = ConfigConst.HUMIDITY_SENSOR_NAME, \
+				typeID = ConfigConst.HUMIDITY_SENSOR_TYPE, \
+				typeCategoryID = ConfigConst.ENV_TYPE_CATEGORY, \
+				playbackRate = replayRate)
+		self.pressureAdapter = \
+			SensorDataReplayTask( \
+				dataFileName = os.path.join(replayPath, SensorDataReplayTask.PRESSURE_DATA_FILE_NAME), \
+				name = ConfigConst.PRESSURE_SENSOR_NAME, \
+				typeID = ConfigConst.PRESSURE_SENSOR_TYPE, \
+				typeCategoryID = ConfigConst.ENV_TYPE_CATEGORY, \
+				playbackRate = replayRate)
+		self.tempAdapter     = \
+			SensorDataReplayTask( \
+				dataFileName = os.path.join(replayPath, SensorDataReplayTask.TEMP_DATA_FILE_NAME), \
+				name = ConfigConst.TEMP_SENSOR_NAME, \
+				typeID = ConfigConst.TEMP_SENSOR_TYPE, \
+				typeCategoryID = ConfigConst.ENV_TYPE_CATEGORY, \
+				playbackRate = replayRate)
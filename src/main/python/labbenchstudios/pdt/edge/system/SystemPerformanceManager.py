@@ -24,23 +24,33 @@
 
 import logging
 
-from apscheduler.schedulers.background import BackgroundScheduler
+from time import monotonic
 
 import labbenchstudios.pdt.common.ConfigConst as ConfigConst
 
 from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
-from labbenchstudios.pdt.common.IDataManager import IDataManager
 from labbenchstudios.pdt.common.IDataMessageListener import IDataMessageListener
+from labbenchstudios.pdt.common.MetricsRegistry import MetricsRegistry
 
+from labbenchstudios.pdt.edge.system.BasePollingManager import BasePollingManager
 from labbenchstudios.pdt.edge.system.SystemCpuUtilTask import SystemCpuUtilTask
 from labbenchstudios.pdt.edge.system.SystemMemUtilTask import SystemMemUtilTask
+from labbenchstudios.pdt.edge.system.SystemTelemetryCollector import SystemTelemetryCollector
 
 from labbenchstudios.pdt.data.SystemPerformanceData import SystemPerformanceData
 
-class SystemPerformanceManager(IDataManager):
+class SystemPerformanceManager(BasePollingManager):
 	"""
 	Shell representation of class for student implementation.
 	
+	If 'enablePipelineMetrics' is set, a snapshot of the MetricsRegistry
+	(pipeline latency histograms and counters) is included as well.
+	
+	On Linux, all telemetry is collected in a single pass over /proc by
+	SystemTelemetryCollector, which adds per-core CPU, disk and network
+	I/O rates, and process RSS and thread count. Elsewhere, only CPU and
+	memory utilization are collected, using the psutil based tasks.
+	
 	"""
 
 	def __init__(self):
@@ -49,25 +59,22 @@ class SystemPerformanceManager(IDataManager):
 		
 		Loads the poll rate and other config properties.
 		"""
-		configUtil = ConfigUtil()
-		
-		self.pollRate = \
-			configUtil.getInteger( \
-				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.POLL_CYCLES_KEY, defaultVal = ConfigConst.DEFAULT_POLL_CYCLES)
+		super().__init__(schedulerLagName = ConfigConst.SYS_PERF_SCHEDULER_LAG)
 		
 		self.locationID = \
-			configUtil.getProperty( \
+			self.configUtil.getProperty( \
 				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.DEVICE_LOCATION_ID_KEY, defaultVal = ConfigConst.NOT_SET)
 		
-		if self.pollRate <= 0:
-			self.pollRate = ConfigConst.DEFAULT_POLL_CYCLES
+		self.enablePipelineMetrics = \
+			self.configUtil.getBoolean( \
+				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.ENABLE_PIPELINE_METRICS_KEY)
+		
+		self.telemetryCollector = SystemTelemetryCollector()
+		
+		if not self.telemetryCollector.isAvailable():
+			logging.info("System telemetry collector is unavailable. Using psutil for CPU and memory utilization.")
 			
-		#self.scheduler = BackgroundScheduler()
-		#self.scheduler.add_job(self.handleTelemetry, 'interval', seconds = self.pollRate)
-		self.scheduler = BackgroundScheduler()
-		self.scheduler.add_job( \
-			self.handleTelemetry, 'interval', seconds = self.pollRate, \
-			max_instances = 2, coalesce = True, misfire_grace_time = 15)
+			self.telemetryCollector = None
 		
 		self.cpuUtilTask = SystemCpuUtilTask()
 		self.memUtilTask = SystemMemUtilTask()
@@ -76,17 +83,50 @@ class SystemPerformanceManager(IDataManager):
 		
 	def handleTelemetry(self):
 		"""
+		If adaptive polling is enabled, CPU and memory utilization are only
+		sampled once either one's interval has elapsed.
+		
 		"""
-		self.cpuUtilPct = self.cpuUtilTask.getTelemetryValue()
-		self.memUtilPct = self.memUtilTask.getTelemetryValue()
+		if self.pollRateController:
+			now = monotonic()
+			
+			if not (self.pollRateController.isSampleDue(ConfigConst.CPU_UTIL_NAME, now) or \
+				self.pollRateController.isSampleDue(ConfigConst.MEM_UTIL_NAME, now)):
+				return
+		
+		telemetry = self.telemetryCollector.collect() if self.telemetryCollector else None
 		
-		logging.debug('CPU utilization is %s percent, and memory utilization is %s percent.', str(self.cpuUtilPct), str(self.memUtilPct))
+		if telemetry:
+			self.cpuUtilPct = telemetry[ConfigConst.CPU_UTIL_PROP]
+			self.memUtilPct = telemetry[ConfigConst.MEM_UTIL_PROP]
+		else:
+			self.cpuUtilPct = self.cpuUtilTask.getTelemetryValue()
+			self.memUtilPct = self.memUtilTask.getTelemetryValue()
+		
+		if self.pollRateController:
+			self.pollRateController.updateSample(ConfigConst.CPU_UTIL_NAME, self.cpuUtilPct, now)
+			self.pollRateController.updateSample(ConfigConst.MEM_UTIL_NAME, self.memUtilPct, now)
+		
+		logging.debug('CPU utilization is %s percent, and memory utilization is %s percent.', self.cpuUtilPct, self.memUtilPct)
 		
 		sysPerfData = SystemPerformanceData()
 		sysPerfData.setLocationID(self.locationID)
 		sysPerfData.setCpuUtilization(self.cpuUtilPct)
 		sysPerfData.setMemoryUtilization(self.memUtilPct)
 		
+		if telemetry:
+			sysPerfData.setCpuCoreUtilization(telemetry[ConfigConst.CPU_CORE_UTIL_PROP])
+			sysPerfData.setDiskUtilization(telemetry[ConfigConst.DISK_UTIL_PROP])
+			sysPerfData.setDiskReadRate(telemetry[ConfigConst.DISK_READ_RATE_PROP])
+			sysPerfData.setDiskWriteRate(telemetry[ConfigConst.DISK_WRITE_RATE_PROP])
+			sysPerfData.setNetworkRxRate(telemetry[ConfigConst.NET_RX_RATE_PROP])
+			sysPerfData.setNetworkTxRate(telemetry[ConfigConst.NET_TX_RATE_PROP])
+			sysPerfData.setProcessRss(telemetry[ConfigConst.PROCESS_RSS_PROP])
+			sysPerfData.setProcessThreadCount(telemetry[ConfigConst.PROCESS_THREAD_COUNT_PROP])
+		
+		if self.enablePipelineMetrics:
+			sysPerfData.setPipelineMetrics(MetricsRegistry().getSnapshot())
+		
 		if self.dataMsgListener:
 			self.dataMsgListener.handleSystemPerformanceMessage(data = sysPerfData)
 			
@@ -104,6 +144,8 @@ class SystemPerformanceManager(IDataManager):
 		"""
 		logging.info("Starting system performance manager...")
 		
+		ConfigUtil().addConfigUpdateListener(self)
+		
 		if not self.scheduler.running:
 			self.scheduler.start()
 		else:
@@ -116,6 +158,8 @@ class SystemPerformanceManager(IDataManager):
 		"""
 		logging.info("Stopping system performance manager...")
 		
+		ConfigUtil().removeConfigUpdateListener(self)
+		
 		try:
 			if self.scheduler.running:
 				self.scheduler.shutdown()
@@ -123,4 +167,7 @@ class SystemPerformanceManager(IDataManager):
 				logging.warning("SystemPerformanceManager scheduler already stopped. Ignoring.")
 		except:
 			logging.warning("SystemPerformanceManager scheduler already stopped. Ignoring.")
+		
+		if self.telemetryCollector:
+			self.telemetryCollector.close()
 			
\ No newline at end of file
@@ -0,0 +1,360 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import os
+
+from time import monotonic
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+class SystemTelemetryCollector():
+	"""
+	Collects system and process telemetry from the Linux /proc file system
+	in a single batched pass, as an alternative to one psutil call per metric.
+	
+	Each /proc file is opened once and re-read from offset 0 on each
+	collect() call (/proc content is regenerated on every read), so a
+	sample costs one read per file and no open / close calls.
+	
+	Counters (CPU time, disk sectors and I/O time, and network bytes) are
+	converted to utilization and per second rates using the deltas since
+	the previous sample. A baseline sample is taken when the collector is
+	created, so the first collect() call returns valid deltas.
+	
+	The collected values (keyed by SystemPerformanceData property name) are:
+	  cpuUtil: aggregate CPU utilization (percent).
+	  cpuCoreUtil: list of per-core CPU utilization (percent).
+	  memUtil: memory utilization, based on MemAvailable (percent).
+	  diskUtil: busiest disk's I/O time utilization (percent).
+	  diskReadRate, diskWriteRate: bytes / sec across all disks.
+	  netRxRate, netTxRate: bytes / sec across all non-loopback interfaces.
+	  processRss: this process's resident set size (bytes).
+	  processThreadCount: this process's thread count.
+	"""
+	
+	PROC_STAT_FILE      = '/proc/stat'
+	PROC_MEMINFO_FILE   = '/proc/meminfo'
+	PROC_DISKSTATS_FILE = '/proc/diskstats'
+	PROC_NET_DEV_FILE   = '/proc/net/dev'
+	PROC_SELF_STAT_FILE = '/proc/self/stat'
+	
+	SYS_BLOCK_DIR = 'block'
+	
+	# virtual block devices that aren't included in the disk stats
+	IGNORED_DISK_PREFIXES = ('loop', 'ram', 'zram', 'dm-', 'md')
+	
+	LOOPBACK_INTERFACE = 'lo'
+	
+	SECTOR_SIZE     = 512
+	READ_CHUNK_SIZE = 65536
+	
+	def __init__(self, procDir: str = '/proc', sysDir: str = '/sys'):
+		"""
+		Constructor.
+		
+		@param procDir The /proc mount point. Primarily for testing.
+		@param sysDir The /sys mount point. Primarily for testing.
+		"""
+		self.procDir  = procDir
+		self.sysDir   = sysDir
+		self.pageSize = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+		
+		self.fileDescriptors = {}
+		self.diskNames = self._loadDiskNames()
+		
+		self.prevSampleTime = None
+		self.prevCpuTimes   = None
+		self.prevDiskStats  = None
+		self.prevNetStats   = None
+		
+		if self.isAvailable():
+			self.collect()
+	
+	def close(self):
+		"""
+		Closes the /proc file handles. They'll be reopened if collect()
+		is called again.
+		
+		"""
+		for fd in self.fileDescriptors.values():
+			try:
+				os.close(fd)
+			except OSError:
+				pass
+		
+		self.fileDescriptors.clear()
+	
+	def collect(self, now: float = None) -> dict:
+		"""
+		Reads all /proc files and returns the telemetry values, keyed
+		by the SystemPerformanceData property names (e.g. CPU_UTIL_PROP).
+		
+		@param now The sample time in seconds. Defaults to monotonic().
+		@return dict The telemetry values, or an empty dict on failure.
+		"""
+		now = monotonic() if now is None else now
+		
+		try:
+			cpuTimes  = self._parseCpuTimes(self._readProcFile(self.PROC_STAT_FILE))
+			memInfo   = self._parseMemInfo(self._readProcFile(self.PROC_MEMINFO_FILE))
+			diskStats = self._parseDiskStats(self._readProcFile(self.PROC_DISKSTATS_FILE))
+			netStats  = self._parseNetStats(self._readProcFile(self.PROC_NET_DEV_FILE))
+			procStats = self._parseProcessStats(self._readProcFile(self.PROC_SELF_STAT_FILE))
+		except (OSError, ValueError, IndexError) as e:
+			logging.warning("Failed to read system telemetry from %s: %s", self.procDir, str(e))
+			
+			self.close()
+			
+			return {}
+		
+		elapsed = (now - self.prevSampleTime) if self.prevSampleTime is not None else 0.0
+		
+		telemetry = { \
+			ConfigConst.CPU_UTIL_PROP:        0.0, \
+			ConfigConst.CPU_CORE_UTIL_PROP:   [], \
+			ConfigConst.MEM_UTIL_PROP:        0.0, \
+			ConfigConst.DISK_UTIL_PROP:       0.0, \
+			ConfigConst.DISK_READ_RATE_PROP:  0.0, \
+			ConfigConst.DISK_WRITE_RATE_PROP: 0.0, \
+			ConfigConst.NET_RX_RATE_PROP:     0.0, \
+			ConfigConst.NET_TX_RATE_PROP:     0.0, \
+			ConfigConst.PROCESS_RSS_PROP:     procStats[0], \
+			ConfigConst.PROCESS_THREAD_COUNT_PROP: procStats[1] }
+		
+		memTotal = memInfo.get('MemTotal', 0)
+		
+		if memTotal > 0:
+			memAvailable = memInfo.get('MemAvailable', memInfo.get('MemFree', 0))
+			telemetry[ConfigConst.MEM_UTIL_PROP] = 100.0 * (memTotal - memAvailable) / memTotal
+		
+		if self.prevCpuTimes:
+			cpuUtilList = [ \
+				self._calculateCpuUtil(self.prevCpuTimes[i], cpuTimes[i]) \
+				for i in range(min(len(cpuTimes), len(self.prevCpuTimes)))]
+			
+			if cpuUtilList:
+				telemetry[ConfigConst.CPU_UTIL_PROP]      = cpuUtilList[0]
+				telemetry[ConfigConst.CPU_CORE_UTIL_PROP] = cpuUtilList[1:]
+		
+		if elapsed > 0.0:
+			readSectors = writeSectors = 0
+			maxIoMillis = 0
+			
+			for name, (reads, writes, ioMillis) in diskStats.items():
+				prevStats = self.prevDiskStats.get(name)
+				
+				if prevStats:
+					readSectors  += max(reads - prevStats[0], 0)
+					writeSectors += max(writes - prevStats[1], 0)
+					maxIoMillis   = max(ioMillis - prevStats[2], maxIoMillis)
+			
+			rxBytes = txBytes = 0
+			
+			for name, (rx, tx) in netStats.items():
+				prevStats = self.prevNetStats.get(name)
+				
+				if prevStats:
+					rxBytes += max(rx - prevStats[0], 0)
+					txBytes += max(tx - prevStats[1], 0)
+			
+			telemetry[ConfigConst.DISK_UTIL_PROP]       = min(100.0, maxIoMillis / (elapsed * 10.0))
+			telemetry[ConfigConst.DISK_READ_RATE_PROP]  = readSectors * self.SECTOR_SIZE / elapsed
+			telemetry[ConfigConst.DISK_WRITE_RATE_PROP] = writeSectors * self.SECTOR_SIZE / elapsed
+			telemetry[ConfigConst.NET_RX_RATE_PROP]     = rxBytes / elapsed
+			telemetry[ConfigConst.NET_TX_RATE_PROP]     = txBytes / elapsed
+		
+		self.prevSampleTime = now
+		self.prevCpuTimes   = cpuTimes
+		self.prevDiskStats  = diskStats
+		self.prevNetStats   = netStats
+		
+		return telemetry
+	
+	def isAvailable(self) -> bool:
+		"""
+		Checks if the /proc files used by this collector exist (i.e. this is Linux).
+		
+		@return bool
+		"""
+		return all(os.path.exists(self._getProcPath(fileName)) for fileName in ( \
+			self.PROC_STAT_FILE, self.PROC_MEMINFO_FILE, self.PROC_DISKSTATS_FILE, \
+			self.PROC_NET_DEV_FILE, self.PROC_SELF_STAT_FILE))
+	
+	def _calculateCpuUtil(self, prevTimes: tuple, curTimes: tuple) -> float:
+		"""
+		Returns the CPU utilization between two (idle, total) jiffy samples.
+		
+		@return float As a percentage.
+		"""
+		totalDelta = curTimes[1] - prevTimes[1]
+		
+		if totalDelta <= 0:
+			return 0.0
+		
+		return max(0.0, 100.0 * (1.0 - (curTimes[0] - prevTimes[0]) / totalDelta))
+	
+	def _getProcPath(self, fileName: str) -> str:
+		"""
+		Maps one of the PROC_*_FILE names to 'procDir'.
+		
+		"""
+		return os.path.join(self.procDir, os.path.relpath(fileName, '/proc'))
+	
+	def _loadDiskNames(self) -> set:
+		"""
+		Returns the names of the whole disks listed in /sys/block, so
+		partitions aren't counted twice, or None if it's unavailable.
+		
+		@return set
+		"""
+		try:
+			return set( \
+				name for name in os.listdir(os.path.join(self.sysDir, self.SYS_BLOCK_DIR)) \
+				if not name.startswith(self.IGNORED_DISK_PREFIXES))
+		except OSError:
+			return None
+	
+	def _parseCpuTimes(self, content: bytes) -> list:
+		"""
+		Parses the 'cpu' lines of /proc/stat. The first entry is the
+		aggregate, followed by one per core.
+		
+		@return list A list of (idleJiffies, totalJiffies) tuples.
+		"""
+		cpuTimes = []
+		
+		for line in content.split(b'\n'):
+			if not line.startswith(b'cpu'):
+				break
+			
+			values = [int(val) for val in line.split()[1:]]
+			
+			# guest time is already included in user time
+			total = sum(values[:8])
+			idle  = values[3] + (values[4] if len(values) > 4 else 0)
+			
+			cpuTimes.append((idle, total))
+		
+		return cpuTimes
+	
+	def _parseDiskStats(self, content: bytes) -> dict:
+		"""
+		Parses /proc/diskstats.
+		
+		@return dict Disk name -> (sectorsRead, sectorsWritten, ioMillis).
+		"""
+		diskStats = {}
+		
+		for line in content.split(b'\n'):
+			fields = line.split()
+			
+			if len(fields) < 13:
+				continue
+			
+			name = fields[2].decode()
+			
+			if self.diskNames is not None:
+				if name not in self.diskNames:
+					continue
+			elif name.startswith(self.IGNORED_DISK_PREFIXES):
+				continue
+			
+			diskStats[name] = (int(fields[5]), int(fields[9]), int(fields[12]))
+		
+		return diskStats
+	
+	def _parseMemInfo(self, content: bytes) -> dict:
+		"""
+		Parses the kB values of /proc/meminfo.
+		
+		@return dict Name -> value in kB.
+		"""
+		memInfo = {}
+		
+		for line in content.split(b'\n'):
+			name, sep, value = line.partition(b':')
+			
+			if sep:
+				memInfo[name.decode()] = int(value.split()[0])
+		
+		return memInfo
+	
+	def _parseNetStats(self, content: bytes) -> dict:
+		"""
+		Parses /proc/net/dev, ignoring the loopback interface.
+		
+		@return dict Interface name -> (rxBytes, txBytes).
+		"""
+		netStats = {}
+		
+		# the first two lines are headers
+		for line in content.split(b'\n')[2:]:
+			name, sep, values = line.partition(b':')
+			name = name.strip().decode()
+			
+			if not sep or name == self.LOOPBACK_INTERFACE:
+				continue
+			
+			fields = values.split()
+			netStats[name] = (int(fields[0]), int(fields[8]))
+		
+		return netStats
+	
+	def _parseProcessStats(self, content: bytes) -> tuple:
+		"""
+		Parses /proc/self/stat.
+		
+		@return tuple (rssBytes, threadCount).
+		"""
+		# the command name may contain spaces, so start after its closing ')'
+		fields = content[content.rindex(b')') + 2:].split()
+		
+		return (int(fields[21]) * self.pageSize, int(fields[17]))
+	
+	def _readProcFile(self, fileName: str) -> bytes:
+		"""
+		Reads the entire content of the /proc file, opening it on first use.
+		
+		@param fileName One of the PROC_*_FILE names.
+		@return bytes
+		"""
+		fd = self.fileDescriptors.get(fileName)
+		
+		if fd is None:
+			fd = os.open(self._getProcPath(fileName), os.O_RDONLY)
+			self.fileDescriptors[fileName] = fd
+		
+		content = os.pread(fd, self.READ_CHUNK_SIZE, 0)
+		
+		# /proc/stat can exceed a single chunk on hosts with many cores
+		while len(content) % self.READ_CHUNK_SIZE == 0 and content:
+			chunk = os.pread(fd, self.READ_CHUNK_SIZE, len(content))
+			
+			if not chunk:
+				break
+			
+			content += chunk
+		
+		return content
@@ -24,12 +24,10 @@
 
 import logging
 
-from apscheduler.schedulers.background import BackgroundScheduler
+from time import monotonic
 
 import labbenchstudios.pdt.common.ConfigConst as ConfigConst
 
-from labbenchstudios.pdt.common.ConfigUtil import ConfigUtil
-from labbenchstudios.pdt.common.IDataManager import IDataManager
 from labbenchstudios.pdt.common.IDataMessageListener import IDataMessageListener
 
 from labbenchstudios.pdt.edge.simulation import WindTurbineSensorSimTask
@@ -39,8 +37,11 @@ from labbenchstudios.pdt.data.ActuatorData import ActuatorData
 from labbenchstudios.pdt.data.SensorData import SensorData
 
 from labbenchstudios.pdt.edge.simulation.SensorDataGenerator import SensorDataGenerator
+from labbenchstudios.pdt.edge.simulation.WindFarmSimulator import WindFarmSimulator
 
-class WindTurbineAdapterManager(IDataManager):
+from labbenchstudios.pdt.edge.system.BasePollingManager import BasePollingManager
+
+class WindTurbineAdapterManager(BasePollingManager):
 	"""
 	
 	"""
@@ -51,36 +52,52 @@ class WindTurbineAdapterManager(IDataManager):
 		
 		Loads the poll rate and other config properties.
 		"""
-		self.configUtil = ConfigUtil()
-		
-		self.pollRate = \
-			self.configUtil.getInteger( \
-				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.POLL_CYCLES_KEY, defaultVal = ConfigConst.DEFAULT_POLL_CYCLES)
+		super().__init__(schedulerLagName = ConfigConst.WIND_TURBINE_SCHEDULER_LAG)
 		
 		self.locationID = \
 			self.configUtil.getProperty( \
 				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.DEVICE_LOCATION_ID_KEY, defaultVal = ConfigConst.NOT_SET)
 		
+		self.turbineCount = \
+			self.configUtil.getInteger( \
+				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.WIND_TURBINE_COUNT_KEY, defaultVal = 1)
+		
 		# for now, power generation is always a simulation
 		self.useSimulator = True
 		self.enableWindTurbineBraking = False
-
-		if self.pollRate <= 0:
-			self.pollRate = ConfigConst.DEFAULT_POLL_CYCLES
-			
-		self.scheduler = BackgroundScheduler()
-		self.scheduler.add_job( \
-			self.handleTelemetry, 'interval', seconds = self.pollRate, \
-			max_instances = 2, coalesce = True, misfire_grace_time = 15)
 		
 		self.windTurbine = None
+		self.windFarm = None
 		self.dataMsgListener = None
 
 		self._initWindTurbineSensorTasks()
 
 	def handleTelemetry(self):
 		"""
+		If adaptive polling is enabled, the turbine (or farm) is only sampled
+		when due, based on the rate of change of the wind speed.
+		
 		"""
+		now = monotonic()
+		
+		if self.pollRateController and not self.pollRateController.isSampleDue(ConfigConst.WIND_SPEED_NAME, now):
+			return
+		
+		if self.windFarm:
+			self.windFarm.generateTelemetry()
+			
+			# farm-level aggregate power output, rotational speed and wind speed
+			for sensorData in self.windFarm.getFarmTelemetry():
+				sensorData.setLocationID(self.locationID)
+				
+				if self.pollRateController and sensorData.getTypeID() == ConfigConst.WIND_TURBINE_AIR_SPEED_SENSOR_TYPE:
+					self.pollRateController.updateSample(ConfigConst.WIND_SPEED_NAME, sensorData.getValue(), now)
+				
+				if self.dataMsgListener:
+					self.dataMsgListener.handleSensorMessage(data = sensorData)
+			
+			return
+		
 		self.windTurbineSimTask.enableBrakingSystem(enable = self.enableWindTurbineBraking)
 		self.windTurbineSimTask.generateTelemetry()
 
@@ -88,6 +105,9 @@ class WindTurbineAdapterManager(IDataManager):
 		rotationalSpeedData = self.windTurbineSimTask.getRotationalSpeedTelemetry()
 		windSpeedData       = self.windTurbineSimTask.getWindSpeedTelemetry()
 		
+		if self.pollRateController:
+			self.pollRateController.updateSample(ConfigConst.WIND_SPEED_NAME, windSpeedData.getValue(), now)
+		
 		logging.debug( \
 			'Power output is %s kw, rotational speed is %s rpm, wind speed is %s m/s.', \
 			str(powerOutputData.getValue()), \
@@ -115,6 +135,8 @@ class WindTurbineAdapterManager(IDataManager):
 		"""
 		logging.info("Starting wind turbine manager...")
 		
+		self.configUtil.addConfigUpdateListener(self)
+		
 		if not self.scheduler.running:
 			self.scheduler.start()
 		else:
@@ -127,6 +149,8 @@ class WindTurbineAdapterManager(IDataManager):
 		"""
 		logging.info("Stopping wind turbine manager...")
 		
+		self.configUtil.removeConfigUpdateListener(self)
+		
 		try:
 			if self.scheduler.running:
 				self.scheduler.shutdown()
@@ -139,13 +163,19 @@ class WindTurbineAdapterManager(IDataManager):
 		"""
 		"""
 		if data and self.useSimulator:
-			logging.info("Updating wind turbine simulated data set: " + data.getName())
+			logging.info("Updating wind turbine simulated data set: %s", data.getName())
 
 			if data.getTypeID() == ConfigConst.WIND_TURBINE_BRAKE_SYSTEM_ACTUATOR_TYPE:
 				if (data.getCommand() == ConfigConst.COMMAND_ON):
 					self.enableWindTurbineBraking = True
 				else:
 					self.enableWindTurbineBraking = False
+				
+				if self.windFarm:
+					# state data may contain a comma separated list of turbine
+					# indexes to apply the command to - if not, apply to all
+					self.windFarm.enableBrakingSystem( \
+						enable = self.enableWindTurbineBraking, turbineIndexes = self._getTurbineIndexes(data.getStateData()))
 
 	def _initWindTurbineSensorTasks(self):
 		"""
@@ -160,18 +190,74 @@ class WindTurbineAdapterManager(IDataManager):
 			self.configUtil.getFloat( \
 				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.MAX_WIND_SPEED_KEY, defaultVal = 20.0)
 		
-		logging.info("\n\n*****\n\nSetting min / max wind speed: " + str(minWindSpeed) + " to " + str(maxWindSpeed) + "\n\n*****\n\n")
+		logging.info("\n\n*****\n\nSetting min / max wind speed: %s to %s\n\n*****\n\n", minWindSpeed, maxWindSpeed)
 
-		self.dataGenerator = SensorDataGenerator()
+		chunkSize = \
+			self.configUtil.getInteger( \
+				section = ConfigConst.CONSTRAINED_DEVICE, key = ConfigConst.SIM_DATA_CHUNK_SIZE_KEY, defaultVal = 0)
+		
+		self.simRandomStreams = self._createSimRandomStreams()
 		
-		windSpeedData = \
+		self.dataGenerator = \
+			SensorDataGenerator( \
+				dataSetCache = self._createDataSetCache(self.simRandomStreams), chunkSize = chunkSize, randomGenerator = self.simRandomStreams.createGenerator())
+		
+		windSpeedData = self._initSampleWeatherData(minWindSpeed = minWindSpeed, maxWindSpeed = maxWindSpeed)
+		
+		self.windTurbineSimTask = None
+		
+		# the farm simulates every turbine, so the single turbine task is only
+		# needed without it
+		if self.turbineCount > 1:
+			self._initSampleWindTurbine(windSpeedData = windSpeedData)
+		else:
+			self.windTurbineSimTask = \
+				WindTurbineSensorSimTask(dataSet = windSpeedData, randomGenerator = self.simRandomStreams.createGenerator())
+	
+	def _getTurbineIndexes(self, stateData: str = None) -> list:
+		"""
+		Parses a comma separated list of turbine indexes, ignoring any that
+		are invalid or out of range.
+		
+		@param stateData The comma separated list of turbine indexes.
+		@return list The list of turbine indexes, or None if there are none (all turbines).
+		"""
+		turbineIndexes = []
+		
+		if stateData:
+			for indexStr in stateData.split(','):
+				try:
+					index = int(indexStr.strip())
+					
+					if 0 <= index < self.windFarm.getTurbineCount():
+						turbineIndexes.append(index)
+				except ValueError:
+					pass
+		
+		return turbineIndexes if turbineIndexes else None
+	
+	def _initSampleWeatherData(self, minWindSpeed: float = 2.0, maxWindSpeed: float = 20.0):
+		"""
+		Generates the wind field (wind speeds in m/sec) shared by the turbine(s).
+		
+		@param minWindSpeed The minimum wind speed.
+		@param maxWindSpeed The maximum wind speed.
+		@return SensorDataSet
+		"""
+		return \
 			self.dataGenerator.generateOscillatingSensorDataSet( \
 				minValue = minWindSpeed, maxValue = maxWindSpeed, useSeconds = False)
 		
-		self.windTurbineSimTask = WindTurbineSensorSimTask(dataSet = windSpeedData)
-			
-	def _initSampleWeatherData(self):
-		pass
+	def _initSampleWindTurbine(self, windSpeedData = None):
+		"""
+		Creates the wind farm simulator for 'turbineCount' turbines, sharing
+		the given wind field.
+		
+		@param windSpeedData The SensorDataSet containing the shared wind field.
+		"""
+		logging.info("Simulating wind farm with %s turbines.", self.turbineCount)
 		
-	def _initSampleWindTurbine(self):
-		pass
+		self.windFarm = \
+			WindFarmSimulator( \
+				turbineCount = self.turbineCount, windSpeedDataSet = windSpeedData, \
+				randomGenerator = self.simRandomStreams.createGenerator())
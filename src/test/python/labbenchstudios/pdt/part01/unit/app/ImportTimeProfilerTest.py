@@ -0,0 +1,79 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import unittest
+
+from labbenchstudios.pdt.edge.app.ImportTimeProfiler import ImportTimeProfiler
+
+class ImportTimeProfilerTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	ImportTimeProfiler. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing ImportTimeProfiler class...")
+		
+		self.profiler = ImportTimeProfiler()
+		self.profiler.profileImports()
+		
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+
+	def testParseImportTimes(self):
+		output = \
+			"import time: self [us] | cumulative | imported package\n" + \
+			"import time:       120 |        120 |     configparser\n" + \
+			"import time:       300 |        420 |   labbenchstudios.pdt.common.ConfigUtil\n" + \
+			"import time:        50 |        470 | labbenchstudios.pdt.edge.app.EdgeDeviceApp\n"
+		
+		importTimes = self.profiler._parseImportTimes(output)
+		
+		self.assertEqual(len(importTimes), 3)
+		self.assertEqual(importTimes[0], ('configparser', 120, 120, 2))
+		self.assertEqual(importTimes[2], ('labbenchstudios.pdt.edge.app.EdgeDeviceApp', 50, 470, 0))
+		
+	def testEdgeDeviceAppImports(self):
+		logging.info("EdgeDeviceApp import time: %.1f ms", self.profiler.getTotalImportMillis())
+		
+		self.assertGreater(self.profiler.getTotalImportMillis(), 0.0)
+		self.assertFalse(self.profiler.hasImport('matplotlib'))
+		
+	def testBudgetExceeded(self):
+		profiler = ImportTimeProfiler(budgetMillis = 0.0)
+		profiler.importTimes = self.profiler.getImportTimes()
+		
+		self.assertFalse(profiler.isWithinBudget())
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,101 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import unittest
+import urllib.error
+import urllib.request
+
+from labbenchstudios.pdt.common.MetricsRegistry import MetricsRegistry
+from labbenchstudios.pdt.edge.app.PrometheusMetricsServer import PrometheusMetricsServer
+
+class PrometheusMetricsServerTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	PrometheusMetricsServer. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing PrometheusMetricsServer class...")
+		
+	def setUp(self):
+		self.registry = MetricsRegistry()
+		self.registry.reset()
+		
+		self.registry.getCounter('testMsgCount').increment(3)
+		self.registry.getGauge('testQueueDepth').setValueSupplier(lambda: 7)
+		self.registry.getHistogram('testSpan').record(2000000)
+		
+		self.metricsServer = PrometheusMetricsServer(host = '127.0.0.1', port = 0, cacheSecs = 60.0)
+		
+	def tearDown(self):
+		self.metricsServer.stopServer()
+		self.registry.reset()
+		
+	def testRenderMetrics(self):
+		text = self.metricsServer.renderMetrics()
+		
+		logging.info("Metrics text:\n%s", text)
+		
+		self.assertIn('# TYPE pdt_test_msg_count_total counter\n', text)
+		self.assertIn('pdt_test_msg_count_total 3\n', text)
+		self.assertIn('pdt_test_queue_depth 7\n', text)
+		self.assertIn('# TYPE pdt_test_span_seconds summary\n', text)
+		self.assertIn('pdt_test_span_seconds{quantile="0.99"}', text)
+		self.assertIn('pdt_test_span_seconds_count 1\n', text)
+		self.assertIn('process_cpu_seconds_total', text)
+		
+	def testMetricsCache(self):
+		firstText = self.metricsServer.getMetricsText()
+		
+		self.registry.getCounter('testMsgCount').increment()
+		
+		# still within 'cacheSecs', so the cached text is returned
+		self.assertIs(firstText, self.metricsServer.getMetricsText())
+		self.assertEqual(self.metricsServer.getRenderCount(), 1)
+		
+	def testScrapeMetrics(self):
+		self.assertTrue(self.metricsServer.startServer())
+		
+		baseUrl = 'http://127.0.0.1:%d' % self.metricsServer.getServerPort()
+		
+		with urllib.request.urlopen(baseUrl + PrometheusMetricsServer.METRICS_PATH, timeout = 5) as response:
+			self.assertEqual(response.status, 200)
+			self.assertEqual(response.headers['Content-Type'], PrometheusMetricsServer.CONTENT_TYPE)
+			self.assertIn(b'pdt_test_msg_count_total 3\n', response.read())
+		
+		with self.assertRaises(urllib.error.HTTPError) as context:
+			urllib.request.urlopen(baseUrl + '/other', timeout = 5)
+		
+		self.assertEqual(context.exception.code, 404)
+		context.exception.close()
+		
+if __name__ == "__main__":
+	unittest.main()
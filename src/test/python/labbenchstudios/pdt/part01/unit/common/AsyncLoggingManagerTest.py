@@ -0,0 +1,119 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import threading
+import unittest
+
+from labbenchstudios.pdt.common.AsyncLoggingManager import AsyncLoggingManager
+
+class RecordingHandler(logging.Handler):
+	"""
+	Simple handler that records each handled record and the thread it was handled on.
+	
+	"""
+	
+	def __init__(self):
+		super(RecordingHandler, self).__init__()
+		
+		self.messages = []
+		self.threadNames = []
+		
+	def emit(self, record):
+		self.messages.append(record.getMessage())
+		self.threadNames.append(threading.current_thread().name)
+	
+class AsyncLoggingManagerTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	AsyncLoggingManager. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing AsyncLoggingManager class...")
+		
+	def setUp(self):
+		self.rootLogger = logging.getLogger()
+		self.rootLevel = self.rootLogger.level
+		self.rootHandlers = list(self.rootLogger.handlers)
+		
+		for handler in self.rootHandlers:
+			self.rootLogger.removeHandler(handler)
+		
+		self.handler = RecordingHandler()
+		self.rootLogger.addHandler(self.handler)
+		
+	def tearDown(self):
+		for handler in list(self.rootLogger.handlers):
+			self.rootLogger.removeHandler(handler)
+		
+		for handler in self.rootHandlers:
+			self.rootLogger.addHandler(handler)
+		
+		self.rootLogger.setLevel(self.rootLevel)
+		
+	def testAsyncLogging(self):
+		loggingMgr = AsyncLoggingManager(logLevel = 'info', enableAsyncLogging = True)
+		
+		self.assertTrue(loggingMgr.start())
+		self.assertTrue(loggingMgr.isStarted())
+		self.assertNotIn(self.handler, self.rootLogger.handlers)
+		
+		logging.info("Test message %s", 1)
+		logging.debug("Filtered message %s", 2)
+		
+		loggingMgr.stop()
+		
+		self.assertFalse(loggingMgr.isStarted())
+		self.assertEqual(self.rootLogger.handlers, [self.handler])
+		self.assertEqual(self.handler.messages, ["Test message 1"])
+		self.assertNotEqual(self.handler.threadNames[0], threading.current_thread().name)
+		
+	def testSyncLogging(self):
+		loggingMgr = AsyncLoggingManager(logLevel = 'WARNING', enableAsyncLogging = False)
+		
+		self.assertFalse(loggingMgr.start())
+		self.assertEqual(self.rootLogger.level, logging.WARNING)
+		
+		logging.info("Filtered message")
+		logging.warning("Test message")
+		
+		loggingMgr.stop()
+		
+		self.assertEqual(self.handler.messages, ["Test message"])
+		self.assertEqual(self.handler.threadNames[0], threading.current_thread().name)
+		
+	def testInvalidLogLevel(self):
+		loggingMgr = AsyncLoggingManager(logLevel = 'NOT_A_LEVEL', enableAsyncLogging = False)
+		
+		self.assertEqual(loggingMgr.getLogLevel(), logging.DEBUG)
+		
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,97 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import configparser
+import logging
+import unittest
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.ConfigSnapshot import ConfigSnapshot
+
+class ConfigSnapshotTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	ConfigSnapshot. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	CONFIG_DATA = \
+		"[" + ConfigConst.CONSTRAINED_DEVICE + "]\n" + \
+		ConfigConst.POLL_CYCLES_KEY + " = 5\n" + \
+		ConfigConst.ENABLE_SENSING_KEY + " = True\n" + \
+		ConfigConst.TRIGGER_HVAC_TEMP_FLOOR_KEY + " = 18.5\n" + \
+		ConfigConst.DEVICE_ID_KEY + " = edgedevice001\n"
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing ConfigSnapshot class...")
+		
+		configParser = configparser.ConfigParser()
+		configParser.read_string(self.CONFIG_DATA)
+		
+		self.configSnapshot = ConfigSnapshot(configParser = configParser, configFile = 'test.props', version = 3)
+		
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+	
+	def testTypedValues(self):
+		section = ConfigConst.CONSTRAINED_DEVICE
+		
+		self.assertEqual(self.configSnapshot.getInteger(section, ConfigConst.POLL_CYCLES_KEY), 5)
+		self.assertEqual(self.configSnapshot.getFloat(section, ConfigConst.POLL_CYCLES_KEY), 5.0)
+		self.assertTrue(self.configSnapshot.getBoolean(section, ConfigConst.ENABLE_SENSING_KEY))
+		self.assertEqual(self.configSnapshot.getFloat(section, ConfigConst.TRIGGER_HVAC_TEMP_FLOOR_KEY), 18.5)
+		self.assertEqual(self.configSnapshot.getProperty(section, ConfigConst.DEVICE_ID_KEY), 'edgedevice001')
+	
+	def testDefaultValues(self):
+		section = ConfigConst.CONSTRAINED_DEVICE
+		
+		self.assertFalse(self.configSnapshot.getBoolean(section, ConfigConst.DEVICE_ID_KEY))
+		self.assertEqual(self.configSnapshot.getInteger(section, ConfigConst.TRIGGER_HVAC_TEMP_FLOOR_KEY, 7), 7)
+		self.assertEqual(self.configSnapshot.getFloat('NotASection', ConfigConst.POLL_CYCLES_KEY, 1.0), 1.0)
+		self.assertIsNone(self.configSnapshot.getProperty(section, 'notAKey'))
+	
+	def testKeysAreCaseInsensitive(self):
+		self.assertTrue(self.configSnapshot.hasProperty(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.POLL_CYCLES_KEY.upper()))
+		self.assertTrue(self.configSnapshot.hasSection(ConfigConst.CONSTRAINED_DEVICE))
+		self.assertFalse(self.configSnapshot.hasSection(ConfigConst.CONSTRAINED_DEVICE.lower()))
+	
+	def testSnapshotIsImmutable(self):
+		props = self.configSnapshot.getSection(ConfigConst.CONSTRAINED_DEVICE)
+		
+		with self.assertRaises(TypeError):
+			props[ConfigConst.POLL_CYCLES_KEY.lower()] = '1'
+		
+		self.assertEqual(self.configSnapshot.getVersion(), 3)
+		self.assertEqual(self.configSnapshot.getConfigFileName(), 'test.props')
+	
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,146 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import threading
+import unittest
+
+from time import perf_counter_ns
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.MetricHistogram import MetricHistogram
+from labbenchstudios.pdt.common.MetricsRegistry import MetricsRegistry
+
+class MetricsRegistryTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	MetricsRegistry and its metrics. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	
+	"""
+	
+	TEST_COUNTER   = 'testCounter'
+	TEST_GAUGE     = 'testGauge'
+	TEST_HISTOGRAM = 'testHistogram'
+	
+	# generous, as the build host may be slow or busy - the target is < 1 us
+	MAX_SPAN_OVERHEAD_NS = 5000
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing MetricsRegistry class...")
+		
+	def setUp(self):
+		self.registry = MetricsRegistry()
+		self.registry.reset()
+		
+	def tearDown(self):
+		self.registry.reset()
+	
+	def testCounterMergesThreads(self):
+		counter = self.registry.getCounter(self.TEST_COUNTER)
+		
+		self.assertIs(counter, self.registry.getCounter(self.TEST_COUNTER))
+		
+		def incrementCounter():
+			for i in range(1000):
+				counter.increment()
+		
+		threads = [threading.Thread(target = incrementCounter) for i in range(4)]
+		
+		for thread in threads:
+			thread.start()
+		
+		for thread in threads:
+			thread.join()
+		
+		self.assertEqual(counter.getValue(), 4000)
+		
+	def testHistogramPercentiles(self):
+		histogram = self.registry.getHistogram(self.TEST_HISTOGRAM)
+		
+		for value in range(1, 1001):
+			histogram.record(value * 1000)
+		
+		stats = histogram.getStats()
+		
+		self.assertEqual(stats['count'], 1000)
+		self.assertEqual(stats['min'], 1000)
+		self.assertEqual(stats['max'], 1000000)
+		self.assertAlmostEqual(stats['mean'], 500500.0)
+		
+		# each bucket is within 12.5% of the values it counts
+		self.assertAlmostEqual(stats['p50'], 500000, delta = 500000 / MetricHistogram.SUB_BUCKET_COUNT)
+		self.assertAlmostEqual(stats['p99'], 990000, delta = 990000 / MetricHistogram.SUB_BUCKET_COUNT)
+		
+	def testHistogramMaxValues(self):
+		histogram = MetricHistogram('testMaxValues')
+		
+		for value in (2 ** 63 - 1, 2 ** 63 + 5, 2 ** 64 - 1):
+			histogram.record(value)
+		
+		stats = histogram.getStats(percentiles = (100.0,))
+		
+		self.assertEqual(stats['count'], 3)
+		self.assertEqual(stats['max'], 2 ** 64 - 1)
+		self.assertEqual(stats['p100'], 2 ** 64 - 1)
+		self.assertEqual(MetricHistogram.getBucketUpperBound(MetricHistogram.BUCKET_COUNT - 1), 2 ** 64 - 1)
+		
+	def testSnapshot(self):
+		self.registry.getCounter(self.TEST_COUNTER).increment(3)
+		self.registry.getGauge(self.TEST_GAUGE).setValue(42.0)
+		self.registry.getHistogram(self.TEST_HISTOGRAM).record(2000)
+		
+		snapshot = self.registry.getSnapshot()
+		
+		logging.info("Metrics snapshot: %s", str(snapshot))
+		
+		self.assertEqual(snapshot[self.TEST_COUNTER], 3)
+		self.assertEqual(snapshot[self.TEST_GAUGE], 42.0)
+		self.assertEqual(snapshot[self.TEST_HISTOGRAM + '-count'], 1)
+		self.assertEqual(snapshot[self.TEST_HISTOGRAM + '-max'], 2.0)
+		self.assertIn(self.TEST_HISTOGRAM + '-p99', snapshot)
+		
+	def testSpanOverhead(self):
+		histogram = self.registry.getHistogram(ConfigConst.DATA_ENCODE_SPAN)
+		spanCount = 100000
+		
+		startTime = perf_counter_ns()
+		
+		for i in range(spanCount):
+			startNs = perf_counter_ns()
+			histogram.recordSince(startNs)
+		
+		overheadNs = (perf_counter_ns() - startTime) / spanCount
+		
+		logging.info("Span overhead: %.0f ns", overheadNs)
+		
+		self.assertLess(overheadNs, self.MAX_SPAN_OVERHEAD_NS)
+		
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,107 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import unittest
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.MetricsRegistry import MetricsRegistry
+
+from labbenchstudios.pdt.edge.system.AdaptivePollRateController import AdaptivePollRateController
+
+class AdaptivePollRateControllerTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	AdaptivePollRateController. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing AdaptivePollRateController class...")
+		
+	def setUp(self):
+		self.controller = \
+			AdaptivePollRateController( \
+				basePollSecs = 4.0, minPollSecs = 1.0, maxPollSecs = 16.0, deadbandPct = 1.0, rateThresholdPct = 5.0)
+
+	def tearDown(self):
+		pass
+
+	def testBackoffWhenQuiet(self):
+		now = 0.0
+		self.controller.updateSample('temp', 20.0, now)
+		
+		for expectedSecs in (8.0, 16.0, 16.0):
+			now += self.controller.getPollSecs('temp')
+			
+			self.assertEqual(self.controller.updateSample('temp', 20.1, now), AdaptivePollRateController.BACKOFF_DECISION)
+			self.assertEqual(self.controller.getPollSecs('temp'), expectedSecs)
+		
+	def testSpeedupWhenChangingFast(self):
+		self.controller.updateSample('temp', 20.0, 0.0)
+		
+		# 5 degrees in 4 seconds is ~6% per second
+		self.assertEqual(self.controller.updateSample('temp', 25.0, 4.0), AdaptivePollRateController.SPEEDUP_DECISION)
+		self.assertEqual(self.controller.getPollSecs('temp'), 1.0)
+		
+	def testTightenWhenChangingSlowly(self):
+		self.controller.updateSample('temp', 20.0, 0.0)
+		
+		self.assertEqual(self.controller.updateSample('temp', 21.0, 4.0), AdaptivePollRateController.TIGHTEN_DECISION)
+		self.assertEqual(self.controller.getPollSecs('temp'), 2.0)
+		
+		stats = self.controller.getStats()['temp']
+		
+		self.assertEqual(stats['samples'], 2)
+		self.assertEqual(stats[AdaptivePollRateController.TIGHTEN_DECISION], 1)
+		
+	def testIsSampleDue(self):
+		self.assertTrue(self.controller.isSampleDue('temp', 0.0))
+		
+		self.controller.updateSample('temp', 20.0, 0.0)
+		
+		self.assertFalse(self.controller.isSampleDue('temp', 1.0))
+		self.assertTrue(self.controller.isSampleDue('temp', 4.0))
+		
+	def testPollRateMetrics(self):
+		key = 'pollMetricsTemp'
+		
+		self.controller.updateSample(key, 20.0, 0.0)
+		self.controller.updateSample(key, 20.1, 4.0)
+		self.controller.updateSample(key, 40.0, 12.0)
+		
+		snapshot = MetricsRegistry().getSnapshot()
+		
+		self.assertEqual(snapshot[ConfigConst.POLL_INTERVAL_GAUGE + '-' + key], 1.0)
+		self.assertEqual(snapshot[ConfigConst.POLL_BACKOFF_COUNTER + '-' + key], 1)
+		self.assertEqual(snapshot[ConfigConst.POLL_TIGHTEN_COUNTER + '-' + key], 0)
+		self.assertEqual(snapshot[ConfigConst.POLL_SPEEDUP_COUNTER + '-' + key], 1)
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,91 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import configparser
+import logging
+import unittest
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.ConfigSnapshot import ConfigSnapshot
+
+from labbenchstudios.pdt.edge.system.AdaptivePollRateController import AdaptivePollRateController
+from labbenchstudios.pdt.edge.system.BasePollingManager import BasePollingManager
+
+class BasePollingManagerTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	BasePollingManager. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing BasePollingManager class...")
+		
+	def setUp(self):
+		self.manager = BasePollingManager(schedulerLagName = 'testSchedulerLag')
+		self.manager.pollRate = 5
+		self.manager.pollRateController = None
+
+	def tearDown(self):
+		pass
+
+	def _createConfigSnapshot(self, pollRate: int = 5) -> ConfigSnapshot:
+		configParser = configparser.ConfigParser()
+		configParser.read_string( \
+			"[" + ConfigConst.CONSTRAINED_DEVICE + "]\n" + ConfigConst.POLL_CYCLES_KEY + " = " + str(pollRate) + "\n")
+		
+		return ConfigSnapshot(configParser = configParser, configFile = 'test.props', version = 1)
+	
+	def testConfigUpdateReschedulesTelemetryJob(self):
+		self.assertTrue(self.manager.handleConfigUpdate(self._createConfigSnapshot(pollRate = 7)))
+		self.assertEqual(self.manager.pollRate, 7)
+		self.assertEqual(self.manager.telemetryJob.trigger.interval.total_seconds(), 7.0)
+		
+	def testConfigUpdateResetsAdaptiveBaseInterval(self):
+		self.manager.pollRateController = \
+			AdaptivePollRateController(basePollSecs = 5.0, minPollSecs = 1.0, maxPollSecs = 16.0, deadbandPct = 1.0, rateThresholdPct = 5.0)
+		
+		jobSecs = self.manager.telemetryJob.trigger.interval.total_seconds()
+		
+		self.assertTrue(self.manager.handleConfigUpdate(self._createConfigSnapshot(pollRate = 8)))
+		self.assertEqual(self.manager.pollRateController.getPollSecs('temp'), 8.0)
+		
+		# the scheduler keeps running at the min interval
+		self.assertEqual(self.manager.telemetryJob.trigger.interval.total_seconds(), jobSecs)
+		
+	def testInvalidConfigUpdate(self):
+		self.assertFalse(self.manager.handleConfigUpdate(None))
+		
+		self.manager.pollRate = ConfigConst.DEFAULT_POLL_CYCLES + 1
+		
+		self.assertTrue(self.manager.handleConfigUpdate(self._createConfigSnapshot(pollRate = 0)))
+		self.assertEqual(self.manager.pollRate, ConfigConst.DEFAULT_POLL_CYCLES)
+		
+if __name__ == "__main__":
+	unittest.main()
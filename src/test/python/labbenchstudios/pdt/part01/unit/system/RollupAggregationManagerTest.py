@@ -0,0 +1,174 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import unittest
+
+from datetime import datetime, timezone
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.DefaultDataMessageListener import DefaultDataMessageListener
+from labbenchstudios.pdt.common.ResourceNameEnum import ResourceNameEnum
+
+from labbenchstudios.pdt.edge.system.RollupAggregationManager import RollupAggregationManager
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+
+class RollupRecordingListener(DefaultDataMessageListener):
+	"""
+	Data message listener that records each rollup callback.
+	
+	"""
+	
+	def __init__(self):
+		super(RollupRecordingListener, self).__init__()
+		
+		self.rollups = []
+		self.rollupDataLists = []
+	
+	def handleSensorRollupMessage(self, resource: ResourceNameEnum = None, dataList: list = None) -> bool:
+		self.rollups.append((resource, {data.getName(): data.getValue() for data in dataList}))
+		self.rollupDataLists.append(dataList)
+		
+		return True
+
+class RollupAggregationManagerTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	RollupAggregationManager. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	
+	"""
+	
+	# aligned to all three default windows
+	BASE_TIME = 1700000000 - (1700000000 % 3600)
+	
+	LOCATION_ID_A = 'rollupTestDeviceA'
+	LOCATION_ID_B = 'rollupTestDeviceB'
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing RollupAggregationManager class...")
+		
+	def setUp(self):
+		self.listener = RollupRecordingListener()
+		
+		self.rollupMgr = RollupAggregationManager()
+		self.rollupMgr.setDataMessageListener(self.listener)
+		
+	def tearDown(self):
+		pass
+	
+	def testRollupStatsOnWindowClose(self):
+		for offset, value in ((0, 20.0), (10, 24.0), (20, 18.0), (30, 22.0)):
+			self.rollupMgr.handleSensorData(self._createSensorData(value), now = self.BASE_TIME + offset)
+		
+		self.assertEqual(len(self.listener.rollups), 0)
+		
+		# the first sample in the next minute closes the 1m window only
+		self.rollupMgr.handleSensorData(self._createSensorData(30.0), now = self.BASE_TIME + 60)
+		
+		self.assertEqual(len(self.listener.rollups), 1)
+		
+		resource, rollup = self.listener.rollups[0]
+		
+		self.assertEqual(resource, ResourceNameEnum.CDA_SENSOR_ROLLUP_1M_RESOURCE)
+		self.assertEqual(rollup[self._getRollupName(ConfigConst.ROLLUP_1M_NAME, ConfigConst.ROLLUP_MIN_NAME)], 18.0)
+		self.assertEqual(rollup[self._getRollupName(ConfigConst.ROLLUP_1M_NAME, ConfigConst.ROLLUP_MAX_NAME)], 24.0)
+		self.assertEqual(rollup[self._getRollupName(ConfigConst.ROLLUP_1M_NAME, ConfigConst.ROLLUP_MEAN_NAME)], 21.0)
+		self.assertEqual(rollup[self._getRollupName(ConfigConst.ROLLUP_1M_NAME, ConfigConst.ROLLUP_COUNT_NAME)], 4)
+		self.assertEqual(rollup[self._getRollupName(ConfigConst.ROLLUP_1M_NAME, ConfigConst.ROLLUP_LAST_NAME)], 22.0)
+		
+	def testCloseExpiredWindows(self):
+		self.rollupMgr.handleSensorData(self._createSensorData(20.0), now = self.BASE_TIME)
+		
+		self.assertEqual(self.rollupMgr.closeExpiredWindows(now = self.BASE_TIME + 59), 0)
+		self.assertEqual(self.rollupMgr.closeExpiredWindows(now = self.BASE_TIME + 900), 2)
+		self.assertEqual(self.rollupMgr.closeExpiredWindows(now = self.BASE_TIME + 3600), 1)
+		
+		resources = [resource for resource, rollup in self.listener.rollups]
+		
+		self.assertIn(ResourceNameEnum.CDA_SENSOR_ROLLUP_15M_RESOURCE, resources)
+		self.assertEqual(resources[-1], ResourceNameEnum.CDA_SENSOR_ROLLUP_1H_RESOURCE)
+		
+	def testConstantMemoryPerSeries(self):
+		for i in range(5000):
+			self.rollupMgr.handleSensorData(self._createSensorData(float(i % 50)), now = self.BASE_TIME + i)
+		
+		self.assertEqual(self.rollupMgr.getSeriesCount(), 3)
+		self.assertEqual(len(self.rollupMgr.seriesTable[(self.LOCATION_ID_A, ConfigConst.TEMP_SENSOR_NAME)]), 3)
+		
+	def testFlushWindows(self):
+		self.rollupMgr.handleSensorData(self._createSensorData(20.0), now = self.BASE_TIME)
+		
+		self.assertEqual(self.rollupMgr.flushWindows(), 3)
+		self.assertEqual(self.rollupMgr.getRollupCount(), 15)
+		self.assertEqual(self.rollupMgr.flushWindows(), 0)
+		
+	def testSeriesPerDevice(self):
+		self.rollupMgr.handleSensorData(self._createSensorData(20.0, self.LOCATION_ID_A), now = self.BASE_TIME)
+		self.rollupMgr.handleSensorData(self._createSensorData(30.0, self.LOCATION_ID_B), now = self.BASE_TIME + 10)
+		
+		self.assertEqual(self.rollupMgr.getSeriesCount(), 6)
+		
+		# closes the 1m window of each device
+		self.assertEqual(self.rollupMgr.closeExpiredWindows(now = self.BASE_TIME + 60), 2)
+		
+		meanName = self._getRollupName(ConfigConst.ROLLUP_1M_NAME, ConfigConst.ROLLUP_MEAN_NAME)
+		means = {}
+		
+		for dataList in self.listener.rollupDataLists:
+			for data in dataList:
+				if data.getName() == meanName:
+					means[data.getLocationID()] = data.getValue()
+		
+		self.assertEqual(means, {self.LOCATION_ID_A: 20.0, self.LOCATION_ID_B: 30.0})
+		
+	def testRollupTimeStamp(self):
+		self.rollupMgr.handleSensorData(self._createSensorData(20.0), now = self.BASE_TIME + 30)
+		self.rollupMgr.handleSensorData(self._createSensorData(21.0), now = self.BASE_TIME + 90)
+		
+		windowStart = datetime.fromtimestamp(self.BASE_TIME, timezone.utc).isoformat()
+		
+		for data in self.listener.rollupDataLists[0]:
+			self.assertEqual(data.getTimeStamp(), windowStart)
+		
+	def _createSensorData(self, value: float, locationID: str = LOCATION_ID_A) -> SensorData:
+		data = SensorData( \
+			typeCategoryID = ConfigConst.ENV_TYPE_CATEGORY, typeID = ConfigConst.TEMP_SENSOR_TYPE, \
+			name = ConfigConst.TEMP_SENSOR_NAME)
+		data.setLocationID(locationID)
+		data.setValue(value)
+		
+		return data
+	
+	def _getRollupName(self, windowName: str, statName: str) -> str:
+		return ConfigConst.TEMP_SENSOR_NAME + '-' + windowName + '-' + statName
+		
+if __name__ == "__main__":
+	unittest.main()
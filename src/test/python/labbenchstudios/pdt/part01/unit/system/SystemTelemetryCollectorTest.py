@@ -0,0 +1,137 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import os
+import tempfile
+import unittest
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.edge.system.SystemTelemetryCollector import SystemTelemetryCollector
+
+class SystemTelemetryCollectorTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	SystemTelemetryCollector. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	
+	The tests use a fake /proc tree, so the expected deltas are known.
+	"""
+	
+	PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing SystemTelemetryCollector class...")
+		
+	def setUp(self):
+		self.tmpDir  = tempfile.TemporaryDirectory()
+		self.procDir = os.path.join(self.tmpDir.name, 'proc')
+		self.sysDir  = os.path.join(self.tmpDir.name, 'sys')
+		
+		os.makedirs(os.path.join(self.procDir, 'net'))
+		os.makedirs(os.path.join(self.procDir, 'self'))
+		os.makedirs(os.path.join(self.sysDir, 'block', 'vda'))
+		os.makedirs(os.path.join(self.sysDir, 'block', 'loop0'))
+		
+		self._writeProcFiles(cpuBusy = (0, 0), cpuIdle = (0, 0), sectors = (0, 0), ioMillis = 0, netBytes = (0, 0))
+		
+		self.collector = SystemTelemetryCollector(procDir = self.procDir, sysDir = self.sysDir)
+		
+	def tearDown(self):
+		self.collector.close()
+		self.tmpDir.cleanup()
+	
+	def testDeltas(self):
+		# per core: 1000 jiffies elapsed; core 0 is 25% busy, core 1 is 75% busy
+		self._writeProcFiles( \
+			cpuBusy = (250, 750), cpuIdle = (750, 250), sectors = (2000, 4000), ioMillis = 500, netBytes = (10000, 20000))
+		
+		telemetry = self.collector.collect(now = self.collector.prevSampleTime + 2.0)
+		
+		self.assertAlmostEqual(telemetry[ConfigConst.CPU_UTIL_PROP], 50.0)
+		self.assertEqual(len(telemetry[ConfigConst.CPU_CORE_UTIL_PROP]), 2)
+		self.assertAlmostEqual(telemetry[ConfigConst.CPU_CORE_UTIL_PROP][0], 25.0)
+		self.assertAlmostEqual(telemetry[ConfigConst.CPU_CORE_UTIL_PROP][1], 75.0)
+		
+		self.assertAlmostEqual(telemetry[ConfigConst.MEM_UTIL_PROP], 75.0)
+		
+		# loop0 and the partition vda1 are ignored
+		self.assertAlmostEqual(telemetry[ConfigConst.DISK_UTIL_PROP], 25.0)
+		self.assertAlmostEqual(telemetry[ConfigConst.DISK_READ_RATE_PROP], 1000 * 512)
+		self.assertAlmostEqual(telemetry[ConfigConst.DISK_WRITE_RATE_PROP], 2000 * 512)
+		
+		# lo is ignored
+		self.assertAlmostEqual(telemetry[ConfigConst.NET_RX_RATE_PROP], 5000.0)
+		self.assertAlmostEqual(telemetry[ConfigConst.NET_TX_RATE_PROP], 10000.0)
+		
+		self.assertEqual(telemetry[ConfigConst.PROCESS_RSS_PROP], 100 * self.PAGE_SIZE)
+		self.assertEqual(telemetry[ConfigConst.PROCESS_THREAD_COUNT_PROP], 7)
+		
+	def testFileHandlesAreReused(self):
+		fileDescriptors = dict(self.collector.fileDescriptors)
+		
+		self.assertEqual(len(fileDescriptors), 5)
+		
+		self.collector.collect()
+		
+		self.assertEqual(self.collector.fileDescriptors, fileDescriptors)
+		
+	def testMissingProcDir(self):
+		collector = SystemTelemetryCollector(procDir = os.path.join(self.tmpDir.name, 'missing'))
+		
+		self.assertFalse(collector.isAvailable())
+		self.assertEqual(collector.collect(), {})
+		
+	def _writeProcFiles(self, cpuBusy: tuple, cpuIdle: tuple, sectors: tuple, ioMillis: int, netBytes: tuple):
+		cpuLines = []
+		
+		for name, busy, idle in (('cpu', sum(cpuBusy), sum(cpuIdle)), ('cpu0', cpuBusy[0], cpuIdle[0]), ('cpu1', cpuBusy[1], cpuIdle[1])):
+			cpuLines.append('%s %d 0 0 %d 0 0 0 0 0 0' % (name, busy, idle))
+		
+		self._writeFile('stat', '\n'.join(cpuLines) + '\nintr 0\nctxt 0\n')
+		self._writeFile('meminfo', 'MemTotal:       1000 kB\nMemFree:         100 kB\nMemAvailable:    250 kB\n')
+		self._writeFile('diskstats', \
+			'   7       0 loop0 0 0 9999 0 0 0 9999 0 0 9999 0 0 0 0 0 0 0\n' \
+			' 253       0 vda 0 0 %d 0 0 0 %d 0 0 %d 0 0 0 0 0 0 0\n' \
+			' 253       1 vda1 0 0 %d 0 0 0 %d 0 0 %d 0 0 0 0 0 0 0\n' % \
+			(sectors[0], sectors[1], ioMillis, sectors[0], sectors[1], ioMillis))
+		self._writeFile(os.path.join('net', 'dev'), \
+			'Inter-|   Receive                                                |  Transmit\n' \
+			' face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed\n' \
+			'    lo: 99999 0 0 0 0 0 0 0 99999 0 0 0 0 0 0 0\n' \
+			'  eth0: %d 0 0 0 0 0 0 0 %d 0 0 0 0 0 0 0\n' % netBytes)
+		self._writeFile(os.path.join('self', 'stat'), \
+			'1234 (python (test)) S ' + ' '.join(['0'] * 16) + ' 7 0 0 0 100 0\n')
+	
+	def _writeFile(self, fileName: str, content: str):
+		with open(os.path.join(self.procDir, fileName), 'w') as procFile:
+			procFile.write(content)
+		
+if __name__ == "__main__":
+	unittest.main()
@@ -198,5 +198,29 @@ class DataUtilTest(unittest.TestCase):
 		self.assertEqual(spdObj1.getTimeStamp(), spdObj2.getTimeStamp())
 		self.assertEqual(spdObj1Str, spdObj2Str)
 
+	def testSystemPerformanceDataTelemetryConversions(self):
+		logging.info("\n\n----- [SystemPerformanceData Telemetry Conversions] -----")
+		
+		spdObj1 = SystemPerformanceData()
+		spdObj1.setCpuCoreUtilization([12.5, 37.5])
+		spdObj1.setDiskUtilization(5.0)
+		spdObj1.setDiskReadRate(1024.0)
+		spdObj1.setDiskWriteRate(2048.0)
+		spdObj1.setNetworkRxRate(512.0)
+		spdObj1.setNetworkTxRate(256.0)
+		spdObj1.setProcessRss(4096000)
+		spdObj1.setProcessThreadCount(12)
+		
+		spdObj2 = self.dataUtil.jsonToSystemPerformanceData(self.dataUtil.systemPerformanceDataToJson(spdObj1))
+		
+		self.assertEqual(spdObj2.getCpuCoreUtilization(), [12.5, 37.5])
+		self.assertEqual(spdObj2.getDiskUtilization(), 5.0)
+		self.assertEqual(spdObj2.getDiskReadRate(), 1024.0)
+		self.assertEqual(spdObj2.getDiskWriteRate(), 2048.0)
+		self.assertEqual(spdObj2.getNetworkRxRate(), 512.0)
+		self.assertEqual(spdObj2.getNetworkTxRate(), 256.0)
+		self.assertEqual(spdObj2.getProcessRss(), 4096000)
+		self.assertEqual(spdObj2.getProcessThreadCount(), 12)
+
 if __name__ == "__main__":
 	unittest.main()
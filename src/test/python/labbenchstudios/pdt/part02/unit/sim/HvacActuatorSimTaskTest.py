@@ -80,6 +80,29 @@ class HvacActuatorSimTaskTest(unittest.TestCase):
 		self.assertEqual(adr.getCommand(), ConfigConst.COMMAND_OFF)
 		logging.info("ActuatorData: " + str(adr))
 		
+	def testSubmitActuatorUpdate(self):
+		hSimTask = HvacActuatorSimTask()
+		responses = []
+		futures = []
+		
+		for val in [self.DEFAULT_VAL_A, self.DEFAULT_VAL_B, self.DEFAULT_VAL_A]:
+			ad = ActuatorData(typeID = ConfigConst.HVAC_ACTUATOR_TYPE)
+			ad.setCommand(ConfigConst.COMMAND_ON)
+			ad.setValue(val)
+			
+			futures.append(hSimTask.submitActuatorUpdate(data = ad, responseHandler = responses.append))
+		
+		for future in futures:
+			self.assertIsNotNone(future.result(timeout = 5))
+		
+		hSimTask.stopCommandQueue()
+		
+		# queued commands must be applied in submission order
+		self.assertEqual( \
+			[adr.getValue() for adr in responses], \
+			[self.DEFAULT_VAL_A, self.DEFAULT_VAL_B, self.DEFAULT_VAL_A])
+		logging.info("ActuatorData: " + str(responses[-1]))
+		
 	@unittest.skip("Ignore for now.")
 	def testUpdateActuatorRepeatCommands(self):
 		ad = ActuatorData(typeID = ConfigConst.HVAC_ACTUATOR_TYPE)
@@ -0,0 +1,133 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import unittest
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.edge.app.DeviceDataManager import DeviceDataManager
+from labbenchstudios.pdt.edge.simulation.SensorFleetSimulator import SensorFleetSimulator
+
+from labbenchstudios.pdt.data.ActuatorData import ActuatorData
+from labbenchstudios.pdt.data.SensorData import SensorData
+
+class DeviceDataManagerComponentTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	the on demand component creation within DeviceDataManager.
+	It should not be considered complete, but serve as a starting
+	point for the student implementing additional functionality
+	within their Programming the IoT environment.
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing DeviceDataManager component registry...")
+		
+	def setUp(self):
+		self.devDataMgr = DeviceDataManager()
+
+	def tearDown(self):
+		if self.devDataMgr.actuatorAdapterMgr:
+			self.devDataMgr.actuatorAdapterMgr.stopManager()
+
+	def testNothingCreatedByConstructor(self):
+		self.assertIsNone(self.devDataMgr.tsdbClient)
+		self.assertIsNone(self.devDataMgr.mqttClient)
+		self.assertIsNone(self.devDataMgr.sensorAdapterMgr)
+		self.assertIsNone(self.devDataMgr.actuatorAdapterMgr)
+		self.assertEqual(self.devDataMgr.getStartupTimeline(), [])
+		
+	def testActuatorManagerCreatedOnFirstUse(self):
+		ad = ActuatorData(typeID = ConfigConst.HVAC_ACTUATOR_TYPE, name = ConfigConst.HVAC_ACTUATOR_NAME)
+		ad.setCommand(ConfigConst.COMMAND_ON)
+		ad.setValue(22.0)
+		
+		self.devDataMgr.handleActuatorCommandMessage(ad)
+		
+		actuatorAdapterMgr = self.devDataMgr.actuatorAdapterMgr
+		
+		self.assertIsNotNone(actuatorAdapterMgr)
+		self.assertIs(self.devDataMgr.getComponent(DeviceDataManager.ACTUATOR_ADAPTER_MGR), actuatorAdapterMgr)
+		
+		phases = [(name, phase) for name, phase, millis in self.devDataMgr.getStartupTimeline()]
+		
+		self.assertEqual(phases, [ \
+			(DeviceDataManager.ACTUATOR_ADAPTER_MGR, DeviceDataManager.IMPORT_PHASE), \
+			(DeviceDataManager.ACTUATOR_ADAPTER_MGR, DeviceDataManager.CREATE_PHASE)])
+		
+		logging.info(self.devDataMgr.getStartupTimelineReport())
+		
+	def testUnknownAndDisabledComponents(self):
+		self.assertIsNone(self.devDataMgr.getComponent('notAComponent'))
+		
+		self.devDataMgr._registerComponent(DeviceDataManager.TSDB_CLIENT, \
+			'labbenchstudios.pdt.edge.connection.InfluxClientConnector', 'InfluxClientConnector', False)
+		
+		self.assertFalse(self.devDataMgr.isComponentEnabled(DeviceDataManager.TSDB_CLIENT))
+		self.assertIsNone(self.devDataMgr.getComponent(DeviceDataManager.TSDB_CLIENT))
+		
+	def testComponentLoadFailure(self):
+		self.devDataMgr._registerComponent(DeviceDataManager.SYS_PERF_MGR, \
+			'labbenchstudios.pdt.edge.system.NotAManager', 'NotAManager', True)
+		
+		self.assertIsNone(self.devDataMgr.getComponent(DeviceDataManager.SYS_PERF_MGR))
+		self.assertFalse(self.devDataMgr.isComponentEnabled(DeviceDataManager.SYS_PERF_MGR))
+		
+	def testFleetBatchQueuesNoActuatorCommands(self):
+		actuatorCmds = []
+		self.devDataMgr._handleActuatorCommand = actuatorCmds.append
+		
+		sensorMsgCount = self.devDataMgr.sensorMsgCounter.getValue()
+		
+		fleetSim = SensorFleetSimulator(deviceCount = 100, seed = 7)
+		fleetSim.setDataMessageListener(self.devDataMgr)
+		fleetSim.handleTelemetry()
+		
+		# every reading is handled, but none is analyzed locally
+		self.assertEqual(self.devDataMgr.sensorMsgCounter.getValue() - sensorMsgCount, 100)
+		self.assertEqual(actuatorCmds, [])
+		
+	def testRemoteSensorMessageSkipsAnalysis(self):
+		actuatorCmds = []
+		self.devDataMgr._handleActuatorCommand = actuatorCmds.append
+		
+		sensorData = SensorData(typeID = ConfigConst.TEMP_SENSOR_TYPE, name = ConfigConst.TEMP_SENSOR_NAME)
+		sensorData.setLocationID('remoteDevice001')
+		sensorData.setValue(40.0)
+		
+		self.devDataMgr.handleSensorMessage(sensorData)
+		
+		self.assertEqual(actuatorCmds, [])
+		
+		sensorData.setLocationID(self.devDataMgr.locationID)
+		
+		self.devDataMgr.handleSensorMessage(sensorData)
+		
+		self.assertEqual(len(actuatorCmds), 1)
+
+if __name__ == "__main__":
+	unittest.main()
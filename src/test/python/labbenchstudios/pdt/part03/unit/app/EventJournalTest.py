@@ -0,0 +1,173 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.ResourceNameEnum import ResourceNameEnum
+
+from labbenchstudios.pdt.edge.app.DeviceDataManager import DeviceDataManager
+from labbenchstudios.pdt.edge.app.EventJournal import EventJournal
+from labbenchstudios.pdt.edge.app.EventJournalReplayer import EventJournalReplayer
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+
+class EventJournalTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	EventJournal and EventJournalReplayer. It should not be
+	considered complete, but serve as a starting point for the
+	student implementing additional functionality within their
+	Programming the IoT environment.
+	
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing EventJournal class...")
+		
+	def setUp(self):
+		self.journalPath = tempfile.mkdtemp(prefix = 'pdt-journal-test-')
+		
+	def tearDown(self):
+		shutil.rmtree(self.journalPath, ignore_errors = True)
+		
+	def testWriteAndReadEvents(self):
+		journal = EventJournal(journalPath = self.journalPath)
+		
+		self.assertTrue(journal.open())
+		self.assertTrue(journal.recordEvent(EventJournal.SENSOR_DATA_EVENT, '{"value": 1.0}'))
+		self.assertTrue(journal.recordIncomingMessage(ResourceNameEnum.CDA_ACTUATOR_CMD_RESOURCE, '{"command": 1}'))
+		self.assertTrue(journal.recordPublishResult(ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE, True, 14))
+		
+		# an open (preallocated) segment can be read
+		self.assertEqual(len(list(EventJournal.readEvents(self.journalPath))), 3)
+		
+		journal.close()
+		
+		self.assertFalse(journal.recordEvent(EventJournal.SENSOR_DATA_EVENT, 'dropped'))
+		self.assertEqual(journal.getRecordCount(), 3)
+		self.assertEqual(journal.getDroppedCount(), 1)
+		
+		events = list(EventJournal.readEvents(self.journalPath))
+		
+		self.assertEqual([eventType for eventType, timestampNs, payload in events], \
+			[EventJournal.SENSOR_DATA_EVENT, EventJournal.INCOMING_MSG_EVENT, EventJournal.PUBLISH_RESULT_EVENT])
+		self.assertEqual(events[0][2], b'{"value": 1.0}')
+		self.assertLessEqual(events[0][1], events[2][1])
+		
+		self.assertEqual(EventJournal.decodeNamedPayload(events[1][2]), \
+			(ResourceNameEnum.CDA_ACTUATOR_CMD_RESOURCE.name, b'{"command": 1}'))
+		self.assertEqual(EventJournal.decodePublishResult(events[2][2]), \
+			(ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE.name, True, 14))
+		
+	def testSegmentRotation(self):
+		journal = EventJournal(journalPath = self.journalPath, maxSegmentBytes = 4096, maxSegmentCount = 2)
+		journal.open()
+		
+		for i in range(20):
+			journal.recordEvent(EventJournal.SENSOR_DATA_EVENT, 'x' * 1000)
+		
+		journal.close()
+		
+		segmentFileNames = EventJournal.getSegmentFileNames(self.journalPath)
+		
+		self.assertEqual(len(segmentFileNames), 2)
+		self.assertEqual(os.path.basename(segmentFileNames[-1]), 'pdt-journal-00000005.pdtj')
+		
+		# 4 records per segment - the oldest segments were removed
+		self.assertEqual(len(list(EventJournal.readEvents(self.journalPath))), 8)
+		
+		# segments written by a new instance are numbered after the existing ones
+		journal = EventJournal(journalPath = self.journalPath, maxSegmentCount = 0)
+		journal.open()
+		journal.close()
+		
+		self.assertEqual(os.path.basename(EventJournal.getSegmentFileNames(self.journalPath)[-1]), 'pdt-journal-00000006.pdtj')
+		
+	def testTornRecordIsSkipped(self):
+		journal = EventJournal(journalPath = self.journalPath)
+		journal.open()
+		journal.recordEvent(EventJournal.SENSOR_DATA_EVENT, 'first')
+		journal.recordEvent(EventJournal.SENSOR_DATA_EVENT, 'second')
+		journal.close()
+		
+		fileName = EventJournal.getSegmentFileNames(self.journalPath)[0]
+		
+		with open(fileName, 'r+b') as segmentFile:
+			segmentFile.seek(-1, os.SEEK_END)
+			segmentFile.write(b'X')
+		
+		events = list(EventJournal.readEvents(fileName))
+		
+		self.assertEqual([payload for eventType, timestampNs, payload in events], [b'first'])
+		
+	def testReplayThroughDeviceDataManager(self):
+		devDataMgr = DeviceDataManager()
+		devDataMgr.eventJournal = EventJournal(journalPath = self.journalPath)
+		devDataMgr.eventJournal.open()
+		
+		for i in range(5):
+			sensorData = SensorData(typeID = ConfigConst.HUMIDITY_SENSOR_TYPE, name = ConfigConst.HUMIDITY_SENSOR_NAME)
+			sensorData.setValue(40.0 + i)
+			
+			devDataMgr.handleSensorMessage(sensorData)
+		
+		devDataMgr.eventJournal.close()
+		
+		if devDataMgr.actuatorAdapterMgr:
+			devDataMgr.actuatorAdapterMgr.stopManager()
+		
+		replayer = EventJournalReplayer(listener = DefaultReplayListener(), speedup = EventJournalReplayer.AS_FAST_AS_POSSIBLE)
+		
+		self.assertEqual(replayer.replay(self.journalPath), 5)
+		self.assertEqual(replayer.getFailedCount(), 0)
+		self.assertEqual(replayer.getReplayCounts(), {EventJournal.SENSOR_DATA_EVENT: 5})
+		
+		# each reading also creates an LED display actuation, which isn't replayed
+		self.assertEqual(replayer.getEventCounts().get(EventJournal.ACTUATION_EVENT), 5)
+		self.assertEqual(replayer.listener.values, [40.0, 41.0, 42.0, 43.0, 44.0])
+	
+class DefaultReplayListener(object):
+	"""
+	Simple listener that records the value of each replayed SensorData.
+	
+	"""
+	
+	def __init__(self):
+		self.values = []
+		
+	def handleSensorMessage(self, data: SensorData) -> bool:
+		self.values.append(data.getValue())
+		
+		return True
+	
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,199 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from time import sleep
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.ResourceNameEnum import ResourceNameEnum
+
+from labbenchstudios.pdt.edge.app.DeviceDataManager import DeviceDataManager
+from labbenchstudios.pdt.edge.app.SamplingProfiler import SamplingProfiler
+
+from labbenchstudios.pdt.data.ActuatorData import ActuatorData
+from labbenchstudios.pdt.data.DataUtil import DataUtil
+
+class SamplingProfilerTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	SamplingProfiler. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing SamplingProfiler class...")
+		
+	def setUp(self):
+		self.outputPath = tempfile.mkdtemp(prefix = 'pdt-profile-test-')
+		self.stopEvent = threading.Event()
+		
+	def tearDown(self):
+		self.stopEvent.set()
+		
+		shutil.rmtree(self.outputPath, ignore_errors = True)
+		
+	def testProfileBusyThread(self):
+		worker = threading.Thread(target = self._busyWork, name = 'BusyWorker', daemon = True)
+		worker.start()
+		
+		profiler = SamplingProfiler(sampleSecs = 0.005, maxDurationSecs = 10.0, outputPath = self.outputPath)
+		
+		self.assertTrue(profiler.startProfiling())
+		
+		sleep(0.3)
+		
+		outputFile = profiler.stopProfiling()
+		
+		self.assertFalse(profiler.isRunning())
+		self.assertGreater(profiler.getSampleCount(), 0)
+		self.assertIsNotNone(outputFile)
+		self.assertTrue(os.path.dirname(outputFile) == self.outputPath)
+		
+		with open(outputFile, 'r', encoding = 'utf-8') as inFile:
+			lines = inFile.read().splitlines()
+		
+		self.assertTrue(lines)
+		
+		for line in lines:
+			stack, count = line.rsplit(' ', 1)
+			
+			self.assertGreater(int(count), 0)
+			
+			# the profiler never samples its own thread
+			self.assertFalse(stack.startswith('SamplingProfiler;'))
+		
+		busyStacks = [line for line in lines if line.startswith('BusyWorker;') and '_busyWork (' in line]
+		
+		self.assertTrue(busyStacks)
+		
+	def testDurationLimit(self):
+		completedFiles = []
+		
+		profiler = SamplingProfiler(sampleSecs = 0.005, maxDurationSecs = 0.2, outputPath = self.outputPath)
+		profiler.setCompletionListener(completedFiles.append)
+		
+		# the requested duration is limited to the max duration
+		self.assertTrue(profiler.startProfiling(durationSecs = 60.0))
+		self.assertTrue(self._waitForStop(profiler, 5.0))
+		
+		self.assertEqual(len(completedFiles), 1)
+		self.assertEqual(completedFiles[0], profiler.getLastOutputFile())
+		self.assertTrue(os.path.isfile(completedFiles[0]))
+		
+	def testToggleProfiling(self):
+		profiler = SamplingProfiler(sampleSecs = 0.005, maxDurationSecs = 10.0, outputPath = self.outputPath)
+		
+		self.assertTrue(profiler.toggleProfiling())
+		self.assertTrue(profiler.isRunning())
+		self.assertFalse(profiler.startProfiling())
+		
+		self.assertFalse(profiler.toggleProfiling())
+		self.assertTrue(self._waitForStop(profiler, 5.0))
+		self.assertIsNotNone(profiler.getLastOutputFile())
+		
+		# a stopped profiler can be started again
+		self.assertTrue(profiler.toggleProfiling())
+		self.assertIsNotNone(profiler.stopProfiling())
+		
+	def testMgmtCommand(self):
+		profiler = SamplingProfiler(sampleSecs = 0.005, maxDurationSecs = 10.0, outputPath = self.outputPath)
+		
+		dataMgr = DeviceDataManager()
+		dataMgr.setSamplingProfiler(profiler)
+		
+		ad = ActuatorData(name = ConfigConst.SAMPLING_PROFILER_NAME, typeID = ConfigConst.SAMPLING_PROFILER_TYPE)
+		ad.setLocationID(dataMgr.locationID)
+		ad.setCommand(ConfigConst.COMMAND_ON)
+		ad.setValue(0.2)
+		
+		dataUtil = DataUtil()
+		
+		self.assertTrue(dataMgr.handleIncomingMessage( \
+			resource = ResourceNameEnum.CDA_MGMT_STATUS_CMD_RESOURCE, msg = dataUtil.actuatorDataToJson(ad)))
+		
+		self.assertTrue(profiler.isRunning())
+		
+		# the command's value is used as the duration
+		self.assertTrue(self._waitForStop(profiler, 5.0))
+		
+		ad.setCommand(ConfigConst.COMMAND_ON)
+		ad.setValue(10.0)
+		
+		dataMgr.handleIncomingMessage( \
+			resource = ResourceNameEnum.CDA_MGMT_STATUS_CMD_RESOURCE, msg = dataUtil.actuatorDataToJson(ad))
+		
+		self.assertTrue(profiler.isRunning())
+		
+		ad.setCommand(ConfigConst.COMMAND_OFF)
+		
+		dataMgr.handleIncomingMessage( \
+			resource = ResourceNameEnum.CDA_MGMT_STATUS_CMD_RESOURCE, msg = dataUtil.actuatorDataToJson(ad))
+		
+		self.assertTrue(self._waitForStop(profiler, 5.0))
+		
+	def testMgmtCommandForOtherDevice(self):
+		profiler = SamplingProfiler(sampleSecs = 0.005, maxDurationSecs = 10.0, outputPath = self.outputPath)
+		
+		dataMgr = DeviceDataManager()
+		dataMgr.setSamplingProfiler(profiler)
+		
+		ad = ActuatorData(name = ConfigConst.SAMPLING_PROFILER_NAME, typeID = ConfigConst.SAMPLING_PROFILER_TYPE)
+		ad.setLocationID('otherDevice001')
+		ad.setCommand(ConfigConst.COMMAND_ON)
+		ad.setValue(0.2)
+		
+		# the command topic is shared, so a command for another device is ignored
+		self.assertTrue(dataMgr.handleIncomingMessage( \
+			resource = ResourceNameEnum.CDA_MGMT_STATUS_CMD_RESOURCE, msg = DataUtil().actuatorDataToJson(ad)))
+		
+		self.assertFalse(profiler.isRunning())
+		
+	def _busyWork(self):
+		while not self.stopEvent.is_set():
+			sum(range(1000))
+		
+	def _waitForStop(self, profiler: SamplingProfiler, timeoutSecs: float) -> bool:
+		for i in range(int(timeoutSecs / 0.05)):
+			if not profiler.isRunning():
+				return True
+			
+			sleep(0.05)
+		
+		return False
+	
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,124 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import unittest
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.edge.app.SensorDataFilter import SensorDataFilter
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+
+class SensorDataFilterTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	SensorDataFilter. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	LOCATION_ID_A = 'filterTestDeviceA'
+	LOCATION_ID_B = 'filterTestDeviceB'
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing SensorDataFilter class...")
+		
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+
+	def testDeadband(self):
+		dataFilter = SensorDataFilter(deadband = 0.5, useDeadbandPct = False, maxSilenceSecs = 0.0, enableSwingingDoor = False)
+		
+		transmitted = [self._filter(dataFilter, val, i)[1] for i, val in enumerate([20.0, 20.0, 20.4, 20.6, 20.2])]
+		
+		self.assertEqual(transmitted, [True, False, False, True, False])
+		
+		stats = dataFilter.getStats()[(self.LOCATION_ID_A, ConfigConst.TEMP_SENSOR_NAME)]
+		
+		self.assertEqual(stats[SensorDataFilter.RECEIVED_STAT], 5)
+		self.assertEqual(stats[SensorDataFilter.TRANSMITTED_STAT], 2)
+		self.assertAlmostEqual(stats['transmitSuppressionRatio'], 0.6)
+		
+	def testDeadbandPct(self):
+		dataFilter = SensorDataFilter(deadband = 1.0, useDeadbandPct = True, maxSilenceSecs = 0.0, enableSwingingDoor = False)
+		
+		transmitted = [self._filter(dataFilter, val, i)[1] for i, val in enumerate([1000.0, 1009.0, 1011.0])]
+		
+		self.assertEqual(transmitted, [True, False, True])
+		
+	def testHeartbeat(self):
+		dataFilter = SensorDataFilter(deadband = 0.5, useDeadbandPct = False, maxSilenceSecs = 10.0, enableSwingingDoor = False)
+		
+		transmitted = [self._filter(dataFilter, 20.0, now)[1] for now in (0.0, 5.0, 10.0, 15.0)]
+		
+		self.assertEqual(transmitted, [True, False, True, False])
+		
+	def testSwingingDoor(self):
+		dataFilter = SensorDataFilter(deadband = 0.5, useDeadbandPct = False, maxSilenceSecs = 0.0, enableSwingingDoor = True)
+		
+		# a straight ramp is fully represented by its first point, until it changes direction
+		values = [20.0, 21.0, 22.0, 23.0, 24.0, 23.0, 22.0]
+		persisted = []
+		
+		for i, val in enumerate(values):
+			persistList, transmit = self._filter(dataFilter, val, i)
+			persisted.extend([data.getValue() for data in persistList])
+		
+		self.assertEqual(persisted, [20.0, 24.0])
+		
+	def testMultipleDevices(self):
+		dataFilter = SensorDataFilter(deadband = 1.0, useDeadbandPct = False, maxSilenceSecs = 0.0, enableSwingingDoor = False)
+		
+		persistListA, transmitA = self._filter(dataFilter, 20.0, 0.0, locationID = self.LOCATION_ID_A)
+		persistListB, transmitB = self._filter(dataFilter, 20.5, 1.0, locationID = self.LOCATION_ID_B)
+		
+		# device B's first reading must not be suppressed by device A's
+		self.assertTrue(transmitA)
+		self.assertTrue(transmitB)
+		self.assertEqual(len(persistListB), 1)
+		
+		self.assertFalse(self._filter(dataFilter, 20.5, 2.0, locationID = self.LOCATION_ID_A)[1])
+		self.assertFalse(self._filter(dataFilter, 21.0, 3.0, locationID = self.LOCATION_ID_B)[1])
+		
+		stats = dataFilter.getStats()
+		
+		self.assertEqual(stats[(self.LOCATION_ID_A, ConfigConst.TEMP_SENSOR_NAME)][SensorDataFilter.RECEIVED_STAT], 2)
+		self.assertEqual(stats[(self.LOCATION_ID_B, ConfigConst.TEMP_SENSOR_NAME)][SensorDataFilter.RECEIVED_STAT], 2)
+		
+	def _filter(self, dataFilter: SensorDataFilter, value: float, now: float, locationID: str = LOCATION_ID_A) -> tuple:
+		data = SensorData(typeID = ConfigConst.TEMP_SENSOR_TYPE, name = ConfigConst.TEMP_SENSOR_NAME)
+		data.setLocationID(locationID)
+		data.setValue(value)
+		
+		return dataFilter.filterSensorData(data, now = float(now))
+
+if __name__ == "__main__":
+	unittest.main()
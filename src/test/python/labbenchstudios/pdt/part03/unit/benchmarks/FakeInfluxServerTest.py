@@ -0,0 +1,112 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import unittest
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.benchmarks.FakeInfluxServer import FakeInfluxServer
+
+from labbenchstudios.pdt.edge.connection.ConnectionStateEnum import ConnectionStateEnum
+from labbenchstudios.pdt.edge.connection.InfluxClientConnector import InfluxClientConnector
+
+from labbenchstudios.pdt.data.SensorData import SensorData
+
+class FakeInfluxServerTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	FakeInfluxServer, using InfluxClientConnector. It should not
+	be considered complete, but serve as a starting point for the
+	student implementing additional functionality within their
+	Programming the IoT environment.
+	
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing FakeInfluxServer class...")
+		
+	def setUp(self):
+		self.influxServer = FakeInfluxServer()
+		self.influxServer.authToken = 'testToken'
+		self.influxServer.startServer()
+		
+		self.icc = InfluxClientConnector()
+		self.icc.uriPath = self.influxServer.getUrl()
+		self.icc.clientToken = 'testToken'
+		self.icc.orgID = 'testOrg'
+		self.icc.connectClient()
+		
+		self.sensorData = SensorData(typeID = ConfigConst.TEMP_SENSOR_TYPE, name = ConfigConst.TEMP_SENSOR_NAME)
+		self.sensorData.setValue(21.5)
+		
+	def tearDown(self):
+		self.icc.disconnectClient()
+		self.influxServer.stopServer()
+		
+	def testStoreSensorData(self):
+		self.assertTrue(self.icc.storeSensorData(data = self.sensorData))
+		
+		bucket, org, precision, lines, recvTime = self.influxServer.getWrites()[0]
+		
+		self.assertEqual((bucket, org, precision), (ConfigConst.SENSOR_DATA_PERSISTENCE_NAME, 'testOrg', 'ms'))
+		self.assertEqual(len(lines), 1)
+		self.assertTrue(lines[0].startswith(ConfigConst.TEMP_SENSOR_NAME + ','))
+		self.assertIn(ConfigConst.VALUE_PROP + '=21.5', lines[0])
+		
+		self.assertEqual(self.icc.getConnectionState().getMessageOutCount(), 1)
+		self.assertEqual(self.icc.connStateTracker.getState(), ConnectionStateEnum.CONNECTED)
+		
+	def testWriteFailureAndRecovery(self):
+		self.influxServer.failEvery = 2
+		
+		self.assertTrue(self.icc.storeSensorData(data = self.sensorData))
+		
+		with self.assertRaises(Exception):
+			self.icc.storeSensorData(data = self.sensorData)
+		
+		self.assertEqual(self.influxServer.getFailedCount(), 1)
+		self.assertEqual(self.icc.connStateTracker.getState(), ConnectionStateEnum.DISCONNECTED)
+		
+		self.assertTrue(self.icc.storeSensorData(data = self.sensorData))
+		
+		self.assertEqual(len(self.influxServer.getLines()), 2)
+		self.assertEqual(self.icc.getConnectionState().getReconnectCount(), 1)
+		
+	def testUnauthorizedWrite(self):
+		icc = InfluxClientConnector()
+		icc.uriPath = self.influxServer.getUrl()
+		icc.clientToken = 'wrongToken'
+		icc.orgID = 'testOrg'
+		icc.connectClient()
+		
+		with self.assertRaises(Exception):
+			icc.storeSensorData(data = self.sensorData)
+		
+		self.assertEqual(self.influxServer.getWrites(), [])
+	
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,153 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import socket
+import time
+import unittest
+
+import paho.mqtt.client as mqttClient
+
+from labbenchstudios.pdt.benchmarks.FakeMqttBroker import FakeMqttBroker
+
+class FakeMqttBrokerTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	FakeMqttBroker. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing FakeMqttBroker class...")
+		
+	def setUp(self):
+		self.broker = FakeMqttBroker()
+		self.port = self.broker.startBroker()
+		self.clients = []
+		
+	def tearDown(self):
+		for client in self.clients:
+			client.disconnect()
+			client.loop_stop()
+		
+		self.broker.stopBroker(stopLoop = True)
+		
+	def testTopicMatch(self):
+		self.assertTrue(FakeMqttBroker.isTopicMatch('PIOT/+/Msg', 'PIOT/EdgeDevice/Msg'))
+		self.assertTrue(FakeMqttBroker.isTopicMatch('PIOT/#', 'PIOT/EdgeDevice/Msg'))
+		self.assertTrue(FakeMqttBroker.isTopicMatch('PIOT/EdgeDevice/Msg', 'PIOT/EdgeDevice/Msg'))
+		self.assertFalse(FakeMqttBroker.isTopicMatch('PIOT/+', 'PIOT/EdgeDevice/Msg'))
+		self.assertFalse(FakeMqttBroker.isTopicMatch('PIOT/EdgeDevice/Msg/+', 'PIOT/EdgeDevice/Msg'))
+		
+	def testPublishAndSubscribe(self):
+		received = []
+		
+		subscriber = self._createClient('subscriber')
+		subscriber.on_message = lambda client, userdata, msg: received.append((msg.topic, msg.payload, msg.qos))
+		subscriber.subscribe('PIOT/+/Msg', qos = 2)
+		
+		self.assertTrue(self._waitFor(lambda: self.broker.getSubscriptionCount() == 1))
+		
+		publisher = self._createClient('publisher')
+		
+		msgInfo = publisher.publish('PIOT/EdgeDevice/Msg', 'test1', qos = 1)
+		msgInfo.wait_for_publish(timeout = 5.0)
+		
+		self.assertTrue(msgInfo.is_published())
+		
+		publisher.publish('PIOT/Other', 'test2', qos = 0)
+		
+		self.assertTrue(self._waitFor(lambda: len(self.broker.getMessages()) == 2))
+		self.assertTrue(self._waitFor(lambda: len(received) == 1))
+		
+		# QoS 2 subscriptions are granted as QoS 1
+		self.assertEqual(received, [('PIOT/EdgeDevice/Msg', b'test1', 1)])
+		
+		clientID, topic, payload, qos, recvTime = self.broker.getMessages('PIOT/EdgeDevice/Msg')[0]
+		
+		self.assertEqual((clientID, payload, qos), ('publisher', b'test1', 1))
+		self.assertEqual([clientID for clientID, recvTime in self.broker.getConnects()], ['subscriber', 'publisher'])
+		
+	def testConnectRefused(self):
+		self.broker.connectRc = 5
+		
+		client = mqttClient.Client('refusedClient')
+		
+		self.assertEqual(client.connect('127.0.0.1', self.port), mqttClient.MQTT_ERR_SUCCESS)
+		
+		# the CONNACK is read by the network loop
+		rc = mqttClient.MQTT_ERR_SUCCESS
+		
+		for i in range(20):
+			rc = client.loop(timeout = 0.1)
+			
+			if rc != mqttClient.MQTT_ERR_SUCCESS:
+				break
+		
+		self.assertNotEqual(rc, mqttClient.MQTT_ERR_SUCCESS)
+		self.assertEqual(self.broker.getClientCount(), 0)
+		
+	def testDisconnectClientsAndRestart(self):
+		self._createClient('restartClient')
+		
+		self.assertTrue(self._waitFor(lambda: self.broker.getClientCount() == 1))
+		self.assertEqual(self.broker.disconnectClients(), 1)
+		self.assertTrue(self._waitFor(lambda: self.broker.getClientCount() == 0))
+		
+		self.broker.stopBroker()
+		
+		self.assertFalse(self.broker.isRunning())
+		
+		with self.assertRaises(OSError):
+			socket.create_connection(('127.0.0.1', self.port), timeout = 1.0).close()
+		
+		self.assertEqual(self.broker.startBroker(), self.port)
+		
+	def _createClient(self, clientID: str) -> mqttClient.Client:
+		client = mqttClient.Client(clientID)
+		client.connect('127.0.0.1', self.port)
+		client.loop_start()
+		
+		self.clients.append(client)
+		
+		return client
+		
+	def _waitFor(self, condition, timeout: float = 5.0) -> bool:
+		endTime = time.monotonic() + timeout
+		
+		while not condition():
+			if time.monotonic() > endTime:
+				return False
+			
+			time.sleep(0.05)
+		
+		return True
+	
+if __name__ == "__main__":
+	unittest.main()
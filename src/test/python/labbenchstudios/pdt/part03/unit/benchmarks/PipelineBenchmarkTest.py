@@ -0,0 +1,100 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import os
+import tempfile
+import unittest
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.benchmarks.PipelineBenchmark import PipelineBenchmark
+
+class PipelineBenchmarkTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	PipelineBenchmark. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing PipelineBenchmark class...")
+		
+	def setUp(self):
+		pass
+		
+	def tearDown(self):
+		pass
+	
+	def testRunBenchmark(self):
+		benchmark = PipelineBenchmark(msgCount = 300, allocMsgCount = 50, warmUpCount = 30)
+		results = benchmark.runBenchmark()
+		metrics = results['metrics']
+		
+		self.assertGreater(metrics['msgsPerSec'], 0.0)
+		self.assertGreater(metrics['cpuNsPerMsg'], 0.0)
+		self.assertIn('peakAllocBytes', metrics)
+		self.assertEqual(metrics['stages'][PipelineBenchmark.PIPELINE_SPAN]['count'], 300)
+		self.assertEqual(metrics['stages'][ConfigConst.MQTT_PUBLISH_SPAN]['count'], 300)
+		self.assertEqual(metrics['stages'][ConfigConst.TSDB_STORE_SPAN]['count'], 300)
+		
+		# the alloc pass sends more messages after the counts are taken
+		self.assertEqual(benchmark.getFakeMqttClient().getPublishCount(), 350)
+		self.assertEqual(benchmark.getFakeWriteApi().getWriteCount(), 350)
+		
+	def testSaveLoadAndCompareResults(self):
+		baseline = { \
+			'metrics': { \
+				'msgsPerSec': 1000.0, \
+				'cpuNsPerMsg': 100000.0, \
+				'stages': {'mqttPublish': {'count': 10, 'p50': 5.0, 'p99': 20.0}}}}
+		
+		fileName = os.path.join(tempfile.mkdtemp(prefix = 'pdt-bench-test-'), 'baseline.json')
+		
+		PipelineBenchmark.saveResults(baseline, fileName)
+		
+		self.assertEqual(PipelineBenchmark.loadResults(fileName), baseline)
+		self.assertEqual(PipelineBenchmark.compareResults(baseline, baseline), [])
+		
+		results = { \
+			'metrics': { \
+				'msgsPerSec': 800.0, \
+				'cpuNsPerMsg': 90000.0, \
+				'stages': {'mqttPublish': {'count': 99, 'p50': 5.2, 'p99': 30.0}}}}
+		
+		regressions = PipelineBenchmark.compareResults(results, baseline, tolerancePct = 10.0)
+		
+		self.assertEqual(sorted(name for name, baselineVal, currentVal, changePct in regressions), \
+			['msgsPerSec', 'stages.mqttPublish.p99'])
+		
+		os.remove(fileName)
+		os.rmdir(os.path.dirname(fileName))
+	
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,131 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import unittest
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.MetricCounter import MetricCounter
+from labbenchstudios.pdt.data.DataUtil import DataUtil
+from labbenchstudios.pdt.edge.connection.ConnectionStateTracker import ConnectionStateTracker
+
+class ConnectionStateTrackerTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	ConnectionStateTracker. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing ConnectionStateTracker class...")
+		
+	def setUp(self):
+		self.msgInCounter  = MetricCounter('testMsgIn')
+		self.msgOutCounter = MetricCounter('testMsgOut')
+		
+		self.tracker = \
+			ConnectionStateTracker( \
+				name = ConfigConst.MQTT_CONN_STATE_NAME, hostName = 'localhost', hostPort = 1883, \
+				msgInCounter = self.msgInCounter, msgOutCounter = self.msgOutCounter)
+		
+	def testInitialState(self):
+		data = self.tracker.createConnectionStateData()
+		
+		self.assertTrue(data.isClientDisconnected())
+		self.assertFalse(data.isClientConnected())
+		self.assertEqual(data.getReconnectCount(), 0)
+		self.assertEqual(data.getConnectTime(), ConfigConst.NOT_SET)
+		self.assertEqual(data.getTypeID(), ConfigConst.SYSTEM_CONN_STATE_TYPE)
+		
+	def testConnectAndReconnect(self):
+		self.tracker.markConnecting()
+		
+		self.assertTrue(self.tracker.createConnectionStateData().isClientConnecting())
+		
+		self.tracker.markConnected()
+		self.tracker.markConnected()
+		
+		data = self.tracker.createConnectionStateData()
+		
+		self.assertTrue(data.isClientConnected())
+		self.assertNotEqual(data.getConnectTime(), ConfigConst.NOT_SET)
+		self.assertEqual(data.getDisconnectTime(), ConfigConst.NOT_SET)
+		self.assertEqual(data.getReconnectCount(), 0)
+		
+		self.tracker.markDisconnected()
+		self.tracker.markDisconnected()
+		self.tracker.markConnected()
+		
+		data = self.tracker.createConnectionStateData()
+		
+		self.assertTrue(data.isClientConnected())
+		self.assertNotEqual(data.getDisconnectTime(), ConfigConst.NOT_SET)
+		self.assertEqual(data.getReconnectCount(), 1)
+		
+	def testMessageCountsAndRoundTrip(self):
+		self.msgInCounter.increment(2)
+		self.msgOutCounter.increment(5)
+		
+		self.tracker.recordRoundTrip(10000000)
+		self.assertEqual(self.tracker.getRoundTripLatency(), 10.0)
+		
+		# each sample moves the estimate 1/8th of the way
+		self.tracker.recordRoundTrip(18000000)
+		self.assertAlmostEqual(self.tracker.getRoundTripLatency(), 11.0)
+		
+		data = self.tracker.createConnectionStateData()
+		
+		self.assertEqual(data.getMessageInCount(), 2)
+		self.assertEqual(data.getMessageOutCount(), 5)
+		self.assertAlmostEqual(data.getRoundTripLatency(), 11.0)
+		
+	def testJsonConversion(self):
+		self.tracker.markConnected()
+		self.tracker.recordRoundTrip(4000000)
+		self.msgOutCounter.increment(3)
+		
+		data = self.tracker.createConnectionStateData()
+		
+		dataUtil = DataUtil()
+		jsonData = dataUtil.connectionStateDataToJson(data)
+		
+		logging.info("ConnectionStateData JSON: " + jsonData)
+		
+		data2 = dataUtil.jsonToConnectionStateData(jsonData)
+		
+		self.assertEqual(data2.getName(), ConfigConst.MQTT_CONN_STATE_NAME)
+		self.assertEqual(data2.getHostName(), 'localhost')
+		self.assertEqual(data2.getMessageOutCount(), 3)
+		self.assertEqual(data2.getConnectTime(), data.getConnectTime())
+		self.assertTrue(data2.isClientConnected())
+		self.assertEqual(data2.getRoundTripLatency(), 4.0)
+		
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,137 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import socket
+import time
+import unittest
+
+from labbenchstudios.pdt.benchmarks.FakeMqttBroker import FakeMqttBroker
+
+from labbenchstudios.pdt.common.ResourceNameEnum import ResourceNameEnum
+
+from labbenchstudios.pdt.edge.connection.ConnectionStateEnum import ConnectionStateEnum
+from labbenchstudios.pdt.edge.connection.MqttClientConnector import MqttClientConnector
+from labbenchstudios.pdt.edge.connection.ReconnectBackoff import ReconnectBackoff
+
+class MqttClientReconnectTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for the
+	MqttClientConnector reconnect handling, using a port nothing
+	is listening on, or a FakeMqttBroker (so no broker is needed).
+	It should not be
+	considered complete, but serve as a starting point for the
+	student implementing additional functionality within their
+	Programming the IoT environment.
+	
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing MqttClientConnector reconnect handling...")
+		
+	def setUp(self):
+		# bind (but don't listen on) a port, so connections to it are refused
+		self.closedSocket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+		self.closedSocket.bind(('127.0.0.1', 0))
+		
+		self.mcc = MqttClientConnector(clientID = 'reconnectTestClient')
+		self.mcc.host = '127.0.0.1'
+		self.mcc.port = self.closedSocket.getsockname()[1]
+		self.mcc.reconnectBackoff = ReconnectBackoff(minDelay = 0.1, maxDelay = 0.2, seed = 1)
+		
+	def tearDown(self):
+		self.mcc.disconnectClient()
+		self.closedSocket.close()
+		
+	def testConnectWithoutBrokerRetries(self):
+		self.assertEqual(self.mcc.getConnectionStatus(), ConnectionStateEnum.DISCONNECTED)
+		
+		# doesn't raise, even though the broker isn't reachable
+		self.assertTrue(self.mcc.connectClient())
+		self.assertFalse(self.mcc.connectClient())
+		
+		self.assertTrue(self.mcc.connStateTracker.waitForState(ConnectionStateEnum.RECONNECTING, timeout = 5.0))
+		self.assertFalse(self.mcc.waitForConnection(timeout = 0.5))
+		
+		# several attempts should have been made by now
+		self.assertGreaterEqual(self.mcc.reconnectBackoff.getAttemptCount(), 2)
+		self.assertLessEqual(self.mcc.connStateTracker.getReconnectDelay(), 0.2)
+		
+		self.assertTrue(self.mcc.disconnectClient())
+		self.assertEqual(self.mcc.getConnectionStatus(), ConnectionStateEnum.DISCONNECTED)
+		
+	def testSubscriptionsKeptWhileDisconnected(self):
+		self.mcc.connectClient()
+		
+		self.assertTrue(self.mcc.subscribeToTopicByName('PIOT/test/Topic', qos = 1))
+		
+		self.assertIn('PIOT/test/Topic', self.mcc.subscriptions)
+		self.assertEqual(self.mcc.subscriptions['PIOT/test/Topic'][0], 1)
+		
+	def testReconnectAfterBrokerRestart(self):
+		broker = FakeMqttBroker()
+		
+		try:
+			self.mcc.port = broker.startBroker()
+			self.mcc.connectClient()
+			self.mcc.subscribeToTopicByName('PIOT/test/Topic', qos = 1)
+			
+			self.assertTrue(self.mcc.waitForConnection(timeout = 5.0))
+			self.assertTrue(self._waitFor(lambda: broker.getSubscriptionCount() == 3))
+			
+			broker.stopBroker()
+			
+			self.assertTrue(self.mcc.connStateTracker.waitForState(ConnectionStateEnum.RECONNECTING, timeout = 5.0))
+			
+			# QoS 1 messages are queued by the client while disconnected
+			self.assertTrue(self.mcc.publishMessage(ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE, msg = 'queued', qos = 1))
+			
+			broker.startBroker()
+			
+			self.assertTrue(self.mcc.waitForConnection(timeout = 5.0))
+			self.assertEqual(self.mcc.getConnectionState().getReconnectCount(), 1)
+			
+			# the actuator command, management command and test topics are all resubscribed
+			self.assertTrue(self._waitFor(lambda: broker.getSubscriptionCount() == 3))
+			self.assertTrue(self._waitFor( \
+				lambda: len(broker.getMessages(ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE.value)) == 1))
+		finally:
+			self.mcc.disconnectClient()
+			broker.stopBroker(stopLoop = True)
+		
+	def _waitFor(self, condition, timeout: float = 5.0) -> bool:
+		endTime = time.monotonic() + timeout
+		
+		while not condition():
+			if time.monotonic() > endTime:
+				return False
+			
+			time.sleep(0.05)
+		
+		return True
+		
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,92 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import unittest
+
+from labbenchstudios.pdt.edge.connection.ReconnectBackoff import ReconnectBackoff
+
+class ReconnectBackoffTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	ReconnectBackoff. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing ReconnectBackoff class...")
+		
+	def testDelayCeilingGrowsAndCaps(self):
+		backoff = ReconnectBackoff(minDelay = 1.0, maxDelay = 10.0, seed = 1)
+		ceilings = []
+		
+		for i in range(6):
+			ceilings.append(backoff.getDelayCeiling())
+			backoff.nextDelay()
+		
+		self.assertEqual(ceilings, [1.0, 2.0, 4.0, 8.0, 10.0, 10.0])
+		self.assertEqual(backoff.getAttemptCount(), 6)
+		
+	def testDelaysAreJitteredWithinBounds(self):
+		backoff = ReconnectBackoff(minDelay = 0.5, maxDelay = 30.0, seed = 7)
+		delays = []
+		
+		for i in range(50):
+			ceiling = backoff.getDelayCeiling()
+			delay = backoff.nextDelay()
+			
+			self.assertGreaterEqual(delay, 0.5)
+			self.assertLessEqual(delay, ceiling)
+			
+			delays.append(delay)
+		
+		# capped delays must not all be the same value
+		self.assertGreater(len(set(delays[-10:])), 1)
+		
+	def testLongOutageDoesNotOverflow(self):
+		backoff = ReconnectBackoff(minDelay = 1.0, maxDelay = 60.0)
+		
+		for i in range(5000):
+			backoff.nextDelay()
+		
+		self.assertEqual(backoff.getDelayCeiling(), 60.0)
+		
+	def testReset(self):
+		backoff = ReconnectBackoff(minDelay = 2.0, maxDelay = 60.0)
+		
+		for i in range(5):
+			backoff.nextDelay()
+		
+		backoff.reset()
+		
+		self.assertEqual(backoff.getAttemptCount(), 0)
+		self.assertEqual(backoff.nextDelay(), 2.0)
+		
+if __name__ == "__main__":
+	unittest.main()
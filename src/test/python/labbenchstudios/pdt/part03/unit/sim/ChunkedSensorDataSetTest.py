@@ -0,0 +1,86 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import unittest
+
+import numpy as calcLib
+
+from labbenchstudios.pdt.edge.simulation.SensorDataGenerator import SensorDataGenerator
+from labbenchstudios.pdt.edge.simulation.SensorDataGenerator import ChunkedSensorDataSet
+
+class ChunkedSensorDataSetTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	ChunkedSensorDataSet. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing ChunkedSensorDataSet class...")
+		
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+
+	def testChunkedMatchesEagerDataSet(self):
+		eagerGenerator   = SensorDataGenerator()
+		chunkedGenerator = SensorDataGenerator(chunkSize = 100)
+		
+		eagerDataSet   = eagerGenerator.generateDailyEnvironmentPressureDataSet(noiseLevel = SensorDataGenerator.NO_NOISE, minValue = 990.0, maxValue = 1010.0)
+		chunkedDataSet = chunkedGenerator.generateDailyEnvironmentPressureDataSet(noiseLevel = SensorDataGenerator.NO_NOISE, minValue = 990.0, maxValue = 1010.0)
+		
+		self.assertIsInstance(chunkedDataSet, ChunkedSensorDataSet)
+		self.assertEqual(chunkedDataSet.getDataEntryCount(), eagerDataSet.getDataEntryCount())
+		self.assertEqual(chunkedDataSet.getChunkCount(), 15)
+		
+		# random access, including across chunk boundaries
+		for index in (1439, 0, 99, 100, 700, 5):
+			self.assertAlmostEqual(chunkedDataSet.getDataEntry(index), eagerDataSet.getDataEntry(index))
+			self.assertAlmostEqual(chunkedDataSet.getTimeEntry(index), eagerDataSet.getTimeEntry(index))
+		
+		self.assertTrue(calcLib.allclose(chunkedDataSet.getDataEntries(), eagerDataSet.getDataEntries()))
+		
+	def testChunkedNoiseIsRepeatable(self):
+		chunkedDataSet = \
+			ChunkedSensorDataSet( \
+				startHour = 0, endHour = 168, totalDataPoints = 168 * 3600, curveDenominator = 4.0, \
+				noiseLevel = SensorDataGenerator.DEFAULT_NOISE, minValue = 18.0, maxValue = 22.0, \
+				chunkSize = 4096, seed = 42)
+		
+		firstVal = chunkedDataSet.getDataEntry(500000)
+		
+		chunkedDataSet.getDataEntry(0)
+		
+		self.assertEqual(chunkedDataSet.getDataEntry(500000), firstVal)
+		self.assertLessEqual(chunkedDataSet.dataChunk.size, 4096)
+
+if __name__ == "__main__":
+	unittest.main()
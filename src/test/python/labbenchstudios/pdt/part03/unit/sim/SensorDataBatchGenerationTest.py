@@ -0,0 +1,81 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import unittest
+
+import numpy as calcLib
+
+from numpy.random import Generator, PCG64
+
+from labbenchstudios.pdt.edge.simulation.SensorDataGenerator import SensorDataGenerator
+
+class SensorDataBatchGenerationTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	SensorDataGenerator.generateSensorDataSetBatch(). It should not
+	be considered complete, but serve as a starting point for the
+	student implementing additional functionality within their
+	Programming the IoT environment.
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing SensorDataGenerator batch generation...")
+		
+		self.dataSetSpecs = [ \
+			{'curveType': SensorDataGenerator.FULL_WAVE, 'minValue': 18.0, 'maxValue': 22.0, 'endHour': 24}, \
+			{'curveType': SensorDataGenerator.BELL_CURVE, 'minValue': 35.0, 'maxValue': 45.0, 'endHour': 48}, \
+			{'curveType': SensorDataGenerator.INVERSE_CURVE, 'minValue': 990.0, 'maxValue': 1010.0, 'endHour': 24, 'useSeconds': True} ]
+		
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+
+	def testGenerateBatch(self):
+		dataSets = SensorDataGenerator().generateSensorDataSetBatch(self.dataSetSpecs, maxWorkers = 2)
+		
+		self.assertEqual([dataSet.getDataEntryCount() for dataSet in dataSets], [24 * 60, 48 * 60, 24 * 3600])
+		self.assertGreater(dataSets[2].getDataEntry(0), 900.0)
+		
+	def testSeededBatchIsReproducible(self):
+		dataSetsA = \
+			SensorDataGenerator(randomGenerator = Generator(PCG64(5))).generateSensorDataSetBatch(self.dataSetSpecs, maxWorkers = 1)
+		dataSetsB = \
+			SensorDataGenerator(randomGenerator = Generator(PCG64(5))).generateSensorDataSetBatch(self.dataSetSpecs, maxWorkers = 3)
+		
+		for dataSetA, dataSetB in zip(dataSetsA, dataSetsB):
+			self.assertTrue(calcLib.array_equal(dataSetA.getDataEntries(), dataSetB.getDataEntries()))
+		
+	def testInvalidSpec(self):
+		dataSets = SensorDataGenerator().generateSensorDataSetBatch([{'notAParam': 1}, self.dataSetSpecs[0]])
+		
+		self.assertIsNone(dataSets[0])
+		self.assertIsNotNone(dataSets[1])
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,204 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import unittest
+
+from time import sleep
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.edge.simulation.SensorDataReplayTask import SensorDataReplayTask
+
+class SensorDataReplayTaskTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	SensorDataReplayTask. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	SIM_TEST_DATA_PATH = \
+		os.path.join( \
+			os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', '..', '..', '..', '..', '..', 'simTestData')
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing SensorDataReplayTask class...")
+		
+		self.tempDir = tempfile.TemporaryDirectory()
+		self.dataFileName = os.path.join(self.tempDir.name, 'ReplayTestData.json')
+		
+		records = []
+		
+		for i in range(10):
+			records.append({'timeOffsetSeconds': i * 10.0, 'name': 'Recorded', 'typeID': 0, 'value': float(i)})
+		
+		with open(self.dataFileName, 'w') as dataFile:
+			json.dump({'sensorDataList': records}, dataFile, indent = 4)
+		
+	@classmethod
+	def tearDownClass(self):
+		self.tempDir.cleanup()
+		
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+
+	def testGenerateTelemetryAsFastAsPossible(self):
+		replayTask = \
+			SensorDataReplayTask( \
+				dataFileName = self.dataFileName, name = ConfigConst.TEMP_SENSOR_NAME, typeID = ConfigConst.TEMP_SENSOR_TYPE, \
+				playbackRate = SensorDataReplayTask.AS_FAST_AS_POSSIBLE, chunkSize = 16)
+		
+		for i in range(10):
+			sd = replayTask.generateTelemetry()
+			
+			self.assertEqual(sd.getValue(), float(i))
+			self.assertEqual(sd.getName(), ConfigConst.TEMP_SENSOR_NAME)
+			self.assertEqual(sd.getTypeID(), ConfigConst.TEMP_SENSOR_TYPE)
+		
+		# rollover is enabled by default
+		self.assertEqual(replayTask.generateTelemetry().getValue(), 0.0)
+		
+	def testGenerateTelemetryWithoutRollover(self):
+		replayTask = \
+			SensorDataReplayTask(dataFileName = self.dataFileName, playbackRate = SensorDataReplayTask.AS_FAST_AS_POSSIBLE)
+		replayTask.enableSimulatedDataRollover(enable = False)
+		
+		for i in range(12):
+			sd = replayTask.generateTelemetry()
+		
+		self.assertEqual(sd.getValue(), 9.0)
+		self.assertEqual(replayTask.getReplayedRecordCount(), 10)
+		
+	def testGenerateTelemetryRealTime(self):
+		replayTask = \
+			SensorDataReplayTask(dataFileName = self.dataFileName, playbackRate = SensorDataReplayTask.REAL_TIME)
+		
+		# the recorded offsets are 10 seconds apart, so the first record is held
+		self.assertEqual(replayTask.generateTelemetry().getValue(), 0.0)
+		self.assertEqual(replayTask.generateTelemetry().getValue(), 0.0)
+		self.assertEqual(replayTask.getSkippedRecordCount(), 0)
+		
+	def testGenerateTelemetrySlowPolling(self):
+		replayTask = \
+			SensorDataReplayTask(dataFileName = self.dataFileName, playbackRate = SensorDataReplayTask.REAL_TIME)
+		
+		self.assertEqual(replayTask.generateTelemetry().getValue(), 0.0)
+		
+		# poll 35 seconds later - the records at 10, 20 and 30 seconds are due,
+		# and only the latest is returned
+		replayTask.replayStartTime -= 35.0
+		
+		self.assertEqual(replayTask.generateTelemetry().getValue(), 3.0)
+		self.assertEqual(replayTask.getSkippedRecordCount(), 2)
+		
+		# poll 10 seconds later - only the record at 40 seconds is due
+		replayTask.replayStartTime -= 10.0
+		
+		self.assertEqual(replayTask.generateTelemetry().getValue(), 4.0)
+		self.assertEqual(replayTask.getSkippedRecordCount(), 2)
+		
+	def testGenerateTelemetryTimedRollover(self):
+		dataFileName = os.path.join(self.tempDir.name, 'RolloverTestData.json')
+		
+		records = [{'timeOffsetSeconds': float(i), 'name': 'Recorded', 'typeID': 0, 'value': float(i)} for i in range(3)]
+		
+		with open(dataFileName, 'w') as dataFile:
+			json.dump({'sensorDataList': records}, dataFile)
+		
+		replayTask = SensorDataReplayTask(dataFileName = dataFileName, playbackRate = 100.0)
+		
+		values = []
+		
+		def generate():
+			for i in range(3):
+				values.append(replayTask.generateTelemetry().getValue())
+				
+				# 0.05 seconds at 100x is well past the end of the file
+				sleep(0.05)
+		
+		# the rollover used to loop forever, so guard against a hang
+		generator = threading.Thread(target = generate, daemon = True)
+		generator.start()
+		generator.join(timeout = 5.0)
+		
+		self.assertFalse(generator.is_alive())
+		
+		# each call past the end restarts from the first record
+		self.assertEqual(values, [0.0, 0.0, 0.0])
+		# the first record, then two full passes
+		self.assertEqual(replayTask.getReplayedRecordCount(), 7)
+		
+	def testReplayAccelerated(self):
+		replayTask = \
+			SensorDataReplayTask(dataFileName = self.dataFileName, playbackRate = 1000.0)
+		
+		received = []
+		
+		class ReplayListener():
+			def handleSensorMessage(self, data) -> bool:
+				received.append(data.getValue())
+				
+				return True
+		
+		# 90 seconds of recorded data at 1000x is ~0.09 seconds
+		count = replayTask.replay(listener = ReplayListener())
+		
+		self.assertEqual(count, 10)
+		self.assertEqual(received, [float(i) for i in range(10)])
+		
+	def testMissingFile(self):
+		replayTask = \
+			SensorDataReplayTask(dataFileName = os.path.join(self.tempDir.name, 'Missing.json'))
+		
+		self.assertIsNone(replayTask.generateTelemetry())
+		
+	def testReplaySimTestData(self):
+		dataFileName = os.path.join(self.SIM_TEST_DATA_PATH, SensorDataReplayTask.TEMP_DATA_FILE_NAME)
+		
+		if not os.path.isfile(dataFileName):
+			self.skipTest("Sim test data not found: " + dataFileName)
+		
+		replayTask = \
+			SensorDataReplayTask( \
+				dataFileName = dataFileName, typeID = ConfigConst.TEMP_SENSOR_TYPE, \
+				playbackRate = SensorDataReplayTask.AS_FAST_AS_POSSIBLE)
+		
+		count = replayTask.replay()
+		
+		self.assertEqual(count, 1440)
+		logging.info("Last replayed temperature SensorData: %s", str(replayTask.getLatestTelemetry()))
+
+if __name__ == "__main__":
+	unittest.main()
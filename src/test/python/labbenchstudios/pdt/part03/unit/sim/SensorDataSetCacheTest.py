@@ -0,0 +1,131 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import tempfile
+import unittest
+
+import numpy as calcLib
+
+from numpy.random import Generator, PCG64
+
+from labbenchstudios.pdt.edge.simulation.SensorDataGenerator import SensorDataGenerator
+from labbenchstudios.pdt.edge.simulation.SensorDataSetCache import SensorDataSetCache
+
+class SensorDataSetCacheTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	SensorDataSetCache. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing SensorDataSetCache class...")
+		
+	def setUp(self):
+		self.tempDir = tempfile.TemporaryDirectory()
+		self.dataSetCache = SensorDataSetCache(cachePath = self.tempDir.name)
+
+	def tearDown(self):
+		self.tempDir.cleanup()
+
+	def testCacheKey(self):
+		params = {'curveType': 0, 'minValue': 1.0, 'maxValue': 2.0}
+		
+		self.assertEqual(self.dataSetCache.getCacheKey(params), self.dataSetCache.getCacheKey(dict(reversed(params.items()))))
+		self.assertNotEqual(self.dataSetCache.getCacheKey(params), self.dataSetCache.getCacheKey({'curveType': 5, 'minValue': 1.0, 'maxValue': 2.0}))
+		
+	def testGenerateAndLoadCachedDataSet(self):
+		generatedDataSet = \
+			self._createGenerator(seed = 1).generateDailyIndoorTemperatureDataSet(minValue = 18.0, maxValue = 22.0)
+		cachedDataSet    = \
+			self._createGenerator(seed = 1).generateDailyIndoorTemperatureDataSet(minValue = 18.0, maxValue = 22.0)
+		
+		# the second call loads the (memory mapped) arrays stored by the first
+		self.assertIsInstance(cachedDataSet.getDataEntries(), calcLib.memmap)
+		self.assertEqual(cachedDataSet.getDataEntryCount(), generatedDataSet.getDataEntryCount())
+		self.assertTrue(calcLib.array_equal(cachedDataSet.getDataEntries(), generatedDataSet.getDataEntries()))
+		self.assertTrue(calcLib.array_equal(cachedDataSet.getTimeEntries(), generatedDataSet.getTimeEntries()))
+		
+		# different parameters must not hit the same entry
+		otherDataSet = \
+			self._createGenerator(seed = 1).generateDailyIndoorTemperatureDataSet(minValue = 16.0, maxValue = 22.0)
+		
+		self.assertNotIsInstance(otherDataSet.getDataEntries(), calcLib.memmap)
+		self.assertEqual(self.dataSetCache.clearCache(), 4)
+		
+	def testCacheKeyIncludesSeed(self):
+		seedOneDataSet = \
+			self._createGenerator(seed = 1).generateDailyIndoorTemperatureDataSet(minValue = 18.0, maxValue = 22.0)
+		seedTwoDataSet = \
+			self._createGenerator(seed = 2).generateDailyIndoorTemperatureDataSet(minValue = 18.0, maxValue = 22.0)
+		
+		self.assertNotIsInstance(seedTwoDataSet.getDataEntries(), calcLib.memmap)
+		self.assertFalse(calcLib.array_equal(seedOneDataSet.getDataEntries(), seedTwoDataSet.getDataEntries()))
+		
+		# the next data set from the same stream has different noise
+		dataGenerator = self._createGenerator(seed = 1)
+		dataGenerator.generateDailyIndoorTemperatureDataSet(minValue = 18.0, maxValue = 22.0)
+		
+		nextDataSet = dataGenerator.generateDailyIndoorTemperatureDataSet(minValue = 18.0, maxValue = 22.0)
+		
+		self.assertNotIsInstance(nextDataSet.getDataEntries(), calcLib.memmap)
+		self.assertFalse(calcLib.array_equal(seedOneDataSet.getDataEntries(), nextDataSet.getDataEntries()))
+		
+	def testCacheDoesNotChangeRandomStream(self):
+		# cold cache (miss), then warm cache (hit) - the next draw must match
+		warmGenerator = self._createGenerator(seed = 1)
+		coldGenerator = self._createGenerator(seed = 1)
+		
+		coldGenerator.generateDailyIndoorTemperatureDataSet(minValue = 18.0, maxValue = 22.0)
+		warmDataSet = warmGenerator.generateDailyIndoorTemperatureDataSet(minValue = 18.0, maxValue = 22.0)
+		
+		self.assertIsInstance(warmDataSet.getDataEntries(), calcLib.memmap)
+		self.assertEqual(warmGenerator.randomGenerator.integers(0, 2 ** 32), coldGenerator.randomGenerator.integers(0, 2 ** 32))
+		
+	def testRandomSeedSkipsCacheForNoise(self):
+		dataGenerator = SensorDataGenerator(dataSetCache = self.dataSetCache)
+		
+		dataGenerator.generateDailyIndoorTemperatureDataSet(minValue = 18.0, maxValue = 22.0)
+		
+		self.assertEqual(self.dataSetCache.clearCache(), 0)
+		
+		# data sets without noise don't depend on the seed, so they're still cached
+		dataGenerator.generateDailyIndoorTemperatureDataSet(noiseLevel = SensorDataGenerator.NO_NOISE)
+		cachedDataSet = dataGenerator.generateDailyIndoorTemperatureDataSet(noiseLevel = SensorDataGenerator.NO_NOISE)
+		
+		self.assertIsInstance(cachedDataSet.getDataEntries(), calcLib.memmap)
+		
+	def testLoadMissingDataSet(self):
+		self.assertIsNone(self.dataSetCache.loadDataSet({'curveType': 0}))
+		
+	def _createGenerator(self, seed: int) -> SensorDataGenerator:
+		return SensorDataGenerator(dataSetCache = self.dataSetCache, randomGenerator = Generator(PCG64(seed)))
+
+if __name__ == "__main__":
+	unittest.main()
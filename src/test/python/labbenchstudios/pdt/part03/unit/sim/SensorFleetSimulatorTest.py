@@ -0,0 +1,93 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import unittest
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.common.DefaultDataMessageListener import DefaultDataMessageListener
+from labbenchstudios.pdt.edge.simulation.SensorFleetSimulator import SensorFleetSimulator
+
+class SensorFleetSimulatorTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	SensorFleetSimulator. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing SensorFleetSimulator class...")
+		self.fleetSim = SensorFleetSimulator(deviceCount = 50, minValue = 18.0, maxValue = 22.0, seed = 1)
+		
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+
+	def testGenerateTelemetry(self):
+		values = self.fleetSim.generateTelemetry()
+		
+		self.assertEqual(values.shape, (50,))
+		
+		# default noise is small relative to the curve's range
+		self.assertGreater(values.min(), 17.0)
+		self.assertLess(values.max(), 23.0)
+		
+	def testGenerateSensorDataBatch(self):
+		batch = self.fleetSim.generateSensorDataBatch()
+		
+		self.assertEqual(len(batch), 50)
+		self.assertEqual(batch[0].getName(), ConfigConst.TEMP_SENSOR_NAME)
+		self.assertEqual(batch[0].getTypeID(), ConfigConst.TEMP_SENSOR_TYPE)
+		self.assertEqual(len(set([sd.getDeviceID() for sd in batch])), 50)
+		self.assertEqual(batch[49].getLocationID(), self.fleetSim.getDeviceIDs()[49])
+		
+	def testHandleTelemetry(self):
+		received = []
+		
+		class BatchListener(DefaultDataMessageListener):
+			def handleSensorMessageBatch(self, dataList: list) -> bool:
+				received.extend(dataList)
+				
+				return True
+		
+		self.fleetSim.setDataMessageListener(BatchListener())
+		self.fleetSim.handleTelemetry()
+		
+		self.assertEqual(len(received), self.fleetSim.getDeviceCount())
+		
+	def testSeededFleetIsRepeatable(self):
+		fleetSimA = SensorFleetSimulator(deviceCount = 10, seed = 7)
+		fleetSimB = SensorFleetSimulator(deviceCount = 10, seed = 7)
+		
+		self.assertEqual(fleetSimA.generateTelemetry().tolist(), fleetSimB.generateTelemetry().tolist())
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,94 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import unittest
+
+import numpy as calcLib
+
+from labbenchstudios.pdt.edge.simulation.SensorDataGenerator import SensorDataGenerator
+from labbenchstudios.pdt.edge.simulation.SimRandomStreams import SimRandomStreams
+from labbenchstudios.pdt.edge.simulation.TemperatureSensorSimTask import TemperatureSensorSimTask
+
+class SimRandomStreamsTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	SimRandomStreams. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing SimRandomStreams class...")
+		
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+
+	def testSeededDataSetsAreReproducible(self):
+		dataSetA = SensorDataGenerator(randomGenerator = SimRandomStreams(seed = 42).createGenerator()).generateDailyIndoorTemperatureDataSet()
+		dataSetB = SensorDataGenerator(randomGenerator = SimRandomStreams(seed = 42).createGenerator()).generateDailyIndoorTemperatureDataSet()
+		dataSetC = SensorDataGenerator(randomGenerator = SimRandomStreams(seed = 43).createGenerator()).generateDailyIndoorTemperatureDataSet()
+		
+		self.assertTrue(calcLib.array_equal(dataSetA.getDataEntries(), dataSetB.getDataEntries()))
+		self.assertFalse(calcLib.array_equal(dataSetA.getDataEntries(), dataSetC.getDataEntries()))
+		
+	def testIsSeeded(self):
+		self.assertTrue(SimRandomStreams(seed = 42).isSeeded())
+		self.assertTrue(SimRandomStreams(seed = SimRandomStreams(seed = 42).spawnSeedSequences(1)[0]).isSeeded())
+		self.assertFalse(SimRandomStreams(seed = -1).isSeeded())
+		self.assertFalse(SimRandomStreams().isSeeded())
+		
+	def testSpawnedStreamsAreIndependent(self):
+		randomStreams = SimRandomStreams(seed = 7)
+		
+		generatorA, generatorB = randomStreams.createGenerators(2)
+		
+		self.assertNotEqual(generatorA.random(), generatorB.random())
+		
+		# a worker process re-creating a stream from a spawned seed sequence
+		childSeeds = SimRandomStreams(seed = 7).spawnSeedSequences(3)
+		workerGenerator = SimRandomStreams(seed = childSeeds[0]).createGenerator()
+		
+		self.assertEqual(workerGenerator.random(), SimRandomStreams(seed = childSeeds[0]).createGenerator().random())
+		self.assertEqual(randomStreams.getSeed(), 7)
+		
+	def testSeededSensorTaskIsReproducible(self):
+		simTaskA = TemperatureSensorSimTask(randomGenerator = SimRandomStreams(seed = 1).createGenerator())
+		simTaskB = TemperatureSensorSimTask(randomGenerator = SimRandomStreams(seed = 1).createGenerator())
+		
+		for i in range(300):
+			valA = simTaskA.generateTelemetry().getValue()
+			
+			self.assertEqual(valA, simTaskB.generateTelemetry().getValue())
+			self.assertGreaterEqual(valA, SensorDataGenerator.MIN_INDOOR_TEMP)
+			self.assertLessEqual(valA, SensorDataGenerator.MAX_INDOOR_TEMP)
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,123 @@
+##
+# MIT License
+# 
+# Copyright (c) 2020 - 2024 Andrew D. King
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import logging
+import unittest
+
+import numpy as calcLib
+
+import labbenchstudios.pdt.common.ConfigConst as ConfigConst
+
+from labbenchstudios.pdt.edge.simulation.SensorDataGenerator import SensorDataSet
+from labbenchstudios.pdt.edge.simulation.WindFarmSimulator import WindFarmSimulator
+from labbenchstudios.pdt.edge.simulation.WindTurbineSensorSimTask import WindTurbineSensorSimTask
+
+class WindFarmSimulatorTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	WindFarmSimulator. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing WindFarmSimulator class...")
+		
+		self.windField = SensorDataSet(timeEntries = calcLib.arange(4.0), dataEntries = calcLib.array([8.0, 10.0, 12.0, 14.0]))
+		
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+
+	def testSingleTurbineMatchesSimTask(self):
+		windFarm = WindFarmSimulator(turbineCount = 1, windSpeedDataSet = self.windField)
+		wtSimTask = WindTurbineSensorSimTask()
+		
+		powerOutputs, rotorHubRpms, rotorTipSpeeds = wtSimTask.calcPowerCurve(self.windField)
+		
+		for i in range(4):
+			windFarm.generateTelemetry()
+			
+			self.assertAlmostEqual(windFarm.getPowerOutputs()[0], powerOutputs[i])
+			self.assertAlmostEqual(windFarm.getRotorHubRpms()[0], rotorHubRpms[i])
+		
+	def testRotorDiameterVariance(self):
+		windFarm = \
+			WindFarmSimulator( \
+				turbineCount = 5, windSpeedDataSet = self.windField, turbinesPerRow = 5, rotorDiameterVariance = 0.2, seed = 1)
+		wtSimTask = WindTurbineSensorSimTask()
+		
+		powerOutputs = windFarm.generateTelemetry()
+		
+		# each turbine matches a single turbine of the same rotor diameter
+		for i in range(5):
+			turbinePowerOutputs, turbineHubRpms, turbineTipSpeeds = \
+				wtSimTask.calcPowerCurve([8.0], rotorDiameters = windFarm.rotorDiameters[i])
+			
+			self.assertAlmostEqual(powerOutputs[i], turbinePowerOutputs[0])
+			self.assertAlmostEqual(windFarm.getRotorHubRpms()[i], turbineHubRpms[0])
+		
+		self.assertGreater(powerOutputs.max(), powerOutputs.min())
+		
+	def testLagAndWakeDeficit(self):
+		windFarm = \
+			WindFarmSimulator( \
+				turbineCount = 4, windSpeedDataSet = self.windField, turbinesPerRow = 2, \
+				lagStepsPerRow = 1, wakeDeficitPerRow = 0.1)
+		
+		windFarm.generateTelemetry()
+		windFarm.generateTelemetry()
+		
+		# the second row sees the previous wind speed, reduced by the wake deficit
+		self.assertEqual(windFarm.getWindSpeeds().tolist()[0:2], [10.0, 10.0])
+		self.assertAlmostEqual(windFarm.getWindSpeeds()[2], 8.0 * 0.9)
+		
+	def testBrakingAndFarmTelemetry(self):
+		windFarm = WindFarmSimulator(turbineCount = 10, windSpeedDataSet = self.windField)
+		windFarm.enableBrakingSystem(enable = True, turbineIndexes = [0, 3])
+		
+		powerOutputs = windFarm.generateTelemetry()
+		
+		self.assertEqual(powerOutputs[0], 0.0)
+		self.assertEqual(windFarm.getActiveTurbineCount(), 8)
+		
+		powerData, rpmData, windSpeedData = windFarm.getFarmTelemetry()
+		
+		self.assertEqual(powerData.getName(), ConfigConst.WIND_FARM_NAME)
+		self.assertEqual(powerData.getTypeID(), ConfigConst.WIND_TURBINE_POWER_OUTPUT_SENSOR_TYPE)
+		self.assertAlmostEqual(powerData.getValue(), float(powerOutputs.sum()))
+		self.assertEqual(rpmData.getTypeID(), ConfigConst.WIND_TURBINE_HUB_SPEED_SENSOR_TYPE)
+		
+		windFarm.enableBrakingSystem(enable = False)
+		windFarm.generateTelemetry()
+		
+		self.assertEqual(windFarm.getActiveTurbineCount(), 10)
+
+if __name__ == "__main__":
+	unittest.main()
@@ -25,8 +25,11 @@
 import logging
 import unittest
 
+import numpy as calcLib
+
 import labbenchstudios.pdt.common.ConfigConst as ConfigConst
 
+from labbenchstudios.pdt.edge.simulation.SensorDataGenerator import SensorDataGenerator
 from labbenchstudios.pdt.edge.simulation.WindTurbineSensorSimTask import WindTurbineSensorSimTask
 
 class WindTurbineSensorSimTaskTest(unittest.TestCase):
@@ -64,6 +67,63 @@ class WindTurbineSensorSimTaskTest(unittest.TestCase):
 		
 		self.assertGreater(val, 0.0)
 		logging.info("Wind Turbine power output: %f", val)
+	
+	def testCalcPowerCurve(self):
+		windSpeeds = calcLib.array([2.0, 5.0, 10.0, 60.0])
+		
+		powerOutputs, rotorHubRpms, rotorTipSpeeds = self.wtSimTask.calcPowerCurve(windSpeeds, applyCutInCutOut = True)
+		
+		# below cut-in and above cut-out speeds the rotor is stopped
+		self.assertEqual(powerOutputs[0], 0.0)
+		self.assertEqual(rotorHubRpms[3], 0.0)
+		self.assertGreater(rotorTipSpeeds[1], 0.0)
+		
+		# power scales with the cube of wind speed
+		self.assertAlmostEqual(powerOutputs[2] / powerOutputs[1], 8.0)
+		
+		powerOutputs, rotorHubRpms, rotorTipSpeeds = \
+			self.wtSimTask.calcPowerCurve(windSpeeds, brakingMask = [False, False, True, False], applyCutInCutOut = False)
+		
+		self.assertGreater(powerOutputs[0], 0.0)
+		self.assertEqual(powerOutputs[2], 0.0)
+		self.assertEqual(rotorHubRpms[2], 0.0)
+		
+	def testPrecomputedTelemetryMatchesPowerCurve(self):
+		dataSet = SensorDataGenerator().generateOscillatingSensorDataSet(minValue = 2.0, maxValue = 20.0)
+		wtSimTask = WindTurbineSensorSimTask(dataSet = dataSet)
+		
+		powerOutputs, rotorHubRpms, rotorTipSpeeds = wtSimTask.calcPowerCurve(dataSet)
+		
+		for i in range(3):
+			wtSimTask.generateTelemetry()
+			
+			self.assertEqual(wtSimTask.getWindSpeed(), dataSet.getDataEntry(i))
+			self.assertAlmostEqual(wtSimTask.getPowerOutput(), powerOutputs[i])
+			self.assertAlmostEqual(wtSimTask.getCalculatedRotorHubRpm(), rotorHubRpms[i])
+		
+		wtSimTask.enableBrakingSystem(enable = True)
+		wtSimTask.generateTelemetry()
+		
+		self.assertEqual(wtSimTask.getPowerOutput(), 0.0)
+		
+	def testChunkedTelemetryMatchesPowerCurve(self):
+		dataSet = SensorDataGenerator(chunkSize = 16).generateOscillatingSensorDataSet(minValue = 2.0, maxValue = 20.0)
+		wtSimTask = WindTurbineSensorSimTask(dataSet = dataSet)
+		
+		# nothing is precomputed for the full horizon
+		self.assertIsNone(wtSimTask.powerCurve)
+		
+		for i in range(40):
+			wtSimTask.generateTelemetry()
+			
+			powerOutputs, rotorHubRpms, rotorTipSpeeds = wtSimTask.calcPowerCurve([dataSet.getDataEntry(i)])
+			
+			self.assertEqual(wtSimTask.getWindSpeed(), dataSet.getDataEntry(i))
+			self.assertAlmostEqual(wtSimTask.getPowerOutput(), powerOutputs[0])
+			self.assertAlmostEqual(wtSimTask.getCalculatedRotorHubRpm(), rotorHubRpms[0])
+		
+		# only the current chunk's power curve is held
+		self.assertEqual(len(wtSimTask.powerCurve[0]), 16)
 
 if __name__ == "__main__":
 	unittest.main()